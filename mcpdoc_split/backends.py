@@ -0,0 +1,247 @@
+"""Output backends: where generate_docs puts the files it produces.
+
+Every file of a run (section files, TOC, search index, cache manifest,
+bundle) is handed to a backend under the path it would have on disk, section
+files through write_section() together with their section dictionary:
+
+- FilesystemBackend writes it there, as the splitter always did;
+- MemoryBackend keeps it in a dictionary, for tests and pipelines that
+  post-process the output without temporary directories;
+- ArchiveBackend streams it into a zip or tar archive written to any binary
+  file object, stdout included, so thousands of sections become one upload;
+- SqliteBackend (in mcpdoc_split.database) stores sections as rows of a
+  full-text indexed SQLite database.
+
+In-memory and archive members are named after the relative path, with
+leading slashes removed as tar does. Incremental, streaming and
+multi-target runs read or link files already on disk and need the
+filesystem backend.
+
+close() completes a successful run; abort() is called instead when the run
+fails, so a backend can discard what it started.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tarfile
+import time
+import zipfile
+from typing import BinaryIO, Dict, Set
+
+from mcpdoc_split.incremental import write_if_changed
+
+ARCHIVE_FORMATS = ("zip", "tar", "tar.gz")
+
+# Archive format by file extension
+_EXTENSIONS = (
+    (".zip", "zip"),
+    (".tar.gz", "tar.gz"),
+    (".tgz", "tar.gz"),
+    (".tar", "tar"),
+)
+
+
+def member_name(path: str) -> str:
+    """
+    Return the in-memory or archive name of an output path.
+
+    Raises:
+        ValueError: If the path climbs above its starting directory
+    """
+    name = os.path.normpath(path).replace(os.sep, "/").lstrip("/")
+    if name == ".." or name.startswith("../"):
+        raise ValueError(f"Output path {path} is outside the archive root")
+    return name
+
+
+def archive_format(path: str) -> str:
+    """
+    Return the archive format matching a file name's extension.
+
+    Raises:
+        ValueError: If the extension is not a supported archive format
+    """
+    for extension, name in _EXTENSIONS:
+        if path.lower().endswith(extension):
+            return name
+    raise ValueError(
+        f"Can't tell the archive format of {path}; use .zip, .tar, .tar.gz or .tgz"
+    )
+
+
+class FilesystemBackend:
+    """Write every output to its path on the local filesystem."""
+
+    def __init__(self):
+        # Directories known to exist, so section writes don't check each time
+        self._dirs: Set[str] = set()
+
+    def prepare(self, output_dir: str, clean: bool) -> None:
+        """Create the output directory, removing what it held if clean."""
+        if clean and os.path.exists(output_dir):
+            shutil.rmtree(output_dir)
+            print(f"Cleaned up existing directory: {output_dir}")
+        os.makedirs(output_dir, exist_ok=True)
+        self._dirs.add(output_dir)
+
+    def write(self, path: str, data) -> None:
+        """Write bytes to a file."""
+        self._ensure_parent(path)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def write_section(self, path: str, section: Dict, data) -> None:
+        """Write the bytes of a section file."""
+        self.write(path, data)
+
+    def update(self, path: str, content: str) -> bool:
+        """Write a text file unless it already holds content; True if written."""
+        self._ensure_parent(path)
+        return write_if_changed(path, content)
+
+    def close(self) -> None:
+        """Nothing to finish: files are complete once written."""
+
+    def abort(self) -> None:
+        """Nothing to undo: the files written so far are kept, as always."""
+
+    def _ensure_parent(self, path: str) -> None:
+        parent = os.path.dirname(path)
+        if parent and parent not in self._dirs:
+            os.makedirs(parent, exist_ok=True)
+            self._dirs.add(parent)
+
+
+class MemoryBackend:
+    """Keep every output in memory."""
+
+    def __init__(self):
+        # File content by member name, in the order written
+        self.files: Dict[str, bytes] = {}
+
+    def prepare(self, output_dir: str, clean: bool) -> None:
+        """Forget the files of the output directory if clean."""
+        if clean:
+            prefix = member_name(output_dir) + "/"
+            for name in [name for name in self.files if name.startswith(prefix)]:
+                del self.files[name]
+
+    def write(self, path: str, data) -> None:
+        """Store bytes under the path's member name."""
+        self.files[member_name(path)] = bytes(data)
+
+    def write_section(self, path: str, section: Dict, data) -> None:
+        """Write the bytes of a section file."""
+        self.write(path, data)
+
+    def update(self, path: str, content: str) -> bool:
+        """Store text unless the same content is stored; True if stored."""
+        name = member_name(path)
+        data = content.encode("utf-8")
+        if self.files.get(name) == data:
+            return False
+        self.files[name] = data
+        return True
+
+    def contents(self) -> Dict[str, str]:
+        """Return the text of every file by member name."""
+        return {name: data.decode("utf-8") for name, data in self.files.items()}
+
+    def close(self) -> None:
+        """Nothing to finish: the files stay available."""
+
+    def abort(self) -> None:
+        """Nothing to undo: the files stored so far stay available."""
+
+
+class ArchiveBackend:
+    """
+    Stream every output into a zip or tar archive.
+
+    Members are added as soon as they are written, so the archive can go to
+    a pipe: only the current member is held in memory. close() completes the
+    archive but leaves the file object open.
+    """
+
+    def __init__(self, fileobj: BinaryIO, archive_format: str = "tar"):
+        """
+        Start an archive.
+
+        Args:
+            fileobj: Binary file object to write to; it doesn't need to be
+                seekable
+            archive_format: One of ARCHIVE_FORMATS
+
+        Raises:
+            ValueError: If archive_format is unknown
+        """
+        if archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(
+                f"archive_format must be one of: {', '.join(ARCHIVE_FORMATS)}"
+            )
+        self.fileobj = fileobj
+        self.archive_format = archive_format
+        self._mtime = time.time()
+        self._zip = None
+        self._tar = None
+        if archive_format == "zip":
+            self._zip = zipfile.ZipFile(
+                fileobj, "w", compression=zipfile.ZIP_DEFLATED
+            )
+        else:
+            mode = "w|gz" if archive_format == "tar.gz" else "w|"
+            self._tar = tarfile.open(fileobj=fileobj, mode=mode)
+
+    def prepare(self, output_dir: str, clean: bool) -> None:
+        """Nothing to prepare: directories are implied by member names."""
+
+    def write(self, path: str, data) -> None:
+        """Add a member holding bytes."""
+        name = member_name(path)
+        if self._zip is not None:
+            info = zipfile.ZipInfo(name, time.localtime(self._mtime)[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            with self._zip.open(info, "w") as member:
+                member.write(data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(self._mtime)
+            info.mode = 0o644
+            self._tar.addfile(info, io.BytesIO(data))
+
+    def write_section(self, path: str, section: Dict, data) -> None:
+        """Write the bytes of a section file."""
+        self.write(path, data)
+
+    def update(self, path: str, content: str) -> bool:
+        """Add a member holding text; always True."""
+        self.write(path, content.encode("utf-8"))
+        return True
+
+    def close(self) -> None:
+        """Write the end of the archive and flush the file object."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        if self._tar is not None:
+            self._tar.close()
+            self._tar = None
+        self.fileobj.flush()
+
+    def abort(self) -> None:
+        """
+        Stop writing after a failed run, leaving the file object open.
+
+        The archive writer is closed so it doesn't touch the file object
+        later; the caller removes the incomplete file it opened.
+        """
+        for archive in (self._zip, self._tar):
+            if archive is not None:
+                with contextlib.suppress(Exception):
+                    archive.close()
+        self._zip = None
+        self._tar = None
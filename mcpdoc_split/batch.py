@@ -0,0 +1,246 @@
+"""Batch mode: split many markdown sources in parallel on a process pool."""
+
+import contextlib
+import glob
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from mcpdoc_split.main import generate_docs
+
+# Options of generate_docs that a batch job may set
+JOB_OPTIONS = (
+    "input_file",
+    "output_dir",
+    "url_prefix",
+    "base_path",
+    "max_level",
+    "toc_file",
+    "incremental",
+    "streaming",
+    "parse_mode",
+    "search_index",
+    "chunk_size",
+    "min_chunk_size",
+    "chunk_unit",
+    "content_hash",
+    "cache_manifest",
+    "bundle_file",
+    "bundle_index",
+    "parse_cache",
+    "parse_cache_size",
+    "precompress",
+    "rewrite_links",
+)
+
+# Options that may contain {stem}, {name} and {parent} placeholders
+TEMPLATE_OPTIONS = (
+    "output_dir",
+    "url_prefix",
+    "base_path",
+    "toc_file",
+    "search_index",
+    "cache_manifest",
+    "bundle_file",
+    "bundle_index",
+)
+
+
+def expand_inputs(patterns: Iterable[str]) -> List[str]:
+    """
+    Expand input paths and glob patterns into a list of files.
+
+    Args:
+        patterns: File paths or glob patterns (``**`` matches recursively)
+
+    Returns:
+        Matching files in the given order, without duplicates
+    """
+    files: List[str] = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        for match in matches:
+            if match not in files:
+                files.append(match)
+    return files
+
+
+def build_jobs(inputs: Iterable[str], **options) -> List[Dict]:
+    """
+    Build batch jobs for a list of inputs sharing the same option templates.
+
+    String options listed in TEMPLATE_OPTIONS are formatted per input with
+    ``{stem}`` (file name without extension), ``{name}`` (file name) and
+    ``{parent}`` (name of the containing directory), so every input can get its
+    own output directory, URL prefix, base path and TOC file.
+
+    Args:
+        inputs: Input markdown files
+        **options: generate_docs options shared by all jobs
+
+    Returns:
+        One job dictionary per input
+
+    Raises:
+        ValueError: If an option is unknown or a template uses an unknown
+            placeholder
+    """
+    unknown = set(options) - set(JOB_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown batch option(s): {', '.join(sorted(unknown))}")
+
+    jobs = []
+    for input_file in inputs:
+        path = Path(input_file)
+        fields = {"stem": path.stem, "name": path.name, "parent": path.parent.name}
+        job = {"input_file": input_file}
+        for key, value in options.items():
+            if key in TEMPLATE_OPTIONS and isinstance(value, str):
+                try:
+                    value = value.format(**fields)
+                except (AttributeError, IndexError, KeyError, ValueError) as e:
+                    raise ValueError(
+                        f"Invalid placeholder in batch option {key}={value!r}: {e}; "
+                        "use {stem}, {name} or {parent}"
+                    ) from e
+            job[key] = value
+        jobs.append(job)
+    return jobs
+
+
+def _validate_jobs(jobs: List[Dict]) -> None:
+    """Reject jobs that are malformed or would overwrite each other's output."""
+    outputs: Dict[str, str] = {}
+    # (output path, job number) of every output, and of the directories
+    targets: List[Tuple[str, int]] = []
+    output_dirs: List[Tuple[str, int]] = []
+    for number, job in enumerate(jobs):
+        if "input_file" not in job:
+            raise ValueError("Every batch job needs an input_file")
+        unknown = set(job) - set(JOB_OPTIONS)
+        if unknown:
+            raise ValueError(
+                f"Unknown option(s) in job for {job['input_file']}: "
+                f"{', '.join(sorted(unknown))}"
+            )
+        for key, default in (
+            ("output_dir", "docs"),
+            ("toc_file", "llms.txt"),
+            ("search_index", None),
+            ("cache_manifest", None),
+            ("bundle_file", None),
+            ("bundle_index", None),
+        ):
+            if not job.get(key, default):
+                continue
+            target = os.path.abspath(job.get(key, default))
+            if target in outputs:
+                raise ValueError(
+                    f"Jobs for {outputs[target]} and {job['input_file']} "
+                    f"both write to {target}"
+                )
+            outputs[target] = job["input_file"]
+            targets.append((target, number))
+            if key == "output_dir":
+                output_dirs.append((target, number))
+
+    # A job's outputs inside another job's output directory would be
+    # overwritten, or removed as stale files, by that job
+    for directory, owner in output_dirs:
+        for target, number in targets:
+            if number != owner and _is_inside(target, directory):
+                raise ValueError(
+                    f"Job for {jobs[number]['input_file']} writes to {target}, "
+                    f"inside the output directory of the job for "
+                    f"{jobs[owner]['input_file']}"
+                )
+
+
+def _is_inside(path: str, directory: str) -> bool:
+    """Tell whether an absolute path is inside (or is) a directory."""
+    try:
+        return os.path.commonpath([path, directory]) == directory
+    except ValueError:
+        # Paths on different drives
+        return False
+
+
+def run_job(job: Dict) -> Dict:
+    """
+    Run a single batch job, capturing its output and any error.
+
+    Args:
+        job: Keyword arguments for generate_docs
+
+    Returns:
+        Report entry with the input file, output locations, status, error
+        message, section and byte counters and elapsed seconds
+    """
+    report = {
+        "input_file": job["input_file"],
+        "output_dir": job.get("output_dir", "docs"),
+        "toc_file": job.get("toc_file", "llms.txt"),
+        "ok": True,
+        "error": None,
+        "sections": 0,
+        "bytes_read": 0,
+        "bytes_written": 0,
+    }
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = generate_docs(**job)
+        report["sections"] = result.sections
+        report["bytes_read"] = result.bytes_read
+        report["bytes_written"] = result.bytes_written
+    except Exception as e:
+        report["ok"] = False
+        report["error"] = f"{type(e).__name__}: {e}"
+    report["seconds"] = round(time.perf_counter() - started, 6)
+    return report
+
+
+def run_batch(jobs: List[Dict], workers: Optional[int] = None) -> Dict:
+    """
+    Split many markdown sources, running the jobs on a process pool.
+
+    Args:
+        jobs: Keyword arguments for generate_docs, one dictionary per input
+        workers: Number of worker processes (default: number of CPUs);
+            1 runs every job in the current process
+
+    Returns:
+        Aggregated report with per-job entries, success and failure counts,
+        section and byte totals and total wall time
+
+    Raises:
+        ValueError: If a job is malformed, two jobs share an output location or
+            workers is not positive
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+    _validate_jobs(jobs)
+
+    started = time.perf_counter()
+    if workers == 1 or len(jobs) <= 1:
+        results = [run_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run_job, jobs))
+
+    failed = sum(1 for result in results if not result["ok"])
+    return {
+        "jobs": results,
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "sections": sum(result["sections"] for result in results),
+        "bytes_read": sum(result["bytes_read"] for result in results),
+        "bytes_written": sum(result["bytes_written"] for result in results),
+        "seconds": round(time.perf_counter() - started, 6),
+    }
@@ -0,0 +1,109 @@
+"""Single-file bundle of all sections with a byte-offset index.
+
+The bundle (``llms-full.txt``) holds every section in document order,
+separated by a blank line, exactly as the section files hold them. The index
+next to it records where each section starts in the bundle and how many
+bytes it takes, so a client can fetch one section with a single HTTP Range
+request against one cacheable object, or download the whole corpus at once.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Tuple
+
+from mcpdoc_split.cache import strong_etag
+from mcpdoc_split.main import section_url
+
+BUNDLE_INDEX_VERSION = 1
+
+# Written between two sections in the bundle
+SEPARATOR = "\n\n"
+
+
+def default_index_path(bundle_file: str) -> str:
+    """Return the index path used for a bundle when none is given."""
+    return f"{os.path.splitext(bundle_file)[0]}.index.json"
+
+
+def build_bundle(
+    rendered: List[Tuple[Dict, str]],
+    bundle_file: str,
+    url_prefix: str,
+    base_path: str,
+) -> Tuple[str, Dict]:
+    """
+    Concatenate rendered sections into a bundle and index their byte ranges.
+
+    The bundle is assumed to be published at ``<url_prefix>/<bundle file
+    name>``, like the TOC.
+
+    Args:
+        rendered: (section, content) pairs in document order
+        bundle_file: Path of the bundle file
+        url_prefix: URL prefix for absolute links
+        base_path: Base path for docs
+
+    Returns:
+        The bundle text and a JSON-serializable index with the bundle's
+        name, url, size, digest and etag and a "sections" list of entries
+        with filename, header, level, url (of the section file), offset and
+        length, both in bytes of the UTF-8 encoded bundle
+    """
+    parts = []
+    entries = []
+    offset = 0
+    separator_length = len(SEPARATOR.encode("utf-8"))
+    for section, content in rendered:
+        length = len(content.encode("utf-8"))
+        entries.append({
+            "filename": section["filename"],
+            "header": section["header"],
+            "level": section["level"],
+            "url": section_url(section["filename"], url_prefix, base_path),
+            "offset": offset,
+            "length": length,
+        })
+        parts.append(content)
+        offset += length + separator_length
+
+    bundle = SEPARATOR.join(parts) + "\n" if parts else ""
+    data = bundle.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    name = os.path.basename(bundle_file)
+    index = {
+        "version": BUNDLE_INDEX_VERSION,
+        "filename": name,
+        "url": f"{url_prefix.rstrip('/')}/{name}",
+        "size": len(data),
+        "digest": f"sha256:{digest}",
+        "etag": strong_etag(digest),
+        "sections": entries,
+    }
+    return bundle, index
+
+
+def dump_bundle_index(index: Dict) -> str:
+    """Serialize a bundle index as JSON."""
+    return json.dumps(index, indent=2, ensure_ascii=False) + "\n"
+
+
+def range_header(entry: Dict) -> str:
+    """Return the HTTP Range header value fetching one indexed section."""
+    return f"bytes={entry['offset']}-{entry['offset'] + entry['length'] - 1}"
+
+
+def read_bundle_section(bundle_file: str, entry: Dict) -> str:
+    """
+    Read one indexed section from a local bundle without reading the rest.
+
+    Args:
+        bundle_file: Path of the bundle
+        entry: Section entry of the bundle index
+
+    Returns:
+        The section content
+    """
+    with open(bundle_file, "rb") as f:
+        f.seek(entry["offset"])
+        return f.read(entry["length"]).decode("utf-8")
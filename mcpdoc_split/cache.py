@@ -0,0 +1,263 @@
+"""Cache-validation manifest for published docs and a client that uses it.
+
+The manifest is a JSON file published next to the TOC. It lists the URL, byte
+size, SHA-256 digest and strong ETag of the TOC and of every section file,
+plus a generation id derived from all digests. A client keeps the last
+manifest it saw and, on every poll,
+
+1. fetches the manifest conditionally (``If-None-Match``), stopping at a 304;
+2. compares the new digests with its local copies and only downloads the
+   files whose content changed, reusing local files whose content merely
+   moved to a new filename;
+3. verifies every download against its digest and removes files that are no
+   longer listed.
+"""
+
+import hashlib
+import json
+import os
+import urllib.error
+import urllib.request
+from typing import Callable, Dict, List, Optional, Tuple
+
+from mcpdoc_split.main import section_url
+
+CACHE_MANIFEST_VERSION = 1
+
+# Client state kept in the cache directory
+STATE_FILENAME = ".mcpdoc-cache.json"
+
+# fetch(url, request headers) -> (status, lowercase response headers, body)
+Fetch = Callable[[str, Dict[str, str]], Tuple[int, Dict[str, str], bytes]]
+
+
+def strong_etag(digest: str) -> str:
+    """Return the strong HTTP entity tag for a SHA-256 hex digest."""
+    return f'"{digest}"'
+
+
+def _entry(filename: str, url: str, digest: str, size: int) -> Dict:
+    return {
+        "filename": filename,
+        "url": url,
+        "size": size,
+        "digest": f"sha256:{digest}",
+        "etag": strong_etag(digest),
+    }
+
+
+def build_cache_manifest(
+    files: List[Tuple[str, str, int]],
+    toc_file: str,
+    toc_data: bytes,
+    url_prefix: str,
+    base_path: str,
+) -> Dict:
+    """
+    Build the cache-validation manifest of a generated documentation set.
+
+    The TOC is assumed to be published at ``<url_prefix>/<TOC file name>``,
+    the sections under ``<url_prefix><base_path>/``.
+
+    Args:
+        files: (filename, SHA-256 hex digest, size in bytes) of every section
+            file, in document order
+        toc_file: Path of the TOC file
+        toc_data: Content of the TOC file
+        url_prefix: URL prefix for absolute links
+        base_path: Base path for docs
+
+    Returns:
+        JSON-serializable manifest with version, generation, toc and sections
+    """
+    toc_name = os.path.basename(toc_file)
+    toc_digest = hashlib.sha256(toc_data).hexdigest()
+    toc = _entry(
+        toc_name, f"{url_prefix.rstrip('/')}/{toc_name}", toc_digest, len(toc_data)
+    )
+    sections = [
+        _entry(filename, section_url(filename, url_prefix, base_path), digest, size)
+        for filename, digest, size in files
+    ]
+
+    generation = hashlib.sha256()
+    for entry in [toc] + sections:
+        generation.update(f"{entry['filename']}\0{entry['digest']}\n".encode("utf-8"))
+
+    return {
+        "version": CACHE_MANIFEST_VERSION,
+        "generation": generation.hexdigest()[:16],
+        "toc": toc,
+        "sections": sections,
+    }
+
+
+def dump_cache_manifest(manifest: Dict) -> str:
+    """Serialize a cache manifest as JSON."""
+    return json.dumps(manifest, indent=2, ensure_ascii=False) + "\n"
+
+
+def http_fetch(url: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+    """
+    Fetch a URL with urllib, reporting 304 Not Modified as a status.
+
+    Raises:
+        OSError: On network errors and error statuses
+    """
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            status = getattr(response, "status", None) or 200
+            response_headers = {k.lower(): v for k, v in response.headers.items()}
+            return status, response_headers, response.read()
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, {k.lower(): v for k, v in e.headers.items()}, b""
+        raise
+
+
+def _file_digest(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def _load_state(cache_dir: str) -> Dict:
+    try:
+        with open(os.path.join(cache_dir, STATE_FILENAME), "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def _listed_files(manifest: Dict) -> List[Dict]:
+    """Return the TOC and section entries of a manifest, checking their fields."""
+    toc = manifest.get("toc")
+    sections = manifest.get("sections")
+    if not isinstance(toc, dict) or not isinstance(sections, list):
+        raise ValueError(
+            "Invalid cache manifest: expected a toc object and a sections list"
+        )
+    entries = [toc] + sections
+    for entry in entries:
+        if not isinstance(entry, dict) or not all(
+            isinstance(entry.get(field), str) for field in ("filename", "url", "digest")
+        ):
+            raise ValueError(
+                "Invalid cache manifest entry (needs string filename, url and "
+                f"digest): {entry!r}"
+            )
+        name = entry["filename"]
+        if os.path.basename(name) != name or name in ("", ".", "..", STATE_FILENAME):
+            raise ValueError(f"Invalid filename in cache manifest: {name!r}")
+    return entries
+
+
+def sync_from_manifest(
+    manifest_url: str, cache_dir: str, fetch: Optional[Fetch] = None
+) -> Dict:
+    """
+    Bring a local copy of published docs up to date using its cache manifest.
+
+    Args:
+        manifest_url: URL of the cache manifest
+        cache_dir: Directory holding the local copy of the TOC and sections
+        fetch: Function performing HTTP GET requests (default: urllib)
+
+    Returns:
+        Statistics: generation, not_modified (the manifest was unchanged),
+        downloaded, reused, unchanged and deleted file counts and
+        bytes_downloaded
+
+    Raises:
+        OSError: If a request fails
+        ValueError: If the manifest is invalid or a download doesn't match its
+            digest
+    """
+    fetch = fetch or http_fetch
+    os.makedirs(cache_dir, exist_ok=True)
+    state = _load_state(cache_dir)
+    previous = state.get("manifest") or {}
+    stats = {
+        "generation": previous.get("generation"),
+        "not_modified": False,
+        "downloaded": 0,
+        "reused": 0,
+        "unchanged": 0,
+        "deleted": 0,
+        "bytes_downloaded": 0,
+    }
+
+    headers = {"If-None-Match": state["etag"]} if state.get("etag") and previous else {}
+    status, response_headers, body = fetch(manifest_url, headers)
+    if status == 304:
+        stats["not_modified"] = True
+        return stats
+
+    try:
+        manifest = json.loads(body.decode("utf-8"))
+    except ValueError as e:
+        raise ValueError(f"Invalid cache manifest {manifest_url}: {e}")
+    if (
+        not isinstance(manifest, dict)
+        or manifest.get("version") != CACHE_MANIFEST_VERSION
+    ):
+        raise ValueError(f"Unsupported cache manifest: {manifest_url}")
+    if "generation" not in manifest:
+        raise ValueError(f"Invalid cache manifest {manifest_url}: missing generation")
+    entries = _listed_files(manifest)
+    stats["generation"] = manifest["generation"]
+
+    # Local files by the digest recorded for them in the previous manifest
+    local = {}
+    if previous:
+        for entry in _listed_files(previous):
+            local.setdefault(entry["digest"], entry["filename"])
+
+    for entry in entries:
+        path = os.path.join(cache_dir, entry["filename"])
+        digest = entry["digest"].split(":", 1)[-1]
+        if _file_digest(path) == digest:
+            stats["unchanged"] += 1
+            continue
+
+        source = local.get(entry["digest"])
+        if source and _file_digest(os.path.join(cache_dir, source)) == digest:
+            with open(os.path.join(cache_dir, source), "rb") as f:
+                _write_atomic(path, f.read())
+            stats["reused"] += 1
+            continue
+
+        status, _, data = fetch(entry["url"], {})
+        if status != 200:
+            raise OSError(f"Unexpected status {status} for {entry['url']}")
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Digest mismatch for {entry['url']}")
+        _write_atomic(path, data)
+        stats["downloaded"] += 1
+        stats["bytes_downloaded"] += len(data)
+
+    listed = {entry["filename"] for entry in entries}
+    if previous:
+        for entry in _listed_files(previous):
+            path = os.path.join(cache_dir, entry["filename"])
+            if entry["filename"] not in listed and os.path.isfile(path):
+                os.remove(path)
+                stats["deleted"] += 1
+
+    state = {"etag": response_headers.get("etag"), "manifest": manifest}
+    _write_atomic(
+        os.path.join(cache_dir, STATE_FILENAME),
+        json.dumps(state, ensure_ascii=False).encode("utf-8"),
+    )
+    return stats
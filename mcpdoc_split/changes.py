@@ -0,0 +1,239 @@
+"""Section-level change feed between two generations of the split output.
+
+A section table can come from a markdown source (sections are rendered the
+same way the splitter writes them) or from a manifest of a previous run:
+either the incremental manifest in the output directory or the cache
+manifest published next to the TOC. Manifests only carry digests, so moved
+content is recognised when it's identical, and modified sections get no
+similarity score.
+
+Sections are matched in four steps:
+
+1. same filename and same digest: unchanged;
+2. same digest under another filename: renamed, similarity 1.0;
+3. same filename, different digest: modified;
+4. the remaining sections are paired by content similarity, best pairs
+   first, and reported as renamed when the similarity reaches the threshold.
+
+Whatever is left over is added or removed.
+"""
+
+import difflib
+import hashlib
+import json
+from typing import Dict, List, Optional
+
+from mcpdoc_split.main import collect_sections, read_markdown, render_section
+
+FEED_VERSION = 1
+
+CHANGE_TYPES = ("added", "removed", "modified", "renamed")
+
+# Minimum similarity for a removed and an added section to count as a rename
+RENAME_THRESHOLD = 0.6
+
+
+def sections_from_markdown(
+    input_file: str, max_level: int = 6, parse_mode: str = "block"
+) -> List[Dict]:
+    """
+    Build a comparable section table from a markdown source.
+
+    Args:
+        input_file: Path to the markdown file
+        max_level: Maximum header level to split at
+        parse_mode: Parser mode passed to collect_sections
+
+    Returns:
+        Section dictionaries with filename, header, level, digest, size and
+        content keys
+    """
+    content = read_markdown(input_file)
+    content_lines = content.split("\n")
+    table = []
+    for section in collect_sections(content, max_level, parse_mode):
+        text = render_section(section, content_lines)
+        data = text.encode("utf-8")
+        table.append({
+            "filename": section["filename"],
+            "header": section["header"],
+            "level": section["level"],
+            "digest": hashlib.sha256(data).hexdigest(),
+            "size": len(data),
+            "content": text,
+        })
+    return table
+
+
+def sections_from_manifest(path: str) -> List[Dict]:
+    """
+    Build a comparable section table from an incremental or cache manifest.
+
+    Args:
+        path: Path to the manifest JSON file
+
+    Returns:
+        Section dictionaries with filename, header (None when the manifest
+        doesn't record it), digest and size keys
+
+    Raises:
+        ValueError: If the file is not a manifest
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except ValueError as e:
+        raise ValueError(f"Invalid manifest {path}: {e}")
+    if not isinstance(data, dict) or not isinstance(data.get("sections"), list):
+        raise ValueError(f"Not a section manifest: {path}")
+
+    return [
+        {
+            "filename": entry["filename"],
+            "header": entry.get("header"),
+            "level": entry.get("level"),
+            "digest": entry["digest"].split(":", 1)[-1],
+            "size": entry.get("size"),
+        }
+        for entry in data["sections"]
+    ]
+
+
+def load_section_table(
+    path: str, max_level: int = 6, parse_mode: str = "block"
+) -> List[Dict]:
+    """Load a section table from a manifest (.json) or a markdown source."""
+    if path.endswith(".json"):
+        return sections_from_manifest(path)
+    return sections_from_markdown(path, max_level, parse_mode)
+
+
+def similarity(old: Dict, new: Dict) -> Optional[float]:
+    """
+    Return the line-based similarity of two sections between 0 and 1.
+
+    Returns:
+        1.0 for identical digests, None when a section has no content to
+        compare, the difflib ratio of the section lines otherwise
+    """
+    if old["digest"] == new["digest"]:
+        return 1.0
+    if "content" not in old or "content" not in new:
+        return None
+    return _line_matcher(old, new).ratio()
+
+
+def _line_matcher(old: Dict, new: Dict) -> difflib.SequenceMatcher:
+    return difflib.SequenceMatcher(
+        None, old["content"].splitlines(), new["content"].splitlines(), autojunk=False
+    )
+
+
+def diff_sections(
+    old: List[Dict], new: List[Dict], rename_threshold: float = RENAME_THRESHOLD
+) -> Dict:
+    """
+    Compare two section tables and build a change feed.
+
+    Args:
+        old: Section table of the previous generation
+        new: Section table of the current generation
+        rename_threshold: Minimum similarity to pair a removed and an added
+            section as a rename
+
+    Returns:
+        Feed with a version, per-type counts (plus unchanged) under "summary"
+        and the "changes" list in the order of the new table, removed
+        sections last. Every change has a "change" type, a "filename" and a
+        "header"; renamed changes carry the "old_filename", modified and
+        renamed changes a "similarity" when it can be computed, and all but
+        removed changes the new content "digest"
+    """
+    old_left = {section["filename"]: section for section in old}
+    new_left = {section["filename"]: section for section in new}
+    matches: Dict[str, Dict] = {}
+
+    def match(
+        old_section: Dict,
+        new_section: Dict,
+        change: Optional[str],
+        ratio: Optional[float] = None,
+    ) -> None:
+        del old_left[old_section["filename"]]
+        del new_left[new_section["filename"]]
+        if ratio is None and change is not None:
+            ratio = similarity(old_section, new_section)
+        matches[new_section["filename"]] = {
+            "change": change,
+            "old": old_section,
+            "similarity": ratio,
+        }
+
+    for filename, section in list(new_left.items()):
+        previous = old_left.get(filename)
+        if previous is not None and previous["digest"] == section["digest"]:
+            match(previous, section, None)
+
+    by_digest: Dict[str, Dict] = {}
+    for section in old_left.values():
+        by_digest.setdefault(section["digest"], section)
+    for section in list(new_left.values()):
+        previous = by_digest.pop(section["digest"], None)
+        if previous is not None:
+            match(previous, section, "renamed")
+
+    for filename, section in list(new_left.items()):
+        if filename in old_left:
+            match(old_left[filename], section, "modified")
+
+    candidates = []
+    for new_section in new_left.values():
+        for old_section in old_left.values():
+            if "content" not in old_section or "content" not in new_section:
+                continue
+            matcher = _line_matcher(old_section, new_section)
+            # Cheap upper bounds first, the full ratio only when they pass
+            if matcher.real_quick_ratio() < rename_threshold:
+                continue
+            if matcher.quick_ratio() < rename_threshold:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= rename_threshold:
+                candidates.append((ratio, old_section, new_section))
+    for ratio, old_section, new_section in sorted(
+        candidates, key=lambda candidate: -candidate[0]
+    ):
+        if old_section["filename"] in old_left and new_section["filename"] in new_left:
+            match(old_section, new_section, "renamed", ratio)
+
+    summary = {change: 0 for change in CHANGE_TYPES}
+    summary["unchanged"] = 0
+    changes = []
+    for section in new:
+        entry = matches.get(section["filename"])
+        if entry is not None and entry["change"] is None:
+            summary["unchanged"] += 1
+            continue
+        change = {
+            "change": "added" if entry is None else entry["change"],
+            "filename": section["filename"],
+            "header": section.get("header"),
+            "digest": section["digest"],
+        }
+        if entry is not None:
+            if entry["change"] == "renamed":
+                change["old_filename"] = entry["old"]["filename"]
+            if entry["similarity"] is not None:
+                change["similarity"] = round(entry["similarity"], 4)
+        summary[change["change"]] += 1
+        changes.append(change)
+    for section in old:
+        if section["filename"] in old_left:
+            summary["removed"] += 1
+            changes.append({
+                "change": "removed",
+                "filename": section["filename"],
+                "header": section.get("header"),
+            })
+
+    return {"version": FEED_VERSION, "summary": summary, "changes": changes}
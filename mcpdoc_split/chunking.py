@@ -0,0 +1,216 @@
+"""Budget-driven chunking: split oversized sections and merge tiny ones.
+
+The regular splitter cuts at every heading up to ``max_level``, which leaves
+bare parent headings as files of a few bytes and deep sections with long code
+samples as files that don't fit an LLM context. Chunking starts from the same
+sections and then
+
+1. splits every section larger than the budget at its next heading level,
+   recursively, and at top-level block boundaries (paragraphs, fences, lists,
+   ...) once no headings are left, naming the extra files ``<name>-part-N.md``;
+2. merges undersized chunks with their neighbours when the result fits the
+   budget: an undersized parent first takes in the subsections that follow
+   it, then undersized chunks merge into a preceding chunk that starts at the
+   same or a higher heading level, so a chunk never absorbs a heading above
+   its own.
+
+Headings that end up inside another chunk stay in the TOC as links to their
+anchor in that chunk's file, so the TOC keeps every heading up to
+``max_level`` and its hierarchy.
+
+Sizes are measured on the raw section lines. In "tokens" mode they're
+estimated at four bytes per token. A single block larger than the budget, such
+as a long code fence, is never cut and becomes an oversized chunk of its own.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from mcpdoc_split.main import (
+    FilenameRegistry,
+    generate_filename,
+    sections_from_tokens,
+)
+
+CHUNK_UNITS = ("tokens", "bytes")
+
+# Rough number of UTF-8 bytes per LLM token, used for the "tokens" unit
+BYTES_PER_TOKEN = 4
+
+# (start line, end line, heading) of a chunk during splitting
+_Chunk = Tuple[int, int, Dict]
+
+
+def chunk_sections(
+    tokens: List,
+    content_lines: Optional[List[str]],
+    max_level: int,
+    chunk_size: int,
+    min_chunk_size: Optional[int] = None,
+    chunk_unit: str = "tokens",
+    line_offsets: Optional[Sequence[int]] = None,
+) -> List[Dict]:
+    """
+    Build a section table whose files target a size budget.
+
+    Args:
+        tokens: markdown-it tokens of the whole document
+        content_lines: All lines of the document (unused if line_offsets is
+            given)
+        max_level: Maximum header level of the regular split
+        chunk_size: Largest chunk size to aim for, in chunk_unit
+        min_chunk_size: Chunks smaller than this are merged with a neighbour
+            where possible (default: a quarter of chunk_size)
+        chunk_unit: "tokens" or "bytes"
+        line_offsets: Byte offset of every line start plus one past the end
+            of the document, instead of measuring content_lines
+
+    Returns:
+        Section dictionaries as returned by collect_sections, each with an
+        extra "anchors" list of the headings (header and level) up to
+        max_level that are contained in the chunk below its first heading
+
+    Raises:
+        ValueError: If the budget or the unit is invalid
+    """
+    if chunk_unit not in CHUNK_UNITS:
+        raise ValueError(f"chunk_unit must be one of: {', '.join(CHUNK_UNITS)}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if min_chunk_size is None:
+        min_chunk_size = chunk_size // 4
+    if not 0 <= min_chunk_size <= chunk_size:
+        raise ValueError("min_chunk_size must be between 0 and chunk_size")
+
+    scale = BYTES_PER_TOKEN if chunk_unit == "tokens" else 1
+    offsets = line_offsets
+    if offsets is None:
+        # Byte offset of every line start, counting one newline per line
+        offsets = [0]
+        for line in content_lines:
+            offsets.append(offsets[-1] + len(line.encode("utf-8")) + 1)
+    total_lines = len(offsets) - 1
+
+    def size(start: int, end: int) -> int:
+        return -(-(offsets[end] - offsets[start]) // scale)
+
+    block_starts = sorted({
+        token.map[0]
+        for token in tokens
+        if token.level == 0 and token.nesting != -1 and token.map
+    })
+    headings = [
+        {
+            "line": section["start_line"],
+            "header": section["header"],
+            "level": section["level"],
+            "filename": section["filename"],
+        }
+        for section in sections_from_tokens(tokens, 6, total_lines)
+    ]
+
+    def split_blocks(start: int, end: int, heading: Dict) -> List[_Chunk]:
+        """Pack whole top-level blocks into chunks of at most chunk_size."""
+        # The first part keeps at least one block after the heading
+        points = [line for line in block_starts if start < line < end][1:] + [end]
+        chunks = []
+        index = 0
+        while start < end:
+            # Every chunk takes at least one block, even an oversized one
+            cut = points[index]
+            index += 1
+            while index < len(points) and size(start, points[index]) <= chunk_size:
+                cut = points[index]
+                index += 1
+            chunks.append((start, cut, heading))
+            start = cut
+        return [
+            (start, end, _part(heading, number))
+            for number, (start, end, heading) in enumerate(chunks, 1)
+        ]
+
+    def split(start: int, end: int, heading: Dict, inner: List[Dict]) -> List[_Chunk]:
+        """Split a heading's lines at the next heading level, then at blocks."""
+        if size(start, end) <= chunk_size:
+            return [(start, end, heading)]
+        if not inner:
+            return split_blocks(start, end, heading)
+
+        level = min(sub["level"] for sub in inner)
+        tops = [pos for pos, sub in enumerate(inner) if sub["level"] == level]
+        chunks = split(start, inner[tops[0]]["line"], heading, inner[:tops[0]])
+        for pos, following in zip(tops, tops[1:] + [len(inner)]):
+            sub_end = inner[following]["line"] if following < len(inner) else end
+            chunks.extend(
+                split(inner[pos]["line"], sub_end, inner[pos], inner[pos + 1:following])
+            )
+        return chunks
+
+    # Regular sections at max_level, closed by an end-of-document sentinel
+    bounds = headings + [{"line": total_lines, "level": 0}]
+    units = [pos for pos, heading in enumerate(bounds) if heading["level"] <= max_level]
+    chunks: List[_Chunk] = []
+    for pos, following in zip(units, units[1:]):
+        chunks.extend(split(
+            bounds[pos]["line"], bounds[following]["line"], bounds[pos],
+            bounds[pos + 1:following],
+        ))
+
+    def coalesce(chunks: List[_Chunk], siblings: bool) -> List[_Chunk]:
+        """Merge undersized chunks into the preceding chunk where allowed."""
+        merged: List[_Chunk] = []
+        for start, end, heading in chunks:
+            if merged:
+                prev_start, _, prev_heading = merged[-1]
+                if siblings:
+                    nested = heading["level"] >= prev_heading["level"]
+                    small = min(size(prev_start, start), size(start, end))
+                else:
+                    nested = heading["level"] > prev_heading["level"]
+                    small = size(prev_start, start)
+                if (
+                    nested
+                    and small < min_chunk_size
+                    and size(prev_start, end) <= chunk_size
+                ):
+                    merged[-1] = (prev_start, end, prev_heading)
+                    continue
+            merged.append((start, end, heading))
+        return merged
+
+    # Bare parent headings take in their subsections first, then siblings merge
+    merged = coalesce(coalesce(chunks, siblings=False), siblings=True)
+
+    listed = [heading for heading in headings if heading["level"] <= max_level]
+    # Part names may clash with headings, so names are made unique once more
+    registry = FilenameRegistry()
+    sections = []
+    index = 0
+    for start, end, heading in merged:
+        anchors = []
+        while index < len(listed) and listed[index]["line"] < end:
+            if listed[index]["line"] > start:
+                anchors.append(
+                    {"header": listed[index]["header"], "level": listed[index]["level"]}
+                )
+            index += 1
+        sections.append({
+            "filename": registry.claim(heading["filename"]),
+            "header": heading["header"],
+            "level": heading["level"],
+            "start_line": start,
+            "end_line": end,
+            "anchors": anchors,
+        })
+    return sections
+
+
+def _part(heading: Dict, number: int) -> Dict:
+    """Return the heading of the n-th part of a section split at blocks."""
+    if number == 1:
+        return heading
+    stem = heading["filename"][: -len(".md")]
+    return {
+        **heading,
+        "header": f"{heading['header']} (part {number})",
+        "filename": generate_filename(f"{stem}-part-{number}"),
+    }
@@ -2,11 +2,16 @@
 """Command-line interface for mcpdoc-split."""
 
 import argparse
+import contextlib
+import json
+import os
 import sys
 from pathlib import Path
+from typing import List, Optional
 
 from mcpdoc_split._version import __version__
-from mcpdoc_split.main import generate_docs
+from mcpdoc_split.backends import ARCHIVE_FORMATS
+from mcpdoc_split.main import PARSE_MODES, generate_docs
 from mcpdoc_split.splash import SPLASH
 
 
@@ -28,6 +33,76 @@ Examples:
   # Split only top-level headers (H1 and H2)
   mcpdoc-split README.md --max-level 3
 
+  # Only rewrite the section files whose content changed since the last run
+  mcpdoc-split README.md --incremental
+
+  # Re-split on every save, rewriting only the sections that changed
+  mcpdoc-split README.md --watch
+
+  # Split a very large file with bounded memory
+  mcpdoc-split handbook.md --streaming
+
+  # Write a full and a shallow split with TOCs for two mirrors in one run
+  mcpdoc-split README.md -o docs -t llms.txt \\
+    --target toc_file=llms-mirror.txt,url_prefix=https://mirror.example.com \\
+    --target output_dir=docs-short,toc_file=llms-short.txt,max_level=2
+
+  # Stream all output files as one archive into an artifact store
+  mcpdoc-split README.md --archive - | upload-artifact docs.tar
+  mcpdoc-split README.md --archive docs.zip
+
+  # Store the sections in one full-text indexed SQLite database
+  mcpdoc-split README.md --database docs.sqlite
+
+  # Parse a huge single file on 32 cores
+  mcpdoc-split handbook.md --parse-workers 32
+
+  # Keep a warm splitter running and forward calls to it
+  mcpdoc-split daemon &
+  mcpdoc-split README.md --daemon
+
+  # Split many files in parallel (see `mcpdoc-split batch --help`)
+  mcpdoc-split batch "handbooks/**/*.md" --workers 8
+
+  # Print per-phase timings and counters (or as JSON on stdout)
+  mcpdoc-split README.md --stats
+  mcpdoc-split README.md --stats json
+
+  # Aim for files of about 2000 tokens, splitting and merging sections
+  mcpdoc-split README.md --chunk-size 2000
+
+  # Content-addressed filenames (services.1a2b3c4d.md) for immutable URLs
+  mcpdoc-split README.md --content-hash
+
+  # Publish a cache manifest and keep a local copy in sync with it
+  mcpdoc-split README.md --cache-manifest llms.manifest.json
+  mcpdoc-split fetch https://example.com/llms.manifest.json ./docs-cache
+
+  # List the sections added, removed, modified or renamed between revisions
+  mcpdoc-split diff old/README.md README.md --output changes.json
+
+  # Also bundle all sections into one file, indexed for HTTP Range requests
+  mcpdoc-split README.md --bundle llms-full.txt
+
+  # Point links such as (#services) at the section files holding the headings
+  mcpdoc-split README.md --rewrite-links --stats
+
+  # Write services.md.gz next to every output for nginx gzip_static
+  mcpdoc-split README.md --precompress --bundle llms-full.txt
+
+  # Emit a full-text search index and query it
+  mcpdoc-split README.md --search-index search-index.json
+  mcpdoc-split search search-index.json "select_related"
+
+  # Index section byte ranges in the input instead of writing section files
+  mcpdoc-split handbook.md --virtual handbook.index.json
+
+  # Mirror the generated docs over HTTP with gzip, ETags and byte ranges
+  mcpdoc-split http --output-dir docs --toc-file llms.txt --port 8000
+
+  # Serve the sections to AI editors over MCP stdio, fully offline
+  mcpdoc-split serve README.md
+
   # Show version with ASCII art splash screen
   mcpdoc-split --version
 
@@ -36,12 +111,121 @@ Examples:
 """
 
 
+BATCH_EPILOG = """
+Output options accept {stem}, {name} and {parent} placeholders that are
+filled in per input file.
+
+Examples:
+  # Split every README under services/ into its own docs directory
+  mcpdoc-split batch "services/*/README.md" \\
+    --output-dir "build/{parent}/docs" \\
+    --toc-file "build/{parent}/llms.txt" \\
+    --base-path "/{parent}/docs"
+
+  # Run jobs described in a JSON file on 4 workers and save a report
+  mcpdoc-split batch --jobs-file jobs.json --workers 4 --report report.json
+"""
+
+
 class CustomFormatter(
     argparse.RawDescriptionHelpFormatter, argparse.ArgumentDefaultsHelpFormatter
 ):
     """Custom formatter to preserve epilog formatting while showing default values."""
 
-    pass
+    def _get_help_string(self, action):
+        # Help that already describes its default doesn't get a second one
+        if "(default" in (action.help or ""):
+            return action.help
+        return super()._get_help_string(action)
+
+
+def parse_target(spec: str) -> dict:
+    """
+    Parse a --target value such as ``output_dir=docs-short,max_level=2``.
+
+    Keys are the settings a target may override, written with underscores or
+    dashes.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is malformed
+    """
+    from mcpdoc_split.targets import TARGET_OPTIONS
+
+    target = {}
+    for item in spec.split(","):
+        key, sep, value = item.partition("=")
+        key = key.strip().replace("-", "_")
+        if not sep or key not in TARGET_OPTIONS:
+            raise argparse.ArgumentTypeError(
+                f"invalid target setting {item!r}; expected KEY=VALUE with KEY "
+                f"one of {', '.join(TARGET_OPTIONS)}"
+            )
+        if key == "max_level":
+            try:
+                value = int(value)
+            except ValueError:
+                raise argparse.ArgumentTypeError(f"invalid max_level {value!r}")
+        target[key] = value
+    return target
+
+
+def add_chunk_args(parser: argparse.ArgumentParser) -> None:
+    """Add the options of budget-driven chunking to a parser."""
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="Size budget per output file: split oversized sections at deeper "
+        "headings or block boundaries and merge tiny ones",
+    )
+
+    parser.add_argument(
+        "--min-chunk-size",
+        type=int,
+        default=None,
+        help="Merge chunks smaller than this where possible "
+        "(default: a quarter of --chunk-size)",
+    )
+
+    parser.add_argument(
+        "--chunk-unit",
+        choices=["tokens", "bytes"],
+        default="tokens",
+        help="Unit of the chunk sizes; tokens are estimated from bytes",
+    )
+
+
+def add_parse_cache_args(parser: argparse.ArgumentParser) -> None:
+    """Add the parse cache options shared by the main and batch parsers."""
+    parser.add_argument(
+        "--parse-cache",
+        default=None,
+        metavar="DIR",
+        help="Cache section tables in this directory, keyed on the input's "
+        "content, so unchanged inputs aren't parsed again",
+    )
+    parser.add_argument(
+        "--parse-cache-size",
+        type=int,
+        default=64,
+        metavar="MB",
+        help="Evict the least recently used parse cache entries beyond this "
+        "size (default: %(default)s)",
+    )
+
+
+def precompress_list(value: str) -> List[str]:
+    """Parse the comma-separated sidecar formats of --precompress."""
+    from mcpdoc_split.precompress import SIDECAR_FORMATS
+
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in (*SIDECAR_FORMATS, "all")]
+    if not names or unknown:
+        raise argparse.ArgumentTypeError(
+            f"invalid format list {value!r} (choose from "
+            f"{', '.join(SIDECAR_FORMATS)}, all)"
+        )
+    return names
 
 
 def parse_args() -> argparse.Namespace:
@@ -87,6 +271,203 @@ def parse_args() -> argparse.Namespace:
         help="Maximum header level to split at (1=H1, 2=H2, etc.)",
     )
 
+    parser.add_argument(
+        "--incremental",
+        "-i",
+        action="store_true",
+        help="Keep the output directory and only write, rename or delete "
+        "section files whose content changed",
+    )
+
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Read the input line by line and write sections as they end, "
+        "using bounded memory on very large files; headings in rare lazy "
+        "blockquote/list continuations may split differently",
+    )
+
+    parser.add_argument(
+        "--parser",
+        choices=PARSE_MODES,
+        default="block",
+        help="Parse only the block structure needed to find headings, or run "
+        "the full CommonMark parser",
+    )
+
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Parse the input in chunks cut at safe headings on N worker "
+        "processes, for very large single inputs",
+    )
+
+    add_parse_cache_args(parser)
+
+    parser.add_argument(
+        "--target",
+        action="append",
+        type=parse_target,
+        default=None,
+        metavar="KEY=VALUE,...",
+        help="Also generate another output from the same parse, overriding "
+        "any of output_dir, toc_file, url_prefix, base_path and max_level "
+        "(repeatable)",
+    )
+
+    parser.add_argument(
+        "--search-index",
+        "-s",
+        default=None,
+        help="Write a full-text search index over the sections to this file",
+    )
+
+    add_chunk_args(parser)
+
+    parser.add_argument(
+        "--content-hash",
+        action="store_true",
+        help="Embed a short content digest in every section filename so "
+        "section URLs can be cached as immutable",
+    )
+
+    parser.add_argument(
+        "--cache-manifest",
+        default=None,
+        help="Write a manifest with the URL, size and digest of every "
+        "published file to this path, for conditional fetches",
+    )
+
+    parser.add_argument(
+        "--bundle",
+        default=None,
+        help="Also write all sections in document order to this single file, "
+        "such as llms-full.txt",
+    )
+
+    parser.add_argument(
+        "--bundle-index",
+        default=None,
+        help="Path of the byte-offset index of the bundle's sections "
+        "(default: the bundle path with an .index.json extension)",
+    )
+
+    parser.add_argument(
+        "--rewrite-links",
+        action="store_true",
+        help="Rewrite links to headings of the input, such as (#services), to "
+        "the URL of the section file holding the heading, and report the "
+        "anchors no heading matches",
+    )
+
+    parser.add_argument(
+        "--precompress",
+        nargs="?",
+        const=["gzip"],
+        type=precompress_list,
+        default=None,
+        metavar="FORMATS",
+        help="Write precompressed sidecars (services.md.gz) of the section "
+        "files, TOC and bundle for static servers: comma-separated formats "
+        "among gzip and zstd (Python 3.14+), or all (default format: gzip)",
+    )
+
+    parser.add_argument(
+        "--precompress-workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of compression threads (default: number of CPUs)",
+    )
+
+    parser.add_argument(
+        "--archive",
+        default=None,
+        metavar="FILE",
+        help="Write all output files into this zip or tar archive instead of "
+        "the filesystem, streamed as they are produced ('-' for stdout)",
+    )
+
+    parser.add_argument(
+        "--archive-format",
+        choices=ARCHIVE_FORMATS,
+        default=None,
+        help="Format of --archive (default: from its extension, tar for stdout)",
+    )
+
+    parser.add_argument(
+        "--database",
+        default=None,
+        metavar="DB_FILE",
+        help="Store the sections in this SQLite database, with a full-text "
+        "index, instead of one file per section (the TOC is still written)",
+    )
+
+    parser.add_argument(
+        "--virtual",
+        default=None,
+        metavar="INDEX_FILE",
+        help="Write no section files, only the TOC and this index of the "
+        "sections' byte ranges in the input (read with VirtualDocs)",
+    )
+
+    parser.add_argument(
+        "--watch",
+        "-w",
+        action="store_true",
+        help="Keep running and re-split the input whenever it changes, "
+        "re-parsing only the edited region",
+    )
+
+    parser.add_argument(
+        "--debounce",
+        type=int,
+        default=50,
+        metavar="MS",
+        help="With --watch, wait until the input has been unchanged for this "
+        "many milliseconds before re-splitting",
+    )
+
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="With --watch, poll the input for changes instead of using inotify",
+    )
+
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Forward the split to the daemon when it is running, on "
+        "$MCPDOC_SPLIT_SOCKET or the per-user socket",
+    )
+
+    parser.add_argument(
+        "--daemon-socket",
+        default=None,
+        metavar="PATH",
+        help="Forward the split to the daemon on this socket when it is "
+        "running (implies --daemon)",
+    )
+
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Split in this process, overriding --daemon and --daemon-socket "
+        "(the default is to split in this process)",
+    )
+
+    parser.add_argument(
+        "--stats",
+        nargs="?",
+        const="text",
+        choices=["text", "json"],
+        default=None,
+        help="Print per-phase timings and counters after splitting; with "
+        "'json' the stats are the only output on stdout",
+    )
+
     # Version information
     parser.add_argument(
         "--version",
@@ -105,8 +486,730 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def parse_batch_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments of the batch subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="mcpdoc-split batch",
+        description="Split many markdown files in parallel on a process pool",
+        formatter_class=CustomFormatter,
+        epilog=BATCH_EPILOG,
+    )
+
+    parser.add_argument(
+        "inputs", nargs="*", help="Markdown files or glob patterns to split"
+    )
+
+    parser.add_argument(
+        "--jobs-file",
+        "-j",
+        help="JSON file with a list of jobs, each an object of generate_docs "
+        "options with at least input_file",
+    )
+
+    # Output options
+    parser.add_argument(
+        "--output-dir", "-o", default="docs/{stem}",
+        help="Output directory template for split files",
+    )
+
+    parser.add_argument(
+        "--toc-file", "-t", default="llms/{stem}.txt",
+        help="TOC file template",
+    )
+
+    # URL generation options
+    parser.add_argument(
+        "--url-prefix",
+        "-u",
+        default="https://example.com",
+        help="URL prefix template for absolute links in TOC",
+    )
+
+    parser.add_argument(
+        "--base-path", "-b", default="/docs/{stem}",
+        help="Base path template for docs in URLs",
+    )
+
+    # Content options
+    parser.add_argument(
+        "--max-level",
+        "-m",
+        type=int,
+        default=6,
+        choices=range(1, 7),
+        metavar="1-6",
+        help="Maximum header level to split at (1=H1, 2=H2, etc.)",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        "-i",
+        action="store_true",
+        help="Only write, rename or delete section files whose content changed",
+    )
+
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Split every input with the bounded-memory streaming splitter",
+    )
+
+    parser.add_argument(
+        "--parser",
+        choices=PARSE_MODES,
+        default="block",
+        help="Parse only the block structure needed to find headings, or run "
+        "the full CommonMark parser",
+    )
+
+    add_parse_cache_args(parser)
+
+    parser.add_argument(
+        "--search-index", "-s", default=None,
+        help="Search index file template (default: no index)",
+    )
+
+    add_chunk_args(parser)
+
+    parser.add_argument(
+        "--content-hash",
+        action="store_true",
+        help="Embed a short content digest in every section filename",
+    )
+
+    parser.add_argument(
+        "--cache-manifest", default=None,
+        help="Cache manifest file template (default: no manifest)",
+    )
+
+    parser.add_argument(
+        "--bundle", default=None,
+        help="Single-file bundle template, such as llms/{stem}-full.txt "
+        "(default: no bundle)",
+    )
+
+    parser.add_argument(
+        "--bundle-index", default=None,
+        help="Bundle index file template (default: next to the bundle)",
+    )
+
+    # Execution options
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: number of CPUs)",
+    )
+
+    parser.add_argument(
+        "--report", "-r", help="Write the aggregated report as JSON to this file"
+    )
+
+    return parser.parse_args(argv)
+
+
+def batch_main(argv: List[str]) -> int:
+    """Entry point of the batch subcommand, returning the exit code."""
+    from mcpdoc_split.batch import build_jobs, expand_inputs, run_batch
+
+    args = parse_batch_args(argv)
+
+    options = {
+        "output_dir": args.output_dir,
+        "toc_file": args.toc_file,
+        "url_prefix": args.url_prefix,
+        "base_path": args.base_path,
+        "max_level": args.max_level,
+        "incremental": args.incremental,
+        "streaming": args.streaming,
+        "parse_mode": args.parser,
+        "content_hash": args.content_hash,
+    }
+    if args.search_index:
+        options["search_index"] = args.search_index
+    if args.cache_manifest:
+        options["cache_manifest"] = args.cache_manifest
+    if args.bundle:
+        options["bundle_file"] = args.bundle
+        options["bundle_index"] = args.bundle_index
+    if args.parse_cache:
+        options["parse_cache"] = args.parse_cache
+        options["parse_cache_size"] = args.parse_cache_size << 20
+    if args.chunk_size:
+        options["chunk_size"] = args.chunk_size
+        options["min_chunk_size"] = args.min_chunk_size
+        options["chunk_unit"] = args.chunk_unit
+
+    try:
+        jobs = build_jobs(expand_inputs(args.inputs), **options)
+        if args.jobs_file:
+            with open(args.jobs_file, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            if not isinstance(entries, list):
+                raise ValueError("the jobs file must contain a JSON list")
+            for entry in entries:
+                job_options = {**options, **entry}
+                input_file = job_options.pop("input_file", None)
+                if not input_file:
+                    raise ValueError("every job in the jobs file needs input_file")
+                jobs.extend(build_jobs([input_file], **job_options))
+
+        if not jobs:
+            print("Error: no input files given or matched", file=sys.stderr)
+            return 1
+
+        report = run_batch(jobs, workers=args.workers)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print("\nOperation cancelled by user", file=sys.stderr)
+        return 1
+
+    for result in report["jobs"]:
+        if result["ok"]:
+            print(
+                f"ok      {result['input_file']} -> {result['output_dir']} "
+                f"({result['sections']} sections, {result['seconds']:.3f}s)"
+            )
+        else:
+            print(f"FAILED  {result['input_file']}: {result['error']}")
+    print(
+        f"Batch finished: {report['succeeded']} succeeded, "
+        f"{report['failed']} failed, {report['sections']} sections "
+        f"in {report['seconds']:.3f}s"
+    )
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {args.report}")
+
+    return 1 if report["failed"] else 0
+
+
+def parse_serve_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments of the serve subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="mcpdoc-split serve",
+        description="Serve the sections of a markdown file over MCP stdio "
+        "from memory",
+        formatter_class=CustomFormatter,
+    )
+
+    parser.add_argument("input_file", help="Path to the markdown file to serve")
+
+    parser.add_argument(
+        "--max-level",
+        "-m",
+        type=int,
+        default=6,
+        choices=range(1, 7),
+        metavar="1-6",
+        help="Maximum header level to split at (1=H1, 2=H2, etc.)",
+    )
+
+    parser.add_argument(
+        "--parser",
+        choices=PARSE_MODES,
+        default="block",
+        help="Parse only the block structure needed to find headings, or run "
+        "the full CommonMark parser",
+    )
+
+    parser.add_argument(
+        "--name", default="mcpdoc-split", help="Server name reported to clients"
+    )
+
+    return parser.parse_args(argv)
+
+
+def serve_main(argv: List[str]) -> int:
+    """Entry point of the serve subcommand, returning the exit code."""
+    from mcpdoc_split.server import DocServer, load_sections, serve_stdio
+
+    args = parse_serve_args(argv)
+
+    if not Path(args.input_file).is_file():
+        print(f"Error: Input file '{args.input_file}' not found", file=sys.stderr)
+        return 1
+
+    try:
+        sections = load_sections(args.input_file, args.max_level, args.parser)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    # stdout carries the protocol, so diagnostics go to stderr
+    print(
+        f"Serving {len(sections)} sections from {args.input_file} over stdio",
+        file=sys.stderr,
+    )
+    try:
+        serve_stdio(DocServer(sections, name=args.name))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def parse_http_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments of the http subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="mcpdoc-split http",
+        description="Serve a generated TOC and its section files over HTTP with "
+        "gzip, ETags, byte ranges and keep-alive (reloaded on SIGHUP)",
+        formatter_class=CustomFormatter,
+    )
+
+    parser.add_argument(
+        "--output-dir", "-o", default="docs", help="Directory of the section files"
+    )
+
+    parser.add_argument(
+        "--toc-file", "-t", default="llms.txt", help="TOC file, also served at /"
+    )
+
+    parser.add_argument(
+        "--url-prefix",
+        "-u",
+        default="https://example.com",
+        help="URL prefix the docs were generated with",
+    )
+
+    parser.add_argument(
+        "--base-path",
+        "-b",
+        default="/docs",
+        help="Base path the docs were generated with; sections are served "
+        "under it",
+    )
+
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+
+    parser.add_argument(
+        "--port", "-p", type=int, default=8000, help="Port to listen on"
+    )
+
+    parser.add_argument(
+        "--public-url",
+        default=None,
+        help="URL of this server that TOC links are rewritten to "
+        "(default: http://HOST:PORT)",
+    )
+
+    return parser.parse_args(argv)
+
+
+def http_main(argv: List[str]) -> int:
+    """Entry point of the http subcommand, returning the exit code."""
+    import asyncio
+
+    from mcpdoc_split.http_server import DocsHTTPServer
+
+    args = parse_http_args(argv)
+
+    server = DocsHTTPServer(
+        output_dir=args.output_dir,
+        toc_file=args.toc_file,
+        url_prefix=args.url_prefix,
+        base_path=args.base_path,
+        public_url=args.public_url,
+    )
+
+    def ready(public_url: str) -> None:
+        print(
+            f"Serving {len(server.resources) - 1} files at {public_url}/ "
+            "(Ctrl+C to stop)",
+            flush=True,
+        )
+
+    try:
+        asyncio.run(server.serve(args.host, args.port, ready))
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print("\nStopped", file=sys.stderr)
+    return 0
+
+
+def parse_search_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments of the search subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="mcpdoc-split search",
+        description="Find the sections most relevant to a query in a search "
+        "index written with --search-index",
+        formatter_class=CustomFormatter,
+    )
+
+    parser.add_argument("index_file", help="Path to the search index")
+
+    parser.add_argument("query", nargs="+", help="Search terms")
+
+    parser.add_argument(
+        "--limit", "-n", type=int, default=10, help="Maximum number of results"
+    )
+
+    parser.add_argument(
+        "--json", action="store_true", help="Print the results as JSON"
+    )
+
+    return parser.parse_args(argv)
+
+
+def search_main(argv: List[str]) -> int:
+    """Entry point of the search subcommand, returning the exit code."""
+    from mcpdoc_split.search import SearchIndex
+
+    args = parse_search_args(argv)
+
+    try:
+        results = SearchIndex(args.index_file).search(
+            " ".join(args.query), limit=args.limit
+        )
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        for result in results:
+            print(f"{result['score']:8.3f}  {result['header']}  {result['url']}")
+    return 0 if results else 1
+
+
+def parse_fetch_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments of the fetch subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="mcpdoc-split fetch",
+        description="Update a local copy of published docs, downloading only "
+        "the files whose digest changed in the cache manifest",
+        formatter_class=CustomFormatter,
+    )
+
+    parser.add_argument("manifest_url", help="URL of the cache manifest")
+
+    parser.add_argument("cache_dir", help="Directory holding the local copy")
+
+    return parser.parse_args(argv)
+
+
+def fetch_main(argv: List[str]) -> int:
+    """Entry point of the fetch subcommand, returning the exit code."""
+    from mcpdoc_split.cache import sync_from_manifest
+
+    args = parse_fetch_args(argv)
+
+    try:
+        stats = sync_from_manifest(args.manifest_url, args.cache_dir)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if stats["not_modified"]:
+        print(f"Not modified (generation {stats['generation']})")
+    else:
+        print(
+            f"Generation {stats['generation']}: {stats['downloaded']} downloaded "
+            f"({stats['bytes_downloaded']} bytes), {stats['reused']} reused, "
+            f"{stats['unchanged']} unchanged, {stats['deleted']} deleted"
+        )
+    return 0
+
+
+def parse_diff_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments of the diff subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="mcpdoc-split diff",
+        description="Print a section-level change feed between two generations, "
+        "each given as a markdown source or a manifest (.json) of a previous run",
+        formatter_class=CustomFormatter,
+    )
+
+    parser.add_argument("old", help="Previous markdown source or manifest")
+
+    parser.add_argument("new", help="Current markdown source or manifest")
+
+    parser.add_argument(
+        "--max-level",
+        "-m",
+        type=int,
+        default=6,
+        choices=range(1, 7),
+        metavar="1-6",
+        help="Maximum header level to split markdown sources at",
+    )
+
+    parser.add_argument(
+        "--parser",
+        choices=PARSE_MODES,
+        default="block",
+        help="Parse only the block structure needed to find headings, or run "
+        "the full CommonMark parser",
+    )
+
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.6,
+        help="Minimum similarity for a removed and an added section to be "
+        "reported as a rename",
+    )
+
+    parser.add_argument(
+        "--output", "-o", help="Write the change feed to this file instead of stdout"
+    )
+
+    return parser.parse_args(argv)
+
+
+def diff_main(argv: List[str]) -> int:
+    """Entry point of the diff subcommand, returning the exit code."""
+    from mcpdoc_split.changes import diff_sections, load_section_table
+
+    args = parse_diff_args(argv)
+
+    try:
+        old, new = (
+            load_section_table(path, args.max_level, args.parser)
+            for path in (args.old, args.new)
+        )
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    feed = json.dumps(
+        diff_sections(old, new, args.threshold), indent=2, ensure_ascii=False
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(feed + "\n")
+        print(f"Change feed saved to: {args.output}", file=sys.stderr)
+    else:
+        print(feed)
+    return 0
+
+
+def parse_daemon_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments of the daemon subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="mcpdoc-split daemon",
+        description="Keep a splitter running on a Unix socket, with parsers and "
+        "recent section tables warm; mcpdoc-split forwards to it",
+        formatter_class=CustomFormatter,
+    )
+
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help="Socket to listen on (default: $MCPDOC_SPLIT_SOCKET or a "
+        "per-user socket)",
+    )
+
+    parser.add_argument(
+        "--max-tables",
+        type=int,
+        default=128,
+        help="Number of section tables kept in memory",
+    )
+
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument(
+        "--status", action="store_true", help="Report on the running daemon"
+    )
+    action.add_argument(
+        "--stop", action="store_true", help="Stop the running daemon"
+    )
+
+    return parser.parse_args(argv)
+
+
+def daemon_main(argv: List[str]) -> int:
+    """Entry point of the daemon subcommand, returning the exit code."""
+    from mcpdoc_split.daemon import default_socket_path, request, serve
+
+    args = parse_daemon_args(argv)
+    socket_path = args.socket or default_socket_path()
+
+    if args.status or args.stop:
+        try:
+            response = request(socket_path, {"op": "shutdown" if args.stop else "ping"})
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        if response is None:
+            print(f"No daemon is listening on {socket_path}", file=sys.stderr)
+            return 1
+        if args.stop:
+            print(f"Stopped the daemon on {socket_path}")
+        else:
+            print(json.dumps(response, indent=2))
+        return 0
+
+    if args.max_tables < 1:
+        print("Error: --max-tables must be at least 1", file=sys.stderr)
+        return 1
+
+    def ready(path: str) -> None:
+        print(f"Listening on {path} (Ctrl+C to stop)", file=sys.stderr, flush=True)
+
+    try:
+        # The default socket gets a private directory, checked by serve()
+        serve(args.socket, args.max_tables, ready)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print("\nStopped", file=sys.stderr)
+    return 0
+
+
+def forward_to_daemon(args: argparse.Namespace, options: dict):
+    """
+    Run a split on the daemon if one is running.
+
+    Args:
+        args: Parsed command-line arguments
+        options: Keyword arguments for generate_docs
+
+    Returns:
+        The GenerationResult, or None if no compatible daemon is running
+        and the split must run in this process
+
+    Raises:
+        FileNotFoundError, ValueError: As generate_docs would
+        RuntimeError: If the run failed in another way
+    """
+    from mcpdoc_split.daemon import default_socket_path, request
+    from mcpdoc_split.main import GenerationResult
+
+    message = {
+        "op": "split",
+        "version": __version__,
+        "cwd": os.getcwd(),
+        "options": options,
+    }
+    socket_path = args.daemon_socket or default_socket_path()
+    try:
+        response = request(socket_path, message)
+    except PermissionError as e:
+        print(f"Warning: Not forwarding to the daemon: {e}", file=sys.stderr)
+        return None
+    except (OSError, ValueError):
+        return None
+    if response is None or response.get("version_mismatch"):
+        return None
+
+    print(response.get("output", ""), end="")
+    if not response["ok"]:
+        errors = {"FileNotFoundError": FileNotFoundError, "ValueError": ValueError}
+        raise errors.get(response.get("error_type"), RuntimeError)(response["error"])
+    return GenerationResult(**response["result"])
+
+
+SUBCOMMANDS = {
+    "batch": batch_main,
+    "daemon": daemon_main,
+    "diff": diff_main,
+    "fetch": fetch_main,
+    "http": http_main,
+    "search": search_main,
+    "serve": serve_main,
+}
+
+
+def watch_main(args: argparse.Namespace) -> int:
+    """Split the input, then re-split it on every change until interrupted."""
+    from mcpdoc_split.watch import LiveSplitter, watch
+
+    if args.streaming:
+        print("Error: --watch can't be combined with --streaming", file=sys.stderr)
+        return 1
+    for flag, value in (
+        ("--target", args.target),
+        ("--archive", args.archive),
+        ("--database", args.database),
+    ):
+        if value:
+            print(f"Error: --watch can't be combined with {flag}", file=sys.stderr)
+            return 1
+    if args.debounce < 0:
+        print("Error: --debounce must not be negative", file=sys.stderr)
+        return 1
+
+    if (
+        args.search_index
+        or args.chunk_size
+        or args.content_hash
+        or args.cache_manifest
+        or args.bundle
+        or args.precompress
+        or args.rewrite_links
+    ):
+        # These outputs depend on the whole document: regenerate incrementally
+        def regenerate() -> dict:
+            result = generate_docs(
+                input_file=args.input_file,
+                output_dir=args.output_dir,
+                url_prefix=args.url_prefix,
+                base_path=args.base_path,
+                max_level=args.max_level,
+                toc_file=args.toc_file,
+                incremental=True,
+                parse_mode=args.parser,
+                search_index=args.search_index,
+                chunk_size=args.chunk_size,
+                min_chunk_size=args.min_chunk_size,
+                chunk_unit=args.chunk_unit,
+                content_hash=args.content_hash,
+                cache_manifest=args.cache_manifest,
+                bundle_file=args.bundle,
+                bundle_index=args.bundle_index,
+                precompress=args.precompress,
+                precompress_workers=args.precompress_workers,
+                rewrite_links=args.rewrite_links,
+            )
+            return {"sections": result.sections, "seconds": result.timings["total"]}
+    else:
+        regenerate = LiveSplitter(
+            args.input_file,
+            output_dir=args.output_dir,
+            url_prefix=args.url_prefix,
+            base_path=args.base_path,
+            max_level=args.max_level,
+            toc_file=args.toc_file,
+            parse_mode=args.parser,
+        ).update
+
+    def report(stats: dict) -> None:
+        if "error" in stats:
+            print(f"Warning: {stats['error']}", file=sys.stderr)
+            return
+        message = f"{stats['sections']} sections"
+        if "written" in stats:
+            message += f", {stats['written']} written, {stats['deleted']} deleted"
+        print(f"Updated {message} in {stats['seconds'] * 1000:.1f} ms", flush=True)
+
+    try:
+        report(regenerate())
+        print(f"Watching {args.input_file} for changes (Ctrl+C to stop)", flush=True)
+        watch(args.input_file, regenerate, report, args.debounce / 1000, args.poll)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print("\nStopped watching", file=sys.stderr)
+    return 0
+
+
 def main() -> None:
     """Main entry point for the CLI."""
+    # Dispatch subcommands before the single-file parser sees the arguments
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        sys.exit(SUBCOMMANDS[sys.argv[1]](sys.argv[2:]))
+
     # Check if any arguments were provided
     if len(sys.argv) == 1:
         # No arguments, print help
@@ -167,16 +1270,157 @@ def main() -> None:
     if not input_path.suffix.lower() in [".md", ".markdown"]:
         print(f"Warning: '{args.input_file}' doesn't appear to be a markdown file")
 
+    if args.watch:
+        sys.exit(watch_main(args))
+
+    if args.virtual:
+        combined = [
+            flag
+            for flag, value in (
+                ("--incremental", args.incremental),
+                ("--streaming", args.streaming),
+                ("--search-index", args.search_index),
+                ("--chunk-size", args.chunk_size),
+                ("--content-hash", args.content_hash),
+                ("--cache-manifest", args.cache_manifest),
+                ("--bundle", args.bundle),
+                ("--precompress", args.precompress),
+                ("--rewrite-links", args.rewrite_links),
+                ("--target", args.target),
+                ("--archive", args.archive),
+                ("--database", args.database),
+            )
+            if value
+        ]
+        if combined:
+            print(
+                f"Error: --virtual can't be combined with {', '.join(combined)}",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
+    if args.archive and args.database:
+        print("Error: --archive can't be combined with --database", file=sys.stderr)
+        sys.exit(1)
+
+    # Checked before the archive or database is created, so a bad call
+    # leaves nothing behind
+    backend_flag = None
+    if args.archive:
+        backend_flag = "--archive"
+    elif args.database:
+        backend_flag = "--database"
+    if backend_flag:
+        for flag, value in (
+            ("--incremental", args.incremental),
+            ("--streaming", args.streaming),
+            ("--target", args.target),
+        ):
+            if value:
+                print(
+                    f"Error: {backend_flag} can't be combined with {flag}",
+                    file=sys.stderr,
+                )
+                sys.exit(1)
+
+    if args.precompress:
+        for flag, value in (
+            ("--target", args.target),
+            ("--archive", args.archive),
+            ("--database", args.database),
+        ):
+            if value:
+                print(
+                    f"Error: --precompress can't be combined with {flag}",
+                    file=sys.stderr,
+                )
+                sys.exit(1)
+
+    # Keep stdout clean for machine-readable stats and archives
+    archive_to_stdout = args.archive == "-"
+    log = sys.stderr if args.stats == "json" or archive_to_stdout else sys.stdout
+
+    archive_file = None
+    backend = None
+    completed = False
     try:
+        if args.archive:
+            from mcpdoc_split.backends import ArchiveBackend, archive_format
+
+            if args.archive_format:
+                format_name = args.archive_format
+            elif archive_to_stdout:
+                format_name = "tar"
+            else:
+                format_name = archive_format(args.archive)
+            if archive_to_stdout:
+                archive_file = sys.stdout.buffer
+            else:
+                archive_file = open(args.archive, "wb")
+            backend = ArchiveBackend(archive_file, format_name)
+        elif args.database:
+            from mcpdoc_split.database import SqliteBackend
+
+            backend = SqliteBackend(args.database)
+
         # Call the main function
-        generate_docs(
-            input_file=args.input_file,
-            output_dir=args.output_dir,
-            url_prefix=args.url_prefix,
-            base_path=args.base_path,
-            max_level=args.max_level,
-            toc_file=args.toc_file,
-        )
+        with contextlib.redirect_stdout(log):
+            if args.virtual:
+                from mcpdoc_split.virtual import write_virtual_index
+
+                result = write_virtual_index(
+                    input_file=args.input_file,
+                    index_file=args.virtual,
+                    url_prefix=args.url_prefix,
+                    base_path=args.base_path,
+                    max_level=args.max_level,
+                    toc_file=args.toc_file,
+                    parse_mode=args.parser,
+                )
+            else:
+                options = {
+                    "input_file": args.input_file,
+                    "output_dir": args.output_dir,
+                    "url_prefix": args.url_prefix,
+                    "base_path": args.base_path,
+                    "max_level": args.max_level,
+                    "toc_file": args.toc_file,
+                    "incremental": args.incremental,
+                    "streaming": args.streaming,
+                    "parse_mode": args.parser,
+                    "parse_cache": args.parse_cache,
+                    "parse_cache_size": args.parse_cache_size << 20,
+                    "targets": [{}] + args.target if args.target else None,
+                    "search_index": args.search_index,
+                    "chunk_size": args.chunk_size,
+                    "min_chunk_size": args.min_chunk_size,
+                    "chunk_unit": args.chunk_unit,
+                    "content_hash": args.content_hash,
+                    "cache_manifest": args.cache_manifest,
+                    "bundle_file": args.bundle,
+                    "bundle_index": args.bundle_index,
+                    "precompress": args.precompress,
+                    "rewrite_links": args.rewrite_links,
+                }
+                result = None
+                # The daemon writes to the filesystem with its own worker counts
+                if (args.daemon or args.daemon_socket) and not (
+                    args.no_daemon
+                    or backend
+                    or args.parse_workers
+                    or args.precompress_workers
+                ):
+                    result = forward_to_daemon(args, options)
+                if result is None:
+                    result = generate_docs(
+                        **options,
+                        parse_workers=args.parse_workers,
+                        precompress_workers=args.precompress_workers,
+                        backend=backend,
+                    )
+        if backend is not None:
+            backend.close()
+        completed = True
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -189,6 +1433,22 @@ def main() -> None:
     except Exception as e:
         print(f"Unexpected error: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if backend is not None and not completed:
+            backend.abort()
+        if archive_file is not None and not archive_to_stdout:
+            archive_file.close()
+            if not completed:
+                # Don't leave a truncated archive behind
+                with contextlib.suppress(OSError):
+                    os.remove(args.archive)
+
+    stats_file = sys.stderr if archive_to_stdout else sys.stdout
+    if args.stats == "json":
+        print(json.dumps(result.to_dict(), indent=2), file=stats_file)
+    elif args.stats == "text":
+        print(file=stats_file)
+        print(result.format(), file=stats_file)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,465 @@
+"""Daemon mode: a long-lived splitter serving jobs over a Unix socket.
+
+Editor integrations and hooks that split on every save pay interpreter
+startup, the markdown-it import and a cold parse on every call. The daemon
+pays them once: it listens on a Unix socket, keeps the parsers and the
+section tables of recent inputs warm in a SectionCache, and runs jobs on a
+thread per connection. The CLI forwards to it when asked to with
+``--daemon`` or ``--daemon-socket``.
+
+The default socket lives in a per-user directory only its owner can enter,
+and clients refuse a socket, or a peer, owned by another user: otherwise
+anyone on the machine could listen there first and swallow the jobs.
+
+The protocol is one JSON object per line in each direction; a connection
+may send any number of requests. Every request has an ``op``:
+
+- ``ping``: report the daemon's version, process id and counters;
+- ``split``: run generate_docs with the request's ``options``;
+- ``sections``: return the section table of ``input_file``;
+- ``search``: query a search index written with ``search_index``;
+- ``shutdown``: stop the daemon.
+
+Relative paths are resolved against the request's ``cwd``. Responses carry
+``ok`` and either the op's data or an ``error``; split responses also carry
+the ``output`` the run printed. A request whose ``version`` differs from the
+daemon's is refused with ``version_mismatch`` so that clients fall back to
+splitting themselves. The splitting modules are only imported by the daemon,
+so clients start without them.
+"""
+
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import struct
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from mcpdoc_split._version import __version__
+
+# Options holding paths, resolved against the request's working directory
+PATH_OPTIONS = (
+    "input_file",
+    "output_dir",
+    "toc_file",
+    "search_index",
+    "cache_manifest",
+    "bundle_file",
+    "bundle_index",
+    "parse_cache",
+)
+
+# Seconds a client waits for the daemon to accept a connection
+CONNECT_TIMEOUT = 1.0
+
+
+def default_socket_path() -> str:
+    """
+    Return the socket path used when none is given.
+
+    It is ``$MCPDOC_SPLIT_SOCKET`` if set, otherwise ``daemon.sock`` in a
+    per-user ``mcpdoc-split-<uid>`` directory of ``$XDG_RUNTIME_DIR`` or the
+    temporary directory.
+    """
+    path = os.environ.get("MCPDOC_SPLIT_SOCKET")
+    if path:
+        return path
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(directory, f"mcpdoc-split-{os.getuid()}", "daemon.sock")
+
+
+def _check_owner(path: str) -> os.stat_result:
+    """
+    Make sure a path belongs to the current user.
+
+    Raises:
+        PermissionError: If another user owns the path
+    """
+    stat = os.stat(path)
+    if stat.st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by another user")
+    return stat
+
+
+def _private_directory(path: str) -> None:
+    """
+    Create a directory only its owner can use, or check an existing one.
+
+    Raises:
+        PermissionError: If the directory belongs to another user or others
+            can access it
+    """
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    stat = _check_owner(path)
+    if stat.st_mode & 0o077:
+        raise PermissionError(f"{path} is accessible to other users")
+
+
+def _check_peer(client: socket.socket, socket_path: str) -> None:
+    """Refuse a daemon running as another user, where the OS can tell."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return
+    credentials = client.getsockopt(
+        socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+    )
+    _, uid, _ = struct.unpack("3i", credentials)
+    if uid != os.getuid():
+        raise PermissionError(f"The daemon on {socket_path} runs as another user")
+
+
+class _ThreadOutput(io.TextIOBase):
+    """sys.stdout replacement sending each job thread's output to its buffer."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def _target(self):
+        return getattr(self._local, "buffer", None) or self.stream
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    @contextlib.contextmanager
+    def capture(self) -> Iterator[io.StringIO]:
+        """Collect what the current thread prints."""
+        self._local.buffer = io.StringIO()
+        try:
+            yield self._local.buffer
+        finally:
+            self._local.buffer = None
+
+
+_install_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _captured_output() -> Iterator[io.StringIO]:
+    """Collect what the current job thread prints."""
+    with _install_lock:
+        # Installed by serve(), but sys.stdout may have been replaced since
+        output = sys.stdout
+        if not isinstance(output, _ThreadOutput):
+            output = sys.stdout = _ThreadOutput(output)
+    with output.capture() as buffer:
+        yield buffer
+
+
+class SplitDaemon:
+    """Request handler keeping parsers, section tables and indexes warm."""
+
+    def __init__(self, max_tables: Optional[int] = None):
+        """
+        Create a handler.
+
+        Args:
+            max_tables: Number of section tables kept in memory
+                (default: DEFAULT_MEMORY_ENTRIES)
+        """
+        from mcpdoc_split.parse_cache import DEFAULT_MEMORY_ENTRIES, SectionCache
+
+        self.section_cache = SectionCache(max_tables or DEFAULT_MEMORY_ENTRIES)
+        self.jobs = 0
+        self.started = time.time()
+        self.stop_requested = threading.Event()
+        # Search indexes by path, with the (mtime, size) they were read at
+        self._indexes: Dict[str, Tuple[Tuple[int, int], object]] = {}
+        # One lock per output directory, so jobs sharing one run in turn
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def handle(self, request: Dict) -> Dict:
+        """
+        Answer one request.
+
+        Args:
+            request: Decoded request object
+
+        Returns:
+            Response object; failures are reported in it, never raised
+        """
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "request must be a JSON object"}
+        version = request.get("version")
+        if version is not None and version != __version__:
+            return {
+                "ok": False,
+                "error": f"daemon runs mcpdoc-split {__version__}, not {version}",
+                "version_mismatch": True,
+            }
+
+        handlers = {
+            "ping": self._ping,
+            "split": self._split,
+            "sections": self._sections,
+            "search": self._search,
+            "shutdown": self._shutdown,
+        }
+        op = request.get("op")
+        if op not in handlers:
+            return {"ok": False, "error": f"unknown op: {op!r}"}
+
+        with self._lock:
+            self.jobs += 1
+        try:
+            return handlers[op](request)
+        except Exception as e:
+            return {"ok": False, "error": str(e), "error_type": type(e).__name__}
+
+    def _ping(self, request: Dict) -> Dict:
+        return {
+            "ok": True,
+            "version": __version__,
+            "pid": os.getpid(),
+            "jobs": self.jobs,
+            "cached_tables": len(self.section_cache),
+            "uptime": round(time.time() - self.started, 3),
+        }
+
+    def _split(self, request: Dict) -> Dict:
+        from mcpdoc_split.batch import JOB_OPTIONS
+        from mcpdoc_split.main import generate_docs
+
+        options = request.get("options")
+        if not isinstance(options, dict) or "input_file" not in options:
+            raise ValueError("split needs options with an input_file")
+        # Batch job options plus targets; worker pools don't mix with threads
+        unknown = set(options) - set(JOB_OPTIONS) - {"targets"}
+        if unknown:
+            raise ValueError(f"unknown split options: {', '.join(sorted(unknown))}")
+        # Defaults of generate_docs that are paths, relative to the client too
+        options = {"output_dir": "docs", "toc_file": "llms.txt", **options}
+        options = _resolve_paths(options, request.get("cwd"))
+
+        output_dirs = [options["output_dir"]]
+        for target in options.get("targets") or ():
+            if isinstance(target, dict) and "output_dir" in target:
+                output_dirs.append(target["output_dir"])
+        with self._output_locks(output_dirs), _captured_output() as output:
+            try:
+                result = generate_docs(**options, section_cache=self.section_cache)
+            except Exception as e:
+                return {
+                    "ok": False,
+                    "error": str(e),
+                    "error_type": type(e).__name__,
+                    "output": output.getvalue(),
+                }
+        return {"ok": True, "result": result.to_dict(), "output": output.getvalue()}
+
+    def _sections(self, request: Dict) -> Dict:
+        from mcpdoc_split.main import GenerationResult, section_table
+        from mcpdoc_split.source import open_source
+
+        input_file = _resolve(request.get("input_file"), request.get("cwd"))
+        if not input_file:
+            raise ValueError("sections needs an input_file")
+        max_level = request.get("max_level", 6)
+        if not isinstance(max_level, int) or not 1 <= max_level <= 6:
+            raise ValueError("max_level must be between 1 and 6")
+
+        result = GenerationResult(input_file=input_file, output_dir="", toc_file="")
+        source = open_source(input_file)
+        try:
+            sections = section_table(
+                source, result, max_level, request.get("parse_mode", "block"),
+                section_cache=self.section_cache,
+            )
+        finally:
+            source.close()
+        return {
+            "ok": True,
+            "sections": sections,
+            "cached": result.parse_cache_hit,
+        }
+
+    def _search(self, request: Dict) -> Dict:
+        from mcpdoc_split.search import SearchIndex
+
+        index_file = _resolve(request.get("index_file"), request.get("cwd"))
+        query = request.get("query")
+        if not index_file or not isinstance(query, str):
+            raise ValueError("search needs an index_file and a query")
+
+        stat = os.stat(index_file)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._indexes.get(index_file)
+            if cached is None or cached[0] != signature:
+                cached = (signature, SearchIndex(index_file))
+                self._indexes[index_file] = cached
+        results = cached[1].search(query, limit=request.get("limit", 10))
+        return {"ok": True, "results": results}
+
+    def _shutdown(self, request: Dict) -> Dict:
+        self.stop_requested.set()
+        return {"ok": True}
+
+    @contextlib.contextmanager
+    def _output_locks(self, output_dirs: List[str]) -> Iterator[None]:
+        """Hold the locks of some output directories, taken in a fixed order."""
+        with self._lock:
+            locks = [
+                self._locks.setdefault(os.path.abspath(path), threading.Lock())
+                for path in sorted(set(output_dirs))
+            ]
+        with contextlib.ExitStack() as stack:
+            for lock in locks:
+                stack.enter_context(lock)
+            yield
+
+
+def _resolve(path: Optional[str], cwd: Optional[str]) -> Optional[str]:
+    """Resolve a request path against the client's working directory."""
+    if not isinstance(path, str) or not path:
+        return path
+    return os.path.join(cwd, path) if cwd else path
+
+
+def _resolve_paths(options: Dict, cwd: Optional[str]) -> Dict:
+    """Resolve the path options of a split request, including its targets."""
+    options = {
+        key: _resolve(value, cwd) if key in PATH_OPTIONS else value
+        for key, value in options.items()
+    }
+    if options.get("targets"):
+        options["targets"] = [
+            {
+                key: _resolve(value, cwd) if key in PATH_OPTIONS else value
+                for key, value in target.items()
+            }
+            if isinstance(target, dict)
+            else target
+            for target in options["targets"]
+        ]
+    return options
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answer the JSON lines of one connection."""
+
+    def handle(self) -> None:
+        daemon: SplitDaemon = self.server.split_daemon
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response = {"ok": False, "error": "invalid JSON request"}
+            else:
+                response = daemon.handle(request)
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+            self.wfile.write(b"\n")
+            self.wfile.flush()
+            if daemon.stop_requested.is_set():
+                threading.Thread(target=self.server.shutdown).start()
+                return
+
+
+def serve(
+    socket_path: Optional[str] = None,
+    max_tables: Optional[int] = None,
+    ready=None,
+) -> None:
+    """
+    Run the daemon until a shutdown request or KeyboardInterrupt.
+
+    Args:
+        socket_path: Unix socket to listen on (default: default_socket_path())
+        max_tables: Number of section tables kept in memory
+            (default: DEFAULT_MEMORY_ENTRIES)
+        ready: Optional callable invoked with the socket path once listening
+
+    Raises:
+        OSError: If another daemon already listens on the socket
+        PermissionError: If the default socket directory isn't private
+    """
+    if socket_path is None:
+        socket_path = default_socket_path()
+        if "MCPDOC_SPLIT_SOCKET" not in os.environ:
+            _private_directory(os.path.dirname(socket_path))
+    if os.path.lexists(socket_path):
+        if request(socket_path, {"op": "ping"}) is not None:
+            raise OSError(f"A daemon is already listening on {socket_path}")
+        # Left behind by a daemon that didn't shut down cleanly
+        os.remove(socket_path)
+
+    # Created without group and other permissions, so nobody else can
+    # connect between bind() and a chmod()
+    umask = os.umask(0o077)
+    try:
+        server = _Server(socket_path, _RequestHandler)
+    finally:
+        os.umask(umask)
+    server.split_daemon = SplitDaemon(max_tables)
+    stdout = sys.stdout
+    try:
+        os.chmod(socket_path, 0o600)
+        sys.stdout = _ThreadOutput(stdout)
+        if ready is not None:
+            ready(socket_path)
+        server.serve_forever()
+    finally:
+        sys.stdout = stdout
+        server.server_close()
+        with contextlib.suppress(OSError):
+            os.remove(socket_path)
+
+
+def request(
+    socket_path: str, message: Dict, timeout: Optional[float] = None
+) -> Optional[Dict]:
+    """
+    Send one request to a daemon and wait for its response.
+
+    Args:
+        socket_path: Unix socket of the daemon
+        message: Request object
+        timeout: Seconds to wait for the response (default: no limit)
+
+    Returns:
+        The response, or None if no daemon listens on socket_path
+
+    Raises:
+        PermissionError: If the socket or the daemon belongs to another user;
+            nothing is sent then
+        OSError: If the daemon accepted the request but didn't answer
+    """
+    try:
+        _check_owner(socket_path)
+    except FileNotFoundError:
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(CONNECT_TIMEOUT)
+        try:
+            client.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError, socket.timeout):
+            return None
+        _check_peer(client, socket_path)
+        client.settimeout(timeout)
+        client.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        with client.makefile("rb") as reader:
+            line = reader.readline()
+    finally:
+        client.close()
+    if not line:
+        raise OSError(f"The daemon on {socket_path} closed the connection")
+    return json.loads(line)
@@ -0,0 +1,214 @@
+"""SQLite output: every section of a split in one database file.
+
+A SqliteBackend stores the sections in a ``sections`` table instead of one
+markdown file per section, with an FTS5 index over their headers and
+content. One file is cheaper to ship and cache than thousands of small
+ones, and tools can look sections up by slug, by parent or by full-text
+match without scanning a directory. The TOC, search index, cache manifest
+and bundle are still written to the filesystem.
+
+The database is built in a single transaction in a temporary file that
+replaces the target on close(), so readers never see a partial database;
+abort() removes the temporary file instead.
+"""
+
+import contextlib
+import hashlib
+import os
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+from mcpdoc_split.backends import FilesystemBackend
+
+DATABASE_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE sections (
+    ordinal INTEGER PRIMARY KEY,
+    slug TEXT NOT NULL UNIQUE,
+    header TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    parent TEXT REFERENCES sections (slug),
+    content TEXT NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE INDEX sections_parent ON sections (parent);
+CREATE VIRTUAL TABLE sections_fts USING fts5(
+    header, content, content='sections', content_rowid='ordinal'
+);
+"""
+
+
+def section_slug(filename: str) -> str:
+    """Return the slug of a section file: its name without the .md suffix."""
+    return filename[: -len(".md")] if filename.endswith(".md") else filename
+
+
+class SqliteBackend:
+    """
+    Store sections in a SQLite database and other outputs on disk.
+
+    Sections are numbered in document order, starting at 1; the parent of a
+    section is the closest preceding section with a lower level.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Start a database.
+
+        Args:
+            db_path: Database file, replaced when the backend is closed
+
+        Raises:
+            ValueError: If the SQLite library lacks FTS5
+        """
+        self.db_path = db_path
+        self._files = FilesystemBackend()
+        self._temp_path = f"{db_path}.{os.getpid()}.tmp"
+        parent_dir = os.path.dirname(db_path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+
+        self._conn = sqlite3.connect(self._temp_path, isolation_level=None)
+        try:
+            self._conn.executescript(SCHEMA)
+        except sqlite3.OperationalError as e:
+            self._conn.close()
+            os.remove(self._temp_path)
+            raise ValueError(f"SQLite output needs FTS5 support: {e}")
+        self._conn.execute(f"PRAGMA user_version = {DATABASE_VERSION}")
+        self._conn.execute("BEGIN")
+        self._ordinal = 0
+        # (level, slug) of the enclosing sections of the next one
+        self._ancestors: List[Tuple[int, str]] = []
+
+    def prepare(self, output_dir: str, clean: bool) -> None:
+        """Nothing to prepare: sections don't go to the output directory."""
+
+    def write(self, path: str, data) -> None:
+        """Write a file that isn't a section, such as the TOC, to disk."""
+        self._files.write(path, data)
+
+    def update(self, path: str, content: str) -> bool:
+        """Write a text file to disk unless it already holds content."""
+        return self._files.update(path, content)
+
+    def write_section(self, path: str, section: Dict, data) -> None:
+        """Insert a section row."""
+        slug = section_slug(section["filename"])
+        level = section["level"]
+        while self._ancestors and self._ancestors[-1][0] >= level:
+            self._ancestors.pop()
+        parent = self._ancestors[-1][1] if self._ancestors else None
+        self._ancestors.append((level, slug))
+
+        self._ordinal += 1
+        self._conn.execute(
+            "INSERT INTO sections VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                self._ordinal,
+                slug,
+                section["header"],
+                level,
+                parent,
+                str(data, "utf-8"),
+                hashlib.sha256(data).hexdigest(),
+            ),
+        )
+
+    def close(self) -> None:
+        """Index the content, commit and move the database into place."""
+        if self._conn is None:
+            return
+        self._conn.execute("INSERT INTO sections_fts (sections_fts) VALUES ('rebuild')")
+        self._conn.execute("COMMIT")
+        self._conn.close()
+        self._conn = None
+        os.replace(self._temp_path, self.db_path)
+
+    def abort(self) -> None:
+        """Discard the database after a failed run; the target is untouched."""
+        if self._conn is None:
+            return
+        with contextlib.suppress(sqlite3.Error):
+            self._conn.rollback()
+        self._conn.close()
+        self._conn = None
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._temp_path)
+
+
+class SectionDatabase:
+    """Section lookup over a database written by SqliteBackend."""
+
+    def __init__(self, db_path: str):
+        """
+        Open a database read-only.
+
+        Raises:
+            FileNotFoundError: If the database doesn't exist
+            ValueError: If the file is not a section database of a supported
+                version
+        """
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"Section database not found: {db_path}")
+        self._conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        self._conn.row_factory = sqlite3.Row
+        try:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        except sqlite3.DatabaseError as e:
+            self._conn.close()
+            raise ValueError(f"Invalid section database {db_path}: {e}")
+        if version != DATABASE_VERSION:
+            self._conn.close()
+            raise ValueError(f"Unsupported section database: {db_path}")
+
+    def get(self, slug: str) -> Optional[Dict]:
+        """Return the section with a slug, or None."""
+        row = self._conn.execute(
+            "SELECT * FROM sections WHERE slug = ?", (slug,)
+        ).fetchone()
+        return dict(row) if row is not None else None
+
+    def children(self, slug: Optional[str] = None) -> List[Dict]:
+        """Return the sections directly under a slug, or the top-level ones."""
+        if slug is None:
+            rows = self._conn.execute(
+                "SELECT * FROM sections WHERE parent IS NULL ORDER BY ordinal"
+            )
+        else:
+            rows = self._conn.execute(
+                "SELECT * FROM sections WHERE parent = ? ORDER BY ordinal", (slug,)
+            )
+        return [dict(row) for row in rows]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Rank sections by an FTS5 full-text query.
+
+        Args:
+            query: FTS5 query, such as ``select_related`` or ``"service layer"``
+            limit: Maximum number of sections to return
+
+        Returns:
+            Matching sections, best first
+
+        Raises:
+            ValueError: If the query is not valid FTS5 syntax
+        """
+        try:
+            rows = self._conn.execute(
+                "SELECT sections.* FROM sections_fts "
+                "JOIN sections ON sections.ordinal = sections_fts.rowid "
+                "WHERE sections_fts MATCH ? ORDER BY rank LIMIT ?",
+                (query, limit),
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query {query!r}: {e}")
+        return [dict(row) for row in rows]
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
@@ -0,0 +1,530 @@
+"""HTTP server for generated docs, built on asyncio.
+
+Serves a TOC and its section directory the way agents fetch them from a
+static host, with what a plain file server lacks:
+
+- gzip content negotiation, compressed once per file when it is loaded;
+- strong ETags (the SHA-256 of the bytes served) and 304 responses to
+  ``If-None-Match``;
+- single byte ranges with ``If-Range``, on the uncompressed bytes;
+- HTTP/1.1 keep-alive.
+
+Files are loaded when the server starts and on SIGHUP, on a worker thread:
+small ones are read into memory, large ones are memory-mapped, and hidden
+files and precompressed sidecars are left out. Section links in the TOC
+are rewritten from the URL prefix the docs were generated for to the
+server's own public URL, so agents following them stay on the mirror.
+Every request is answered from memory on the event loop, and bodies are
+written without copying them, so one core serves thousands of concurrent
+connections.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import mmap
+import os
+import signal
+import threading
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import unquote, urlsplit
+
+from mcpdoc_split.cache import strong_etag
+from mcpdoc_split.main import section_url
+
+DEFAULT_PORT = 8000
+
+# Files at least this large are memory-mapped instead of read
+MMAP_THRESHOLD = 1 << 20
+
+# Smaller bodies are sent uncompressed
+GZIP_MIN_SIZE = 256
+
+# Seconds an idle keep-alive connection stays open
+KEEP_ALIVE_TIMEOUT = 15.0
+
+# Largest request head (request line and headers) accepted, in bytes
+MAX_HEAD_SIZE = 16 << 10
+
+# Largest request body read and discarded; bigger ones close the connection
+MAX_BODY_SIZE = 16 << 10
+
+# Precompressed sidecars and temporary files next to the served files
+SKIPPED_SUFFIXES = (".gz", ".br", ".zst", ".tmp")
+
+CONTENT_TYPES = {
+    ".md": "text/markdown; charset=utf-8",
+    ".txt": "text/plain; charset=utf-8",
+    ".json": "application/json",
+}
+
+# Response body: bytes, or a view of a loaded file to send without copying
+Body = Union[bytes, memoryview]
+
+# Response: status, headers and body
+Response = Tuple[int, List[Tuple[str, str]], Body]
+
+
+@dataclass
+class Resource:
+    """A servable file with its validators and compressed form."""
+
+    data: object
+    content_type: str
+    etag: str
+    gzip_data: Optional[bytes] = None
+    gzip_etag: Optional[str] = None
+    # Memory map to close on reload, if data is one
+    mapping: Optional[mmap.mmap] = field(default=None, repr=False)
+
+
+def _resource(data, content_type: str, mapping=None) -> Resource:
+    digest = hashlib.sha256(data).hexdigest()
+    resource = Resource(data, content_type, strong_etag(digest), mapping=mapping)
+    if len(data) >= GZIP_MIN_SIZE:
+        packed = gzip.compress(data, mtime=0)
+        # Keep the gzip form only if compressing pays off
+        if len(packed) < len(data):
+            resource.gzip_data = packed
+            resource.gzip_etag = strong_etag(hashlib.sha256(packed).hexdigest())
+    return resource
+
+
+def _close(mapping: mmap.mmap) -> None:
+    """Close a memory map, unless responses still being sent use it."""
+    try:
+        mapping.close()
+    except BufferError:
+        # The last view released closes it
+        pass
+
+
+def _read(path: str) -> Tuple[object, Optional[mmap.mmap]]:
+    """Return a file's content, memory-mapped if large, and the map."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return f.read(), None
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return mapping, mapping
+
+
+def rewrite_toc(toc: bytes, url_prefix: str, base_path: str, public_url: str) -> bytes:
+    """
+    Point the section links of a TOC at another host.
+
+    Args:
+        toc: TOC file content
+        url_prefix: URL prefix the TOC was generated with
+        base_path: Base path the TOC was generated with
+        public_url: Public URL of the server, without a trailing slash
+
+    Returns:
+        The TOC with every link under url_prefix + base_path moved to
+        public_url + base_path
+    """
+    old = section_url("", url_prefix, base_path).encode("utf-8")
+    new = section_url("", public_url, "/" + base_path.strip("/")).encode("utf-8")
+    return toc.replace(b"](" + old, b"](" + new)
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a Range header for a body of a given size.
+
+    Args:
+        header: Range header value
+        size: Body size in bytes
+
+    Returns:
+        Inclusive (first, last) byte positions, or None if the header must be
+        ignored (malformed, not in bytes or asking for several ranges)
+
+    Raises:
+        ValueError: If the range is well-formed but not satisfiable
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = (part.strip() for part in spec.partition("-"))
+    if (
+        not dash
+        or not (first or last)
+        or (first and not first.isdigit())
+        or (last and not last.isdigit())
+    ):
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        if int(last) == 0 or size == 0:
+            raise ValueError("empty suffix range")
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError("range starts after the end")
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def accepts_gzip(header: str) -> bool:
+    """Tell whether an Accept-Encoding header allows gzip."""
+    qualities: Dict[str, float] = {}
+    for item in header.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Tell whether an If-None-Match header lists an entity tag."""
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as If-None-Match uses
+    return etag in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+class DocsHTTPServer:
+    """Serve a TOC and its section files from memory."""
+
+    def __init__(
+        self,
+        output_dir: str = "docs",
+        toc_file: str = "llms.txt",
+        url_prefix: str = "https://example.com",
+        base_path: str = "/docs",
+        public_url: Optional[str] = None,
+    ):
+        """
+        Create a server; files are loaded by reload() or start().
+
+        Args:
+            output_dir: Directory of the section files
+            toc_file: TOC file, served at ``/`` and under its own name
+            url_prefix: URL prefix the docs were generated with
+            base_path: Base path of the section files, in the TOC and here
+            public_url: URL prefix of this server for the rewritten TOC
+                (default: its listening address)
+        """
+        self.output_dir = output_dir
+        self.toc_file = toc_file
+        self.url_prefix = url_prefix
+        self.toc_base_path = base_path
+        self.base_path = "/" + base_path.strip("/") if base_path.strip("/") else ""
+        self.public_url = public_url.rstrip("/") if public_url else None
+        self.resources: Dict[str, Resource] = {}
+        self.requests = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._reload_lock = threading.Lock()
+
+    def reload(self) -> int:
+        """
+        Load the TOC and the section files, replacing the served set.
+
+        Hidden files and directories (such as the incremental manifest),
+        precompressed sidecars and temporary files aren't served.
+
+        Returns:
+            Number of files served
+
+        Raises:
+            FileNotFoundError: If the TOC or the output directory is missing
+        """
+        with self._reload_lock:
+            return self._reload()
+
+    def _reload(self) -> int:
+        resources: Dict[str, Resource] = {}
+        if not os.path.isdir(self.output_dir):
+            raise FileNotFoundError(f"Output directory not found: {self.output_dir}")
+        for root, dirs, files in os.walk(self.output_dir):
+            dirs[:] = sorted(name for name in dirs if not name.startswith("."))
+            for name in sorted(files):
+                if name.startswith(".") or name.endswith(SKIPPED_SUFFIXES):
+                    continue
+                path = os.path.join(root, name)
+                relative = os.path.relpath(path, self.output_dir).replace(os.sep, "/")
+                data, mapping = _read(path)
+                content_type = CONTENT_TYPES.get(
+                    os.path.splitext(name)[1].lower(), "application/octet-stream"
+                )
+                resources[f"{self.base_path}/{relative}"] = _resource(
+                    data, content_type, mapping
+                )
+
+        with open(self.toc_file, "rb") as f:
+            toc = f.read()
+        if self.public_url:
+            toc = rewrite_toc(
+                toc, self.url_prefix, self.toc_base_path, self.public_url
+            )
+        toc_resource = _resource(toc, CONTENT_TYPES[".txt"])
+        resources["/"] = toc_resource
+        resources["/" + os.path.basename(self.toc_file)] = toc_resource
+
+        previous, self.resources = self.resources, resources
+        for resource in previous.values():
+            if resource.mapping is not None:
+                _close(resource.mapping)
+        return len(resources) - 1
+
+    def respond(self, method: str, target: str, headers: Dict[str, str]) -> Response:
+        """
+        Answer a request from the loaded files.
+
+        Args:
+            method: Request method
+            target: Request target (path and query)
+            headers: Request headers with lowercase names
+
+        Returns:
+            Status, response headers and body (empty for HEAD)
+        """
+        self.requests += 1
+        status, response_headers, body = self._respond(method, target, headers)
+        if method == "HEAD":
+            body = b""
+        return status, response_headers, body
+
+    def _respond(self, method: str, target: str, headers: Dict[str, str]) -> Response:
+        if method not in ("GET", "HEAD"):
+            return _error(HTTPStatus.METHOD_NOT_ALLOWED, [("Allow", "GET, HEAD")])
+
+        resource = self.resources.get(unquote(urlsplit(target).path))
+        if resource is None:
+            return _error(HTTPStatus.NOT_FOUND)
+
+        body = memoryview(resource.data)
+        response_headers = [("Content-Type", resource.content_type)]
+        compressed = None
+        if len(body) >= GZIP_MIN_SIZE:
+            response_headers.append(("Vary", "Accept-Encoding"))
+            if accepts_gzip(headers.get("accept-encoding", "")):
+                compressed = resource.gzip_data
+        # Entity tag of the representation a full response would carry
+        etag = resource.gzip_etag if compressed is not None else resource.etag
+
+        if _etag_matches(headers.get("if-none-match", ""), etag):
+            return HTTPStatus.NOT_MODIFIED, [("ETag", etag)], b""
+
+        status = HTTPStatus.OK
+        response_headers.append(("Accept-Ranges", "bytes"))
+        byte_range = None
+        # Ranges address the uncompressed bytes, validated by their own tag
+        if_range = headers.get("if-range", resource.etag)
+        if "range" in headers and if_range == resource.etag:
+            try:
+                byte_range = parse_range(headers["range"], len(body))
+            except ValueError:
+                return _error(
+                    HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+                    [("Content-Range", f"bytes */{len(body)}")],
+                )
+
+        if byte_range is not None:
+            first, last = byte_range
+            status = HTTPStatus.PARTIAL_CONTENT
+            etag = resource.etag
+            response_headers.append(
+                ("Content-Range", f"bytes {first}-{last}/{len(body)}")
+            )
+            body = body[first:last + 1]
+        elif compressed is not None:
+            body = compressed
+            response_headers.append(("Content-Encoding", "gzip"))
+
+        response_headers.append(("ETag", etag))
+        response_headers.append(("Cache-Control", "no-cache"))
+        response_headers.append(("Content-Length", str(len(body))))
+        return status, response_headers, body
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer the requests of one connection until it is closed."""
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(
+                        reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT
+                    )
+                except asyncio.LimitOverrunError:
+                    writer.writelines(_encode(*_error(
+                        HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE
+                    ), keep_alive=False))
+                    break
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    break
+
+                request = _parse_head(head)
+                if request is None:
+                    writer.writelines(_encode(
+                        *_error(HTTPStatus.BAD_REQUEST), keep_alive=False
+                    ))
+                    break
+                method, target, version, headers = request
+
+                # Discard a request body, which no supported method uses
+                length = headers.get("content-length", "0")
+                if not length.isdigit() or "transfer-encoding" in headers:
+                    writer.writelines(_encode(
+                        *_error(HTTPStatus.BAD_REQUEST), keep_alive=False
+                    ))
+                    break
+                if int(length) > MAX_BODY_SIZE:
+                    writer.writelines(_encode(
+                        *_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE), keep_alive=False
+                    ))
+                    break
+                if int(length):
+                    await reader.readexactly(int(length))
+
+                connection = headers.get("connection", "").lower()
+                if version == "HTTP/1.1":
+                    keep_alive = "close" not in connection
+                else:
+                    keep_alive = "keep-alive" in connection
+                writer.writelines(_encode(
+                    *self.respond(method, target, headers),
+                    keep_alive=keep_alive,
+                    version=version,
+                ))
+                await writer.drain()
+                if not keep_alive:
+                    break
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT):
+        """
+        Listen on an address and load the files.
+
+        Returns:
+            The asyncio server
+        """
+        self._server = await asyncio.start_server(
+            self.handle_connection, host, port, limit=MAX_HEAD_SIZE, backlog=1024,
+            start_serving=False,
+        )
+        if self.public_url is None:
+            bound_host, bound_port = self._server.sockets[0].getsockname()[:2]
+            if host in ("", "0.0.0.0", "::"):
+                bound_host = "localhost"
+            elif ":" in bound_host:
+                bound_host = f"[{bound_host}]"
+            self.public_url = f"http://{bound_host}:{bound_port}"
+        # Reading and compressing the files mustn't block the event loop
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self.reload)
+        except BaseException:
+            self._server.close()
+            raise
+        await self._server.start_serving()
+        return self._server
+
+    async def serve(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        ready: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """
+        Serve until cancelled, reloading the files on SIGHUP.
+
+        Args:
+            host: Address to listen on
+            port: Port to listen on (0 for any free port)
+            ready: Optional callable invoked with the public URL once serving
+        """
+        server = await self.start(host, port)
+        loop = asyncio.get_running_loop()
+        if hasattr(signal, "SIGHUP"):
+            try:
+                loop.add_signal_handler(
+                    signal.SIGHUP,
+                    lambda: loop.run_in_executor(None, self._reload_quietly),
+                )
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
+        if ready is not None:
+            ready(self.public_url)
+        async with server:
+            await server.serve_forever()
+
+    def _reload_quietly(self) -> None:
+        try:
+            count = self.reload()
+            print(f"Reloaded {count} files", flush=True)
+        except OSError as e:
+            print(f"Warning: Reload failed, still serving the old files: {e}")
+
+
+def _error(status: HTTPStatus, headers: Optional[List] = None) -> Response:
+    body = f"{status.value} {status.phrase}\n".encode("utf-8")
+    return status, [
+        ("Content-Type", "text/plain; charset=utf-8"),
+        *(headers or []),
+        ("Content-Length", str(len(body))),
+    ], body
+
+
+def _parse_head(head: bytes) -> Optional[Tuple[str, str, str, Dict[str, str]]]:
+    """Parse a request head into method, target, version and headers."""
+    try:
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        return None
+    if version not in ("HTTP/1.0", "HTTP/1.1"):
+        return None
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, colon, value = line.partition(":")
+        if not colon or not name or name != name.strip():
+            return None
+        name = name.lower()
+        value = value.strip()
+        headers[name] = f"{headers[name]}, {value}" if name in headers else value
+    return method, target, version, headers
+
+
+def _encode(
+    status: int,
+    headers: List[Tuple[str, str]],
+    body: Body,
+    keep_alive: bool = True,
+    version: str = "HTTP/1.1",
+) -> List[Body]:
+    """Serialize a response into buffers to write, leaving the body as is."""
+    status = HTTPStatus(status)
+    lines = [f"{version} {status.value} {status.phrase}"]
+    lines.extend(f"{name}: {value}" for name, value in headers)
+    if status != HTTPStatus.NOT_MODIFIED and not any(
+        name == "Content-Length" for name, _ in headers
+    ):
+        lines.append("Content-Length: 0")
+    if keep_alive and version == "HTTP/1.0":
+        lines.append("Connection: keep-alive")
+    elif not keep_alive:
+        lines.append("Connection: close")
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return [head, body] if len(body) else [head]
@@ -0,0 +1,194 @@
+"""Incremental regeneration of split documentation driven by a content-hash manifest."""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+MANIFEST_FILENAME = ".mcpdoc-manifest.json"
+MANIFEST_VERSION = 1
+
+
+def load_manifest(output_dir: str) -> Optional[Dict[str, Dict]]:
+    """
+    Load the manifest of a previous run.
+
+    Args:
+        output_dir: Directory holding the split files
+
+    Returns:
+        Mapping of filename to manifest entry, or None if there is no
+        usable manifest
+    """
+    path = os.path.join(output_dir, MANIFEST_FILENAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return None
+
+    return {entry["filename"]: entry for entry in data.get("sections", [])}
+
+
+def save_manifest(output_dir: str, entries: List[Dict]) -> None:
+    """
+    Write the manifest describing the current contents of the output directory.
+
+    Args:
+        output_dir: Directory holding the split files
+        entries: Manifest entries in document order
+    """
+    data = {"version": MANIFEST_VERSION, "sections": entries}
+    write_if_changed(
+        os.path.join(output_dir, MANIFEST_FILENAME),
+        json.dumps(data, indent=2, ensure_ascii=False) + "\n",
+    )
+
+
+def write_if_changed(path: str, content: str) -> bool:
+    """
+    Write a text file only if its content differs from what is on disk.
+
+    Args:
+        path: File to write
+        content: New file content
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    data = content.encode("utf-8")
+    linked = False
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+            linked = os.fstat(f.fileno()).st_nlink > 1
+    except OSError:
+        pass
+
+    if linked:
+        # Section files may be hard links shared between output directories:
+        # replace this one instead of rewriting the shared content in place
+        os.remove(path)
+    with open(path, "wb") as f:
+        f.write(data)
+    return True
+
+
+def scan_existing(output_dir: str) -> Dict[str, Dict]:
+    """
+    Build manifest entries for markdown files left by a non-incremental run.
+
+    Args:
+        output_dir: Directory holding the section files
+
+    Returns:
+        Manifest entries with filename, digest and size keys, by filename
+    """
+    entries = {}
+    for name in sorted(os.listdir(output_dir)):
+        path = os.path.join(output_dir, name)
+        if not name.endswith(".md") or not os.path.isfile(path):
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        entries[name] = {
+            "filename": name,
+            "digest": hashlib.sha256(data).hexdigest(),
+            "size": len(data),
+        }
+    return entries
+
+
+def _is_current(path: str, entry: Dict, previous: Optional[Dict]) -> bool:
+    """Check whether the file at path already holds the entry's content."""
+    if previous is None or previous.get("digest") != entry["digest"]:
+        return False
+    try:
+        return os.path.getsize(path) == entry["size"]
+    except OSError:
+        return False
+
+
+def sync_sections(
+    rendered: List[Tuple[Dict, str]], output_dir: str
+) -> Dict[str, int]:
+    """
+    Bring the output directory in line with the rendered sections.
+
+    Files whose content digest matches the previous manifest are left untouched,
+    files whose content moved to a new filename are renamed, files that no longer
+    correspond to a section are deleted and everything else is written. The
+    manifest is updated afterwards.
+
+    Args:
+        rendered: Pairs of (section dictionary, section content) in document order
+        output_dir: Directory holding the split files
+
+    Returns:
+        Counts of written, renamed, deleted and unchanged files, and the
+        number of bytes written
+    """
+    entries: Dict[str, Dict] = {}
+    contents: Dict[str, str] = {}
+    for section, content in rendered:
+        filename = section["filename"]
+        data = content.encode("utf-8")
+        # Repeated filenames overwrite each other, so the last section wins
+        entries[filename] = {
+            "filename": filename,
+            "header": section["header"],
+            "level": section["level"],
+            "start_line": section["start_line"],
+            "end_line": section["end_line"],
+            "digest": hashlib.sha256(data).hexdigest(),
+            "size": len(data),
+        }
+        contents[filename] = content
+
+    old = load_manifest(output_dir)
+    if old is None:
+        old = scan_existing(output_dir)
+    # Guard against manifests pointing outside the output directory
+    old = {
+        name: entry for name, entry in old.items() if os.path.basename(name) == name
+    }
+
+    stale = {
+        entry["digest"]: name for name, entry in old.items() if name not in entries
+    }
+    stats = {
+        "written": 0,
+        "renamed": 0,
+        "deleted": 0,
+        "unchanged": 0,
+        "bytes_written": 0,
+    }
+
+    for filename, entry in entries.items():
+        path = os.path.join(output_dir, filename)
+        if _is_current(path, entry, old.get(filename)):
+            stats["unchanged"] += 1
+            continue
+
+        source = stale.pop(entry["digest"], None)
+        if source is not None and os.path.isfile(os.path.join(output_dir, source)):
+            os.replace(os.path.join(output_dir, source), path)
+            stats["renamed"] += 1
+        elif write_if_changed(path, contents[filename]):
+            stats["written"] += 1
+            stats["bytes_written"] += entry["size"]
+        else:
+            stats["unchanged"] += 1
+
+    for name in old:
+        path = os.path.join(output_dir, name)
+        if name not in entries and os.path.isfile(path):
+            os.remove(path)
+            stats["deleted"] += 1
+
+    save_manifest(output_dir, list(entries.values()))
+    return stats
@@ -0,0 +1,232 @@
+"""Rewriting of in-document anchor links to the section files they point at.
+
+A link such as ``[see Services](#services)`` resolves inside the original
+document, but once the document is split the heading it names lives in
+another file. The boundary pass records, for every section, the anchors of
+the headings it contains; the rewriter then replaces each ``#anchor``
+target with the absolute URL of the section file, plus the anchor inside
+that file when the heading isn't the one the file starts with.
+
+Anchors follow the GitHub convention of generate_anchor_link, numbered
+``-1``, ``-2``... when a heading text repeats, both across the whole
+document (the anchors the links were written against) and within each
+section file (the anchors that exist after splitting).
+"""
+
+import bisect
+import re
+from typing import Dict, List, Tuple
+from urllib.parse import unquote
+
+from mcpdoc_split.main import generate_anchor_link, section_url
+
+# Anchor targets, tried in one pass over a section's text. Fenced code
+# blocks and code spans are matched first so links inside them are kept;
+# indented code blocks are found by _indented_code.
+_ANCHOR_LINKS = re.compile(
+    r"(?P<fence>^ {0,3}(?P<mark>`{3,}|~{3,})[^\n]*\n.*?(?:^ {0,3}(?P=mark)|\Z))"
+    r"|(?P<code>(?P<ticks>`+)[^\n]*?(?P=ticks))"
+    # Inline links and images: [text](#anchor "title")
+    r"|\]\([ \t]*<?(?P<inline>#[^\s)>]*)"
+    # Reference definitions: [label]: #anchor
+    r"|^ {0,3}\[[^\]\n]+\]:[ \t]*<?(?P<reference>#[^\s>]*)"
+    # Raw HTML: <a href="#anchor">
+    r"|\bhref=(?P<quote>[\"'])(?P<href>#[^\"'\s]*)(?P=quote)",
+    re.M | re.S,
+)
+
+_TARGET_GROUPS = ("inline", "reference", "href")
+
+# What precedes every anchor target above: most sections have none, and this
+# search is an order of magnitude faster than the full pass
+_MAYBE_ANCHOR = re.compile(r"[(:\"'<][ \t]*#")
+
+_LIST_ITEM = re.compile(r"(?:[-+*]|\d{1,9}[.)])(?=[ \t]|$)")
+_ATX_HEADING = re.compile(r"#{1,6}(?:[ \t]|$)")
+# Setext underlines and thematic breaks, which also end the block before them
+_BLOCK_RULE = re.compile(
+    r"(?:=+|-+|(?:\*[ \t]*){3,}|(?:-[ \t]*){3,}|(?:_[ \t]*){3,})[ \t]*$"
+)
+
+
+def _indented_code(text: str) -> List[Tuple[int, int]]:
+    """
+    Return the (start, end) character ranges of a text's indented code.
+
+    A line indented by four or more columns past its container is code after
+    a blank line or a heading, and keeps a code block going across blank
+    lines. The container is the innermost list item whose content column the
+    line reaches, so list continuations aren't code but deeper lines are.
+    """
+    ranges: List[Tuple[int, int]] = []
+    position = 0
+    block_start = True
+    in_code = False
+    # Content columns of the open list items, innermost last
+    columns: List[int] = []
+    # Whether the innermost list item has only had its marker line so far
+    empty_item = False
+    for line in text.splitlines(keepends=True):
+        end = position + len(line)
+        expanded = line.expandtabs(4).rstrip("\r\n")
+        stripped = expanded.lstrip(" ")
+        indent = len(expanded) - len(stripped)
+        item = _LIST_ITEM.match(stripped)
+        if not stripped:
+            if empty_item:
+                # An item can start with at most one blank line
+                columns.pop()
+                empty_item = False
+            block_start = True
+            position = end
+            continue
+        in_paragraph = not block_start and not in_code
+        empty_item = False
+        if item and in_paragraph and indent >= (columns[-1] if columns else 0):
+            number = item.group()[:-1]
+            if not stripped[item.end():].strip() or number not in ("", "1"):
+                # Empty items and items not numbered 1 can't interrupt a
+                # paragraph in their container, so this is paragraph text or
+                # a setext underline
+                item = None
+        heading = (
+            _ATX_HEADING.match(stripped) is not None
+            or bool(_BLOCK_RULE.match(stripped))
+        )
+        if not in_paragraph or item or heading:
+            # Less indented lines leave the items, unless they're lazy
+            # continuations of a paragraph
+            while columns and indent < columns[-1]:
+                columns.pop()
+        base = columns[-1] if columns else 0
+        if indent >= base + 4:
+            in_code = in_code or block_start
+            heading = False
+        elif item:
+            marker = item.group()
+            content = stripped[len(marker):]
+            spaces = len(content) - len(content.lstrip(" "))
+            if not content.strip() or spaces > 4:
+                # Blank or indented code content starts one space past the marker
+                columns.append(indent + len(marker) + 1)
+            else:
+                columns.append(indent + len(marker) + spaces)
+            empty_item = not content.strip()
+            in_code = spaces > 4 and not empty_item
+            heading = not in_code and _ATX_HEADING.match(content.lstrip()) is not None
+        else:
+            in_code = False
+        if in_code:
+            if ranges and ranges[-1][1] == position:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((position, end))
+        block_start = empty_item or heading
+        position = end
+    return ranges
+
+
+class _AnchorNames:
+    """Hand out GitHub-style anchors, numbering repeated ones."""
+
+    def __init__(self):
+        self._seen: Dict[str, int] = {}
+
+    def claim(self, header: str) -> str:
+        anchor = generate_anchor_link(header)[1:]
+        count = self._seen.get(anchor, 0)
+        self._seen[anchor] = count + 1
+        return f"{anchor}-{count}" if count else anchor
+
+
+def attach_link_targets(sections: List[Dict], headings: List[Dict]) -> None:
+    """
+    Record the anchors every section resolves.
+
+    Each section gets a "link_targets" dictionary mapping the document-wide
+    anchors of the headings it contains to the anchor of the heading in the
+    section file, or to "" for the heading the file starts with.
+
+    Args:
+        sections: Section table in document order
+        headings: Every heading of the document with line and header keys,
+            in document order, as returned by heading_starts(tokens, 6)
+    """
+    document = _AnchorNames()
+    index = 0
+    for section in sections:
+        in_file = _AnchorNames()
+        targets: Dict[str, str] = {}
+        while index < len(headings) and headings[index]["line"] < section["end_line"]:
+            heading = headings[index]
+            index += 1
+            anchor = document.claim(heading["header"])
+            if heading["line"] < section["start_line"]:
+                continue
+            local = in_file.claim(heading["header"])
+            if heading["line"] == section["start_line"]:
+                local = ""
+            if anchor and anchor not in targets:
+                targets[anchor] = local
+        section["link_targets"] = targets
+
+
+class AnchorRewriter:
+    """Rewrite the anchor links of section files to absolute section URLs."""
+
+    def __init__(self, sections: List[Dict], url_prefix: str, base_path: str):
+        """
+        Build the anchor-to-URL map of a section table.
+
+        Args:
+            sections: Sections with the "link_targets" of attach_link_targets
+            url_prefix: URL prefix for absolute links
+            base_path: Base path for docs
+        """
+        self.urls: Dict[str, str] = {}
+        for section in sections:
+            for anchor, local in section.get("link_targets", {}).items():
+                link = section["filename"] + (f"#{local}" if local else "")
+                self.urls.setdefault(anchor, section_url(link, url_prefix, base_path))
+        self.rewritten = 0
+        # (filename, anchor) of every link left as it was
+        self.unresolved: List[Tuple[str, str]] = []
+
+    def rewrite(self, filename: str, text: str) -> str:
+        """
+        Return a section's text with its anchor links rewritten.
+
+        Args:
+            filename: Section file the text belongs to, for the report
+            text: Section content
+
+        Returns:
+            The text with every resolvable ``#anchor`` target replaced
+        """
+        if _MAYBE_ANCHOR.search(text) is None:
+            return text
+        code = _indented_code(text)
+        code_starts = [start for start, _ in code]
+
+        def replace(match: re.Match) -> str:
+            group = next(
+                (name for name in _TARGET_GROUPS if match.group(name) is not None),
+                None,
+            )
+            block = bisect.bisect_right(code_starts, match.start()) - 1
+            if group is None or (block >= 0 and match.start() < code[block][1]):
+                # Code keeps its links
+                return match.group(0)
+            target = match.group(group)
+            if target == "#":
+                return match.group(0)
+            url = self.urls.get(unquote(target[1:]).lower())
+            if url is None:
+                self.unresolved.append((filename, target))
+                return match.group(0)
+            self.rewritten += 1
+            start = match.start(group) - match.start()
+            end = match.end(group) - match.start()
+            return match.group(0)[:start] + url + match.group(0)[end:]
+
+        return _ANCHOR_LINKS.sub(replace, text)
@@ -1,12 +1,112 @@
 """MCP markdown splitter - Split large markdown files into smaller documents."""
 
+import hashlib
 import os
 import re
-import shutil
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, List, Dict, Iterator, Optional, Set, Union
 
-from markdown_it import MarkdownIt
+from mcpdoc_split.backends import FilesystemBackend
+from mcpdoc_split.incremental import sync_sections
+
+if TYPE_CHECKING:
+    from markdown_it import MarkdownIt
+
+    from mcpdoc_split.backends import ArchiveBackend, MemoryBackend
+    from mcpdoc_split.database import SqliteBackend
+    from mcpdoc_split.parse_cache import SectionCache
+
+    # Output backends a run can write through
+    Backend = Union[FilesystemBackend, MemoryBackend, ArchiveBackend, SqliteBackend]
+
+TOC_HEADER = "# Table of Contents\n\n"
+
+# "block" skips inline tokenization, "full" runs the complete CommonMark parser
+PARSE_MODES = ("block", "full")
+
+# Number of hex digits of the content digest embedded in content-hash filenames
+CONTENT_HASH_LENGTH = 8
+
+# Unresolved anchor links printed at the end of a run; the result has them all
+UNRESOLVED_ANCHORS_SHOWN = 20
+
+
+@dataclass
+class GenerationResult:
+    """Outcome of a generate_docs run with per-phase timings and counters."""
+
+    input_file: str
+    output_dir: str
+    toc_file: str
+    sections: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    largest_section: Optional[str] = None
+    largest_section_bytes: int = 0
+    # Whether the section table came from the parse cache (None: no cache)
+    parse_cache_hit: Optional[bool] = None
+    # Precompressed sidecars written (None: no precompression)
+    sidecars_written: Optional[int] = None
+    # Anchor links rewritten to section URLs (None: links not rewritten)
+    anchor_links: Optional[int] = None
+    # {"file", "anchor"} of every anchor link no heading matched
+    unresolved_anchors: List[Dict] = field(default_factory=list)
+    # Per-target settings and counters of a multi-target run
+    targets: List[Dict] = field(default_factory=list)
+    # Wall time in seconds per phase, plus "total"
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    def track_section(self, filename: str, content: str) -> None:
+        """Record a section's size, keeping track of the largest one."""
+        self.track_size(filename, len(content.encode("utf-8")))
+
+    def track_size(self, filename: str, size: int) -> None:
+        """Record a section's size in bytes, keeping track of the largest one."""
+        if self.largest_section is None or size > self.largest_section_bytes:
+            self.largest_section = filename
+            self.largest_section_bytes = size
+
+    def to_dict(self) -> Dict:
+        """Return the result as a JSON-serializable dictionary."""
+        return asdict(self)
+
+    def format(self) -> str:
+        """Return a human-readable summary of the counters and timings."""
+        lines = [
+            f"Sections:        {self.sections}",
+            f"Bytes read:      {self.bytes_read}",
+            f"Bytes written:   {self.bytes_written}",
+        ]
+        if self.largest_section is not None:
+            lines.append(
+                f"Largest section: {self.largest_section} "
+                f"({self.largest_section_bytes} bytes)"
+            )
+        if self.parse_cache_hit is not None:
+            lines.append(
+                f"Parse cache:     {'hit' if self.parse_cache_hit else 'miss'}"
+            )
+        if self.sidecars_written is not None:
+            lines.append(f"Sidecars:        {self.sidecars_written} written")
+        if self.anchor_links is not None:
+            lines.append(
+                f"Anchor links:    {self.anchor_links} rewritten, "
+                f"{len(self.unresolved_anchors)} unresolved"
+            )
+        for target in self.targets:
+            lines.append(
+                f"Target:          {target['output_dir']} + {target['toc_file']} "
+                f"(max_level={target['max_level']}, {target['sections']} sections, "
+                f"{target['linked']} linked)"
+            )
+        lines.append("Timings:")
+        for phase, seconds in self.timings.items():
+            lines.append(f"  {phase:<15}{seconds * 1000:10.2f} ms")
+        return "\n".join(lines)
 
 
 def generate_docs(
@@ -16,7 +116,27 @@ def generate_docs(
     base_path: str = "/docs",
     max_level: int = 6,
     toc_file: str = "llms.txt",
-) -> None:
+    incremental: bool = False,
+    streaming: bool = False,
+    parse_mode: str = "block",
+    search_index: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    min_chunk_size: Optional[int] = None,
+    chunk_unit: str = "tokens",
+    content_hash: bool = False,
+    cache_manifest: Optional[str] = None,
+    bundle_file: Optional[str] = None,
+    bundle_index: Optional[str] = None,
+    parse_workers: Optional[int] = None,
+    parse_cache: Optional[str] = None,
+    parse_cache_size: Optional[int] = None,
+    targets: Optional[List[Dict]] = None,
+    backend: Optional["Backend"] = None,
+    section_cache: Optional["SectionCache"] = None,
+    precompress: Optional[List[str]] = None,
+    precompress_workers: Optional[int] = None,
+    rewrite_links: bool = False,
+) -> "GenerationResult":
     """
     Split a large markdown file into smaller files and generate TOC with absolute URLs.
     Uses a single-pass algorithm through the AST for maximum efficiency.
@@ -28,10 +148,67 @@ def generate_docs(
         base_path: Base path for docs (e.g., "/docs")
         max_level: Maximum header level to split at (1=H1, 2=H2, 3=H3, etc.)
         toc_file: Path to the TOC file to generate (default: "llms.txt")
+        incremental: Keep the existing output directory and only write, rename
+            or delete the section files whose content changed since the last
+            run, as recorded in the output directory's manifest
+        streaming: Read the input line by line and write each section as soon
+            as its end is known, keeping memory use bounded for huge inputs
+        parse_mode: "block" (default) to only run the block-level rules needed
+            to find headings, or "full" to run the complete CommonMark parser;
+            both produce the same sections
+        search_index: Path of a full-text search index over the section
+            contents to write next to the TOC (default: no index)
+        chunk_size: Size budget per output file; oversized sections are split
+            at deeper headings or block boundaries and undersized ones are
+            merged with their neighbours (default: split at headings only)
+        min_chunk_size: Chunks smaller than this are merged where possible
+            (default: a quarter of chunk_size)
+        chunk_unit: Unit of the chunk sizes, "tokens" (estimated) or "bytes"
+        content_hash: Embed a short digest of each section's content in its
+            filename (``services.1a2b3c4d.md``), so section URLs change
+            whenever their content does and can be cached as immutable
+        cache_manifest: Path of a cache-validation manifest to write next to
+            the TOC, listing the URL, size and digest of every published file
+            (default: no manifest)
+        bundle_file: Path of a single file holding all sections in document
+            order, such as ``llms-full.txt`` (default: no bundle)
+        bundle_index: Path of the byte-offset index of the bundle's sections
+            (default: the bundle path with an ``.index.json`` extension)
+        parse_workers: Parse the input in chunks cut at safe headings on this
+            many worker processes (default: parse in the current process)
+        parse_cache: Directory of a persistent cache of section tables keyed
+            on the input's content, so unchanged inputs aren't parsed again
+            (default: no cache)
+        parse_cache_size: Size limit of the parse cache in bytes; the least
+            recently used entries are evicted beyond it (default: 64 MiB)
+        targets: Generate several outputs from one parse: dictionaries with
+            any of output_dir, toc_file, url_prefix, base_path and max_level,
+            the settings they leave out taking the values of the arguments
+            above (default: the single output those arguments describe)
+        backend: Output backend receiving every file the run writes, such as
+            a MemoryBackend, an ArchiveBackend or a SqliteBackend (default: a
+            FilesystemBackend); incremental, streaming and multi-target runs
+            need the filesystem
+        section_cache: In-memory SectionCache of section tables shared by the
+            runs of a long-lived process, checked before parse_cache; ignored
+            in streaming mode
+        precompress: Sidecar formats ("gzip", "zstd" where available, or
+            "all") to write next to every section file, the TOC and the
+            bundle, such as ``services.md.gz``; only files whose content
+            changed are compressed again (default: no sidecars)
+        precompress_workers: Number of compression threads (default: number
+            of CPUs)
+        rewrite_links: Rewrite links to headings of the document, such as
+            ``[see Services](#services)``, to the absolute URL of the section
+            file holding the heading; links no heading matches are kept and
+            reported in the result's unresolved_anchors
+
+    Returns:
+        GenerationResult with per-phase timings and counters
 
     Raises:
         FileNotFoundError: If input file doesn't exist
-        ValueError: If max_level is invalid
+        ValueError: If max_level is invalid or the options can't be combined
     """
     if not os.path.exists(input_file):
         raise FileNotFoundError(f"Input file not found: {input_file}")
@@ -39,90 +216,741 @@ def generate_docs(
     if max_level < 1 or max_level > 6:
         raise ValueError("max_level must be between 1 and 6")
 
-    # Clean up existing docs directory
-    if os.path.exists(output_dir):
-        shutil.rmtree(output_dir)
-        print(f"Cleaned up existing directory: {output_dir}")
+    if parse_mode not in PARSE_MODES:
+        raise ValueError(f"parse_mode must be one of: {', '.join(PARSE_MODES)}")
 
-    # Ensure output directory exists
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    if streaming and incremental:
+        raise ValueError("streaming and incremental modes can't be combined")
 
-    # Read the input file
-    try:
-        with open(input_file, "r", encoding="utf-8") as f:
-            content = f.read()
-    except UnicodeDecodeError as e:
-        raise ValueError(f"Unable to read file {input_file}: {e}")
+    if streaming and search_index:
+        raise ValueError("streaming mode can't build a search index")
 
-    # Parse markdown to AST
-    md = MarkdownIt("commonmark")
-    tokens = md.parse(content)
+    if streaming and chunk_size:
+        raise ValueError("streaming mode can't be combined with chunking")
 
-    # Single-pass algorithm: parse AST and generate files + TOC simultaneously
-    sections_generated = 0
-    
-    # Ensure TOC directory exists
-    toc_dir = os.path.dirname(toc_file)
-    if toc_dir and not os.path.exists(toc_dir):
-        Path(toc_dir).mkdir(parents=True, exist_ok=True)
-    
+    if streaming and bundle_file:
+        raise ValueError("streaming mode can't build a bundle")
+
+    if streaming and parse_cache:
+        raise ValueError("streaming mode can't use a parse cache")
+
+    if rewrite_links:
+        for name, value in (
+            ("streaming mode", streaming),
+            ("parse_workers", parse_workers),
+            ("content_hash", content_hash),
+        ):
+            if value:
+                raise ValueError(f"rewrite_links can't be combined with {name}")
+
+    if parse_workers is not None:
+        if parse_workers < 1:
+            raise ValueError("parse_workers must be at least 1")
+        if streaming:
+            raise ValueError("streaming mode can't be combined with parse_workers")
+        if chunk_size:
+            raise ValueError("chunking can't be combined with parse_workers")
+
+    if precompress:
+        from mcpdoc_split.precompress import resolve_formats
+
+        precompress = resolve_formats(precompress)
+        if precompress_workers is not None and precompress_workers < 1:
+            raise ValueError("precompress_workers must be at least 1")
+
+    if backend is None:
+        backend = FilesystemBackend()
+    elif not isinstance(backend, FilesystemBackend):
+        for name, value in (
+            ("incremental", incremental),
+            ("streaming", streaming),
+            ("targets", targets is not None),
+            ("precompress", precompress),
+        ):
+            if value:
+                raise ValueError(f"{name} output needs the filesystem backend")
+
+    if targets is not None:
+        combined = [
+            name
+            for name, value in (
+                ("streaming", streaming),
+                ("search_index", search_index),
+                ("chunk_size", chunk_size),
+                ("cache_manifest", cache_manifest),
+                ("bundle_file", bundle_file),
+                ("precompress", precompress),
+                ("rewrite_links", rewrite_links),
+            )
+            if value
+        ]
+        if combined:
+            raise ValueError(f"targets can't be combined with {', '.join(combined)}")
+
+        from mcpdoc_split.targets import generate_targets, resolve_targets
+
+        return generate_targets(
+            input_file,
+            resolve_targets(
+                targets,
+                output_dir=output_dir,
+                toc_file=toc_file,
+                url_prefix=url_prefix,
+                base_path=base_path,
+                max_level=max_level,
+            ),
+            parse_mode,
+            incremental,
+            content_hash,
+            parse_workers,
+            parse_cache,
+            parse_cache_size,
+            section_cache,
+        )
+
+    if bundle_file:
+        from mcpdoc_split.bundle import default_index_path
+
+        bundle_index = bundle_index or default_index_path(bundle_file)
+
+    result = GenerationResult(
+        input_file=input_file, output_dir=output_dir, toc_file=toc_file
+    )
+    timings = result.timings
+    started = time.perf_counter()
+
+    with timed(timings, "prepare"):
+        # Clean up existing docs directory (incremental runs reuse it instead)
+        backend.prepare(output_dir, clean=not incremental)
+
+        # The streaming splitter opens the TOC file itself
+        parent_dir = os.path.dirname(toc_file)
+        if streaming and parent_dir and not os.path.exists(parent_dir):
+            Path(parent_dir).mkdir(parents=True, exist_ok=True)
+
+    result.bytes_read = os.path.getsize(input_file)
+
+    if streaming:
+        from mcpdoc_split.streaming import stream_docs
+
+        with timed(timings, "stream"):
+            stats = stream_docs(
+                input_file, output_dir, url_prefix, base_path, max_level, toc_file,
+                content_hash,
+            )
+        result.sections = stats["sections"]
+        result.bytes_written = stats["bytes_written"]
+        result.largest_section = stats["largest_section"]
+        result.largest_section_bytes = stats["largest_section_bytes"]
+        if cache_manifest:
+            with timed(timings, "cache_manifest"):
+                _write_cache_manifest(
+                    result, cache_manifest, stats["files"], url_prefix, base_path,
+                    backend,
+                )
+        if precompress:
+            _precompress(
+                result, output_dir, [toc_file], precompress, precompress_workers
+            )
+        timings["total"] = time.perf_counter() - started
+        print_summary(output_dir, toc_file, result.sections, max_level)
+        return result
+
+    from mcpdoc_split.source import open_source
+
+    with timed(timings, "read"):
+        source = open_source(input_file)
     try:
-        with open(toc_file, "w", encoding="utf-8") as toc_file_handle:
-            toc_file_handle.write("# Table of Contents\n\n")
-            
-            current_section = None
-            content_lines = content.split('\n')
-            section_starts = []  # Store all section start positions
-            
-            # First pass: collect all section starts
-            for i, token in enumerate(tokens):
-                if token.type == "heading_open" and int(token.tag[1]) <= max_level:
-                    header_text = extract_heading_text(tokens, i)
-                    if header_text and hasattr(token, 'map') and token.map:
-                        section_starts.append({
-                            "line": token.map[0],
-                            "header": header_text,
-                            "level": int(token.tag[1]),
-                            "filename": generate_filename(header_text)
-                        })
-            
-            # Second pass: generate sections and TOC
-            for idx, section_info in enumerate(section_starts):
-                # Write to TOC
-                level = section_info["level"]
-                header_text = section_info["header"]
-                filename = section_info["filename"]
-                url = f"{url_prefix.rstrip('/')}{base_path.rstrip('/')}/{filename}"
-                indent = "  " * (level - 1)
-                toc_file_handle.write(f"{indent}- [{header_text}]({url})\n")
-                
-                # Determine section boundaries
-                start_line = section_info["line"]
-                if idx + 1 < len(section_starts):
-                    end_line = section_starts[idx + 1]["line"]
-                else:
-                    end_line = len(content_lines)
-                
-                # Save section
-                section = {
-                    "filename": filename,
-                    "header": header_text,
-                    "level": level,
-                    "start_line": start_line,
-                    "end_line": end_line
+        section_starts = section_table(
+            source, result, max_level, parse_mode, parse_workers, chunk_size,
+            min_chunk_size, chunk_unit, parse_cache, parse_cache_size,
+            section_cache, rewrite_links,
+        )
+
+        rewriter = None
+        if rewrite_links:
+            from mcpdoc_split.links import AnchorRewriter
+
+            rewriter = AnchorRewriter(section_starts, url_prefix, base_path)
+
+        if content_hash:
+            with timed(timings, "content_hash"):
+                for section in section_starts:
+                    with source.section_view(section) as data:
+                        digest = hashlib.sha256(data).hexdigest()
+                    section["filename"] = hashed_filename(section["filename"], digest)
+
+        with timed(timings, "toc_write"):
+            toc = build_toc(section_starts, url_prefix, base_path)
+            result.bytes_written += write_toc(toc_file, toc, incremental, backend)
+
+        rendered = []
+        with timed(timings, "section_writes"):
+            if incremental:
+                rendered = [
+                    (section, source.section_text(section))
+                    for section in section_starts
+                ]
+                if rewriter is not None:
+                    rendered = [
+                        (section, rewriter.rewrite(section["filename"], text))
+                        for section, text in rendered
+                    ]
+                for section, section_content in rendered:
+                    result.track_section(section["filename"], section_content)
+                stats = sync_sections(rendered, output_dir)
+                result.bytes_written += stats["bytes_written"]
+                print(
+                    f"Incremental update: {stats['written']} written, "
+                    f"{stats['renamed']} renamed, {stats['deleted']} deleted, "
+                    f"{stats['unchanged']} unchanged"
+                )
+            else:
+                keep = search_index or cache_manifest or bundle_file
+                for section in section_starts:
+                    if rewriter is not None:
+                        text = rewriter.rewrite(
+                            section["filename"], source.section_text(section)
+                        )
+                        data = text.encode("utf-8")
+                        result.track_size(section["filename"], len(data))
+                        result.bytes_written += write_section_data(
+                            section, data, output_dir, backend
+                        )
+                        if keep:
+                            rendered.append((section, text))
+                        continue
+                    # Written straight from the input, without a text copy
+                    with source.section_view(section) as data:
+                        result.track_size(section["filename"], len(data))
+                        result.bytes_written += write_section_data(
+                            section, data, output_dir, backend
+                        )
+                        if keep:
+                            rendered.append((section, str(data, "utf-8")))
+    finally:
+        source.close()
+
+    if rewriter is not None:
+        _report_anchor_links(result, rewriter)
+
+    if search_index:
+        from mcpdoc_split.search import build_index, dump_index
+
+        with timed(timings, "search_index"):
+            index = dump_index(build_index(rendered, url_prefix, base_path))
+            try:
+                if backend.update(search_index, index):
+                    result.bytes_written += len(index.encode("utf-8"))
+            except OSError as e:
+                print(f"Warning: Failed to write search index {search_index}: {e}")
+
+    if cache_manifest:
+        with timed(timings, "cache_manifest"):
+            files = [
+                (
+                    section["filename"],
+                    content_digest(section_content),
+                    len(section_content.encode("utf-8")),
+                )
+                for section, section_content in rendered
+            ]
+            _write_cache_manifest(
+                result, cache_manifest, files, url_prefix, base_path, backend,
+                toc.encode("utf-8"),
+            )
+
+    if bundle_file:
+        from mcpdoc_split.bundle import build_bundle, dump_bundle_index
+
+        with timed(timings, "bundle"):
+            bundle, index = build_bundle(rendered, bundle_file, url_prefix, base_path)
+            try:
+                for path, data in (
+                    (bundle_file, bundle),
+                    (bundle_index, dump_bundle_index(index)),
+                ):
+                    if backend.update(path, data):
+                        result.bytes_written += len(data.encode("utf-8"))
+            except OSError as e:
+                print(f"Warning: Failed to write bundle {bundle_file}: {e}")
+    del rendered
+
+    if precompress:
+        _precompress(
+            result, output_dir, [toc_file, bundle_file], precompress,
+            precompress_workers,
+        )
+
+    result.sections = len(section_starts)
+    timings["total"] = time.perf_counter() - started
+
+    print_summary(output_dir, toc_file, result.sections, max_level)
+    return result
+
+
+def section_table(
+    source,
+    result: GenerationResult,
+    max_level: int,
+    parse_mode: str,
+    parse_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    min_chunk_size: Optional[int] = None,
+    chunk_unit: str = "tokens",
+    parse_cache: Optional[str] = None,
+    parse_cache_size: Optional[int] = None,
+    section_cache: Optional["SectionCache"] = None,
+    link_targets: bool = False,
+) -> List[Dict]:
+    """
+    Return an opened input's section table, from a cache if possible.
+
+    The section table is looked up in the in-memory section cache, then in the
+    parse cache directory, and only parsed when neither has it; a fresh parse
+    is stored in both. Time spent is added to result.timings.
+
+    Args:
+        source: Opened input, as returned by open_source
+        result: Result collecting timings and the parse-cache hit flag
+        max_level: Maximum header level to split at
+        parse_mode: Parser to use, one of PARSE_MODES
+        parse_workers: Worker processes for parsing large inputs
+        chunk_size: Split sections larger than this into chunks
+        min_chunk_size: Smallest chunk to produce when chunking
+        chunk_unit: Unit of the chunk sizes, "tokens" or "bytes"
+        parse_cache: Directory caching section tables between runs
+        parse_cache_size: Maximum size of the parse cache directory in bytes
+        section_cache: In-memory cache of section tables kept across runs
+        link_targets: Record the heading anchors each section resolves
+
+    Returns:
+        Sections with filename, header, level, start_line and end_line keys
+    """
+    timings = result.timings
+    if parse_cache or section_cache is not None:
+        from mcpdoc_split.parse_cache import load_sections, parse_cache_key
+
+        with timed(timings, "parse_cache"):
+            chunking = None
+            if chunk_size:
+                chunking = {
+                    "chunk_size": chunk_size,
+                    "min_chunk_size": min_chunk_size,
+                    "chunk_unit": chunk_unit,
                 }
-                save_section_by_lines(section, content_lines, output_dir)
-                sections_generated += 1
-                
-    except Exception as e:
+            cache_key = parse_cache_key(
+                source.digest(), max_level, chunking, link_targets
+            )
+            section_starts = None
+            if section_cache is not None:
+                section_starts = section_cache.load(cache_key)
+            if section_starts is None and parse_cache:
+                section_starts = load_sections(parse_cache, cache_key)
+                if section_starts is not None and section_cache is not None:
+                    section_cache.store(cache_key, section_starts)
+        result.parse_cache_hit = section_starts is not None
+        if section_starts is not None:
+            return section_starts
+
+    section_starts = _parse_sections(
+        source, timings, max_level, parse_mode, parse_workers,
+        chunk_size, min_chunk_size, chunk_unit, link_targets,
+    )
+    if section_cache is not None:
+        section_cache.store(cache_key, section_starts)
+    if parse_cache:
+        from mcpdoc_split.parse_cache import store_sections
+
+        with timed(timings, "parse_cache_store"):
+            try:
+                store_sections(parse_cache, cache_key, section_starts, parse_cache_size)
+            except OSError as e:
+                print(f"Warning: Failed to update parse cache {parse_cache}: {e}")
+    return section_starts
+
+
+def _parse_sections(
+    source,
+    timings: Dict[str, float],
+    max_level: int,
+    parse_mode: str,
+    parse_workers: Optional[int],
+    chunk_size: Optional[int],
+    min_chunk_size: Optional[int],
+    chunk_unit: str,
+    link_targets: bool = False,
+) -> List[Dict]:
+    """
+    Parse an opened input and build its section table, timing the phases.
+
+    With link_targets, every section also gets the "link_targets" of
+    attach_link_targets().
+    """
+    # Parse markdown to AST and collect all section starts
+    if parse_workers:
+        from mcpdoc_split.parallel import parallel_sections
+
+        with timed(timings, "parse"):
+            return parallel_sections(
+                source.decode(), max_level, parse_mode, parse_workers
+            )
+
+    with timed(timings, "parse"):
+        tokens = get_parser(parse_mode).parse(source.decode())
+    with timed(timings, "boundaries"):
+        if chunk_size:
+            from mcpdoc_split.chunking import chunk_sections
+
+            sections = chunk_sections(
+                tokens, None, max_level, chunk_size, min_chunk_size, chunk_unit,
+                line_offsets=source.line_offsets,
+            )
+        else:
+            sections = sections_from_tokens(tokens, max_level, source.line_count)
+        if link_targets:
+            from mcpdoc_split.links import attach_link_targets
+
+            attach_link_targets(sections, heading_starts(tokens, 6))
+        return sections
+
+
+def write_toc(toc_file: str, toc: str, incremental: bool, backend: "Backend") -> int:
+    """
+    Write a TOC file through a backend; failures only print a warning.
+
+    Args:
+        toc_file: Path to the TOC file
+        toc: TOC text
+        incremental: Leave the file alone when its content is unchanged
+        backend: Output backend writing the file
+
+    Returns:
+        Bytes written, 0 when the file was unchanged or couldn't be written
+    """
+    try:
+        data = toc.encode("utf-8")
+        if incremental:
+            if not backend.update(toc_file, toc):
+                return 0
+        else:
+            backend.write(toc_file, data)
+        return len(data)
+    except OSError as e:
         print(f"Warning: Failed to write TOC file {toc_file}: {e}")
+        return 0
 
-    print(f"Documentation generated successfully!")
+
+def _write_cache_manifest(
+    result: "GenerationResult",
+    cache_manifest: str,
+    files: List,
+    url_prefix: str,
+    base_path: str,
+    backend,
+    toc_data: Optional[bytes] = None,
+) -> None:
+    """
+    Write the cache-validation manifest for the files of a run.
+
+    The TOC is read back from disk unless its content is given.
+    """
+    from mcpdoc_split.cache import build_cache_manifest, dump_cache_manifest
+
+    try:
+        if toc_data is None:
+            with open(result.toc_file, "rb") as f:
+                toc_data = f.read()
+        manifest = dump_cache_manifest(build_cache_manifest(
+            files, result.toc_file, toc_data, url_prefix, base_path
+        ))
+        if backend.update(cache_manifest, manifest):
+            result.bytes_written += len(manifest.encode("utf-8"))
+    except OSError as e:
+        print(f"Warning: Failed to write cache manifest {cache_manifest}: {e}")
+
+
+def _precompress(
+    result: "GenerationResult",
+    output_dir: str,
+    extra_files: List[Optional[str]],
+    formats: List[str],
+    workers: Optional[int],
+) -> None:
+    """Bring the sidecars of a run's outputs up to date; failures only warn."""
+    from mcpdoc_split.precompress import precompress
+
+    with timed(result.timings, "precompress"):
+        try:
+            stats = precompress(
+                output_dir, [path for path in extra_files if path], formats, workers
+            )
+        except OSError as e:
+            print(f"Warning: Failed to write precompressed files: {e}")
+            return
+    result.sidecars_written = stats["written"]
+    result.bytes_written += stats["bytes_written"]
+    print(
+        f"Precompressed: {stats['written']} written, {stats['unchanged']} "
+        f"unchanged, {stats['removed']} removed"
+    )
+
+
+def _report_anchor_links(result: "GenerationResult", rewriter) -> None:
+    """Record and print the outcome of rewriting anchor links."""
+    result.anchor_links = rewriter.rewritten
+    result.unresolved_anchors = [
+        {"file": filename, "anchor": anchor}
+        for filename, anchor in rewriter.unresolved
+    ]
+    print(
+        f"Anchor links: {rewriter.rewritten} rewritten, "
+        f"{len(rewriter.unresolved)} unresolved"
+    )
+    for filename, anchor in rewriter.unresolved[:UNRESOLVED_ANCHORS_SHOWN]:
+        print(f"Warning: Unresolved anchor link {anchor} in {filename}")
+    hidden = len(rewriter.unresolved) - UNRESOLVED_ANCHORS_SHOWN
+    if hidden > 0:
+        print(f"Warning: ... and {hidden} more unresolved anchor links")
+
+
+def print_summary(
+    output_dir: str, toc_file: str, sections_generated: int, max_level: int
+) -> None:
+    """
+    Print the end-of-run summary.
+
+    Args:
+        output_dir: Directory the section files were saved to
+        toc_file: Path of the TOC file
+        sections_generated: Number of section files generated
+        max_level: Maximum header level split at
+    """
+    print("Documentation generated successfully!")
     print(f"Files saved to: {output_dir}")
     print(f"TOC saved to: {toc_file}")
     print(f"Generated {sections_generated} files (filtered by max_level={max_level})")
 
 
+@contextmanager
+def timed(timings: Dict[str, float], phase: str) -> Iterator[None]:
+    """
+    Add the wall time spent in a with block to timings[phase].
+
+    Args:
+        timings: Phase timings in seconds, updated in place
+        phase: Name of the phase the block belongs to
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - started
+
+
+def read_markdown(input_file: str) -> str:
+    """
+    Read a markdown file as UTF-8 text.
+
+    Args:
+        input_file: Path to the markdown file
+
+    Returns:
+        The file content
+
+    Raises:
+        ValueError: If the file is not valid UTF-8
+    """
+    try:
+        with open(input_file, "r", encoding="utf-8") as f:
+            return f.read()
+    except UnicodeDecodeError as e:
+        raise ValueError(f"Unable to read file {input_file}: {e}")
+
+
+@lru_cache(maxsize=None)
+def get_parser(parse_mode: str = "block") -> "MarkdownIt":
+    """
+    Return the shared markdown-it parser for a parse mode.
+
+    Heading boundaries only depend on the block rules: the heading text is the
+    raw content of the inline token, which the block rules fill in before any
+    inline tokenization happens. The "block" mode therefore disables the inline
+    core rules, while every block rule stays enabled because fences, code,
+    HTML blocks, lists, blockquotes, thematic breaks and reference definitions
+    all decide where headings can appear.
+
+    Args:
+        parse_mode: One of PARSE_MODES
+
+    Returns:
+        Configured MarkdownIt instance
+
+    Raises:
+        ValueError: If parse_mode is unknown
+    """
+    if parse_mode not in PARSE_MODES:
+        raise ValueError(f"parse_mode must be one of: {', '.join(PARSE_MODES)}")
+
+    # Imported here so that thin clients of the daemon don't pay for it
+    from markdown_it import MarkdownIt
+
+    md = MarkdownIt("commonmark")
+    if parse_mode == "block":
+        md.disable(["inline", "text_join"])
+    return md
+
+
+def collect_sections(
+    content: str, max_level: int = 6, parse_mode: str = "block"
+) -> List[Dict]:
+    """
+    Build the section table for a markdown document.
+
+    Every heading up to ``max_level`` with non-empty text starts a section that
+    runs until the next such heading (or the end of the document).
+
+    Args:
+        content: Markdown source
+        max_level: Maximum header level to split at
+        parse_mode: One of PARSE_MODES
+
+    Returns:
+        List of section dictionaries with filename, header, level,
+        start_line and end_line keys, in document order
+    """
+    tokens = get_parser(parse_mode).parse(content)
+    return sections_from_tokens(tokens, max_level, content.count("\n") + 1)
+
+
+def sections_from_tokens(
+    tokens: List, max_level: int, total_lines: int
+) -> List[Dict]:
+    """
+    Build the section table from markdown-it tokens.
+
+    Args:
+        tokens: Tokens of the whole document
+        max_level: Maximum header level to split at
+        total_lines: Number of lines in the document
+
+    Returns:
+        List of section dictionaries, as returned by collect_sections
+    """
+    section_starts = heading_starts(tokens, max_level)
+    registry = FilenameRegistry()
+    for section_info in section_starts:
+        section_info["filename"] = registry.assign(section_info["header"])
+
+    return close_sections(section_starts, total_lines)
+
+
+def heading_starts(tokens: List, max_level: int) -> List[Dict]:
+    """
+    Find the headings that start sections, without naming their files.
+
+    Args:
+        tokens: markdown-it tokens
+        max_level: Maximum header level to split at
+
+    Returns:
+        List of dictionaries with line, header and level keys, in document
+        order
+    """
+    starts = []
+    for i, token in enumerate(tokens):
+        if token.type == "heading_open" and int(token.tag[1]) <= max_level:
+            header_text = extract_heading_text(tokens, i)
+            if header_text and hasattr(token, "map") and token.map:
+                starts.append({
+                    "line": token.map[0],
+                    "header": header_text,
+                    "level": int(token.tag[1]),
+                })
+    return starts
+
+
+def close_sections(section_starts: List[Dict], total_lines: int) -> List[Dict]:
+    """
+    Turn heading start positions into sections with line boundaries.
+
+    Args:
+        section_starts: Headings with filename, header, level and line keys,
+            in document order
+        total_lines: Number of lines in the document
+
+    Returns:
+        Sections ending where the next one starts, the last one at total_lines
+    """
+    sections = []
+    for idx, section_info in enumerate(section_starts):
+        if idx + 1 < len(section_starts):
+            end_line = section_starts[idx + 1]["line"]
+        else:
+            end_line = total_lines
+        sections.append({
+            "filename": section_info["filename"],
+            "header": section_info["header"],
+            "level": section_info["level"],
+            "start_line": section_info["line"],
+            "end_line": end_line,
+        })
+    return sections
+
+
+def render_section(section: Dict, content_lines: List[str]) -> str:
+    """
+    Return the text of a section exactly as it is written to its file.
+
+    Args:
+        section: Section dictionary with line positions
+        content_lines: All lines from the original content
+
+    Returns:
+        The section content with surrounding whitespace stripped
+    """
+    start_line = section["start_line"]
+    end_line = section.get("end_line", len(content_lines))
+    return "\n".join(content_lines[start_line:end_line]).strip()
+
+
+def section_url(filename: str, url_prefix: str, base_path: str) -> str:
+    """Build the absolute URL of a section file."""
+    return f"{url_prefix.rstrip('/')}{base_path.rstrip('/')}/{filename}"
+
+
+def toc_line(section: Dict, url_prefix: str, base_path: str) -> str:
+    """Build the indented TOC entry for a section."""
+    url = section_url(section["filename"], url_prefix, base_path)
+    indent = "  " * (section["level"] - 1)
+    return f"{indent}- [{section['header']}]({url})\n"
+
+
+def build_toc(sections: List[Dict], url_prefix: str, base_path: str) -> str:
+    """
+    Build the full TOC document for a section table.
+
+    Headings listed in a section's optional "anchors" are linked to their
+    anchor inside the section file.
+
+    Args:
+        sections: Section dictionaries in document order
+        url_prefix: URL prefix for absolute links
+        base_path: Base path for docs
+
+    Returns:
+        TOC markdown text
+    """
+    entries = []
+    for section in sections:
+        entries.append(toc_line(section, url_prefix, base_path))
+        for heading in section.get("anchors", ()):
+            link = section["filename"] + generate_anchor_link(heading["header"])
+            anchor = {**heading, "filename": link}
+            entries.append(toc_line(anchor, url_prefix, base_path))
+    return TOC_HEADER + "".join(entries)
+
+
 def extract_heading_text(tokens: List, heading_open_idx: int) -> Optional[str]:
     """
     Extract heading text from tokens starting at heading_open token.
@@ -142,7 +970,9 @@ def extract_heading_text(tokens: List, heading_open_idx: int) -> Optional[str]:
     return None
 
 
-def save_section_by_lines(section: Dict, content_lines: List[str], output_dir: str) -> None:
+def save_section_by_lines(
+    section: Dict, content_lines: List[str], output_dir: str, backend=None
+) -> int:
     """
     Save a section to file using line-based approach for perfect reconstruction.
     
@@ -150,22 +980,46 @@ def save_section_by_lines(section: Dict, content_lines: List[str], output_dir: s
         section: Section dictionary with line positions
         content_lines: All lines from the original content
         output_dir: Output directory path
+        backend: Output backend to write to (default: the filesystem)
+
+    Returns:
+        Number of bytes written (0 if the file couldn't be written)
+    """
+    # Extract section content directly from original lines
+    content = render_section(section, content_lines)
+    return _write_section(section, content, output_dir, backend)
+
+
+def _write_section(
+    section: Dict, content: str, output_dir: str, backend: Optional["Backend"] = None
+) -> int:
+    """Write rendered section content to its file, returning the bytes written."""
+    return write_section_data(section, content.encode("utf-8"), output_dir, backend)
+
+
+def write_section_data(
+    section: Dict, data, output_dir: str, backend: Optional["Backend"] = None
+) -> int:
+    """
+    Write a section's bytes to its file; failures only print a warning.
+
+    Args:
+        section: Section dictionary with a filename key
+        data: Section content as bytes or a buffer
+        output_dir: Directory to write the file to
+        backend: Output backend (default: a FilesystemBackend)
+
+    Returns:
+        Bytes written, 0 when the file couldn't be written
     """
     filepath = os.path.join(output_dir, section["filename"])
-    
+
     try:
-        start_line = section["start_line"]
-        end_line = section.get("end_line", len(content_lines))
-        
-        # Extract section content directly from original lines
-        section_lines = content_lines[start_line:end_line]
-        content = "\n".join(section_lines).strip()
-        
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(content)
-            
+        (backend or FilesystemBackend()).write_section(filepath, section, data)
+        return len(data)
     except Exception as e:
         print(f"Warning: Failed to write file {filepath}: {e}")
+        return 0
 
 
 def generate_filename(header_text: str) -> str:
@@ -198,6 +1052,58 @@ def generate_filename(header_text: str) -> str:
     return f"{filename}.md"
 
 
+class FilenameRegistry:
+    """
+    Hand out unique section filenames in document order.
+
+    The first section with a given slug gets ``<slug>.md``, later ones get
+    ``<slug>-2.md``, ``<slug>-3.md`` and so on, skipping names that are
+    already taken. The same document therefore always gets the same names.
+    """
+
+    def __init__(self):
+        self.taken: Set[str] = set()
+        # Next number to try per stem, so repeated slugs stay O(1)
+        self._next: Dict[str, int] = {}
+
+    def assign(self, header_text: str) -> str:
+        """Return a unique filename for a header."""
+        return self.claim(generate_filename(header_text))
+
+    def claim(self, filename: str) -> str:
+        """Return filename, or a numbered variant of it if it's taken."""
+        candidate = filename
+        if candidate in self.taken:
+            stem = filename[: -len(".md")]
+            number = self._next.get(stem, 2)
+            while f"{stem}-{number}.md" in self.taken:
+                number += 1
+            self._next[stem] = number + 1
+            candidate = f"{stem}-{number}.md"
+        self.taken.add(candidate)
+        return candidate
+
+
+def content_digest(content: str) -> str:
+    """Return the SHA-256 hex digest of a section's content."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def hashed_filename(filename: str, digest: str) -> str:
+    """
+    Embed a short content digest in a section filename.
+
+    Args:
+        filename: Section filename ending in .md
+        digest: Hex digest of the section content
+
+    Returns:
+        Filename of the form ``<stem>.<digest prefix>.md``
+    """
+    stem = filename[: -len(".md")]
+    return f"{stem}.{digest[:CONTENT_HASH_LENGTH]}.md"
+
+
 def generate_anchor_link(header_text: str) -> str:
     """
     Generate anchor link from header text using GitHub-style formatting.
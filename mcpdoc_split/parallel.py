@@ -0,0 +1,193 @@
+"""Parallel parsing of one large input, cut into chunks at safe headings.
+
+markdown-it parses a document on a single core. For very large inputs the
+document is cut into chunks at top-level ATX headings, every chunk is parsed
+in a worker process, and the per-chunk heading tables are stitched back into
+the section table the serial parser produces.
+
+A ``#`` heading line at the start of a line that follows a blank line always
+starts a new top-level block, unless a fenced code block or an HTML block
+that only ends at a closing marker (``<!--``, ``<script>``, ``<pre>``, ...)
+is still open: paragraphs, reference definitions and the other HTML blocks
+end at the blank line, and list items and blockquotes end at an unindented
+line without ``>``. The pre-scan only proposes such headings outside fences
+it can see. Every cut is then verified with the parse of the chunk before
+it: if that chunk ends inside an unclosed fence or HTML block, the cut was
+not a block boundary and both chunks are parsed again as one.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from mcpdoc_split.main import (
+    FilenameRegistry,
+    close_sections,
+    get_parser,
+    heading_starts,
+    sections_from_tokens,
+)
+
+# Smallest chunk worth a worker process, in characters
+MIN_CHUNK_CHARS = 1 << 20
+
+# A blank line followed by an ATX heading line; the cut is the heading start
+_CUT = re.compile(r"\n[ \t]*\n(?=#{1,6}(?:[ \t\n]|$))")
+
+# A fence line: up to three spaces of indentation, the fence, the rest
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})([^\n]*)$", re.M)
+
+# Top-level blocks that don't end at a blank line
+_OPEN_ENDED = ("fence", "html_block")
+
+
+def find_cut_points(content: str, chunks: int) -> List[int]:
+    """
+    Propose where to cut a document into about ``chunks`` chunks.
+
+    Args:
+        content: Markdown source
+        chunks: Number of chunks wanted
+
+    Returns:
+        Increasing offsets of heading line starts in content, one per cut
+    """
+    spans = _fence_spans(content)
+    span_index = 0
+    cuts: List[int] = []
+    for number in range(1, chunks):
+        position = max(len(content) * number // chunks, cuts[-1] if cuts else 0)
+        while True:
+            match = _CUT.search(content, position)
+            if match is None:
+                return cuts
+            cut = match.end()
+            while span_index < len(spans) and spans[span_index][1] <= cut:
+                span_index += 1
+            if span_index < len(spans) and spans[span_index][0] < cut:
+                # Inside a fence: look again after it
+                position = spans[span_index][1]
+                continue
+            cuts.append(cut)
+            break
+    return cuts
+
+
+def _fence_spans(content: str) -> List[Tuple[int, int]]:
+    """Return the (start, end) offsets of the top-level fenced code blocks."""
+    spans = []
+    opening: Optional[Tuple[int, str]] = None
+    for match in _FENCE.finditer(content):
+        marker, rest = match.groups()
+        if opening is None:
+            # A backtick fence's info string can't contain backticks
+            if not (marker[0] == "`" and "`" in rest):
+                opening = (match.start(), marker)
+        elif (
+            marker[0] == opening[1][0]
+            and len(marker) >= len(opening[1])
+            and not rest.strip()
+        ):
+            spans.append((opening[0], match.end()))
+            opening = None
+    if opening is not None:
+        spans.append((opening[0], len(content)))
+    return spans
+
+
+def _parse_chunk(job: Tuple[str, int, str]) -> Tuple[List[Dict], bool]:
+    """
+    Parse one chunk in a worker process.
+
+    Args:
+        job: Chunk text, maximum header level and parse mode
+
+    Returns:
+        The chunk's heading starts, with lines relative to the chunk, and
+        whether the chunk ends inside an unclosed fence or HTML block
+    """
+    chunk, max_level, parse_mode = job
+    tokens = get_parser(parse_mode).parse(chunk)
+    lines = chunk.count("\n")
+    unclosed = any(
+        token.level == 0 and token.type in _OPEN_ENDED and token.map[1] >= lines
+        for token in tokens
+    )
+    return heading_starts(tokens, max_level), unclosed
+
+
+def parallel_sections(
+    content: str,
+    max_level: int = 6,
+    parse_mode: str = "block",
+    workers: Optional[int] = None,
+    min_chunk_chars: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Build the section table of a markdown document on a process pool.
+
+    The result equals collect_sections(content, max_level, parse_mode).
+    Documents too small for two chunks of ``min_chunk_chars`` are parsed in
+    the current process.
+
+    Args:
+        content: Markdown source
+        max_level: Maximum header level to split at
+        parse_mode: One of PARSE_MODES
+        workers: Number of worker processes (default: number of CPUs)
+        min_chunk_chars: Smallest chunk handed to a worker, in characters
+            (default: MIN_CHUNK_CHARS)
+
+    Returns:
+        List of section dictionaries, as returned by collect_sections
+
+    Raises:
+        ValueError: If workers is not positive
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    if min_chunk_chars is None:
+        min_chunk_chars = MIN_CHUNK_CHARS
+
+    total_lines = content.count("\n") + 1
+    chunks = min(workers, len(content) // max(min_chunk_chars, 1))
+    bounds = [0] + find_cut_points(content, chunks) + [len(content)]
+    if len(bounds) <= 2:
+        tokens = get_parser(parse_mode).parse(content)
+        return sections_from_tokens(tokens, max_level, total_lines)
+
+    jobs = (
+        (content[start:end], max_level, parse_mode)
+        for start, end in zip(bounds, bounds[1:])
+    )
+    with ProcessPoolExecutor(max_workers=min(workers, len(bounds) - 1)) as executor:
+        results = list(executor.map(_parse_chunk, jobs))
+
+    section_starts = []
+    line = 0
+    counted = 0
+    index = 0
+    while index < len(results):
+        start = bounds[index]
+        headings, unclosed = results[index]
+        index += 1
+        while unclosed and index < len(results):
+            # The cut fell inside a block: parse through the next chunk
+            index += 1
+            headings, unclosed = _parse_chunk(
+                (content[start:bounds[index]], max_level, parse_mode)
+            )
+        line += content.count("\n", counted, start)
+        counted = start
+        for heading in headings:
+            heading["line"] += line
+            section_starts.append(heading)
+
+    registry = FilenameRegistry()
+    for section_info in section_starts:
+        section_info["filename"] = registry.assign(section_info["header"])
+    return close_sections(section_starts, total_lines)
@@ -0,0 +1,205 @@
+"""Persistent cache of section tables, so repeat runs skip markdown-it.
+
+The section table of an input only depends on its content, the heading
+level it is split at, the chunking options and the code that parses it. It
+doesn't depend on the URL prefix, base path or TOC location, so regenerating
+the same source for several mirrors parses it once. Entries are JSON files
+named after a key over all of these, stored in one directory that is kept
+under a size limit by evicting the least recently used entries; a hit
+refreshes the entry's modification time.
+
+Entries are written atomically, so processes can share a cache directory.
+
+Long-lived processes such as the daemon also keep recent tables in a
+SectionCache, an in-memory LRU under the same keys that is checked first.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import markdown_it
+
+from mcpdoc_split._version import __version__
+
+PARSE_CACHE_VERSION = 1
+
+# Default size limit of a cache directory, in bytes
+DEFAULT_CACHE_SIZE = 64 << 20
+
+# Default number of section tables a SectionCache keeps
+DEFAULT_MEMORY_ENTRIES = 128
+
+_SUFFIX = ".json"
+
+
+def parse_cache_key(
+    digest: str,
+    max_level: int,
+    chunking: Optional[Dict] = None,
+    link_targets: bool = False,
+) -> str:
+    """
+    Return the cache key of a section table.
+
+    Args:
+        digest: SHA-256 hex digest of the input
+        max_level: Maximum header level the input is split at
+        chunking: chunk_sections options the table was built with, if any
+        link_targets: Whether the sections carry their anchor link targets
+
+    Returns:
+        Hex digest identifying the table
+    """
+    parts = [
+        PARSE_CACHE_VERSION,
+        __version__,
+        markdown_it.__version__,
+        digest,
+        max_level,
+        chunking,
+    ]
+    if link_targets:
+        # Appended so that the keys of plain tables stay the same
+        parts.append("link_targets")
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def load_sections(cache_dir: str, key: str) -> Optional[List[Dict]]:
+    """
+    Look up a section table, marking it as recently used.
+
+    Args:
+        cache_dir: Cache directory
+        key: Key from parse_cache_key
+
+    Returns:
+        The cached section table, or None if there is no usable entry
+    """
+    path = os.path.join(cache_dir, key + _SUFFIX)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != PARSE_CACHE_VERSION
+        or not isinstance(data.get("sections"), list)
+    ):
+        return None
+
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return data["sections"]
+
+
+def store_sections(
+    cache_dir: str,
+    key: str,
+    sections: List[Dict],
+    max_size: Optional[int] = None,
+) -> None:
+    """
+    Store a section table and evict entries beyond the size limit.
+
+    Args:
+        cache_dir: Cache directory, created if missing
+        key: Key from parse_cache_key
+        sections: Section table to store
+        max_size: Size limit of the cache directory in bytes
+            (default: DEFAULT_CACHE_SIZE)
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    data = {"version": PARSE_CACHE_VERSION, "sections": sections}
+    path = os.path.join(cache_dir, key + _SUFFIX)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temp_path, path)
+    evict(cache_dir, DEFAULT_CACHE_SIZE if max_size is None else max_size)
+
+
+def evict(cache_dir: str, max_size: int) -> int:
+    """
+    Delete the least recently used entries until the cache fits max_size.
+
+    Args:
+        cache_dir: Cache directory
+        max_size: Size limit in bytes
+
+    Returns:
+        Number of entries deleted
+    """
+    entries = []
+    total = 0
+    with os.scandir(cache_dir) as scan:
+        for entry in scan:
+            if not entry.name.endswith(_SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, entry.path, stat.st_size))
+            total += stat.st_size
+
+    deleted = 0
+    for _, path, size in sorted(entries):
+        if total <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        deleted += 1
+    return deleted
+
+
+class SectionCache:
+    """
+    In-memory LRU of section tables, safe to share between threads.
+
+    Tables are copied in and out, since runs rename sections in place.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MEMORY_ENTRIES):
+        """
+        Create an empty cache.
+
+        Raises:
+            ValueError: If max_entries is not positive
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._tables: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def load(self, key: str) -> Optional[List[Dict]]:
+        """Return a copy of a cached table, marking it as recently used."""
+        with self._lock:
+            sections = self._tables.get(key)
+            if sections is None:
+                return None
+            self._tables.move_to_end(key)
+        return [dict(section) for section in sections]
+
+    def store(self, key: str, sections: List[Dict]) -> None:
+        """Cache a copy of a table, evicting the least recently used ones."""
+        sections = [dict(section) for section in sections]
+        with self._lock:
+            self._tables[key] = sections
+            self._tables.move_to_end(key)
+            while len(self._tables) > self.max_entries:
+                self._tables.popitem(last=False)
@@ -0,0 +1,247 @@
+"""Precompressed sidecars of the published files.
+
+Static servers can send a file's compressed sibling as is instead of
+compressing it on every request: nginx ``gzip_static`` looks for
+``services.md.gz`` next to ``services.md``, Caddy's ``precompressed`` for
+``.gz``, ``.br`` and ``.zst``. A sidecar is written at the highest level
+of its format, once, on a thread pool (zlib and the other stdlib codecs
+release the GIL while compressing).
+
+A sidecar carries the modification time of its file, and both formats
+record the uncompressed size (the gzip trailer, the zstd frame header).
+It is up to date when both match, so a run only compresses the files it
+wrote: sections an incremental run leaves alone, an unchanged TOC or
+bundle keep their sidecars. Files that don't shrink get no sidecar, and
+sidecars whose file is gone are removed.
+"""
+
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Sidecar suffix by format name
+SIDECAR_FORMATS = {"gzip": ".gz", "zstd": ".zst"}
+
+# Files smaller than this aren't worth a sidecar
+MIN_SIZE = 256
+
+
+def _compressor(format_name: str) -> Optional[Callable[[bytes], bytes]]:
+    """Return the function compressing to a format, or None if unavailable."""
+    if format_name == "gzip":
+        return lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if format_name == "zstd":
+        try:
+            from compression import zstd
+        except ImportError:
+            return None
+        level = zstd.CompressionParameter.compression_level.bounds()[1]
+        return lambda data: zstd.compress(data, level=level)
+    return None
+
+
+def available_formats() -> List[str]:
+    """Return the sidecar formats this Python can write."""
+    return [name for name in SIDECAR_FORMATS if _compressor(name) is not None]
+
+
+def resolve_formats(names: Iterable[str]) -> List[str]:
+    """
+    Validate sidecar format names.
+
+    Args:
+        names: Format names, or "all" for every available format
+
+    Returns:
+        The formats in SIDECAR_FORMATS order, without repeats
+
+    Raises:
+        ValueError: If a format is unknown or not available
+    """
+    names = set(names)
+    if "all" in names:
+        names = (names - {"all"}) | set(available_formats())
+    if not names:
+        raise ValueError("precompress needs at least one format")
+    for name in names:
+        if name not in SIDECAR_FORMATS:
+            raise ValueError(
+                f"Unknown precompress format {name!r}; use one of: "
+                f"{', '.join(SIDECAR_FORMATS)} or all"
+            )
+        if _compressor(name) is None:
+            raise ValueError(
+                f"Precompress format {name!r} is not available in this Python"
+            )
+    return [name for name in SIDECAR_FORMATS if name in names]
+
+
+def is_sidecar(path: str) -> bool:
+    """Tell whether a path names a sidecar of any format."""
+    return path.endswith(tuple(SIDECAR_FORMATS.values()))
+
+
+def _recorded_size(sidecar: str, format_name: str) -> Optional[int]:
+    """Return the uncompressed size a sidecar records, or None if unreadable."""
+    if format_name == "gzip":
+        try:
+            with open(sidecar, "rb") as f:
+                # ISIZE: the size modulo 2**32, in the last four bytes
+                f.seek(-4, os.SEEK_END)
+                return int.from_bytes(f.read(4), "little")
+        except OSError:
+            return None
+    try:
+        from compression import zstd
+    except ImportError:
+        return None
+    try:
+        with open(sidecar, "rb") as f:
+            # The frame header is at most 18 bytes
+            return zstd.get_frame_info(f.read(18)).decompressed_size
+    except (OSError, zstd.ZstdError):
+        return None
+
+
+def _is_fresh(sidecar: str, format_name: str, stat: os.stat_result) -> bool:
+    try:
+        if os.stat(sidecar).st_mtime_ns != stat.st_mtime_ns:
+            return False
+    except FileNotFoundError:
+        return False
+    size = stat.st_size % 2**32 if format_name == "gzip" else stat.st_size
+    return _recorded_size(sidecar, format_name) == size
+
+
+def _write_sidecar(path: str, data: bytes, mtime_ns: int) -> None:
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.utime(temp_path, ns=(mtime_ns, mtime_ns))
+    os.replace(temp_path, path)
+
+
+def _remove(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def compress_file(path: str, formats: List[str]) -> Dict[str, int]:
+    """
+    Bring the sidecars of one file up to date.
+
+    Args:
+        path: File to compress
+        formats: Names of the sidecar formats to write
+
+    Returns:
+        Counts of written, unchanged and removed sidecars, and the number of
+        bytes written
+    """
+    stats = {"written": 0, "unchanged": 0, "removed": 0, "bytes_written": 0}
+    stat = os.stat(path)
+    data = None
+    for name in formats:
+        sidecar = path + SIDECAR_FORMATS[name]
+        if stat.st_size < MIN_SIZE:
+            stats["removed"] += _remove(sidecar)
+            continue
+        if _is_fresh(sidecar, name, stat):
+            stats["unchanged"] += 1
+            continue
+
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        packed = _compressor(name)(data)
+        if len(packed) >= len(data):
+            stats["removed"] += _remove(sidecar)
+            continue
+        _write_sidecar(sidecar, packed, stat.st_mtime_ns)
+        stats["written"] += 1
+        stats["bytes_written"] += len(packed)
+    return stats
+
+
+def prune_sidecars(output_dir: str) -> int:
+    """
+    Remove the sidecars of files that no longer exist.
+
+    Args:
+        output_dir: Directory to clean up, recursively
+
+    Returns:
+        Number of sidecars removed
+    """
+    removed = 0
+    for root, _, files in os.walk(output_dir):
+        present = set(files)
+        for name in files:
+            if not is_sidecar(name):
+                continue
+            source = os.path.splitext(name)[0]
+            if source not in present:
+                os.remove(os.path.join(root, name))
+                removed += 1
+    return removed
+
+
+def published_files(output_dir: str) -> List[str]:
+    """Return the files of an output directory that get sidecars."""
+    paths = []
+    for root, dirs, files in os.walk(output_dir):
+        dirs.sort()
+        for name in sorted(files):
+            # Skip sidecars, temporary files and the incremental manifest
+            if is_sidecar(name) or name.endswith(".tmp") or name.startswith("."):
+                continue
+            paths.append(os.path.join(root, name))
+    return paths
+
+
+def precompress(
+    output_dir: str,
+    extra_files: Iterable[str],
+    formats: Iterable[str],
+    workers: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Write the missing and outdated sidecars of a run's outputs.
+
+    Args:
+        output_dir: Directory of the section files
+        extra_files: Other published files, such as the TOC and the bundle
+        formats: Sidecar format names, as accepted by resolve_formats()
+        workers: Number of compression threads (default: number of CPUs)
+
+    Returns:
+        Counts of written, unchanged and removed sidecars, and the number of
+        bytes written
+
+    Raises:
+        ValueError: If a format is unknown or not available, or workers is
+            less than 1
+    """
+    formats = resolve_formats(formats)
+    if workers is not None and workers < 1:
+        raise ValueError("precompress_workers must be at least 1")
+
+    paths = published_files(output_dir)
+    paths.extend(path for path in extra_files if os.path.isfile(path))
+    totals = {
+        "written": 0,
+        "unchanged": 0,
+        "removed": prune_sidecars(output_dir),
+        "bytes_written": 0,
+    }
+    # Biggest first, so a huge bundle doesn't start last
+    paths.sort(key=os.path.getsize, reverse=True)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        for stats in executor.map(lambda path: compress_file(path, formats), paths):
+            for key, value in stats.items():
+                totals[key] += value
+    return totals
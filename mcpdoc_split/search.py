@@ -0,0 +1,179 @@
+"""Full-text search index over split sections.
+
+The index is built at split time from the rendered section contents and saved
+as compact JSON next to the TOC. It stores the BM25 statistics (document
+lengths and the average length) and an inverted index of postings keyed by
+section, so a query only touches the postings of its own terms and needs no
+access to the section files.
+"""
+
+import json
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+from mcpdoc_split.main import section_url
+
+INDEX_VERSION = 1
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_TERM_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    Identifiers such as ``select_related`` are kept as single terms;
+    single-character terms are dropped.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Terms in text order, with repetitions
+    """
+    return [term for term in _TERM_RE.findall(text.lower()) if len(term) > 1]
+
+
+def build_index(
+    rendered: List[Tuple[Dict, str]], url_prefix: str, base_path: str
+) -> Dict:
+    """
+    Build the search index for rendered sections.
+
+    The splitter's section tables have unique filenames (FilenameRegistry
+    numbers repeated slugs), so every section gets its own entry. Should a
+    caller pass a filename twice, the last content wins, as it would on disk.
+
+    Args:
+        rendered: (section, content) pairs in document order
+        url_prefix: URL prefix for absolute links
+        base_path: Base path for docs
+
+    Returns:
+        JSON-serializable index with the section table as
+        [filename, header, url, length] rows and postings as flat
+        [section number, term frequency, ...] lists per term
+    """
+    by_filename = {
+        section["filename"]: (section, content) for section, content in rendered
+    }
+
+    documents = []
+    postings: Dict[str, List[int]] = {}
+    total_length = 0
+    for number, (section, content) in enumerate(by_filename.values()):
+        terms = tokenize(content)
+        frequencies: Dict[str, int] = {}
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+        for term, frequency in frequencies.items():
+            postings.setdefault(term, []).extend((number, frequency))
+        documents.append([
+            section["filename"],
+            section["header"],
+            section_url(section["filename"], url_prefix, base_path),
+            len(terms),
+        ])
+        total_length += len(terms)
+
+    return {
+        "version": INDEX_VERSION,
+        "k1": K1,
+        "b": B,
+        "average_length": total_length / len(documents) if documents else 0.0,
+        "documents": documents,
+        "postings": postings,
+    }
+
+
+def dump_index(index: Dict) -> str:
+    """Serialize an index as compact JSON."""
+    return json.dumps(index, ensure_ascii=False, separators=(",", ":"))
+
+
+class SearchIndex:
+    """
+    Ranked section lookup over a saved index.
+
+    The index file is only read on the first query, and the BM25 length
+    normalization of every section is computed once at that point.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._index: Optional[Dict] = None
+        self._norms: List[float] = []
+
+    def load(self) -> Dict:
+        """
+        Read the index file if it hasn't been read yet.
+
+        Returns:
+            The decoded index
+
+        Raises:
+            ValueError: If the file is not a search index of a supported version
+        """
+        if self._index is None:
+            with open(self.path, "r", encoding="utf-8") as f:
+                try:
+                    index = json.load(f)
+                except ValueError as e:
+                    raise ValueError(f"Invalid search index {self.path}: {e}")
+            if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+                raise ValueError(f"Unsupported search index: {self.path}")
+            k1, b = index["k1"], index["b"]
+            average = index["average_length"] or 1.0
+            self._norms = [
+                k1 * (1 - b + b * document[3] / average)
+                for document in index["documents"]
+            ]
+            self._index = index
+        return self._index
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Rank sections by BM25 relevance to a query.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of results
+
+        Returns:
+            Result dictionaries with filename, header, url and score keys,
+            best match first
+        """
+        index = self.load()
+        documents = index["documents"]
+        postings = index["postings"]
+        k1 = index["k1"]
+        count = len(documents)
+
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            entries = postings.get(term)
+            if not entries:
+                continue
+            matches = len(entries) // 2
+            idf = math.log(1 + (count - matches + 0.5) / (matches + 0.5))
+            for pos in range(0, len(entries), 2):
+                number, frequency = entries[pos], entries[pos + 1]
+                score = idf * frequency * (k1 + 1) / (frequency + self._norms[number])
+                scores[number] = scores.get(number, 0.0) + score
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        results = []
+        for number, score in ranked[:limit]:
+            filename, header, url, _ = documents[number]
+            results.append({
+                "filename": filename,
+                "header": header,
+                "url": url,
+                "score": round(score, 6),
+            })
+        return results
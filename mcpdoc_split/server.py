@@ -0,0 +1,290 @@
+"""Built-in MCP stdio server that serves split sections from memory.
+
+The input is parsed once with the regular splitter; the section table and the
+section contents are kept in memory and served over the Model Context Protocol
+(JSON-RPC 2.0, one message per line on stdin/stdout). No network access is
+needed, so the server works fully offline.
+"""
+
+import json
+import sys
+from typing import IO, Dict, List, Optional
+
+from mcpdoc_split._version import __version__
+from mcpdoc_split.main import collect_sections, read_markdown, render_section
+
+SUPPORTED_PROTOCOL_VERSIONS = ("2025-06-18", "2025-03-26", "2024-11-05")
+
+RESOURCE_SCHEME = "mcpdoc://"
+TOC_URI = f"{RESOURCE_SCHEME}toc"
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+
+TOOLS = [
+    {
+        "name": "list_sections",
+        "description": (
+            "List the documentation sections as an indented table of contents. "
+            "Each entry shows the section title and the name to pass to "
+            "get_section."
+        ),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "max_level": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": 6,
+                    "description": "Only list headings up to this level",
+                },
+            },
+        },
+    },
+    {
+        "name": "get_section",
+        "description": (
+            "Return the markdown content of a documentation section, looked up "
+            "by its name (e.g. 'services.md' or 'services') or its title."
+        ),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "Section name or title",
+                },
+            },
+            "required": ["name"],
+        },
+    },
+]
+
+
+class RequestError(Exception):
+    """Error reported back to the client as a JSON-RPC error response."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def load_sections(
+    input_file: str, max_level: int = 6, parse_mode: str = "block"
+) -> List[Dict]:
+    """
+    Split a markdown file in memory.
+
+    Args:
+        input_file: Path to the markdown file
+        max_level: Maximum header level to split at
+        parse_mode: Parser mode passed to collect_sections
+
+    Returns:
+        Section dictionaries in document order, each with its rendered content
+        under the "content" key
+    """
+    content = read_markdown(input_file)
+    sections = collect_sections(content, max_level, parse_mode)
+    content_lines = content.split("\n")
+    for section in sections:
+        section["content"] = render_section(section, content_lines)
+    return sections
+
+
+class DocServer:
+    """MCP request handler over an in-memory section table."""
+
+    def __init__(self, sections: List[Dict], name: str = "mcpdoc-split"):
+        self.sections = sections
+        self.name = name
+        self.by_name = {section["filename"]: section for section in sections}
+        self.by_header: Dict[str, Dict] = {}
+        for section in sections:
+            self.by_header.setdefault(section["header"].lower(), section)
+
+    def find_section(self, name: str) -> Optional[Dict]:
+        """Look up a section by filename, filename without .md, or title."""
+        name = name.strip()
+        if name.startswith(RESOURCE_SCHEME + "sections/"):
+            name = name[len(RESOURCE_SCHEME + "sections/"):]
+        return (
+            self.by_name.get(name)
+            or self.by_name.get(f"{name}.md")
+            or self.by_header.get(name.lower())
+        )
+
+    def toc(self, max_level: int = 6) -> str:
+        """Return the table of contents listing section names."""
+        lines = ["# Table of Contents", ""]
+        for section in self.sections:
+            if section["level"] <= max_level:
+                indent = "  " * (section["level"] - 1)
+                lines.append(f"{indent}- {section['header']} ({section['filename']})")
+        return "\n".join(lines) + "\n"
+
+    def handle(self, message: Dict) -> Optional[Dict]:
+        """
+        Handle one JSON-RPC message.
+
+        Args:
+            message: Decoded JSON-RPC request or notification
+
+        Returns:
+            The response to send, or None for notifications
+        """
+        request_id = message.get("id") if isinstance(message, dict) else None
+        is_notification = isinstance(message, dict) and "id" not in message
+        try:
+            if not isinstance(message, dict) or not isinstance(
+                message.get("method"), str
+            ):
+                raise RequestError(INVALID_REQUEST, "Invalid request")
+            handler = self._handlers().get(message["method"])
+            if handler is None:
+                if is_notification:
+                    return None
+                raise RequestError(
+                    METHOD_NOT_FOUND, f"Method not found: {message['method']}"
+                )
+            params = message.get("params") or {}
+            if not isinstance(params, dict):
+                raise RequestError(INVALID_PARAMS, "params must be an object")
+            result = handler(params)
+        except RequestError as e:
+            if is_notification:
+                return None
+            return {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": {"code": e.code, "message": e.message},
+            }
+
+        if is_notification:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def _handlers(self) -> Dict:
+        return {
+            "initialize": self._initialize,
+            "notifications/initialized": lambda params: None,
+            "ping": lambda params: {},
+            "tools/list": lambda params: {"tools": TOOLS},
+            "tools/call": self._call_tool,
+            "resources/list": self._list_resources,
+            "resources/read": self._read_resource,
+        }
+
+    def _initialize(self, params: Dict) -> Dict:
+        requested = params.get("protocolVersion")
+        if requested in SUPPORTED_PROTOCOL_VERSIONS:
+            version = requested
+        else:
+            version = SUPPORTED_PROTOCOL_VERSIONS[0]
+        return {
+            "protocolVersion": version,
+            "capabilities": {"tools": {}, "resources": {}},
+            "serverInfo": {"name": self.name, "version": __version__},
+        }
+
+    def _call_tool(self, params: Dict) -> Dict:
+        name = params.get("name")
+        arguments = params.get("arguments") or {}
+        if not isinstance(arguments, dict):
+            raise RequestError(INVALID_PARAMS, "arguments must be an object")
+        if name == "list_sections":
+            max_level = arguments.get("max_level", 6)
+            # bool is an int subclass, but true isn't a level
+            if (
+                isinstance(max_level, bool)
+                or not isinstance(max_level, int)
+                or not 1 <= max_level <= 6
+            ):
+                return _tool_error("max_level must be between 1 and 6")
+            return _tool_text(self.toc(max_level))
+        if name == "get_section":
+            section_name = arguments.get("name")
+            if not isinstance(section_name, str):
+                return _tool_error("name is required")
+            section = self.find_section(section_name)
+            if section is None:
+                return _tool_error(
+                    f"Unknown section: {section_name}. "
+                    "Call list_sections to see the available sections."
+                )
+            return _tool_text(section["content"])
+        raise RequestError(INVALID_PARAMS, f"Unknown tool: {name}")
+
+    def _list_resources(self, params: Dict) -> Dict:
+        resources = [{
+            "uri": TOC_URI,
+            "name": "toc",
+            "title": "Table of Contents",
+            "mimeType": "text/markdown",
+        }]
+        for section in self.by_name.values():
+            resources.append({
+                "uri": f"{RESOURCE_SCHEME}sections/{section['filename']}",
+                "name": section["filename"],
+                "title": section["header"],
+                "mimeType": "text/markdown",
+            })
+        return {"resources": resources}
+
+    def _read_resource(self, params: Dict) -> Dict:
+        uri = params.get("uri")
+        if uri == TOC_URI:
+            text = self.toc()
+        else:
+            section = None
+            if isinstance(uri, str) and uri.startswith(RESOURCE_SCHEME + "sections/"):
+                section = self.find_section(uri)
+            if section is None:
+                raise RequestError(INVALID_PARAMS, f"Unknown resource: {uri}")
+            text = section["content"]
+        return {"contents": [{"uri": uri, "mimeType": "text/markdown", "text": text}]}
+
+
+def _tool_text(text: str) -> Dict:
+    return {"content": [{"type": "text", "text": text}], "isError": False}
+
+
+def _tool_error(message: str) -> Dict:
+    return {"content": [{"type": "text", "text": message}], "isError": True}
+
+
+def serve_stdio(
+    server: DocServer,
+    stdin: Optional[IO[str]] = None,
+    stdout: Optional[IO[str]] = None,
+) -> None:
+    """
+    Serve MCP requests read line by line from stdin until it is closed.
+
+    Args:
+        server: Request handler
+        stdin: Input stream (default: sys.stdin)
+        stdout: Output stream (default: sys.stdout)
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    for line in stdin:
+        if not line.strip():
+            continue
+        try:
+            message = json.loads(line)
+        except ValueError:
+            response = {
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {"code": PARSE_ERROR, "message": "Parse error"},
+            }
+        else:
+            response = server.handle(message)
+        if response is not None:
+            stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+            stdout.flush()
@@ -0,0 +1,256 @@
+"""Markdown input sliced by byte offsets over a memory map.
+
+The splitter needs the document as text only while parsing. Afterwards every
+section is cut straight out of a read-only memory map of the input, at byte
+offsets computed once for every line start, and written without building a
+list of line strings or re-joining lines per section. The text is not kept,
+so it can be freed as soon as the parser is done with it.
+
+Inputs with CR line breaks fall back to the line-based source, which reads
+them with universal newlines like read_markdown, so both sources produce the
+same sections.
+"""
+
+import hashlib
+import itertools
+import mmap
+import re
+from array import array
+from typing import Dict, List, Optional, Union
+
+from mcpdoc_split.main import read_markdown, render_section
+
+# Bytes that str.strip() removes, besides non-ASCII whitespace
+_ASCII_WHITESPACE = frozenset(b" \t\n\x0b\x0c\r\x1c\x1d\x1e\x1f")
+
+# Bytes of the input split into lines per step when computing line offsets
+_BLOCK = 1 << 20
+
+# Line breaks as markdown-it counts them
+_LINE_BREAK = re.compile(rb"\r\n?|\n")
+
+
+def line_offsets(buffer) -> array:
+    """
+    Return the byte offset of every line start, plus one past the end.
+
+    Lines end at CR LF, CR or LF, as markdown-it counts them.
+
+    Args:
+        buffer: Bytes or memory map of the input
+
+    Returns:
+        The offsets, one more than the number of lines
+    """
+    offsets = array("q", [0])
+    if buffer.find(b"\r") != -1:
+        offsets.extend(match.end() for match in _LINE_BREAK.finditer(buffer))
+    else:
+        for start in range(0, len(buffer), _BLOCK):
+            parts = buffer[start:start + _BLOCK].split(b"\n")
+            # The last part has no newline inside this block
+            parts.pop()
+            ends = itertools.accumulate(
+                map((1).__add__, map(len, parts)), initial=start
+            )
+            next(ends)
+            offsets.extend(ends)
+    offsets.append(len(buffer) + 1)
+    return offsets
+
+
+def open_source(input_file: str) -> Union["MappedSource", "LineSource"]:
+    """
+    Open a markdown input for splitting.
+
+    Args:
+        input_file: Path to the markdown file
+
+    Returns:
+        A MappedSource, or a LineSource if the input contains CR line breaks
+
+    Raises:
+        ValueError: If the input is not valid UTF-8
+    """
+    with open(input_file, "rb") as f:
+        data = f.read()
+    if b"\r" in data:
+        return LineSource(read_markdown(input_file))
+    return MappedSource(input_file, data)
+
+
+class MappedSource:
+    """Markdown input memory-mapped and sliced at line byte offsets."""
+
+    def __init__(self, input_file: str, data: bytes):
+        self.input_file = input_file
+        self.size = len(data)
+        self._data: Optional[bytes] = data
+        self._buffer: Union[mmap.mmap, bytes, None] = None
+        self._offsets: Optional[array] = None
+
+    def decode(self) -> str:
+        """
+        Return the document text for parsing; it is not kept.
+
+        The raw bytes read by open_source are released as well, so only the
+        text occupies memory while parsing. The memory map that sections are
+        cut from is only created afterwards.
+
+        Raises:
+            ValueError: If the input is not valid UTF-8
+        """
+        data, self._data = self._data, None
+        if data is None:
+            with open(self.input_file, "rb") as f:
+                data = f.read()
+        try:
+            return str(data, "utf-8")
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Unable to read file {self.input_file}: {e}")
+
+    def digest(self) -> str:
+        """Return the SHA-256 hex digest of the input."""
+        data = self._data if self._data is not None else self.buffer
+        return hashlib.sha256(data).hexdigest()
+
+    @property
+    def buffer(self) -> Union[mmap.mmap, bytes]:
+        """
+        Read-only memory map of the input.
+
+        Raises:
+            ValueError: If the input changed size since it was opened
+        """
+        if self._buffer is None:
+            if not self.size:
+                self._buffer = b""
+            else:
+                with open(self.input_file, "rb") as f:
+                    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if len(buffer) != self.size:
+                    buffer.close()
+                    raise ValueError(
+                        f"Input file {self.input_file} changed while splitting"
+                    )
+                self._buffer = buffer
+        return self._buffer
+
+    @property
+    def line_offsets(self) -> array:
+        """Byte offset of every line start, plus one past the end of the input."""
+        if self._offsets is None:
+            self._offsets = line_offsets(self.buffer)
+        return self._offsets
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines, counting the one after a final newline."""
+        return len(self.line_offsets) - 1
+
+    def section_view(self, section: Dict) -> memoryview:
+        """
+        Return a section's bytes as written to its file, without copying.
+
+        The view must be released before the source is closed.
+        """
+        offsets = self.line_offsets
+        buffer = self.buffer
+        start = offsets[section["start_line"]]
+        end = min(offsets[section["end_line"]], len(buffer))
+        start, end = strip_range(buffer, start, end)
+        return memoryview(buffer)[start:end]
+
+    def section_text(self, section: Dict) -> str:
+        """Return a section's text, as render_section does."""
+        with self.section_view(section) as view:
+            return str(view, "utf-8")
+
+    def close(self) -> None:
+        """Unmap the input."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._buffer = None
+        self._data = None
+
+
+class LineSource:
+    """Markdown input held as text and split into lines."""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.lines: List[str] = content.split("\n")
+        self._offsets = None
+
+    def decode(self) -> str:
+        """Return the document text."""
+        return self.content
+
+    def digest(self) -> str:
+        """Return the SHA-256 hex digest of the text."""
+        return hashlib.sha256(self.content.encode("utf-8")).hexdigest()
+
+    @property
+    def line_offsets(self) -> array:
+        """Byte offset of every line start, plus one past the end of the text."""
+        if self._offsets is None:
+            self._offsets = array("q", itertools.accumulate(
+                (len(line.encode("utf-8")) + 1 for line in self.lines), initial=0
+            ))
+        return self._offsets
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines, counting the one after a final newline."""
+        return len(self.lines)
+
+    def section_view(self, section: Dict) -> memoryview:
+        """Return a section's bytes as written to its file."""
+        return memoryview(self.section_text(section).encode("utf-8"))
+
+    def section_text(self, section: Dict) -> str:
+        """Return a section's text, as render_section does."""
+        return render_section(section, self.lines)
+
+    def close(self) -> None:
+        """Release the input."""
+
+
+def strip_range(buffer, start: int, end: int):
+    """
+    Narrow buffer[start:end] the way str.strip() narrows its text.
+
+    Args:
+        buffer: UTF-8 encoded bytes or a buffer over them
+        start: Offset of the range's first byte
+        end: Offset just past the range's last byte
+
+    Returns:
+        The (start, end) offsets without leading and trailing whitespace
+    """
+    while start < end:
+        byte = buffer[start]
+        if byte in _ASCII_WHITESPACE:
+            start += 1
+        elif byte < 0x80:
+            break
+        else:
+            # Leading byte of a multi-byte character: check the character
+            length = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+            if not str(buffer[start:start + length], "utf-8", "replace").isspace():
+                break
+            start += length
+    while end > start:
+        byte = buffer[end - 1]
+        if byte in _ASCII_WHITESPACE:
+            end -= 1
+        elif byte < 0x80:
+            break
+        else:
+            lead = end - 1
+            while lead > start and 0x80 <= buffer[lead] < 0xC0:
+                lead -= 1
+            if not str(buffer[lead:end], "utf-8", "replace").isspace():
+                break
+            end = lead
+    return start, end
@@ -0,0 +1,610 @@
+"""Constant-memory streaming splitter for very large markdown inputs.
+
+Instead of parsing the whole document with markdown-it, the streaming splitter
+reads the input line by line and recognises heading boundaries with a small
+block scanner that tracks fenced code, indented code and HTML blocks. Each
+section is written to disk while it is being read, so memory use is bounded by
+the longest paragraph rather than by the size of the input.
+
+The scanner follows CommonMark for ATX and setext headings, fences, HTML
+blocks and link reference definitions (which never become setext headings),
+and looks through blockquote and list markers for headings nested in those
+containers, expanding tabs in container prefixes by column. Lazy
+continuation lines that mix blockquotes and list items are only
+approximated, so in rare layouts a heading boundary can differ from the
+markdown-it based splitter.
+"""
+
+import hashlib
+import os
+import re
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from markdown_it.rules_block.html_block import HTML_SEQUENCES
+
+from mcpdoc_split.main import (
+    TOC_HEADER,
+    FilenameRegistry,
+    hashed_filename,
+    toc_line,
+)
+
+Heading = Tuple[int, str]
+
+_ATX_RE = re.compile(r"^(#{1,6})(?:[ \t]+(.*))?$")
+_ATX_CLOSE_RE = re.compile(r"(?:^|[ \t]+)#+$")
+_FENCE_RE = re.compile(r"^(`{3,}|~{3,})(.*)$")
+_SETEXT_RE = re.compile(r"^(=+|-+)[ \t]*$")
+_THEMATIC_BREAK_RE = re.compile(
+    r"^(?:(?:\*[ \t]*){3,}|(?:-[ \t]*){3,}|(?:_[ \t]*){3,})$"
+)
+_BLOCKQUOTE_RE = re.compile(r"^ {0,3}> ?")
+_LIST_ITEM_RE = re.compile(r"^ {0,3}(?:[-+*]|(\d{1,9})[.)])(?:[ \t]+|$)")
+# A container marker whose trailing tabs count by column (see _expand_prefix_tabs)
+_CONTAINER_MARKER_RE = re.compile(r"^(?:>|(?:[-+*]|\d{1,9}[.)])(?=[ \t]|$))")
+_LINK_LABEL = r"\[(?=[^\]]*\S)(?:[^\[\]\\]|\\.){1,999}\]:"
+_LINK_DESTINATION = r"(?:<(?:[^<>\\]|\\.)*>|[^\s<][^\s]*)"
+_LINK_TITLE = r"(?:\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*'|\((?:[^()\\]|\\.)*\))"
+# A link reference definition on one line, with an optional title
+_REFERENCE_RE = re.compile(
+    rf"^{_LINK_LABEL}[ \t]*{_LINK_DESTINATION}"
+    rf"(?P<title>[ \t]+{_LINK_TITLE})?[ \t]*$"
+)
+# A definition label whose destination is on the next line
+_REFERENCE_LABEL_RE = re.compile(rf"^{_LINK_LABEL}[ \t]*$")
+_REFERENCE_DESTINATION_RE = re.compile(
+    rf"^[ \t]*{_LINK_DESTINATION}(?P<title>[ \t]+{_LINK_TITLE})?[ \t]*$"
+)
+_REFERENCE_TITLE_RE = re.compile(rf"^[ \t]*{_LINK_TITLE}[ \t]*$")
+
+
+def _split_indent(line: str) -> Tuple[int, str]:
+    """Return the column width of the leading whitespace and the rest of the line."""
+    width = 0
+    for pos, char in enumerate(line):
+        if char == " ":
+            width += 1
+        elif char == "\t":
+            width += 4 - width % 4
+        else:
+            return width, line[pos:]
+    return width, ""
+
+
+def _expand_prefix_tabs(line: str) -> str:
+    """
+    Expand the tabs in the indentation and container markers of a line.
+
+    Tab stops are every four columns from the start of the line, so a tab after
+    a blockquote or list marker may count as less than four spaces of content
+    indentation. Tabs in the line's content are left as they are.
+    """
+    expanded = ""
+    while True:
+        rest = line.lstrip(" \t")
+        for char in line[: len(line) - len(rest)]:
+            if char == "\t":
+                expanded += " " * (4 - len(expanded) % 4)
+            else:
+                expanded += " "
+        match = _CONTAINER_MARKER_RE.match(rest)
+        if not match:
+            return expanded + rest
+        expanded += match.group()
+        line = rest[match.end():]
+
+
+def _strip_containers(line: str) -> Tuple[str, Optional[re.Match], int]:
+    """
+    Strip blockquote and list item markers from the start of a line.
+
+    Returns the remaining body, the innermost marker match and the number of
+    blockquote markers the line carried.
+    """
+    marker = None
+    quoted = 0
+    while True:
+        match = _BLOCKQUOTE_RE.match(line)
+        if match:
+            quoted += 1
+        else:
+            match = _LIST_ITEM_RE.match(line)
+        if not match:
+            return line, marker, quoted
+        marker = match
+        line = line[match.end():]
+
+
+def _list_items(line: str) -> List[Tuple[re.Match, int, int]]:
+    """
+    Find the list item markers among the container markers of a line.
+
+    Returns one (marker match, offset just past it, blockquote markers before
+    it) tuple per item, outermost first, so items nested in or around a
+    blockquote (``- > - item``) are all recognised.
+    """
+    items = []
+    offset = 0
+    quoted = 0
+    while True:
+        match = _BLOCKQUOTE_RE.match(line[offset:])
+        if match:
+            quoted += 1
+        else:
+            match = _LIST_ITEM_RE.match(line[offset:])
+            if not match:
+                return items
+            items.append((match, offset + match.end(), quoted))
+        offset += match.end()
+
+
+def _quote_depth(line: str) -> int:
+    """Count the blockquote markers at the very start of a line."""
+    depth = 0
+    match = _BLOCKQUOTE_RE.match(line)
+    while match:
+        depth += 1
+        line = line[match.end():]
+        match = _BLOCKQUOTE_RE.match(line)
+    return depth
+
+
+def _outside_item(item: Tuple[int, int], indent: int, quote_depth: int) -> bool:
+    """Check whether a line is outside a list item, by column or blockquote."""
+    column, depth = item
+    return indent < column or quote_depth < depth
+
+
+def _atx_heading(body: str) -> Optional[Heading]:
+    """Parse an ATX heading from an unindented line body."""
+    match = _ATX_RE.match(body)
+    if not match:
+        return None
+    text = _ATX_CLOSE_RE.sub("", (match.group(2) or "").strip()).strip()
+    return len(match.group(1)), text
+
+
+def _can_interrupt_paragraph(marker: re.Match, body: str) -> bool:
+    """Check whether a container marker line ends an open paragraph."""
+    if marker.re is _BLOCKQUOTE_RE:
+        return True
+    number = marker.group(1)
+    return bool(body.strip()) and (number is None or int(number) == 1)
+
+
+def _interrupts_paragraph(line: str) -> bool:
+    """Check whether a line outside the current list item ends an open paragraph."""
+    indent, rest = _split_indent(line)
+    if indent >= 4:
+        return False
+    if _THEMATIC_BREAK_RE.match(rest) or _BLOCKQUOTE_RE.match(rest):
+        return True
+    # Any list marker here starts a sibling or outer item, even an empty one
+    if _strip_containers(rest)[1] is not None:
+        return True
+    if _atx_heading(rest) is not None or _FENCE_RE.match(rest):
+        return True
+    return any(
+        start_re.search(rest) and interrupts
+        for start_re, _, interrupts in HTML_SEQUENCES
+    )
+
+
+def scan_lines(lines: Iterable[str]) -> Iterator[Tuple[str, Optional[Heading]]]:
+    """
+    Classify markdown lines, marking the ones that start a heading.
+
+    Lines are yielded in input order. Paragraph lines are held back until it is
+    known whether a setext underline turns them into a heading, so only the
+    current paragraph is ever buffered.
+
+    Args:
+        lines: Markdown lines without trailing newlines
+
+    Yields:
+        Tuples of (line, heading) where heading is (level, text) for the first
+        line of a heading and None otherwise
+    """
+    paragraph: List[str] = []
+    # Paragraph lines without their container markers, for setext headings
+    paragraph_text: List[str] = []
+    # Nesting of the open paragraph: (list depth, blockquote depth)
+    paragraph_context = (0, 0)
+    # Content column and blockquote depth of the open list items, innermost last
+    list_stack: List[Tuple[int, int]] = []
+    # Whether the innermost list item has only had its marker line so far
+    empty_item = False
+    # Context of a definition whose title may follow on the next line
+    reference_context: Optional[Tuple[int, int]] = None
+    # Context of a paragraph that may still turn out to be a definition label
+    label_context: Optional[Tuple[int, int]] = None
+    fence: Optional[Tuple[str, int]] = None
+    html_end: Optional[re.Pattern] = None
+    # Container of the open fence or HTML block: (quoted, content column)
+    block_container = (False, 0)
+
+    def flush() -> Iterator[Tuple[str, Optional[Heading]]]:
+        for pending in paragraph:
+            yield pending, None
+        paragraph.clear()
+        paragraph_text.clear()
+
+    for line in lines:
+        normalized = _expand_prefix_tabs(line)
+        indent, rest = _split_indent(normalized)
+
+        if fence is not None or html_end is not None:
+            container_quoted, container_column = block_container
+            quoted = bool(_BLOCKQUOTE_RE.match(normalized))
+            if (container_quoted and not quoted) or (
+                not container_quoted and rest and indent < container_column
+            ):
+                # The enclosing blockquote or list item ended, closing the block
+                fence = None
+                html_end = None
+            elif container_quoted:
+                inner_indent, inner = _split_indent(_strip_containers(normalized)[0])
+            else:
+                inner_indent, inner = _split_indent(normalized[container_column:])
+
+        if fence is not None:
+            match = _FENCE_RE.match(inner) if inner_indent < 4 else None
+            if (
+                match
+                and match.group(1)[0] == fence[0]
+                and len(match.group(1)) >= fence[1]
+                and not match.group(2).strip()
+            ):
+                fence = None
+            yield line, None
+            continue
+
+        if html_end is not None:
+            if html_end.search(inner):
+                html_end = None
+            yield line, None
+            continue
+
+        if not rest:
+            reference_context = label_context = None
+            if empty_item:
+                # An item can start with at most one blank line
+                list_stack.pop()
+                empty_item = False
+            yield from flush()
+            yield line, None
+            continue
+        pending_title, reference_context = reference_context, None
+        pending_label, label_context = label_context, None
+        empty_item = False
+
+        quote_depth = _quote_depth(normalized)
+        outside = bool(list_stack) and _outside_item(
+            list_stack[-1], indent, quote_depth
+        )
+        # The line relative to the innermost list item that still contains it
+        enclosed = normalized[
+            next(
+                (
+                    item[0]
+                    for item in reversed(list_stack)
+                    if not _outside_item(item, indent, quote_depth)
+                ),
+                0,
+            ):
+        ]
+        if paragraph and outside:
+            if not _interrupts_paragraph(enclosed):
+                # Lazy continuation line, the list item stays open
+                paragraph.append(line)
+                paragraph_text.append(line)
+                continue
+        if (
+            pending_title is not None
+            and outside
+            and not _interrupts_paragraph(enclosed)
+            and _REFERENCE_TITLE_RE.match(rest)
+        ):
+            # Lazy title of a definition in the list item
+            yield line, None
+            continue
+        while list_stack and _outside_item(list_stack[-1], indent, quote_depth):
+            list_stack.pop()
+        base = list_stack[-1][0] if list_stack else 0
+        local = normalized[base:]
+        local_indent, local_rest = _split_indent(local)
+
+        if local_indent >= 4 and not paragraph:
+            # Indented code block
+            yield line, None
+            continue
+
+        body, _, quoted = _strip_containers(local)
+        body_indent, body_rest = _split_indent(body)
+        items = _list_items(local)
+        item = items[-1] if items else None
+        is_list_item = item is not None
+        # The list item's own content, which may start with a blockquote marker
+        item_body = local[item[1]:] if item else body
+        context = (len(list_stack), quoted)
+
+        if (
+            pending_label == context
+            and len(paragraph) == 1
+            and not is_list_item
+            and not _interrupts_paragraph(body_rest)
+        ):
+            match = _REFERENCE_DESTINATION_RE.match(body_rest)
+            if match:
+                # The label and this line are a definition, not a paragraph
+                yield from flush()
+                if not match.group("title"):
+                    reference_context = context
+                yield line, None
+                continue
+
+        can_underline = not is_list_item
+        underline = body_rest
+        if is_list_item and not _can_interrupt_paragraph(item[0], item_body):
+            # A bare "-" can't start an item here, so it underlines the paragraph
+            can_underline = True
+            underline = _split_indent(item[0].string)[1]
+        if paragraph and can_underline and paragraph_context == context:
+            match = _SETEXT_RE.match(underline) if body_indent < 4 else None
+            if match:
+                header = "\n".join(paragraph_text).strip()
+                level = 1 if match.group(1)[0] == "=" else 2
+                first, *others = paragraph
+                paragraph.clear()
+                paragraph_text.clear()
+                yield first, (level, header)
+                for pending in others:
+                    yield pending, None
+                yield line, None
+                continue
+
+        if local_indent < 4 and _THEMATIC_BREAK_RE.match(local_rest):
+            yield from flush()
+            yield line, None
+            continue
+
+        starts_item = is_list_item and (
+            not paragraph
+            or _can_interrupt_paragraph(item[0], item_body)
+            # Outside the container of the paragraph, any item ends it
+            or paragraph_context != context
+        )
+        if starts_item or (paragraph and quoted > paragraph_context[1]):
+            # A new list item or blockquote interrupts the open paragraph
+            yield from flush()
+        if starts_item:
+            for _, end, outer_quoted in items[:-1]:
+                list_stack.append((base + end, quote_depth + outer_quoted))
+            if item_body:
+                width = item[1]
+            else:
+                # An item starting with a blank line: one space past the marker
+                width = len(local.rstrip()) + 1
+            list_stack.append((base + width, quote_depth + item[2]))
+            empty_item = not item_body
+            context = (len(list_stack), quoted)
+
+        if not body_rest and (starts_item or quoted):
+            # A bare blockquote or list marker is a blank line in its container
+            yield from flush()
+            yield line, None
+            continue
+
+        if body_indent >= 4:
+            if paragraph:
+                paragraph.append(line)
+                paragraph_text.append(local if base else line)
+            else:
+                yield line, None
+            continue
+
+        heading = _atx_heading(body_rest)
+        if heading is not None:
+            yield from flush()
+            yield line, heading
+            continue
+
+        container = (quoted, base + len(local) - len(body) if is_list_item else base)
+
+        fence_match = _FENCE_RE.match(body_rest)
+        if fence_match and not (
+            fence_match.group(1)[0] == "`" and "`" in fence_match.group(2)
+        ):
+            yield from flush()
+            fence = (fence_match.group(1)[0], len(fence_match.group(1)))
+            block_container = container
+            yield line, None
+            continue
+
+        for start_re, end_re, interrupts in HTML_SEQUENCES:
+            if start_re.search(body_rest) and (interrupts or not paragraph):
+                yield from flush()
+                if not end_re.search(body_rest):
+                    html_end = end_re
+                    block_container = container
+                yield line, None
+                break
+        else:
+            if not paragraph:
+                match = _REFERENCE_RE.match(body_rest)
+                if match:
+                    # Definitions aren't paragraph text, so no setext heading
+                    if not match.group("title"):
+                        reference_context = context
+                    yield line, None
+                    continue
+                lazy = (
+                    pending_title is not None
+                    and pending_title[0] == context[0]
+                    and pending_title[1] > quoted
+                )
+                if (pending_title == context or lazy) and _REFERENCE_TITLE_RE.match(
+                    body_rest
+                ):
+                    yield line, None
+                    continue
+                if _REFERENCE_LABEL_RE.match(body_rest):
+                    label_context = context
+            if not paragraph:
+                paragraph_context = context
+            paragraph.append(line)
+            if starts_item or quoted:
+                paragraph_text.append(body)
+            else:
+                paragraph_text.append(local if base else line)
+
+    yield from flush()
+
+
+class _SectionWriter:
+    """Write a section line by line with the same trimming as the batch splitter."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.handle: IO[str] = open(path, "w", encoding="utf-8", newline="")
+        self.digest = hashlib.sha256()
+        self.bytes_written = 0
+        self.started = False
+        self.pending: Optional[str] = None
+        self.blanks: List[str] = []
+
+    def add(self, line: str) -> None:
+        if not line.strip():
+            if self.started:
+                self.blanks.append(line)
+            return
+
+        if not self.started:
+            line = line.lstrip()
+            self.started = True
+        if self.pending is not None:
+            self._write(self.pending + "\n")
+        for blank in self.blanks:
+            self._write(blank + "\n")
+        self.blanks.clear()
+        self.pending = line
+
+    def close(self) -> None:
+        if self.pending is not None:
+            self._write(self.pending.rstrip())
+            self.pending = None
+        self.handle.close()
+
+    def _write(self, text: str) -> None:
+        self.handle.write(text)
+        data = text.encode("utf-8")
+        self.digest.update(data)
+        self.bytes_written += len(data)
+
+
+def _read_lines(handle: IO[str]) -> Iterator[str]:
+    """Yield lines from a text file without their trailing newline."""
+    line = ""
+    for line in handle:
+        yield line[:-1] if line.endswith("\n") else line
+    if line.endswith("\n") or not line:
+        yield ""
+
+
+def stream_docs(
+    input_file: str,
+    output_dir: str,
+    url_prefix: str,
+    base_path: str,
+    max_level: int,
+    toc_file: str,
+    content_hash: bool = False,
+) -> Dict:
+    """
+    Split a markdown file without loading it into memory.
+
+    Produces the same section files and TOC as the markdown-it based splitter
+    for ordinary documents, writing each section as soon as its lines are read.
+    Heading boundaries may differ for rare lazy continuation lines that mix
+    blockquotes and list items (see the module docstring).
+
+    Args:
+        input_file: Path to the markdown file to split
+        output_dir: Directory to save the split files
+        url_prefix: URL prefix for absolute links
+        base_path: Base path for docs
+        max_level: Maximum header level to split at
+        toc_file: Path to the TOC file to generate
+        content_hash: Embed a short content digest in each filename; sections
+            are renamed to their final name once they're complete
+
+    Returns:
+        Statistics with the number of sections, bytes written, the largest
+        section and the (filename, SHA-256 hex digest, size) of every file
+
+    Raises:
+        ValueError: If the input is not valid UTF-8
+    """
+    stats = {
+        "sections": 0,
+        "bytes_written": 0,
+        "largest_section": None,
+        "largest_section_bytes": 0,
+        "files": [],
+    }
+    writer: Optional[_SectionWriter] = None
+    section: Dict = {}
+    registry = FilenameRegistry()
+
+    def close_writer() -> None:
+        writer.close()
+        if content_hash:
+            filename = hashed_filename(section["filename"], writer.digest.hexdigest())
+            os.replace(writer.path, os.path.join(output_dir, filename))
+            section["filename"] = filename
+        # The TOC entry is written once the final filename is known
+        entry = toc_line(section, url_prefix, base_path)
+        toc_handle.write(entry)
+        stats["bytes_written"] += len(entry.encode("utf-8")) + writer.bytes_written
+        stats["files"].append(
+            (section["filename"], writer.digest.hexdigest(), writer.bytes_written)
+        )
+        if (
+            stats["largest_section"] is None
+            or writer.bytes_written > stats["largest_section_bytes"]
+        ):
+            stats["largest_section"] = section["filename"]
+            stats["largest_section_bytes"] = writer.bytes_written
+
+    try:
+        with open(input_file, "r", encoding="utf-8") as source, open(
+            toc_file, "w", encoding="utf-8", newline=""
+        ) as toc_handle:
+            toc_handle.write(TOC_HEADER)
+            stats["bytes_written"] += len(TOC_HEADER)
+            for line, heading in scan_lines(_read_lines(source)):
+                if heading is not None and heading[0] <= max_level and heading[1]:
+                    if writer is not None:
+                        close_writer()
+                    level, header_text = heading
+                    section = {
+                        "filename": registry.assign(header_text),
+                        "header": header_text,
+                        "level": level,
+                    }
+                    writer = _SectionWriter(
+                        os.path.join(output_dir, section["filename"])
+                    )
+                    stats["sections"] += 1
+                if writer is not None:
+                    writer.add(line)
+            if writer is not None:
+                close_writer()
+                writer = None
+    except UnicodeDecodeError as e:
+        raise ValueError(f"Unable to read file {input_file}: {e}")
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return stats
@@ -0,0 +1,281 @@
+"""Multi-target generation: several outputs from one parse of the input.
+
+A publishing step often splits the same source several times, with a full
+depth and a shallow ``max_level``, or with TOCs for several URL prefixes.
+Generating them as targets of one run reads and parses the input once: the
+section table is built at the deepest level any target needs, and the
+tables of shallower targets are derived from it, since they only drop the
+deeper headings.
+
+Targets with the same ``max_level`` produce the same section files. When
+they share an output directory the files are written once; otherwise every
+file identical to one already written for another target is hard-linked to
+it, falling back to a copy where links aren't supported. Files that are
+rewritten later (by incremental or watch runs) get their links broken first.
+"""
+
+import hashlib
+import os
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from mcpdoc_split.backends import FilesystemBackend
+from mcpdoc_split.incremental import sync_sections
+from mcpdoc_split.main import (
+    FilenameRegistry,
+    GenerationResult,
+    build_toc,
+    close_sections,
+    hashed_filename,
+    print_summary,
+    section_table,
+    timed,
+    write_section_data,
+    write_toc,
+)
+
+if TYPE_CHECKING:
+    from mcpdoc_split.parse_cache import SectionCache
+
+# Settings a target may override, defaulting to the run's own
+TARGET_OPTIONS = ("output_dir", "toc_file", "url_prefix", "base_path", "max_level")
+
+
+def resolve_targets(targets: List[Dict], **defaults) -> List[Dict]:
+    """
+    Fill in the settings every target leaves out and check for collisions.
+
+    Args:
+        targets: Target dictionaries with any of TARGET_OPTIONS
+        **defaults: Value of every TARGET_OPTIONS setting for targets that
+            don't set it
+
+    Returns:
+        Target dictionaries with all of TARGET_OPTIONS
+
+    Raises:
+        ValueError: If a target has an unknown or invalid setting, two targets
+            write the same TOC file, or two targets share an output directory
+            with different max_level values
+    """
+    if not targets:
+        raise ValueError("at least one target is required")
+
+    resolved = []
+    toc_files: Dict[str, int] = {}
+    levels: Dict[str, int] = {}
+    for number, target in enumerate(targets, 1):
+        if not isinstance(target, dict):
+            raise ValueError(f"target {number} must be a dictionary")
+        unknown = sorted(set(target) - set(TARGET_OPTIONS))
+        if unknown:
+            raise ValueError(
+                f"target {number} has unknown settings: {', '.join(unknown)}"
+            )
+        target = {**defaults, **target}
+        if not 1 <= target["max_level"] <= 6:
+            raise ValueError(f"target {number}: max_level must be between 1 and 6")
+
+        toc_file = os.path.abspath(target["toc_file"])
+        if toc_file in toc_files:
+            raise ValueError(
+                f"targets {toc_files[toc_file]} and {number} both write to "
+                f"{target['toc_file']}"
+            )
+        toc_files[toc_file] = number
+
+        output_dir = os.path.abspath(target["output_dir"])
+        if levels.setdefault(output_dir, target["max_level"]) != target["max_level"]:
+            raise ValueError(
+                f"targets sharing {target['output_dir']} need the same max_level"
+            )
+        resolved.append(target)
+    return resolved
+
+
+def derive_sections(
+    sections: List[Dict], max_level: int, total_lines: int
+) -> List[Dict]:
+    """
+    Derive the section table of a shallower split from a deeper one.
+
+    Args:
+        sections: Section table split at a max_level of at least max_level
+        max_level: Maximum header level of the derived table
+        total_lines: Number of lines in the document
+
+    Returns:
+        The table collect_sections returns for max_level
+    """
+    registry = FilenameRegistry()
+    section_starts = [
+        {
+            "line": section["start_line"],
+            "header": section["header"],
+            "level": section["level"],
+            "filename": registry.assign(section["header"]),
+        }
+        for section in sections
+        if section["level"] <= max_level
+    ]
+    return close_sections(section_starts, total_lines)
+
+
+def generate_targets(
+    input_file: str,
+    targets: List[Dict],
+    parse_mode: str = "block",
+    incremental: bool = False,
+    content_hash: bool = False,
+    parse_workers: Optional[int] = None,
+    parse_cache: Optional[str] = None,
+    parse_cache_size: Optional[int] = None,
+    section_cache: Optional["SectionCache"] = None,
+) -> GenerationResult:
+    """
+    Generate several targets from one parse of a markdown file.
+
+    Args:
+        input_file: Path to the markdown file to split
+        targets: Targets as returned by resolve_targets
+        parse_mode: One of PARSE_MODES
+        incremental: Only write, rename or delete changed section files
+        content_hash: Embed a short content digest in every section filename
+        parse_workers: Number of worker processes parsing the input in chunks
+        parse_cache: Directory of the persistent parse cache
+        parse_cache_size: Size limit of the parse cache in bytes
+        section_cache: In-memory SectionCache checked before parse_cache
+
+    Returns:
+        GenerationResult with counters summed over the targets and one
+        summary per target in ``targets``
+    """
+    from mcpdoc_split.source import open_source
+
+    result = GenerationResult(
+        input_file=input_file,
+        output_dir=targets[0]["output_dir"],
+        toc_file=targets[0]["toc_file"],
+    )
+    timings = result.timings
+    started = time.perf_counter()
+
+    backend = FilesystemBackend()
+    with timed(timings, "prepare"):
+        for output_dir in dict.fromkeys(target["output_dir"] for target in targets):
+            backend.prepare(output_dir, clean=not incremental)
+
+    result.bytes_read = os.path.getsize(input_file)
+
+    with timed(timings, "read"):
+        source = open_source(input_file)
+    try:
+        deepest = max(target["max_level"] for target in targets)
+        sections = section_table(
+            source, result, deepest, parse_mode, parse_workers,
+            parse_cache=parse_cache, parse_cache_size=parse_cache_size,
+            section_cache=section_cache,
+        )
+
+        tables: Dict[int, List[Dict]] = {deepest: sections}
+        digests: Dict[Tuple[int, int], str] = {}
+        with timed(timings, "boundaries"):
+            for target in targets:
+                level = target["max_level"]
+                if level not in tables:
+                    tables[level] = derive_sections(
+                        sections, level, source.line_count
+                    )
+        if content_hash:
+            with timed(timings, "content_hash"):
+                for table in tables.values():
+                    for section in table:
+                        span = (section["start_line"], section["end_line"])
+                        if span not in digests:
+                            with source.section_view(section) as data:
+                                digests[span] = hashlib.sha256(data).hexdigest()
+                        section["filename"] = hashed_filename(
+                            section["filename"], digests[span]
+                        )
+
+        # Section file written for a (filename, start, end), by output path
+        written: Dict[Tuple[str, int, int], str] = {}
+        done_dirs = set()
+        for target in targets:
+            table = tables[target["max_level"]]
+            summary = {
+                **target,
+                "sections": len(table),
+                "bytes_written": 0,
+                "linked": 0,
+            }
+            with timed(timings, "toc_write"):
+                toc = build_toc(table, target["url_prefix"], target["base_path"])
+                summary["bytes_written"] += write_toc(
+                    target["toc_file"], toc, incremental, backend
+                )
+
+            output_dir = os.path.abspath(target["output_dir"])
+            if output_dir not in done_dirs:
+                done_dirs.add(output_dir)
+                with timed(timings, "section_writes"):
+                    if incremental:
+                        rendered = [
+                            (section, source.section_text(section))
+                            for section in table
+                        ]
+                        for section, content in rendered:
+                            result.track_section(section["filename"], content)
+                        stats = sync_sections(rendered, target["output_dir"])
+                        summary["bytes_written"] += stats["bytes_written"]
+                    else:
+                        for section in table:
+                            size, linked = _write_shared(
+                                source, section, target["output_dir"], written,
+                                result, backend,
+                            )
+                            summary["bytes_written"] += size
+                            summary["linked"] += linked
+
+            result.sections += summary["sections"]
+            result.bytes_written += summary["bytes_written"]
+            result.targets.append(summary)
+    finally:
+        source.close()
+
+    timings["total"] = time.perf_counter() - started
+    for summary in result.targets:
+        print_summary(
+            summary["output_dir"], summary["toc_file"], summary["sections"],
+            summary["max_level"],
+        )
+    return result
+
+
+def _write_shared(
+    source,
+    section: Dict,
+    output_dir: str,
+    written: Dict[Tuple[str, int, int], str],
+    result: GenerationResult,
+    backend: FilesystemBackend,
+) -> Tuple[int, bool]:
+    """
+    Write a section file, or link it to an identical one already written.
+
+    Returns:
+        Bytes written and whether the file was linked instead
+    """
+    key = (section["filename"], section["start_line"], section["end_line"])
+    path = os.path.join(output_dir, section["filename"])
+    if key in written:
+        try:
+            os.link(written[key], path)
+            return 0, True
+        except OSError:
+            pass
+    with source.section_view(section) as data:
+        result.track_size(section["filename"], len(data))
+        size = write_section_data(section, data, output_dir, backend)
+    written[key] = path
+    return size, False
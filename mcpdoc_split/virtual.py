@@ -0,0 +1,265 @@
+"""Virtual split: a byte-offset index into the source instead of section files.
+
+Writing one file per section is dominated by filesystem metadata on sources
+with tens of thousands of sections. A virtual split writes only the TOC and
+a compact JSON index recording, for every section, its slug, header, level
+and byte range in the source. VirtualDocs maps the source into memory and
+returns any section as a zero-copy slice of it.
+
+Byte ranges cover the section's lines in the source as they are, with the
+surrounding whitespace trimmed; line endings are not normalized.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from mcpdoc_split.incremental import write_if_changed
+from mcpdoc_split.main import (
+    PARSE_MODES,
+    GenerationResult,
+    build_toc,
+    get_parser,
+    sections_from_tokens,
+    timed,
+)
+from mcpdoc_split.source import line_offsets, strip_range
+
+VIRTUAL_INDEX_VERSION = 1
+
+
+def build_virtual_index(
+    data: bytes, source: str, max_level: int = 6, parse_mode: str = "block"
+) -> Tuple[Dict, List[Dict]]:
+    """
+    Build the virtual index of a markdown source.
+
+    Args:
+        data: Content of the source
+        source: Path of the source recorded in the index
+        max_level: Maximum header level to split at
+        parse_mode: One of PARSE_MODES
+
+    Returns:
+        The JSON-serializable index, with the source size and SHA-256 digest
+        and the sections as [slug, header, level, byte_start, byte_end] rows,
+        and the section table as returned by collect_sections
+
+    Raises:
+        ValueError: If the source is not valid UTF-8
+    """
+    try:
+        content = data.decode("utf-8")
+    except UnicodeDecodeError as e:
+        raise ValueError(f"Unable to read file {source}: {e}")
+
+    tokens = get_parser(parse_mode).parse(content)
+    offsets = line_offsets(data)
+    sections = sections_from_tokens(tokens, max_level, len(offsets) - 1)
+    del tokens
+
+    rows = []
+    for section in sections:
+        start = offsets[section["start_line"]]
+        end = min(offsets[section["end_line"]], len(data))
+        # Trimmed like the text of a section file
+        start, end = strip_range(data, start, end)
+        rows.append([
+            section["filename"][: -len(".md")],
+            section["header"],
+            section["level"],
+            start,
+            end,
+        ])
+
+    index = {
+        "version": VIRTUAL_INDEX_VERSION,
+        "source": source,
+        "size": len(data),
+        "digest": f"sha256:{hashlib.sha256(data).hexdigest()}",
+        "sections": rows,
+    }
+    return index, sections
+
+
+def dump_virtual_index(index: Dict) -> str:
+    """Serialize a virtual index as compact JSON."""
+    return json.dumps(index, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_virtual_index(
+    input_file: str,
+    index_file: str,
+    url_prefix: str = "https://example.com",
+    base_path: str = "/docs",
+    max_level: int = 6,
+    toc_file: Optional[str] = "llms.txt",
+    parse_mode: str = "block",
+) -> GenerationResult:
+    """
+    Split a markdown file virtually: write the TOC and the index, no sections.
+
+    The index records the source path relative to the index file, so both
+    can be moved together.
+
+    Args:
+        input_file: Path to the markdown file
+        index_file: Path of the virtual index to write
+        url_prefix: URL prefix for absolute links in the TOC
+        base_path: Base path for docs in the TOC
+        max_level: Maximum header level to split at
+        toc_file: Path to the TOC file to generate (None: no TOC)
+        parse_mode: One of PARSE_MODES
+
+    Returns:
+        GenerationResult with per-phase timings and counters
+
+    Raises:
+        FileNotFoundError: If the input file doesn't exist
+        ValueError: If an option is invalid or the input is not valid UTF-8
+    """
+    if not os.path.exists(input_file):
+        raise FileNotFoundError(f"Input file not found: {input_file}")
+    if max_level < 1 or max_level > 6:
+        raise ValueError("max_level must be between 1 and 6")
+    if parse_mode not in PARSE_MODES:
+        raise ValueError(f"parse_mode must be one of: {', '.join(PARSE_MODES)}")
+
+    result = GenerationResult(
+        input_file=input_file, output_dir="", toc_file=toc_file or ""
+    )
+    timings = result.timings
+    started = time.perf_counter()
+
+    with timed(timings, "read"):
+        with open(input_file, "rb") as f:
+            data = f.read()
+    result.bytes_read = len(data)
+
+    with timed(timings, "parse"):
+        source = os.path.relpath(
+            os.path.abspath(input_file), os.path.dirname(os.path.abspath(index_file))
+        )
+        index, sections = build_virtual_index(data, source, max_level, parse_mode)
+    if index["sections"]:
+        largest = max(index["sections"], key=lambda row: row[4] - row[3])
+        result.largest_section = f"{largest[0]}.md"
+        result.largest_section_bytes = largest[4] - largest[3]
+
+    for path, text, phase in (
+        (index_file, dump_virtual_index(index), "index_write"),
+        (toc_file, build_toc(sections, url_prefix, base_path), "toc_write"),
+    ):
+        if not path:
+            continue
+        with timed(timings, phase):
+            parent_dir = os.path.dirname(path)
+            if parent_dir:
+                os.makedirs(parent_dir, exist_ok=True)
+            if write_if_changed(path, text):
+                result.bytes_written += len(text.encode("utf-8"))
+
+    result.sections = len(sections)
+    timings["total"] = time.perf_counter() - started
+    print(f"Virtual index saved to: {index_file}")
+    if toc_file:
+        print(f"TOC saved to: {toc_file}")
+    print(f"Indexed {result.sections} sections (filtered by max_level={max_level})")
+    return result
+
+
+class VirtualDocs:
+    """
+    Section lookup by slug over a memory-mapped source.
+
+    Slices returned by section_bytes share memory with the map and must be
+    released before close is called.
+    """
+
+    def __init__(self, index_file: str, source: Optional[str] = None):
+        """
+        Open a virtual index and map its source.
+
+        Args:
+            index_file: Path of the virtual index
+            source: Path of the source (default: the one recorded in the
+                index, relative to the index file)
+
+        Raises:
+            ValueError: If the index is invalid or the source changed size
+                since the index was built
+        """
+        with open(index_file, "r", encoding="utf-8") as f:
+            try:
+                index = json.load(f)
+            except ValueError as e:
+                raise ValueError(f"Invalid virtual index {index_file}: {e}")
+        if (
+            not isinstance(index, dict)
+            or index.get("version") != VIRTUAL_INDEX_VERSION
+        ):
+            raise ValueError(f"Unsupported virtual index: {index_file}")
+
+        if source is None:
+            source = os.path.join(
+                os.path.dirname(os.path.abspath(index_file)), index["source"]
+            )
+        self.index = index
+        self.source = source
+        self._rows = {row[0]: row for row in index["sections"]}
+        with open(source, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size != index["size"]:
+                raise ValueError(
+                    f"{source} changed since {index_file} was built; rebuild it"
+                )
+            self._map = None
+            if size:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def slugs(self) -> List[str]:
+        """Return the section slugs in document order."""
+        return [row[0] for row in self.index["sections"]]
+
+    def entry(self, slug: str) -> Dict:
+        """
+        Return the index entry of a section.
+
+        Raises:
+            KeyError: If there is no section with that slug
+        """
+        slug, header, level, start, end = self._rows[slug]
+        return {
+            "slug": slug,
+            "header": header,
+            "level": level,
+            "byte_start": start,
+            "byte_end": end,
+        }
+
+    def section_bytes(self, slug: str) -> memoryview:
+        """Return a section's bytes as a zero-copy view of the source."""
+        _, _, _, start, end = self._rows[slug]
+        if self._map is None:
+            return memoryview(b"")
+        return memoryview(self._map)[start:end]
+
+    def section_text(self, slug: str) -> str:
+        """Return a section's text."""
+        with self.section_bytes(slug) as view:
+            return str(view, "utf-8")
+
+    def close(self) -> None:
+        """Unmap the source."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self) -> "VirtualDocs":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,482 @@
+"""Watch mode: re-split the input whenever it changes.
+
+The live splitter keeps the previous generation in memory: the input lines,
+the start line of every top-level block and the section table with content
+digests. When the input changes it only re-parses the changed region:
+
+* parsing restarts at a top-level block start before the change, so the
+  block structure up to that point is unaffected by the edit;
+* it ends at the first top-level block start after the change that still
+  starts a top-level block in the new text. From there on the parser is in
+  the same clean state as before, so the rest of the previous parse is
+  reused with shifted line numbers. If no such point is found, the whole
+  input is parsed again.
+
+Only sections whose content or filename changed are rendered and written;
+the TOC and the incremental manifest are rewritten only when they differ, so
+the output directory stays usable by ``--incremental`` runs.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, List, Optional, Tuple
+
+from mcpdoc_split.incremental import (
+    load_manifest,
+    save_manifest,
+    scan_existing,
+    write_if_changed,
+)
+from mcpdoc_split.main import (
+    FilenameRegistry,
+    build_toc,
+    content_digest,
+    extract_heading_text,
+    generate_filename,
+    get_parser,
+    read_markdown,
+    render_section,
+)
+
+# Seconds without further changes before regenerating
+DEFAULT_DEBOUNCE = 0.05
+
+# Polling interval of the fallback watcher, in seconds
+POLL_INTERVAL = 0.05
+
+# Characters compared at once when looking for the changed region
+_BLOCK = 1 << 16
+
+# Resynchronisation attempts before falling back to a full parse
+MAX_RESYNC_ATTEMPTS = 8
+
+
+class LiveSplitter:
+    """Keep a split output in sync with an input file, re-parsing only edits."""
+
+    def __init__(
+        self,
+        input_file: str,
+        output_dir: str = "docs",
+        url_prefix: str = "https://example.com",
+        base_path: str = "/docs",
+        max_level: int = 6,
+        toc_file: str = "llms.txt",
+        parse_mode: str = "block",
+    ):
+        self.input_file = input_file
+        self.output_dir = output_dir
+        self.url_prefix = url_prefix
+        self.base_path = base_path
+        self.max_level = max_level
+        self.toc_file = toc_file
+        self.parser = get_parser(parse_mode)
+        self.text = ""
+        self.lines: List[str] = []
+        self.block_starts: List[int] = []
+        self.headings: List[Dict] = []
+        self.sections: List[Dict] = []
+
+    def build(self) -> Dict:
+        """
+        Parse the whole input and bring the output directory in line with it.
+
+        Returns:
+            Update statistics, as returned by update
+        """
+        started = time.perf_counter()
+        text = read_markdown(self.input_file)
+        lines = text.split("\n")
+        block_starts, headings = self._scan(lines, 0, len(lines))
+        os.makedirs(self.output_dir, exist_ok=True)
+        toc_dir = os.path.dirname(self.toc_file)
+        if toc_dir:
+            os.makedirs(toc_dir, exist_ok=True)
+        previous = load_manifest(self.output_dir)
+        if previous is None:
+            previous = scan_existing(self.output_dir)
+        old_files = {name: entry["digest"] for name, entry in previous.items()}
+        stats = self._commit(text, lines, block_starts, headings, None, old_files)
+        stats["parsed_lines"] = len(lines)
+        stats["seconds"] = time.perf_counter() - started
+        return stats
+
+    def update(self) -> Dict:
+        """
+        Re-read the input and apply the changes since the last build or update.
+
+        Returns:
+            Statistics: sections, written, deleted, parsed_lines (lines given
+            to the parser) and seconds
+
+        Raises:
+            ValueError: If the input is not valid UTF-8
+        """
+        if not self.lines:
+            return self.build()
+
+        started = time.perf_counter()
+        text = read_markdown(self.input_file)
+        old = self.lines
+        if text == self.text:
+            return {
+                "sections": len(self.sections),
+                "written": 0,
+                "deleted": 0,
+                "parsed_lines": 0,
+                "seconds": time.perf_counter() - started,
+            }
+
+        # Find the changed lines on the raw text, so unchanged lines are
+        # neither compared nor split again
+        pos = _common_prefix(self.text, text)
+        tail = _common_suffix(self.text, text, min(len(self.text), len(text)) - pos)
+        prefix = self.text.count("\n", 0, pos)
+        line_start = self.text.rfind("\n", 0, pos) + 1
+        newline = text.find("\n", max(len(text) - tail, line_start))
+        if newline == -1:
+            middle = text[line_start:]
+            suffix = 0
+        else:
+            middle = text[line_start:newline]
+            suffix = text.count("\n", newline)
+        # Changed lines are old[prefix:len(old) - suffix]
+        lines = old[:prefix] + middle.split("\n") + old[len(old) - suffix:]
+        delta = len(lines) - len(old)
+
+        # Restart one block early: whether the block before the change ends
+        # where it used to can depend on the changed lines
+        index = bisect_right(self.block_starts, prefix) - 1
+        start = self.block_starts[index - 1] if index >= 1 else 0
+
+        after = bisect_left(self.block_starts, len(old) - suffix)
+        parsed_lines = 0
+        for _ in range(MAX_RESYNC_ATTEMPTS):
+            if after < len(self.block_starts):
+                resync = self.block_starts[after] + delta
+                # Include the resync line so the parser sees whether it starts
+                # a block, but don't trust anything parsed from it on
+                block_starts, headings = self._scan(lines, start, resync + 1)
+                parsed_lines += resync + 1 - start
+                if resync not in block_starts:
+                    after += 1
+                    continue
+            else:
+                resync = len(lines)
+                block_starts, headings = self._scan(lines, start, resync)
+                parsed_lines += resync - start
+            break
+        else:
+            stats = self.build()
+            stats["parsed_lines"] += parsed_lines
+            return stats
+
+        old_resync = resync - delta
+        block_starts = (
+            self.block_starts[:bisect_left(self.block_starts, start)]
+            + [line for line in block_starts if line < resync]
+            + [line + delta for line in self.block_starts[after:]]
+        )
+        headings = (
+            [heading for heading in self.headings if heading["line"] < start]
+            + [heading for heading in headings if heading["line"] < resync]
+            + [
+                {**heading, "line": heading["line"] + delta}
+                for heading in self.headings
+                if heading["line"] >= old_resync
+            ]
+        )
+
+        # Sections entirely within the unchanged head or tail keep their digest
+        known = {}
+        for section in self.sections:
+            if section["end_line"] <= prefix:
+                known[(section["start_line"], section["end_line"])] = section
+            elif section["start_line"] >= len(old) - suffix:
+                key = (section["start_line"] + delta, section["end_line"] + delta)
+                known[key] = section
+        old_files = {
+            section["filename"]: section["digest"] for section in self.sections
+        }
+
+        stats = self._commit(text, lines, block_starts, headings, known, old_files)
+        stats["parsed_lines"] = parsed_lines
+        stats["seconds"] = time.perf_counter() - started
+        return stats
+
+    def _scan(
+        self, lines: List[str], start: int, end: int
+    ) -> Tuple[List[int], List[Dict]]:
+        """Parse lines[start:end] and return top-level block starts and headings."""
+        tokens = self.parser.parse("\n".join(lines[start:end]))
+        block_starts = []
+        headings = []
+        for i, token in enumerate(tokens):
+            if token.level == 0 and token.nesting != -1 and token.map:
+                block_starts.append(token.map[0] + start)
+            if token.type == "heading_open" and int(token.tag[1]) <= self.max_level:
+                header_text = extract_heading_text(tokens, i)
+                if header_text and token.map:
+                    headings.append({
+                        "line": token.map[0] + start,
+                        "header": header_text,
+                        "level": int(token.tag[1]),
+                        "slug": generate_filename(header_text),
+                    })
+        return block_starts, headings
+
+    def _commit(
+        self,
+        text: str,
+        lines: List[str],
+        block_starts: List[int],
+        headings: List[Dict],
+        known: Optional[Dict[Tuple[int, int], Dict]],
+        old_files: Dict[str, str],
+    ) -> Dict:
+        """Write the sections, TOC and manifest of a new generation."""
+        registry = FilenameRegistry()
+        sections = []
+        written = 0
+        for pos, heading in enumerate(headings):
+            end = headings[pos + 1]["line"] if pos + 1 < len(headings) else len(lines)
+            section = {
+                "filename": registry.claim(heading["slug"]),
+                "header": heading["header"],
+                "level": heading["level"],
+                "start_line": heading["line"],
+                "end_line": end,
+            }
+            previous = (known or {}).get((heading["line"], end))
+            content = None
+            if previous is not None:
+                section["digest"] = previous["digest"]
+                section["size"] = previous["size"]
+            else:
+                content = render_section(section, lines)
+                section["digest"] = content_digest(content)
+                section["size"] = len(content.encode("utf-8"))
+            if old_files.get(section["filename"]) != section["digest"]:
+                if content is None:
+                    content = render_section(section, lines)
+                path = os.path.join(self.output_dir, section["filename"])
+                if write_if_changed(path, content):
+                    written += 1
+            sections.append(section)
+
+        current = {section["filename"] for section in sections}
+        deleted = 0
+        for filename in old_files:
+            if filename in current:
+                continue
+            path = os.path.join(self.output_dir, filename)
+            if os.path.isfile(path):
+                os.remove(path)
+                deleted += 1
+
+        write_if_changed(
+            self.toc_file, build_toc(sections, self.url_prefix, self.base_path)
+        )
+        save_manifest(self.output_dir, sections)
+
+        self.text = text
+        self.lines = lines
+        self.block_starts = block_starts
+        self.headings = headings
+        self.sections = sections
+        return {"sections": len(sections), "written": written, "deleted": deleted}
+
+
+def _common_prefix(a: str, b: str) -> int:
+    """Return the length of the common prefix of two strings."""
+    limit = min(len(a), len(b))
+    pos = 0
+    # Skip equal blocks with C-level comparisons, then bisect the last one
+    while pos < limit and a[pos:pos + _BLOCK] == b[pos:pos + _BLOCK]:
+        pos += _BLOCK
+    if pos >= limit:
+        return limit
+    low, high = pos, min(pos + _BLOCK, limit)
+    while low < high:
+        mid = (low + high) // 2
+        if a[low:mid + 1] == b[low:mid + 1]:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    """Return the length of the common suffix of two strings, at most limit."""
+    pos = 0
+    while pos < limit:
+        step = min(_BLOCK, limit - pos)
+        if a[len(a) - pos - step:len(a) - pos] != b[len(b) - pos - step:len(b) - pos]:
+            break
+        pos += step
+    else:
+        return limit
+    low, high = pos, pos + step
+    while low < high:
+        mid = (low + high) // 2
+        if a[len(a) - mid - 1:len(a) - low] == b[len(b) - mid - 1:len(b) - low]:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+
+class PollingWatcher:
+    """Detect changes to a file by polling its size, mtime and inode."""
+
+    def __init__(self, path: str, interval: float = POLL_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.signature = self._signature()
+
+    def _signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Wait up to timeout seconds (None: forever) for a change."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            signature = self._signature()
+            if signature != self.signature:
+                self.signature = signature
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, max(deadline - time.monotonic(), 0))
+            time.sleep(delay)
+
+    def close(self) -> None:
+        """Release the watcher's resources."""
+
+
+class InotifyWatcher:
+    """Detect changes to a file with Linux inotify on its directory.
+
+    Watching the directory catches editors that save by writing a temporary
+    file and renaming it over the original.
+    """
+
+    _EVENT = struct.Struct("iIII")
+    _IN_MODIFY = 0x002
+    _IN_CLOSE_WRITE = 0x008
+    _IN_MOVED_TO = 0x080
+    _IN_CREATE = 0x100
+    _IN_NONBLOCK = 0o4000
+    _IN_CLOEXEC = 0o2000000
+
+    def __init__(self, path: str):
+        libc_name = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(libc_name or None, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.name = os.fsencode(os.path.basename(path))
+        self.fd = libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        directory = os.path.dirname(os.path.abspath(path))
+        mask = (
+            self._IN_MODIFY | self._IN_CLOSE_WRITE | self._IN_MOVED_TO | self._IN_CREATE
+        )
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Wait up to timeout seconds (None: forever) for a change."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None
+            if deadline is not None:
+                remaining = max(deadline - time.monotonic(), 0)
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return False
+            if self._read_events():
+                return True
+
+    def _read_events(self) -> bool:
+        """Drain pending events, reporting whether one concerns the file."""
+        changed = False
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return changed
+            pos = 0
+            while pos < len(data):
+                _, _, _, length = self._EVENT.unpack_from(data, pos)
+                pos += self._EVENT.size
+                name = data[pos:pos + length].rstrip(b"\0")
+                pos += length
+                if name == self.name:
+                    changed = True
+
+    def close(self) -> None:
+        """Release the watcher's resources."""
+        os.close(self.fd)
+
+
+def create_watcher(path: str, polling: bool = False):
+    """Return an inotify watcher where available, a polling watcher otherwise."""
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(path)
+        except OSError:
+            pass
+    return PollingWatcher(path)
+
+
+def watch(
+    input_file: str,
+    regenerate: Callable[[], Dict],
+    report: Callable[[Dict], None],
+    debounce: float = DEFAULT_DEBOUNCE,
+    polling: bool = False,
+    stop: Optional[Callable[[], bool]] = None,
+) -> None:
+    """
+    Call regenerate every time the input file changes, until stop returns True.
+
+    Bursts of changes, such as an editor writing a file in several steps, are
+    coalesced: regeneration starts once no change was seen for debounce
+    seconds.
+
+    Args:
+        input_file: File to watch
+        regenerate: Function bringing the output up to date, returning stats
+        report: Function called with the stats, or with {"error": message}
+            when regeneration fails
+        debounce: Quiet period in seconds before regenerating
+        polling: Poll the file instead of using inotify
+        stop: Checked after every regeneration (default: run forever)
+    """
+    watcher = create_watcher(input_file, polling)
+    try:
+        while not (stop and stop()):
+            watcher.wait(None)
+            while watcher.wait(debounce):
+                pass
+            try:
+                report(regenerate())
+            except (OSError, ValueError) as e:
+                report({"error": str(e)})
+    finally:
+        watcher.close()
@@ -0,0 +1,106 @@
+"""Synthetic markdown corpus generator for the splitter benchmarks."""
+
+import random
+from typing import Dict
+
+WORDS = (
+    "django model service selector api serializer queryset validation "
+    "transaction celery task settings factory test exception handler url "
+    "view request response field manager migration cache signal form admin"
+).split()
+
+INLINE_MARKUP = ("`{}`", "*{}*", "**{}**", "[{}](https://example.com/{})")
+
+FENCE_LANGUAGES = ("python", "bash", "json", "")
+
+
+def _sentence(rng: random.Random) -> str:
+    """Build a sentence with some inline markup."""
+    words = [rng.choice(WORDS) for _ in range(rng.randint(6, 16))]
+    if rng.random() < 0.5:
+        pos = rng.randrange(len(words))
+        words[pos] = rng.choice(INLINE_MARKUP).format(words[pos], words[pos])
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng: random.Random) -> str:
+    """Build a paragraph of a few wrapped sentences."""
+    return "\n".join(_sentence(rng) for _ in range(rng.randint(2, 6)))
+
+
+def _fence(rng: random.Random) -> str:
+    """Build a fenced code block whose comment lines look like headings."""
+    lines = [f"```{rng.choice(FENCE_LANGUAGES)}"]
+    for _ in range(rng.randint(3, 12)):
+        if rng.random() < 0.3:
+            lines.append(f"# {rng.choice(WORDS)} {rng.choice(WORDS)}")
+        else:
+            lines.append(f"{rng.choice(WORDS)} = {rng.choice(WORDS)}()")
+    lines.append("```")
+    return "\n".join(lines)
+
+
+def _heading(rng: random.Random, level: int, counter: int) -> str:
+    """Build a heading, sometimes in setext style."""
+    text = f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {counter}"
+    if level <= 2 and rng.random() < 0.2:
+        return f"{text}\n{('=' if level == 1 else '-') * len(text)}"
+    return f"{'#' * level} {text}"
+
+
+def generate_corpus(
+    path: str,
+    size: int,
+    heading_density: float = 0.15,
+    max_depth: int = 4,
+    fence_ratio: float = 0.2,
+    seed: int = 0,
+) -> Dict:
+    """
+    Write a synthetic markdown document of roughly the requested size.
+
+    The document is written block by block, so sizes up to gigabytes can be
+    generated without holding the corpus in memory.
+
+    Args:
+        path: File to write
+        size: Target size in bytes; the last block may overshoot slightly
+        heading_density: Probability that a block is a heading
+        max_depth: Deepest heading level used (1-6)
+        fence_ratio: Probability that a non-heading block is a fenced code block
+        seed: Random seed, so the same arguments produce the same corpus
+
+    Returns:
+        Statistics with the written bytes, headings and fenced code blocks
+
+    Raises:
+        ValueError: If an argument is out of range
+    """
+    if not 1 <= max_depth <= 6:
+        raise ValueError("max_depth must be between 1 and 6")
+    if not 0 <= heading_density <= 1 or not 0 <= fence_ratio <= 1:
+        raise ValueError("heading_density and fence_ratio must be between 0 and 1")
+
+    rng = random.Random(seed)
+    written = 0
+    headings = 0
+    fences = 0
+    level = 1
+
+    with open(path, "w", encoding="utf-8") as f:
+        while written < size:
+            if headings == 0 or rng.random() < heading_density:
+                # Move at most one level deeper, or back up to any parent level
+                level = rng.randint(1, min(level + 1, max_depth))
+                headings += 1
+                block = _heading(rng, level, headings)
+            elif rng.random() < fence_ratio:
+                fences += 1
+                block = _fence(rng)
+            else:
+                block = _paragraph(rng)
+            data = block + "\n\n"
+            f.write(data)
+            written += len(data.encode("utf-8"))
+
+    return {"bytes": written, "headings": headings, "fences": fences}
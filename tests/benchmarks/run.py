@@ -0,0 +1,286 @@
+"""Benchmark runner for generate_docs.
+
+Run from the repository root:
+
+    python -m tests.benchmarks --sizes 100KB,1MB,10MB --output bench.json
+
+Every measurement runs in a fresh process so peak RSS figures are not
+polluted by earlier runs. Results are written as JSON and can be compared
+against a previous run with ``--compare``.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import re
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from mcpdoc_split._version import __version__
+from tests.benchmarks.corpus import generate_corpus
+
+MODES = ("block", "full", "streaming")
+
+_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
+
+
+def parse_size(text: str) -> int:
+    """
+    Parse a human readable size such as ``100KB`` or ``1GB`` into bytes.
+
+    Raises:
+        ValueError: If the size can't be parsed
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*", text.upper())
+    if not match:
+        raise ValueError(f"Invalid size: {text}")
+    unit = match.group(2)
+    if unit and not unit.endswith("B"):
+        unit += "B"
+    return int(float(match.group(1)) * _UNITS[unit])
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the peak RSS counter of this process (Linux only)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss() -> int:
+    """Return the peak resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _measure_total(input_file: str, mode: str, work_dir: str) -> Dict:
+    """Run generate_docs end to end in this process."""
+    from mcpdoc_split.main import generate_docs
+
+    output_dir = os.path.join(work_dir, "docs")
+    kwargs = {"streaming": True} if mode == "streaming" else {"parse_mode": mode}
+    _reset_peak_rss()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = generate_docs(
+            input_file,
+            output_dir=output_dir,
+            toc_file=os.path.join(work_dir, "llms.txt"),
+            **kwargs,
+        )
+    seconds = time.perf_counter() - started
+    return {
+        "seconds": seconds,
+        "peak_rss_bytes": _peak_rss(),
+        "sections": result.sections,
+        # The phases generate_docs timed itself, in the order they ran
+        "phases": {
+            name: {"seconds": phase_seconds}
+            for name, phase_seconds in result.timings.items()
+            if name != "total"
+        },
+    }
+
+
+def _in_work_dir(func: Callable, input_file: str, mode: str) -> Dict:
+    """Run a measurement with a scratch output directory."""
+    work_dir = tempfile.mkdtemp(prefix="mcpdoc-bench-")
+    try:
+        return func(input_file, mode, work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _measure(input_file: str, mode: str) -> Dict:
+    """Measure one run of a mode in the current process."""
+    return _in_work_dir(_measure_total, input_file, mode)
+
+
+def _in_fresh_process(input_file: str, mode: str) -> Dict:
+    """Measure one run of a mode in a newly spawned interpreter."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(_in_work_dir, _measure_total, input_file, mode).result()
+
+
+def run_benchmarks(
+    sizes: List[int],
+    modes: List[str],
+    repeat: int = 3,
+    corpus_dir: Optional[str] = None,
+    isolate: bool = True,
+    **corpus_options,
+) -> Dict:
+    """
+    Benchmark generate_docs on synthetic corpora of the given sizes.
+
+    Args:
+        sizes: Corpus sizes in bytes
+        modes: Splitter modes to measure, from MODES
+        repeat: Runs per size and mode; the fastest run is reported
+        corpus_dir: Directory to keep generated corpora in (default: temporary)
+        isolate: Run every measurement in a fresh process
+        **corpus_options: Extra arguments for generate_corpus
+
+    Returns:
+        Machine-readable results with environment information
+    """
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        raise ValueError(f"Unknown mode(s): {', '.join(sorted(unknown))}")
+
+    measure = _in_fresh_process if isolate else _measure
+    results = []
+    with tempfile.TemporaryDirectory(prefix="mcpdoc-corpus-") as temp_dir:
+        directory = corpus_dir or temp_dir
+        os.makedirs(directory, exist_ok=True)
+        for size in sizes:
+            input_file = os.path.join(directory, f"corpus-{size}.md")
+            corpus = generate_corpus(input_file, size, **corpus_options)
+            for mode in modes:
+                runs = [measure(input_file, mode) for _ in range(repeat)]
+                best = min(runs, key=lambda run: run["seconds"])
+                megabytes = corpus["bytes"] / 1024**2
+                results.append({
+                    "size_bytes": corpus["bytes"],
+                    "mode": mode,
+                    "sections": best["sections"],
+                    "seconds": best["seconds"],
+                    "median_seconds": statistics.median(r["seconds"] for r in runs),
+                    "sections_per_sec": best["sections"] / best["seconds"],
+                    "mb_per_sec": megabytes / best["seconds"],
+                    "peak_rss_bytes": best["peak_rss_bytes"],
+                    "phases": best["phases"],
+                })
+
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "corpus": corpus_options,
+        "results": results,
+    }
+
+
+def compare(previous: Dict, current: Dict) -> List[str]:
+    """
+    Describe the change in wall time and peak RSS between two result sets.
+
+    Returns:
+        One line per size and mode measured in both result sets
+    """
+    old = {(r["size_bytes"], r["mode"]): r for r in previous["results"]}
+    lines = []
+    for result in current["results"]:
+        before = old.get((result["size_bytes"], result["mode"]))
+        if before is None:
+            continue
+        time_change = (result["seconds"] / before["seconds"] - 1) * 100
+        rss_change = (result["peak_rss_bytes"] / before["peak_rss_bytes"] - 1) * 100
+        lines.append(
+            f"{_format_size(result['size_bytes']):>8} {result['mode']:<9} "
+            f"time {time_change:+6.1f}%  peak RSS {rss_change:+6.1f}%"
+        )
+    return lines
+
+
+def _format_size(size: int) -> str:
+    for unit in ("GB", "MB", "KB"):
+        if size >= _UNITS[unit]:
+            return f"{size / _UNITS[unit]:.1f}{unit}"
+    return f"{size}B"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point of the benchmark runner."""
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.benchmarks",
+        description="Benchmark generate_docs throughput and peak memory",
+    )
+    parser.add_argument(
+        "--sizes", default="100KB,1MB,10MB",
+        help="Comma-separated corpus sizes, e.g. 100KB,1MB,1GB",
+    )
+    parser.add_argument(
+        "--modes", default=",".join(MODES),
+        help="Comma-separated splitter modes to measure",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument(
+        "--heading-density", type=float, default=0.15,
+        help="Probability that a block is a heading",
+    )
+    parser.add_argument(
+        "--max-depth", type=int, default=4, help="Deepest heading level"
+    )
+    parser.add_argument(
+        "--fence-ratio", type=float, default=0.2,
+        help="Probability that a non-heading block is fenced code",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Corpus random seed")
+    parser.add_argument("--corpus-dir", help="Keep generated corpora here")
+    parser.add_argument("--output", "-o", help="Write JSON results to this file")
+    parser.add_argument("--compare", help="Previous JSON results to compare with")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        [parse_size(size) for size in args.sizes.split(",")],
+        args.modes.split(","),
+        repeat=args.repeat,
+        corpus_dir=args.corpus_dir,
+        heading_density=args.heading_density,
+        max_depth=args.max_depth,
+        fence_ratio=args.fence_ratio,
+        seed=args.seed,
+    )
+
+    for result in results["results"]:
+        print(
+            f"{_format_size(result['size_bytes']):>8} {result['mode']:<9} "
+            f"{result['seconds']:8.3f}s {result['sections_per_sec']:10.0f} sect/s "
+            f"{result['mb_per_sec']:7.2f} MB/s "
+            f"peak {result['peak_rss_bytes'] / 1024**2:7.1f} MB"
+        )
+        for name, phase in result["phases"].items():
+            print(f"{'':19}{name:<15}{phase['seconds']:8.3f}s")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to: {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+        print(f"Compared with {args.compare} ({previous.get('version') or '?'}):")
+        for line in compare(previous, results):
+            print(line)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Smoke tests for the benchmark corpus generator and runner."""
+
+import os
+import tempfile
+
+import pytest
+
+from mcpdoc_split.main import collect_sections, read_markdown
+from tests.benchmarks.corpus import generate_corpus
+from tests.benchmarks.run import compare, parse_size, run_benchmarks
+
+
+class TestParseSize:
+    """Test the parse_size function."""
+
+    @pytest.mark.parametrize(
+        "text,expected",
+        [("100KB", 102400), ("1MB", 1048576), ("1gb", 1073741824), ("512", 512)],
+    )
+    def test_sizes(self, text, expected):
+        """Test parsing sizes with units."""
+        assert parse_size(text) == expected
+
+    def test_invalid_size(self):
+        """Test that garbage is rejected."""
+        with pytest.raises(ValueError):
+            parse_size("lots")
+
+
+class TestGenerateCorpus:
+    """Test the generate_corpus function."""
+
+    def test_size_and_determinism(self):
+        """Test that corpora reach the target size and depend only on the seed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first = os.path.join(temp_dir, "a.md")
+            second = os.path.join(temp_dir, "b.md")
+
+            stats = generate_corpus(first, 20000, seed=1)
+            generate_corpus(second, 20000, seed=1)
+
+            assert stats["bytes"] >= 20000
+            assert os.path.getsize(first) == stats["bytes"]
+            with open(first, "rb") as a, open(second, "rb") as b:
+                assert a.read() == b.read()
+
+    def test_headings_respect_depth(self):
+        """Test that every generated heading is found and within max_depth."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "corpus.md")
+            stats = generate_corpus(path, 50000, max_depth=3, fence_ratio=0.5)
+
+            sections = collect_sections(read_markdown(path))
+
+            assert len(sections) == stats["headings"]
+            assert max(section["level"] for section in sections) <= 3
+
+
+class TestRunBenchmarks:
+    """Test the benchmark runner in-process."""
+
+    def test_results_are_machine_readable(self):
+        """Test the result structure and comparison output."""
+        results = run_benchmarks(
+            [10000], ["block", "streaming"], repeat=1, isolate=False
+        )
+
+        assert [r["mode"] for r in results["results"]] == ["block", "streaming"]
+        block = results["results"][0]
+        assert block["sections"] > 0
+        assert block["mb_per_sec"] > 0
+        assert {"read", "parse", "section_writes"} <= set(block["phases"])
+        assert "total" not in block["phases"]
+        assert "stream" in results["results"][1]["phases"]
+        assert len(compare(results, results)) == 2
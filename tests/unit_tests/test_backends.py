@@ -0,0 +1,250 @@
+"""Tests for mcpdoc_split.backends module."""
+
+import io
+import sys
+import tarfile
+import zipfile
+from unittest.mock import patch
+
+import pytest
+
+from mcpdoc_split.backends import (
+    ArchiveBackend,
+    MemoryBackend,
+    archive_format,
+    member_name,
+)
+from mcpdoc_split.cli import main
+from mcpdoc_split.main import generate_docs
+
+MARKDOWN = """# Guide
+Intro.
+
+## Setup
+Setup text.
+
+### Install
+Install text.
+
+# Reference
+Reference text.
+"""
+
+
+class Unseekable(io.RawIOBase):
+    """Binary sink that can't seek or tell, like a pipe."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.data += data
+        return len(data)
+
+    def seekable(self):
+        return False
+
+    def tell(self):
+        raise OSError("unseekable")
+
+
+def _generate(tmp_path, monkeypatch, backend=None, **options):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "guide.md").write_text(MARKDOWN, encoding="utf-8")
+    return generate_docs(
+        "guide.md",
+        output_dir="docs",
+        toc_file="llms.txt",
+        url_prefix="https://example.com",
+        backend=backend,
+        **options,
+    )
+
+
+def _disk_files(tmp_path):
+    files = {"llms.txt": (tmp_path / "llms.txt").read_bytes()}
+    for path in (tmp_path / "docs").rglob("*"):
+        if path.is_file():
+            files[path.relative_to(tmp_path).as_posix()] = path.read_bytes()
+    return files
+
+
+class TestMemberName:
+    """Test the member_name and archive_format functions."""
+
+    def test_member_name(self):
+        """Test that paths are normalized to relative member names."""
+        assert member_name("docs/./setup.md") == "docs/setup.md"
+        assert member_name("/srv/docs/setup.md") == "srv/docs/setup.md"
+        assert member_name("docs/../llms.txt") == "llms.txt"
+
+    def test_rejects_paths_outside_root(self):
+        """Test that paths climbing above the root are rejected."""
+        with pytest.raises(ValueError, match="outside"):
+            member_name("../llms.txt")
+
+    @pytest.mark.parametrize(
+        "path, expected",
+        [
+            ("docs.zip", "zip"),
+            ("docs.tar", "tar"),
+            ("docs.tar.gz", "tar.gz"),
+            ("DOCS.TGZ", "tar.gz"),
+        ],
+    )
+    def test_archive_format(self, path, expected):
+        """Test inferring the archive format from the extension."""
+        assert archive_format(path) == expected
+
+    def test_unknown_archive_format(self):
+        """Test that unknown extensions are rejected."""
+        with pytest.raises(ValueError, match="archive format"):
+            archive_format("docs.rar")
+
+
+class TestMemoryBackend:
+    """Test generating into a MemoryBackend."""
+
+    @pytest.mark.parametrize(
+        "options",
+        [{}, {"search_index": "index.json", "cache_manifest": "manifest.json"}],
+    )
+    def test_matches_filesystem(self, tmp_path, monkeypatch, options):
+        """Test that the stored files equal those of a filesystem run."""
+        disk_dir = tmp_path / "disk"
+        disk_dir.mkdir()
+        _generate(disk_dir, monkeypatch, **options)
+
+        backend = MemoryBackend()
+        memory_dir = tmp_path / "memory"
+        memory_dir.mkdir()
+        result = _generate(memory_dir, monkeypatch, backend=backend, **options)
+
+        assert backend.files == _disk_files(disk_dir) | {
+            name: (disk_dir / name).read_bytes() for name in options.values()
+        }
+        assert result.sections == 4
+        assert not (memory_dir / "docs").exists()
+        assert not (memory_dir / "llms.txt").exists()
+
+    def test_rejects_filesystem_only_options(self, tmp_path, monkeypatch):
+        """Test that incremental and streaming runs need the filesystem."""
+        for option in ("incremental", "streaming"):
+            with pytest.raises(ValueError, match="filesystem backend"):
+                _generate(tmp_path, monkeypatch, MemoryBackend(), **{option: True})
+
+
+class TestArchiveBackend:
+    """Test streaming output into archives."""
+
+    def test_zip_to_unseekable_stream(self, tmp_path, monkeypatch):
+        """Test that a zip streamed to a pipe holds every output file."""
+        _generate(tmp_path, monkeypatch)
+        expected = _disk_files(tmp_path)
+
+        sink = Unseekable()
+        backend = ArchiveBackend(sink, "zip")
+        _generate(tmp_path, monkeypatch, backend=backend)
+        backend.close()
+
+        with zipfile.ZipFile(io.BytesIO(bytes(sink.data))) as archive:
+            assert {
+                name: archive.read(name) for name in archive.namelist()
+            } == expected
+
+    @pytest.mark.parametrize("format_name, mode", [("tar", "r:"), ("tar.gz", "r:gz")])
+    def test_tar_to_unseekable_stream(self, tmp_path, monkeypatch, format_name, mode):
+        """Test that a tar streamed to a pipe holds every output file."""
+        _generate(tmp_path, monkeypatch)
+        expected = _disk_files(tmp_path)
+
+        sink = Unseekable()
+        backend = ArchiveBackend(sink, format_name)
+        _generate(tmp_path, monkeypatch, backend=backend)
+        backend.close()
+
+        with tarfile.open(fileobj=io.BytesIO(bytes(sink.data)), mode=mode) as archive:
+            assert {
+                member.name: archive.extractfile(member).read()
+                for member in archive.getmembers()
+            } == expected
+
+    def test_unknown_format(self):
+        """Test that unknown archive formats are rejected."""
+        with pytest.raises(ValueError, match="archive_format"):
+            ArchiveBackend(io.BytesIO(), "rar")
+
+
+class TestArchiveCli:
+    """Test the --archive option."""
+
+    def test_archive_to_stdout(self, tmp_path, monkeypatch):
+        """Test that --archive - writes only the tar to stdout."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "guide.md").write_text(MARKDOWN, encoding="utf-8")
+        stdout = io.TextIOWrapper(io.BytesIO())
+        argv = ["mcpdoc-split", "guide.md", "--archive", "-", "--stats", "json"]
+        with patch.object(sys, "argv", argv):
+            with patch.object(sys, "stdout", new=stdout):
+                with patch.object(sys, "stderr", new=io.StringIO()) as stderr:
+                    main()
+
+        stdout.flush()
+        with tarfile.open(fileobj=io.BytesIO(stdout.buffer.getvalue())) as archive:
+            names = archive.getnames()
+        assert names[0] == "llms.txt"
+        assert "docs/install.md" in names
+        assert '"sections": 4' in stderr.getvalue()
+        assert not (tmp_path / "docs").exists()
+
+    def test_archive_file(self, tmp_path, monkeypatch):
+        """Test that the format of an archive file follows its extension."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "guide.md").write_text(MARKDOWN, encoding="utf-8")
+        argv = ["mcpdoc-split", "guide.md", "--archive", "docs.zip"]
+        with patch.object(sys, "argv", argv):
+            with patch.object(sys, "stdout", new=io.StringIO()):
+                main()
+        with zipfile.ZipFile(tmp_path / "docs.zip") as archive:
+            assert "docs/guide.md" in archive.namelist()
+
+    @pytest.mark.parametrize(
+        "flags", [["--incremental"], ["--streaming"], ["--target", "max_level=1"]]
+    )
+    def test_rejects_filesystem_only_options(self, tmp_path, monkeypatch, flags):
+        """Test that bad combinations fail before the archive is created."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "guide.md").write_text(MARKDOWN, encoding="utf-8")
+        argv = ["mcpdoc-split", "guide.md", "--archive", "docs.zip", *flags]
+        with patch.object(sys, "argv", argv):
+            with patch.object(sys, "stderr", new=io.StringIO()) as stderr:
+                with pytest.raises(SystemExit):
+                    main()
+        assert f"--archive can't be combined with {flags[0]}" in stderr.getvalue()
+        assert not (tmp_path / "docs.zip").exists()
+
+    def test_failed_run_removes_archive(self, tmp_path, monkeypatch):
+        """Test that a run failing after the archive was opened removes it."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "guide.md").write_text(MARKDOWN, encoding="utf-8")
+        argv = [
+            "mcpdoc-split", "guide.md", "--archive", "docs.zip", "--chunk-size", "-1",
+        ]
+        with patch.object(sys, "argv", argv):
+            with patch.object(sys, "stdout", new=io.StringIO()):
+                with patch.object(sys, "stderr", new=io.StringIO()) as stderr:
+                    with pytest.raises(SystemExit):
+                        main()
+        assert "chunk_size must be at least 1" in stderr.getvalue()
+        assert not (tmp_path / "docs.zip").exists()
+
+    def test_abort(self):
+        """Test that an aborted archive leaves its file object alone."""
+        sink = io.BytesIO()
+        backend = ArchiveBackend(sink, "zip")
+        backend.write("docs/a.md", b"A")
+        backend.abort()
+        sink.close()
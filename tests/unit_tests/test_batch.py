@@ -0,0 +1,193 @@
+"""Tests for mcpdoc_split.batch module."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from mcpdoc_split.batch import build_jobs, expand_inputs, run_batch, run_job
+from mcpdoc_split.cli import main
+
+
+def _write_inputs(temp_dir):
+    """Create two small markdown sources in separate directories."""
+    for name in ("alpha", "beta"):
+        Path(temp_dir, name).mkdir()
+        Path(temp_dir, name, "README.md").write_text(
+            f"# {name.title()}\nText.\n\n## Details\nMore.\n"
+        )
+
+
+class TestExpandInputs:
+    """Test the expand_inputs function."""
+
+    def test_expands_globs_and_keeps_plain_paths(self):
+        """Test glob expansion, ordering and de-duplication."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _write_inputs(temp_dir)
+            pattern = os.path.join(temp_dir, "*", "README.md")
+            plain = os.path.join(temp_dir, "alpha", "README.md")
+
+            result = expand_inputs([plain, pattern])
+
+            assert result == [plain, os.path.join(temp_dir, "beta", "README.md")]
+
+
+class TestBuildJobs:
+    """Test the build_jobs function."""
+
+    def test_formats_templates_per_input(self):
+        """Test that placeholders are filled in for every input."""
+        jobs = build_jobs(
+            ["svc/api/README.md"],
+            output_dir="build/{parent}",
+            toc_file="build/{stem}.txt",
+            base_path="/{parent}",
+            max_level=2,
+        )
+
+        assert jobs == [{
+            "input_file": "svc/api/README.md",
+            "output_dir": "build/api",
+            "toc_file": "build/README.txt",
+            "base_path": "/api",
+            "max_level": 2,
+        }]
+
+    def test_unknown_option(self):
+        """Test that unknown options are rejected."""
+        with pytest.raises(ValueError, match="Unknown batch option"):
+            build_jobs(["a.md"], colour="red")
+
+    def test_unknown_placeholder(self):
+        """Test that unknown template placeholders are reported as ValueError."""
+        with pytest.raises(ValueError, match="base_path.*'nope'"):
+            build_jobs(["a.md"], base_path="/{nope}")
+        with pytest.raises(ValueError, match="output_dir"):
+            build_jobs(["a.md"], output_dir="build/{0}")
+
+
+class TestRunBatch:
+    """Test the run_job and run_batch functions."""
+
+    def test_run_job_reports_errors(self):
+        """Test that a failing job is reported instead of raising."""
+        result = run_job({"input_file": "missing.md"})
+
+        assert result["ok"] is False
+        assert "FileNotFoundError" in result["error"]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_splits_every_input(self, workers):
+        """Test that each job gets its own output directory and TOC."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _write_inputs(temp_dir)
+            jobs = build_jobs(
+                expand_inputs([os.path.join(temp_dir, "*", "README.md")]),
+                output_dir=os.path.join(temp_dir, "out", "{parent}"),
+                toc_file=os.path.join(temp_dir, "out", "{parent}.txt"),
+            )
+
+            report = run_batch(jobs, workers=workers)
+
+            assert report["succeeded"] == 2
+            assert report["failed"] == 0
+            for name in ("alpha", "beta"):
+                assert Path(temp_dir, "out", name, f"{name}.md").exists()
+                assert Path(temp_dir, "out", f"{name}.txt").exists()
+
+    def test_rejects_shared_outputs(self):
+        """Test that jobs writing to the same location are rejected."""
+        jobs = build_jobs(["a/README.md", "b/README.md"], output_dir="docs")
+
+        with pytest.raises(ValueError, match="both write to"):
+            run_batch(jobs)
+
+    @pytest.mark.parametrize(
+        "second",
+        [
+            {"output_dir": "out/docs/beta", "toc_file": "beta.txt"},
+            {"output_dir": "beta", "toc_file": "out/docs/beta.txt"},
+        ],
+    )
+    def test_rejects_outputs_inside_another_output_dir(self, second):
+        """Test that no job writes inside another job's output directory."""
+        jobs = [
+            {"input_file": "a.md", "output_dir": "out/docs", "toc_file": "a.txt"},
+            {"input_file": "b.md", **second},
+        ]
+
+        with pytest.raises(ValueError, match="inside the output directory"):
+            run_batch(jobs)
+
+    def test_accepts_sibling_output_dirs(self, tmp_path):
+        """Test that directories sharing a name prefix aren't nested."""
+        for name in ("a", "ab"):
+            (tmp_path / f"{name}.md").write_text(f"# {name}\nText.\n")
+        jobs = [
+            {
+                "input_file": str(tmp_path / f"{name}.md"),
+                "output_dir": str(tmp_path / "out" / name),
+                "toc_file": str(tmp_path / "out" / f"{name}.txt"),
+            }
+            for name in ("a", "ab")
+        ]
+
+        assert run_batch(jobs)["succeeded"] == 2
+
+    def test_invalid_workers(self):
+        """Test that a non-positive worker count is rejected."""
+        with pytest.raises(ValueError, match="workers must be at least 1"):
+            run_batch([], workers=0)
+
+
+class TestBatchCli:
+    """Test the batch subcommand."""
+
+    def test_batch_subcommand(self):
+        """Test that the batch subcommand splits all matched inputs."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _write_inputs(temp_dir)
+            out = os.path.join(temp_dir, "out")
+            argv = [
+                "mcpdoc-split", "batch", os.path.join(temp_dir, "*", "README.md"),
+                "--output-dir", os.path.join(out, "{parent}"),
+                "--toc-file", os.path.join(out, "{parent}.txt"),
+                "--workers", "1",
+                "--report", os.path.join(temp_dir, "report.json"),
+            ]
+
+            with patch.object(sys, "argv", argv):
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+
+            assert exc_info.value.code == 0
+            assert Path(out, "alpha", "details.md").exists()
+            assert Path(temp_dir, "report.json").exists()
+
+    def test_batch_failure_exit_code(self):
+        """Test that a failed job makes the batch exit with status 1."""
+        with patch.object(sys, "argv", ["mcpdoc-split", "batch", "missing.md"]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+        assert exc_info.value.code == 1
+
+    def test_batch_unknown_placeholder(self, capsys):
+        """Test that an unknown placeholder is reported instead of crashing."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _write_inputs(temp_dir)
+            argv = [
+                "mcpdoc-split", "batch", os.path.join(temp_dir, "*", "README.md"),
+                "--base-path", "/{nope}",
+            ]
+
+            with patch.object(sys, "argv", argv):
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+
+        assert exc_info.value.code == 1
+        assert "nope" in capsys.readouterr().err
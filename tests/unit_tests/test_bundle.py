@@ -0,0 +1,135 @@
+"""Tests for mcpdoc_split.bundle module."""
+
+import json
+
+import pytest
+
+from mcpdoc_split.batch import run_batch
+from mcpdoc_split.bundle import (
+    build_bundle,
+    default_index_path,
+    range_header,
+    read_bundle_section,
+)
+from mcpdoc_split.main import generate_docs
+
+MARKDOWN = """# Guide
+Intro with a non-ASCII character: café.
+
+## Models
+Model text.
+
+## Services
+Service text.
+"""
+
+
+def _section(filename, header, level=1):
+    return {"filename": filename, "header": header, "level": level}
+
+
+class TestBuildBundle:
+    """Test the build_bundle function."""
+
+    def test_offsets_are_utf8_byte_ranges(self):
+        """Test that every entry points at its section's bytes."""
+        rendered = [
+            (_section("a.md", "Café"), "# Café\nText."),
+            (_section("b.md", "B", 2), "## B"),
+        ]
+        bundle, index = build_bundle(
+            rendered, "out/llms-full.txt", "https://example.com", "/docs"
+        )
+
+        assert bundle == "# Café\nText.\n\n## B\n"
+        data = bundle.encode("utf-8")
+        for (_, content), entry in zip(rendered, index["sections"]):
+            end = entry["offset"] + entry["length"]
+            assert data[entry["offset"]:end].decode("utf-8") == content
+        assert index["sections"][1] == {
+            "filename": "b.md",
+            "header": "B",
+            "level": 2,
+            "url": "https://example.com/docs/b.md",
+            "offset": 15,
+            "length": 4,
+        }
+        assert index["filename"] == "llms-full.txt"
+        assert index["url"] == "https://example.com/llms-full.txt"
+        assert index["size"] == len(data)
+        assert index["etag"] == f'"{index["digest"].split(":", 1)[1]}"'
+
+    def test_empty(self):
+        """Test a document without sections."""
+        bundle, index = build_bundle([], "llms-full.txt", "https://example.com", "")
+        assert bundle == ""
+        assert index["sections"] == []
+        assert index["size"] == 0
+
+    def test_range_header(self):
+        """Test the Range header of an entry."""
+        assert range_header({"offset": 16, "length": 4}) == "bytes=16-19"
+
+    def test_default_index_path(self):
+        """Test the index path derived from the bundle path."""
+        assert default_index_path("out/llms-full.txt") == "out/llms-full.index.json"
+
+
+class TestGenerateBundle:
+    """Test bundle generation through generate_docs."""
+
+    def _generate(self, tmp_path, **options):
+        input_file = tmp_path / "guide.md"
+        input_file.write_text(MARKDOWN, encoding="utf-8")
+        return generate_docs(
+            str(input_file),
+            output_dir=str(tmp_path / "docs"),
+            toc_file=str(tmp_path / "llms.txt"),
+            bundle_file=str(tmp_path / "llms-full.txt"),
+            **options,
+        )
+
+    @pytest.mark.parametrize("options", [{}, {"incremental": True}, {"max_level": 1}])
+    def test_sections_match_section_files(self, tmp_path, options):
+        """Test that every indexed range holds the matching section file."""
+        result = self._generate(tmp_path, **options)
+
+        index = json.loads((tmp_path / "llms-full.index.json").read_text())
+        assert len(index["sections"]) == result.sections
+        for entry in index["sections"]:
+            section_file = tmp_path / "docs" / entry["filename"]
+            assert read_bundle_section(
+                str(tmp_path / "llms-full.txt"), entry
+            ) == section_file.read_text(encoding="utf-8")
+        assert "bundle" in result.timings
+
+    def test_bundle_holds_every_section_in_order(self, tmp_path):
+        """Test the full bundle text."""
+        self._generate(tmp_path)
+        assert (tmp_path / "llms-full.txt").read_text(encoding="utf-8") == (
+            "# Guide\nIntro with a non-ASCII character: café.\n\n"
+            "## Models\nModel text.\n\n"
+            "## Services\nService text.\n"
+        )
+
+    def test_custom_index_path(self, tmp_path):
+        """Test writing the index to an explicit path."""
+        self._generate(tmp_path, bundle_index=str(tmp_path / "meta" / "offsets.json"))
+        assert (tmp_path / "meta" / "offsets.json").exists()
+        assert not (tmp_path / "llms-full.index.json").exists()
+
+    def test_streaming_rejects_bundle(self, tmp_path):
+        """Test that streaming mode can't build a bundle."""
+        with pytest.raises(ValueError, match="bundle"):
+            self._generate(tmp_path, streaming=True)
+
+    def test_batch_rejects_shared_bundle(self, tmp_path):
+        """Test that two batch jobs can't write the same bundle."""
+        jobs = [
+            {"input_file": "a.md", "output_dir": "a", "toc_file": "a.txt",
+             "bundle_file": "full.txt"},
+            {"input_file": "b.md", "output_dir": "b", "toc_file": "b.txt",
+             "bundle_file": "full.txt"},
+        ]
+        with pytest.raises(ValueError, match="both write to"):
+            run_batch(jobs, workers=1)
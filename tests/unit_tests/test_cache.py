@@ -0,0 +1,232 @@
+"""Tests for mcpdoc_split.cache module."""
+
+import hashlib
+import json
+import os
+import sys
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from mcpdoc_split.cache import STATE_FILENAME, strong_etag, sync_from_manifest
+from mcpdoc_split.cli import main
+from mcpdoc_split.main import generate_docs
+
+URL_PREFIX = "https://docs.test"
+MANIFEST_URL = f"{URL_PREFIX}/llms.manifest.json"
+
+
+class FakeServer:
+    """Serve a generated documentation set the way a static host would."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.requests = []
+
+    def publish(self, markdown, **options):
+        """Generate docs from markdown into the served directory."""
+        input_file = self.root / "input.md"
+        input_file.write_text(markdown)
+        generate_docs(
+            str(input_file),
+            output_dir=str(self.root / "docs"),
+            toc_file=str(self.root / "llms.txt"),
+            url_prefix=URL_PREFIX,
+            cache_manifest=str(self.root / "llms.manifest.json"),
+            **options,
+        )
+
+    def fetch(self, url, headers):
+        self.requests.append(url)
+        path = self.root / url[len(URL_PREFIX) + 1:]
+        if not path.is_file():
+            return 404, {}, b""
+        data = path.read_bytes()
+        etag = strong_etag(hashlib.sha256(data).hexdigest())
+        if headers.get("If-None-Match") == etag:
+            return 304, {"etag": etag}, b""
+        return 200, {"etag": etag}, data
+
+
+@pytest.fixture
+def server(tmp_path):
+    """A fake static host serving a published documentation set."""
+    root = tmp_path / "site"
+    root.mkdir()
+    return FakeServer(root)
+
+
+class TestCacheManifest:
+    """Test the manifest written by generate_docs."""
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_lists_every_published_file(self, server, streaming):
+        """Test URLs, sizes and digests of the TOC and the sections."""
+        server.publish("# Intro\nA.\n\n## Usage\nB.\n", streaming=streaming)
+
+        manifest = json.loads((server.root / "llms.manifest.json").read_text())
+        assert manifest["version"] == 1
+        assert manifest["toc"]["url"] == f"{URL_PREFIX}/llms.txt"
+        assert [entry["url"] for entry in manifest["sections"]] == [
+            f"{URL_PREFIX}/docs/intro.md",
+            f"{URL_PREFIX}/docs/usage.md",
+        ]
+        for entry in [manifest["toc"]] + manifest["sections"]:
+            data = (server.root / entry["url"][len(URL_PREFIX) + 1:]).read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            assert entry["size"] == len(data)
+            assert entry["digest"] == f"sha256:{digest}"
+            assert entry["etag"] == f'"{digest}"'
+
+    def test_generation_follows_content(self, server):
+        """Test that the generation id only changes with the content."""
+        generations = []
+        for markdown in ("# Intro\nA.\n", "# Intro\nA.\n", "# Intro\nB.\n"):
+            server.publish(markdown)
+            manifest = json.loads((server.root / "llms.manifest.json").read_text())
+            generations.append(manifest["generation"])
+
+        assert generations[0] == generations[1]
+        assert generations[2] != generations[0]
+
+
+class TestSyncFromManifest:
+    """Test the conditional and delta fetch client."""
+
+    def test_initial_fetch_then_not_modified(self, server, tmp_path):
+        """Test a full download followed by a 304 on the manifest."""
+        server.publish("# Intro\nA.\n\n## Usage\nB.\n")
+        cache_dir = str(tmp_path / "cache")
+
+        stats = sync_from_manifest(MANIFEST_URL, cache_dir, server.fetch)
+        assert stats["downloaded"] == 3
+        assert Path(cache_dir, "usage.md").read_text() == "## Usage\nB."
+        assert Path(cache_dir, "llms.txt").read_bytes() == (
+            server.root / "llms.txt"
+        ).read_bytes()
+
+        server.requests.clear()
+        stats = sync_from_manifest(MANIFEST_URL, cache_dir, server.fetch)
+        assert stats["not_modified"] is True
+        assert server.requests == [MANIFEST_URL]
+
+    def test_delta_fetch(self, server, tmp_path):
+        """Test that only changed files are downloaded and stale ones removed."""
+        cache_dir = str(tmp_path / "cache")
+        server.publish("# Intro\nA.\n\n## Usage\nB.\n\n## Old\nC.\n")
+        sync_from_manifest(MANIFEST_URL, cache_dir, server.fetch)
+
+        server.publish("# Intro\nA.\n\n## Usage\nChanged.\n")
+        server.requests.clear()
+        stats = sync_from_manifest(MANIFEST_URL, cache_dir, server.fetch)
+
+        assert stats["downloaded"] == 2  # llms.txt and usage.md
+        assert stats["unchanged"] == 1
+        assert stats["deleted"] == 1
+        assert sorted(server.requests) == sorted([
+            MANIFEST_URL, f"{URL_PREFIX}/llms.txt", f"{URL_PREFIX}/docs/usage.md"
+        ])
+        assert sorted(os.listdir(cache_dir)) == [
+            STATE_FILENAME, "intro.md", "llms.txt", "usage.md"
+        ]
+
+    def test_renamed_content_is_reused(self, server, tmp_path):
+        """Test that content moved to a new filename isn't downloaded again."""
+        cache_dir = str(tmp_path / "cache")
+        server.publish("# Testing\nA.\n\n# Testing\nB.\n")
+        sync_from_manifest(MANIFEST_URL, cache_dir, server.fetch)
+
+        # The second section moves from testing-2.md to testing.md
+        server.publish("# Testing\nB.\n")
+        server.requests.clear()
+        stats = sync_from_manifest(MANIFEST_URL, cache_dir, server.fetch)
+
+        assert stats["reused"] == 1
+        assert stats["deleted"] == 1
+        assert f"{URL_PREFIX}/docs/testing.md" not in server.requests
+        assert Path(cache_dir, "testing.md").read_text() == "# Testing\nB."
+
+    def test_rejects_corrupt_download(self, server, tmp_path):
+        """Test that downloads are verified against their digest."""
+        server.publish("# Intro\nA.\n")
+        (server.root / "docs" / "intro.md").write_text("tampered")
+
+        with pytest.raises(ValueError, match="Digest mismatch"):
+            sync_from_manifest(MANIFEST_URL, str(tmp_path / "cache"), server.fetch)
+
+    def test_rejects_paths_outside_cache(self, tmp_path):
+        """Test that manifest filenames can't escape the cache directory."""
+        manifest = {
+            "version": 1,
+            "generation": "x",
+            "toc": {"filename": "../llms.txt", "url": "u", "digest": "sha256:0"},
+            "sections": [],
+        }
+
+        def fetch(url, headers):
+            return 200, {}, json.dumps(manifest).encode()
+
+        with pytest.raises(ValueError, match="Invalid filename"):
+            sync_from_manifest(MANIFEST_URL, str(tmp_path / "cache"), fetch)
+
+
+    @pytest.mark.parametrize(
+        "changes",
+        [
+            {"toc": None},
+            {"toc": "a"},
+            {"sections": {"filename": "a.md"}},
+            {"sections": [{"filename": "a.md", "url": "u"}]},
+            {"sections": ["a.md"]},
+            {"generation": None},
+        ],
+    )
+    def test_rejects_malformed_manifest(self, tmp_path, changes):
+        """Test that malformed manifests raise ValueError instead of crashing."""
+        manifest = {
+            "version": 1,
+            "generation": "x",
+            "toc": {"filename": "llms.txt", "url": "u", "digest": "sha256:0"},
+            "sections": [],
+        }
+        manifest.update(changes)
+        manifest = {key: value for key, value in manifest.items() if value is not None}
+
+        def fetch(url, headers):
+            return 200, {}, json.dumps(manifest).encode()
+
+        with pytest.raises(ValueError, match="Invalid cache manifest"):
+            sync_from_manifest(MANIFEST_URL, str(tmp_path / "cache"), fetch)
+
+
+class TestFetchCommand:
+    """Test the fetch subcommand."""
+
+    def test_fetch_over_file_urls(self, tmp_path):
+        """Test syncing a copy from a manifest published on the filesystem."""
+        root = tmp_path / "site"
+        input_file = tmp_path / "input.md"
+        input_file.write_text("# Intro\nA.\n")
+        generate_docs(
+            str(input_file),
+            output_dir=str(root / "docs"),
+            toc_file=str(root / "llms.txt"),
+            url_prefix=root.as_uri(),
+            cache_manifest=str(root / "llms.manifest.json"),
+        )
+        cache_dir = tmp_path / "cache"
+        argv = [
+            "mcpdoc-split", "fetch", (root / "llms.manifest.json").as_uri(),
+            str(cache_dir),
+        ]
+
+        with patch.object(sys, "argv", argv):
+            with patch.object(sys, "stdout", new=StringIO()) as mock_stdout:
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+
+        assert exc_info.value.code == 0
+        assert "2 downloaded" in mock_stdout.getvalue()
+        assert (cache_dir / "intro.md").read_text() == "# Intro\nA."
@@ -0,0 +1,178 @@
+"""Tests for mcpdoc_split.changes module."""
+
+import json
+import sys
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+
+from mcpdoc_split.changes import (
+    diff_sections,
+    sections_from_manifest,
+    sections_from_markdown,
+)
+from mcpdoc_split.cli import main
+from mcpdoc_split.main import generate_docs
+
+BODY = "\n".join(f"Line {number} of the services section." for number in range(10))
+
+OLD = f"""# Guide
+Intro.
+
+## Services
+{BODY}
+
+## Selectors
+Selectors fetch data.
+
+## Legacy
+To be removed.
+"""
+
+NEW = f"""# Guide
+Intro.
+
+## Business logic
+{BODY}
+One more line.
+
+## Selectors
+Selectors fetch data from the database.
+
+## APIs
+Brand new.
+"""
+
+
+def _table(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content)
+    return sections_from_markdown(str(path))
+
+
+def _changes(feed):
+    return {change["filename"]: change for change in feed["changes"]}
+
+
+class TestDiffSections:
+    """Test the diff_sections function."""
+
+    def test_change_feed(self, tmp_path):
+        """Test every kind of change between two markdown revisions."""
+        feed = diff_sections(
+            _table(tmp_path, "old.md", OLD), _table(tmp_path, "new.md", NEW)
+        )
+        changes = _changes(feed)
+
+        assert feed["summary"] == {
+            "added": 1, "removed": 1, "modified": 1, "renamed": 1, "unchanged": 1
+        }
+        assert changes["business-logic.md"]["change"] == "renamed"
+        assert changes["business-logic.md"]["old_filename"] == "services.md"
+        assert 0.6 < changes["business-logic.md"]["similarity"] < 1
+        assert changes["selectors.md"]["change"] == "modified"
+        assert "old_filename" not in changes["selectors.md"]
+        assert changes["apis.md"]["change"] == "added"
+        assert changes["legacy.md"] == {
+            "change": "removed", "filename": "legacy.md", "header": "Legacy"
+        }
+        # Removed sections come last
+        assert feed["changes"][-1]["change"] == "removed"
+
+    def test_identical_content_under_new_name(self, tmp_path):
+        """Test that moved content is a rename with similarity 1."""
+        old = _table(tmp_path, "old.md", "# Testing\nA.\n\n# Testing\nB.\n")
+        new = _table(tmp_path, "new.md", "# Testing\nB.\n")
+
+        feed = diff_sections(old, new)
+
+        assert feed["changes"] == [
+            {
+                "change": "renamed",
+                "filename": "testing.md",
+                "header": "Testing",
+                "digest": new[0]["digest"],
+                "old_filename": "testing-2.md",
+                "similarity": 1.0,
+            },
+            {"change": "removed", "filename": "testing.md", "header": "Testing"},
+        ]
+
+    def test_threshold(self, tmp_path):
+        """Test that dissimilar sections are added and removed, not renamed."""
+        old = _table(tmp_path, "old.md", OLD)
+        new = _table(tmp_path, "new.md", NEW)
+
+        feed = diff_sections(old, new, rename_threshold=0.99)
+
+        assert feed["summary"]["renamed"] == 0
+        assert _changes(feed)["business-logic.md"]["change"] == "added"
+
+    def test_no_changes(self, tmp_path):
+        """Test an empty feed for identical generations."""
+        table = _table(tmp_path, "old.md", OLD)
+
+        feed = diff_sections(table, table)
+
+        assert feed["changes"] == []
+        assert feed["summary"]["unchanged"] == len(table)
+
+
+class TestManifests:
+    """Test change feeds between manifests of previous runs."""
+
+    @pytest.mark.parametrize("kind", ["incremental", "cache"])
+    def test_manifest_feed(self, tmp_path, kind):
+        """Test that manifests give the same change types, without similarity."""
+        manifests = []
+        for name, content in (("old", OLD), ("new", NEW)):
+            input_file = tmp_path / f"{name}.md"
+            input_file.write_text(content)
+            output_dir = tmp_path / name
+            options = {"incremental": True}
+            manifest = output_dir / ".mcpdoc-manifest.json"
+            if kind == "cache":
+                manifest = tmp_path / f"{name}.manifest.json"
+                options = {"cache_manifest": str(manifest)}
+            generate_docs(
+                str(input_file), output_dir=str(output_dir),
+                toc_file=str(tmp_path / f"{name}.txt"), **options,
+            )
+            manifests.append(sections_from_manifest(str(manifest)))
+
+        feed = diff_sections(*manifests)
+        changes = _changes(feed)
+
+        assert changes["selectors.md"]["change"] == "modified"
+        assert "similarity" not in changes["selectors.md"]
+        # Without content, an edited and renamed section can't be paired
+        assert changes["business-logic.md"]["change"] == "added"
+        assert changes["services.md"]["change"] == "removed"
+
+    def test_rejects_other_json(self, tmp_path):
+        """Test that JSON files without sections are rejected."""
+        path = tmp_path / "other.json"
+        path.write_text(json.dumps({"version": 1}))
+        with pytest.raises(ValueError):
+            sections_from_manifest(str(path))
+
+
+class TestDiffCommand:
+    """Test the diff subcommand."""
+
+    def test_prints_feed(self, tmp_path):
+        """Test printing the change feed for two markdown files."""
+        (tmp_path / "old.md").write_text(OLD)
+        (tmp_path / "new.md").write_text(NEW)
+        argv = [
+            "mcpdoc-split", "diff", str(tmp_path / "old.md"), str(tmp_path / "new.md")
+        ]
+
+        with patch.object(sys, "argv", argv):
+            with patch.object(sys, "stdout", new=StringIO()) as mock_stdout:
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+
+        assert exc_info.value.code == 0
+        assert json.loads(mock_stdout.getvalue())["summary"]["renamed"] == 1
@@ -0,0 +1,193 @@
+"""Tests for mcpdoc_split.chunking module."""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from mcpdoc_split.chunking import chunk_sections
+from mcpdoc_split.main import (
+    build_toc,
+    collect_sections,
+    generate_docs,
+    get_parser,
+    render_section,
+)
+
+PARAGRAPH = " ".join(["Lorem ipsum dolor sit amet, consectetur adipiscing elit."] * 3)
+
+
+def _chunks(content, chunk_size, max_level=6, min_chunk_size=0, chunk_unit="bytes"):
+    tokens = get_parser("block").parse(content)
+    return chunk_sections(
+        tokens, content.split("\n"), max_level, chunk_size, min_chunk_size, chunk_unit
+    )
+
+
+def _summary(content, chunks):
+    lines = content.split("\n")
+    return [
+        (chunk["filename"], chunk["header"], render_section(chunk, lines))
+        for chunk in chunks
+    ]
+
+
+class TestChunkSections:
+    """Test the chunk_sections function."""
+
+    def test_sections_within_budget_are_unchanged(self):
+        """Test that a document that fits the budget keeps its sections."""
+        content = f"# One\n{PARAGRAPH}\n\n## Two\n{PARAGRAPH}\n"
+
+        chunks = _chunks(content, 10_000)
+
+        assert chunks == [
+            {**section, "anchors": []} for section in collect_sections(content)
+        ]
+
+    def test_splits_at_next_heading_level(self):
+        """Test that an oversized section is split at its deeper headings."""
+        content = (
+            f"# Guide\nIntro.\n\n## Alpha\n{PARAGRAPH}\n\n### Deep\nText.\n\n"
+            f"## Beta\n{PARAGRAPH}\n"
+        )
+
+        chunks = _chunks(content, 300, max_level=1)
+
+        assert [chunk["filename"] for chunk in chunks] == [
+            "guide.md", "alpha.md", "beta.md"
+        ]
+        assert [chunk["level"] for chunk in chunks] == [1, 2, 2]
+        assert _summary(content, chunks)[1][2].endswith("### Deep\nText.")
+
+    def test_splits_at_blocks_without_cutting_fences(self):
+        """Test splitting at block boundaries into numbered parts."""
+        fence = "```python\n" + "x = 1\n\ny = 2\n" * 20 + "```"
+        content = f"# Long\n{PARAGRAPH}\n\n{fence}\n\n{PARAGRAPH}\n"
+
+        chunks = _chunks(content, 250)
+        summary = _summary(content, chunks)
+
+        assert [(name, header) for name, header, _ in summary] == [
+            ("long.md", "Long"),
+            ("long-part-2.md", "Long (part 2)"),
+            ("long-part-3.md", "Long (part 3)"),
+        ]
+        # The fence is larger than the budget but stays in one piece
+        assert summary[1][2] == fence
+        assert "\n\n".join(text for _, _, text in summary) == content.strip()
+
+    def test_part_names_stay_unique(self):
+        """Test that part filenames don't clash with real headings."""
+        content = f"# Long\n{PARAGRAPH}\n\n{PARAGRAPH}\n\n# Long part 2\n{PARAGRAPH}\n"
+
+        chunks = _chunks(content, 200)
+
+        assert [chunk["filename"] for chunk in chunks] == [
+            "long.md", "long-part-2.md", "long-part-2-2.md"
+        ]
+
+    def test_merges_bare_parent_into_subsections(self):
+        """Test that undersized chunks are merged and listed as anchors."""
+        content = (
+            f"# Guide\n\n## Services\n\n### Create\n{PARAGRAPH}\n\n"
+            f"### Update\n{PARAGRAPH}\n\n### Delete\nText.\n"
+        )
+
+        chunks = _chunks(content, 1000, min_chunk_size=100)
+
+        assert [chunk["filename"] for chunk in chunks] == ["guide.md", "update.md"]
+        assert chunks[0]["anchors"] == [
+            {"header": "Services", "level": 2},
+            {"header": "Create", "level": 3},
+        ]
+        assert chunks[1]["anchors"] == [{"header": "Delete", "level": 3}]
+
+    def test_never_merges_into_deeper_chunk(self):
+        """Test that a chunk doesn't absorb a heading above its own level."""
+        content = "## Small\nText.\n\n# Top\nText.\n"
+
+        chunks = _chunks(content, 400, min_chunk_size=100)
+
+        assert [chunk["filename"] for chunk in chunks] == ["small.md", "top.md"]
+
+    def test_token_unit(self):
+        """Test that token budgets are estimated at four bytes per token."""
+        content = f"# One\n{PARAGRAPH}\n\n{PARAGRAPH}\n"
+
+        assert len(_chunks(content, 100, chunk_unit="tokens")) == 1
+        assert len(_chunks(content, 100, chunk_unit="bytes")) == 2
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {"chunk_size": 0},
+            {"chunk_size": 100, "min_chunk_size": 200},
+            {"chunk_size": 100, "chunk_unit": "words"},
+        ],
+    )
+    def test_invalid_options(self, options):
+        """Test validation of the budget."""
+        with pytest.raises(ValueError):
+            _chunks("# One\nText.\n", **options)
+
+
+class TestChunkedGeneration:
+    """Test generate_docs with a chunk budget."""
+
+    def test_toc_lists_every_heading(self):
+        """Test that merged headings stay in the TOC as anchor links."""
+        content = f"# Guide\n\n## Services\n\n### Create\n{PARAGRAPH}\n"
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = os.path.join(temp_dir, "input.md")
+            Path(input_file).write_text(content)
+            output_dir = os.path.join(temp_dir, "docs")
+            toc_file = os.path.join(temp_dir, "llms.txt")
+
+            result = generate_docs(
+                input_file, output_dir=output_dir, toc_file=toc_file,
+                chunk_size=1000, chunk_unit="bytes",
+            )
+
+            assert result.sections == 1
+            assert os.listdir(output_dir) == ["guide.md"]
+            assert Path(toc_file).read_text() == (
+                "# Table of Contents\n\n"
+                "- [Guide](https://example.com/docs/guide.md)\n"
+                "  - [Services](https://example.com/docs/guide.md#services)\n"
+                "    - [Create](https://example.com/docs/guide.md#create)\n"
+            )
+
+    def test_streaming_rejects_chunking(self, tmp_path):
+        """Test that streaming mode can't be combined with chunking."""
+        input_file = tmp_path / "input.md"
+        input_file.write_text("# One\nText.\n")
+        with pytest.raises(ValueError):
+            generate_docs(
+                str(input_file),
+                output_dir=str(tmp_path / "docs"),
+                toc_file=str(tmp_path / "llms.txt"),
+                streaming=True,
+                chunk_size=100,
+            )
+
+
+class TestBuildTocAnchors:
+    """Test TOC entries for headings inside another section file."""
+
+    def test_anchor_entries(self):
+        """Test that anchors link into the containing file."""
+        sections = [{
+            "filename": "a.md",
+            "header": "A",
+            "level": 1,
+            "anchors": [{"header": "Sub Part", "level": 2}],
+        }]
+
+        assert build_toc(sections, "https://x.org", "/d") == (
+            "# Table of Contents\n\n"
+            "- [A](https://x.org/d/a.md)\n"
+            "  - [Sub Part](https://x.org/d/a.md#sub-part)\n"
+        )
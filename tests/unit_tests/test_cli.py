@@ -1,5 +1,7 @@
 """Tests for mcpdoc_split.cli module."""
 
+import json
+import re
 import sys
 from unittest.mock import patch, MagicMock
 from io import StringIO
@@ -78,6 +80,58 @@ class TestParseArgs:
             assert args.max_level == 3
             assert args.toc_file == "toc.md"
 
+    def test_incremental_arg(self):
+        """Test parsing --incremental argument."""
+        with patch.object(sys, "argv", ["mcpdoc-split", "input.md"]):
+            assert parse_args().incremental is False
+
+        with patch.object(sys, "argv", ["mcpdoc-split", "input.md", "--incremental"]):
+            assert parse_args().incremental is True
+
+    def test_stats_arg(self):
+        """Test parsing --stats with and without a format."""
+        with patch.object(sys, "argv", ["mcpdoc-split", "input.md"]):
+            assert parse_args().stats is None
+
+        with patch.object(sys, "argv", ["mcpdoc-split", "input.md", "--stats"]):
+            assert parse_args().stats == "text"
+
+        with patch.object(
+            sys, "argv", ["mcpdoc-split", "input.md", "--stats", "json"]
+        ):
+            assert parse_args().stats == "json"
+
+    def test_chunk_args(self):
+        """Test parsing the chunk budget options."""
+        argv = [
+            "mcpdoc-split", "test.md", "--chunk-size", "2000", "--chunk-unit", "bytes",
+        ]
+        with patch.object(sys, "argv", argv):
+            args = parse_args()
+            assert args.chunk_size == 2000
+            assert args.min_chunk_size is None
+            assert args.chunk_unit == "bytes"
+
+        with patch.object(sys, "argv", ["mcpdoc-split", "test.md"]):
+            args = parse_args()
+            assert args.chunk_size is None
+            assert args.chunk_unit == "tokens"
+
+    def test_watch_args(self):
+        """Test parsing the watch mode options."""
+        with patch.object(sys, "argv", ["mcpdoc-split", "test.md"]):
+            args = parse_args()
+            assert args.watch is False
+            assert args.debounce == 50
+            assert args.poll is False
+
+        argv = ["mcpdoc-split", "test.md", "-w", "--debounce", "200", "--poll"]
+        with patch.object(sys, "argv", argv):
+            args = parse_args()
+            assert args.watch is True
+            assert args.debounce == 200
+            assert args.poll is True
+
     def test_version_arg(self):
         """Test parsing --version argument."""
         with patch.object(sys, "argv", ["mcpdoc-split", "--version"]):
@@ -112,6 +166,84 @@ class TestMain:
 
             mock_generate_docs.assert_called_once()
 
+    def test_stats_json_output(self, tmp_path):
+        """Test that --stats json prints only the result as JSON on stdout."""
+        input_file = tmp_path / "input.md"
+        input_file.write_text("# Title\nText.\n")
+        argv = [
+            "mcpdoc-split", str(input_file),
+            "--output-dir", str(tmp_path / "docs"),
+            "--toc-file", str(tmp_path / "llms.txt"),
+            "--stats", "json",
+        ]
+
+        with patch.object(sys, "argv", argv):
+            with patch.object(sys, "stdout", new=StringIO()) as mock_stdout:
+                with patch.object(sys, "stderr", new=StringIO()):
+                    main()
+
+        stats = json.loads(mock_stdout.getvalue())
+        assert stats["sections"] == 1
+        assert "parse" in stats["timings"]
+
+    def test_watch_splits_then_stops_on_interrupt(self, tmp_path):
+        """Test that --watch splits the input before watching it."""
+        input_file = tmp_path / "input.md"
+        input_file.write_text("# Title\nText.\n")
+        argv = [
+            "mcpdoc-split", str(input_file),
+            "--output-dir", str(tmp_path / "docs"),
+            "--toc-file", str(tmp_path / "llms.txt"),
+            "--watch",
+        ]
+
+        with patch.object(sys, "argv", argv):
+            with patch("mcpdoc_split.watch.watch", side_effect=KeyboardInterrupt):
+                with patch.object(sys, "stdout", new=StringIO()) as mock_stdout:
+                    with patch.object(sys, "stderr", new=StringIO()):
+                        with pytest.raises(SystemExit) as exc_info:
+                            main()
+
+        assert exc_info.value.code == 0
+        assert "Updated 1 sections" in mock_stdout.getvalue()
+        assert (tmp_path / "docs" / "title.md").read_text() == "# Title\nText."
+
+    def test_watch_rejects_streaming(self, tmp_path):
+        """Test that --watch and --streaming can't be combined."""
+        input_file = tmp_path / "input.md"
+        input_file.write_text("# Title\n")
+        argv = ["mcpdoc-split", str(input_file), "--watch", "--streaming"]
+
+        with patch.object(sys, "argv", argv):
+            with patch.object(sys, "stderr", new=StringIO()) as mock_stderr:
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+
+        assert exc_info.value.code == 1
+        assert "--streaming" in mock_stderr.getvalue()
+
+    def test_serve_subcommand(self, tmp_path):
+        """Test that serve answers MCP requests read from stdin."""
+        input_file = tmp_path / "input.md"
+        input_file.write_text("# Title\nText.\n")
+        request = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "tools/call",
+            "params": {"name": "get_section", "arguments": {"name": "title"}},
+        }
+
+        with patch.object(sys, "argv", ["mcpdoc-split", "serve", str(input_file)]):
+            with patch.object(sys, "stdin", new=StringIO(json.dumps(request) + "\n")):
+                with patch.object(sys, "stdout", new=StringIO()) as mock_stdout:
+                    with patch.object(sys, "stderr", new=StringIO()):
+                        with pytest.raises(SystemExit) as exc_info:
+                            main()
+
+        assert exc_info.value.code == 0
+        response = json.loads(mock_stdout.getvalue())
+        assert response["result"]["content"][0]["text"] == "# Title\nText."
+
     @patch("builtins.print")
     @patch("pathlib.Path.exists")
     def test_file_not_found(self, mock_exists, mock_print):
@@ -157,6 +289,19 @@ class TestMain:
                 except SystemExit as e:
                     assert e.code == 0
 
+    @pytest.mark.parametrize("argv", [["--help"], ["batch", "--help"]])
+    def test_help_shows_each_default_once(self, argv):
+        """Test that help text naming its default doesn't get a second one."""
+        with patch.object(sys, "argv", ["mcpdoc-split"] + argv):
+            with patch.object(sys, "stdout", new=StringIO()) as mock_stdout:
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+
+        assert exc_info.value.code == 0
+        output = " ".join(mock_stdout.getvalue().split())
+        assert "(default: number of CPUs)" in output
+        assert not re.search(r"\(default[^)]*\) \(default", output)
+
     def test_version_shows_splash(self):
         """Test that --version shows splash screen and version."""
         with patch.object(sys, "argv", ["mcpdoc-split", "--version"]):
@@ -0,0 +1,351 @@
+"""Tests for mcpdoc_split.daemon module."""
+
+import contextlib
+import os
+import sys
+import threading
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+
+from mcpdoc_split._version import __version__
+from mcpdoc_split.cli import main
+from mcpdoc_split.daemon import SplitDaemon, default_socket_path, request, serve
+from mcpdoc_split.main import generate_docs
+
+MARKDOWN = """# Guide
+Intro.
+
+## Models
+Model text with select_related.
+
+## Services
+Service text.
+"""
+
+
+@pytest.fixture
+def guide(tmp_path):
+    """Write the sample input and return its path."""
+    path = tmp_path / "guide.md"
+    path.write_text(MARKDOWN, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def running_daemon(tmp_path):
+    """Serve a daemon on a socket in a thread and return the socket path."""
+    socket_path = str(tmp_path / "daemon.sock")
+    ready = threading.Event()
+    thread = threading.Thread(
+        target=serve, args=(socket_path, None, lambda path: ready.set())
+    )
+    thread.start()
+    assert ready.wait(5)
+    yield socket_path
+    # Tests may have stopped it already
+    with contextlib.suppress(OSError):
+        request(socket_path, {"op": "shutdown"})
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def _split(daemon, tmp_path, name, **options):
+    return daemon.handle({
+        "op": "split",
+        "cwd": str(tmp_path),
+        "options": {
+            "input_file": "guide.md",
+            "output_dir": name,
+            "toc_file": f"{name}.txt",
+            **options,
+        },
+    })
+
+
+class TestSplitDaemon:
+    """Test the SplitDaemon request handler."""
+
+    def test_split_matches_local_run(self, tmp_path, guide):
+        """Test that a split job writes what generate_docs writes."""
+        generate_docs(
+            str(guide),
+            output_dir=str(tmp_path / "local"),
+            toc_file=str(tmp_path / "local.txt"),
+        )
+        response = _split(SplitDaemon(), tmp_path, "remote")
+
+        assert response["ok"], response
+        assert response["result"]["sections"] == 3
+        assert "Documentation generated successfully!" in response["output"]
+        for path in (tmp_path / "local").iterdir():
+            assert (tmp_path / "remote" / path.name).read_bytes() == path.read_bytes()
+        assert (tmp_path / "remote.txt").read_bytes() == (
+            tmp_path / "local.txt"
+        ).read_bytes()
+
+    def test_repeat_split_uses_warm_table(self, tmp_path, guide):
+        """Test that a second split of the same input doesn't parse."""
+        daemon = SplitDaemon()
+        assert _split(daemon, tmp_path, "a")["result"]["parse_cache_hit"] is False
+        with patch("mcpdoc_split.main.get_parser", side_effect=AssertionError):
+            response = _split(daemon, tmp_path, "b", url_prefix="https://b.example")
+        assert response["result"]["parse_cache_hit"] is True
+        assert "https://b.example" in (tmp_path / "b.txt").read_text()
+
+    def test_split_errors(self, tmp_path, guide):
+        """Test that invalid jobs are reported, not raised."""
+        daemon = SplitDaemon()
+        response = _split(daemon, tmp_path, "a", max_level=9)
+        assert response["ok"] is False
+        assert response["error_type"] == "ValueError"
+
+        response = _split(daemon, tmp_path, "a", backend="memory")
+        assert response == {
+            "ok": False,
+            "error": "unknown split options: backend",
+            "error_type": "ValueError",
+        }
+
+        response = daemon.handle({"op": "split", "options": {}})
+        assert "input_file" in response["error"]
+
+    def test_refuses_other_versions_and_ops(self):
+        """Test that clients of another version and unknown ops are refused."""
+        daemon = SplitDaemon()
+        response = daemon.handle({"op": "ping", "version": __version__ + ".dev"})
+        assert response["version_mismatch"] is True
+        assert daemon.handle({"op": "compile"})["error"] == "unknown op: 'compile'"
+        assert daemon.handle([])["ok"] is False
+
+    def test_sections(self, tmp_path, guide):
+        """Test returning a section table from the warm cache."""
+        daemon = SplitDaemon()
+        message = {
+            "op": "sections", "cwd": str(tmp_path), "input_file": "guide.md",
+            "max_level": 1,
+        }
+        first = daemon.handle(message)
+        assert [section["filename"] for section in first["sections"]] == ["guide.md"]
+        assert first["cached"] is False
+        assert daemon.handle(message)["cached"] is True
+
+    def test_search(self, tmp_path, guide):
+        """Test querying a search index, reloaded when it changes."""
+        daemon = SplitDaemon()
+        _split(daemon, tmp_path, "a", search_index="index.json")
+        message = {
+            "op": "search", "cwd": str(tmp_path), "index_file": "index.json",
+            "query": "select_related",
+        }
+        results = daemon.handle(message)["results"]
+        assert [result["header"] for result in results] == ["Models"]
+
+        guide.write_text(MARKDOWN.replace("select_related", "prefetch"))
+        _split(daemon, tmp_path, "a", search_index="index.json")
+        assert daemon.handle(message)["results"] == []
+
+
+class TestServe:
+    """Test the daemon over its Unix socket."""
+
+    def test_ping_and_shutdown(self, tmp_path):
+        """Test that the daemon answers and removes its socket on shutdown."""
+        socket_path = str(tmp_path / "daemon.sock")
+        ready = threading.Event()
+        thread = threading.Thread(
+            target=serve, args=(socket_path, None, lambda path: ready.set())
+        )
+        thread.start()
+        assert ready.wait(5)
+
+        response = request(socket_path, {"op": "ping"})
+        assert response["ok"] is True
+        assert response["pid"] == os.getpid()
+        assert oct(os.stat(socket_path).st_mode & 0o777) == "0o600"
+
+        assert request(socket_path, {"op": "shutdown"}) == {"ok": True}
+        thread.join(5)
+        assert not thread.is_alive()
+        assert not os.path.exists(socket_path)
+        assert request(socket_path, {"op": "ping"}) is None
+
+    def test_default_socket_in_private_directory(self, tmp_path, monkeypatch):
+        """Test that the default socket gets a directory only its owner uses."""
+        monkeypatch.delenv("MCPDOC_SPLIT_SOCKET", raising=False)
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        socket_path = default_socket_path()
+        directory = os.path.dirname(socket_path)
+        assert directory == str(tmp_path / f"mcpdoc-split-{os.getuid()}")
+
+        ready = threading.Event()
+        thread = threading.Thread(
+            target=serve, args=(None, None, lambda path: ready.set())
+        )
+        thread.start()
+        assert ready.wait(5)
+        assert oct(os.stat(directory).st_mode & 0o777) == "0o700"
+        request(socket_path, {"op": "shutdown"})
+        thread.join(5)
+
+        os.chmod(directory, 0o755)
+        with pytest.raises(PermissionError, match="accessible to other users"):
+            serve()
+
+    def test_refuses_socket_of_another_user(self, running_daemon):
+        """Test that nothing is sent to a socket owned by someone else."""
+        with patch("mcpdoc_split.daemon.os.getuid", return_value=os.getuid() + 1):
+            with pytest.raises(PermissionError, match="owned by another user"):
+                request(running_daemon, {"op": "shutdown"})
+        assert request(running_daemon, {"op": "ping"})["ok"] is True
+
+    def test_refuses_second_daemon(self, running_daemon):
+        """Test that a second daemon can't take over a live socket."""
+        with pytest.raises(OSError, match="already listening"):
+            serve(running_daemon)
+
+    def test_replaces_stale_socket(self, tmp_path):
+        """Test that a socket file left behind by a dead daemon is reused."""
+        socket_path = tmp_path / "daemon.sock"
+        socket_path.write_text("")
+        ready = threading.Event()
+        thread = threading.Thread(
+            target=serve, args=(str(socket_path), None, lambda path: ready.set())
+        )
+        thread.start()
+        assert ready.wait(5)
+        assert request(str(socket_path), {"op": "ping"})["ok"] is True
+        request(str(socket_path), {"op": "shutdown"})
+        thread.join(5)
+
+    def test_concurrent_jobs_capture_their_own_output(
+        self, tmp_path, guide, running_daemon
+    ):
+        """Test that jobs on parallel connections get only their own output."""
+        responses = {}
+
+        def split(name):
+            responses[name] = request(running_daemon, {
+                "op": "split",
+                "cwd": str(tmp_path),
+                "options": {
+                    "input_file": "guide.md",
+                    "output_dir": name,
+                    "toc_file": f"{name}.txt",
+                },
+            })
+
+        threads = [
+            threading.Thread(target=split, args=(f"out{number}",))
+            for number in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        for name, response in responses.items():
+            assert response["ok"], response
+            assert response["output"].count("Files saved to:") == 1
+            assert f"{name}.txt" in response["output"]
+        assert len(responses) == 4
+
+
+class TestDaemonCli:
+    """Test forwarding from the CLI to a running daemon."""
+
+    def _run(self, argv):
+        with patch.object(sys, "argv", ["mcpdoc-split", *argv]):
+            with patch.object(sys, "stdout", new=StringIO()) as stdout:
+                main()
+        return stdout.getvalue()
+
+    def test_forwards_to_daemon(self, tmp_path, guide, running_daemon, monkeypatch):
+        """Test that the CLI runs the split on the daemon, paths relative."""
+        monkeypatch.chdir(tmp_path)
+        with patch("mcpdoc_split.cli.generate_docs", side_effect=AssertionError):
+            output = self._run(
+                ["guide.md", "--daemon-socket", running_daemon, "--stats"]
+            )
+        assert "Documentation generated successfully!" in output
+        assert "Sections:        3" in output
+        assert (tmp_path / "docs" / "models.md").exists()
+        assert (tmp_path / "llms.txt").exists()
+        assert request(running_daemon, {"op": "ping"})["jobs"] >= 2
+
+    def test_daemon_errors_are_reported(
+        self, tmp_path, guide, running_daemon, monkeypatch
+    ):
+        """Test that a failed forwarded split exits with the error."""
+        monkeypatch.chdir(tmp_path)
+        argv = [
+            "mcpdoc-split", str(guide), "--daemon-socket", running_daemon,
+            "--chunk-size", "-1",
+        ]
+        with patch.object(sys, "argv", argv):
+            with patch.object(sys, "stdout", new=StringIO()):
+                with patch.object(sys, "stderr", new=StringIO()) as stderr:
+                    with pytest.raises(SystemExit):
+                        main()
+        assert "Error: chunk_size must be at least 1" in stderr.getvalue()
+
+    def test_runs_locally_without_daemon(self, tmp_path, guide):
+        """Test that the CLI splits itself when no daemon is listening."""
+        self._run([
+            str(guide), "--daemon-socket", str(tmp_path / "missing.sock"),
+            "--output-dir", str(tmp_path / "docs"),
+            "--toc-file", str(tmp_path / "llms.txt"),
+        ])
+        assert (tmp_path / "docs" / "models.md").exists()
+
+    def test_forwarding_is_opt_in(self, tmp_path, guide, running_daemon, monkeypatch):
+        """Test that a running daemon is only used when asked for."""
+        monkeypatch.setenv("MCPDOC_SPLIT_SOCKET", running_daemon)
+        argv = [
+            str(guide),
+            "--output-dir", str(tmp_path / "docs"),
+            "--toc-file", str(tmp_path / "llms.txt"),
+        ]
+        self._run(argv)
+        assert request(running_daemon, {"op": "ping"})["jobs"] == 1
+        self._run([*argv, "--daemon"])
+        assert request(running_daemon, {"op": "ping"})["jobs"] == 3
+
+    def test_other_users_daemon_is_not_used(
+        self, tmp_path, guide, running_daemon, capsys
+    ):
+        """Test that the CLI splits itself rather than trust another user."""
+        argv = [
+            "mcpdoc-split", str(guide), "--daemon-socket", running_daemon,
+            "--output-dir", str(tmp_path / "docs"),
+            "--toc-file", str(tmp_path / "llms.txt"),
+        ]
+        with patch.object(sys, "argv", argv):
+            with patch("mcpdoc_split.daemon.os.getuid", return_value=os.getuid() + 1):
+                main()
+        assert "Not forwarding to the daemon" in capsys.readouterr().err
+        assert (tmp_path / "docs" / "models.md").exists()
+        assert request(running_daemon, {"op": "ping"})["jobs"] == 1
+
+    def test_no_daemon(self, tmp_path, guide, running_daemon):
+        """Test that --no-daemon splits locally even with a daemon running."""
+        self._run([
+            str(guide), "--daemon-socket", running_daemon, "--no-daemon",
+            "--output-dir", str(tmp_path / "docs"),
+            "--toc-file", str(tmp_path / "llms.txt"),
+        ])
+        assert (tmp_path / "docs" / "models.md").exists()
+        assert request(running_daemon, {"op": "ping"})["jobs"] == 1
+
+    def test_status_and_stop(self, running_daemon, capsys):
+        """Test the --status and --stop options of the daemon subcommand."""
+        for action in ("--status", "--stop"):
+            argv = ["mcpdoc-split", "daemon", "--socket", running_daemon, action]
+            with patch.object(sys, "argv", argv):
+                with pytest.raises(SystemExit) as exit_info:
+                    main()
+            assert exit_info.value.code == 0
+        output = capsys.readouterr().out
+        assert '"version"' in output
+        assert "Stopped the daemon" in output
@@ -0,0 +1,195 @@
+"""Tests for mcpdoc_split.database module."""
+
+import os
+import sqlite3
+import sys
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+
+from mcpdoc_split.cli import main
+from mcpdoc_split.database import SectionDatabase, SqliteBackend, section_slug
+from mcpdoc_split.main import generate_docs
+
+MARKDOWN = """# Guide
+Intro.
+
+## Setup
+Use select_related for foreign keys.
+
+### Install
+Install text.
+
+## Models
+Model text.
+
+### Setup
+Repeated header.
+
+# Reference
+Reference text.
+"""
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Split MARKDOWN into a database and return its path."""
+    input_file = tmp_path / "guide.md"
+    input_file.write_text(MARKDOWN, encoding="utf-8")
+    db_path = tmp_path / "docs.sqlite"
+    backend = SqliteBackend(str(db_path))
+    generate_docs(
+        str(input_file),
+        output_dir=str(tmp_path / "docs"),
+        toc_file=str(tmp_path / "llms.txt"),
+        backend=backend,
+    )
+    backend.close()
+    return db_path
+
+
+class TestSqliteBackend:
+    """Test writing sections into a SQLite database."""
+
+    def test_section_rows(self, tmp_path, database):
+        """Test that every section is a row with its parent and content."""
+        with sqlite3.connect(database) as conn:
+            rows = conn.execute(
+                "SELECT ordinal, slug, header, level, parent FROM sections "
+                "ORDER BY ordinal"
+            ).fetchall()
+        assert rows == [
+            (1, "guide", "Guide", 1, None),
+            (2, "setup", "Setup", 2, "guide"),
+            (3, "install", "Install", 3, "setup"),
+            (4, "models", "Models", 2, "guide"),
+            (5, "setup-2", "Setup", 3, "models"),
+            (6, "reference", "Reference", 1, None),
+        ]
+
+    def test_toc_still_written(self, tmp_path, database):
+        """Test that the TOC goes to disk while section files don't."""
+        assert "setup-2.md" in (tmp_path / "llms.txt").read_text(encoding="utf-8")
+        assert not (tmp_path / "docs").exists()
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_content_matches_files(self, tmp_path, database):
+        """Test that row content and digests match a filesystem split."""
+        input_file = tmp_path / "guide.md"
+        generate_docs(
+            str(input_file),
+            output_dir=str(tmp_path / "files"),
+            toc_file=str(tmp_path / "files.txt"),
+            cache_manifest=str(tmp_path / "manifest.json"),
+        )
+        manifest = (tmp_path / "manifest.json").read_text(encoding="utf-8")
+        db = SectionDatabase(str(database))
+        try:
+            for path in (tmp_path / "files").iterdir():
+                section = db.get(section_slug(path.name))
+                assert section["content"] == path.read_text(encoding="utf-8")
+                assert section["digest"] in manifest
+        finally:
+            db.close()
+
+
+    def test_abort(self, tmp_path):
+        """Test that an aborted database leaves no file behind."""
+        db_path = tmp_path / "docs.sqlite"
+        backend = SqliteBackend(str(db_path))
+        backend.write_section(
+            "docs/a.md", {"filename": "a.md", "header": "A", "level": 1}, b"# A"
+        )
+        backend.abort()
+        backend.abort()
+        assert os.listdir(tmp_path) == []
+
+
+class TestSectionDatabase:
+    """Test lookups in a section database."""
+
+    def test_get(self, database):
+        """Test looking a section up by slug."""
+        db = SectionDatabase(str(database))
+        assert db.get("install")["content"] == "### Install\nInstall text."
+        assert db.get("missing") is None
+        db.close()
+
+    def test_children(self, database):
+        """Test listing sections by parent."""
+        db = SectionDatabase(str(database))
+        assert [row["slug"] for row in db.children()] == ["guide", "reference"]
+        assert [row["slug"] for row in db.children("guide")] == ["setup", "models"]
+        db.close()
+
+    def test_search(self, database):
+        """Test full-text search over headers and content."""
+        db = SectionDatabase(str(database))
+        assert [row["slug"] for row in db.search("select_related")] == ["setup"]
+        assert {row["slug"] for row in db.search("setup")} == {"setup", "setup-2"}
+        with pytest.raises(ValueError, match="Invalid search query"):
+            db.search('"unterminated')
+        db.close()
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test that files that aren't section databases are rejected."""
+        with pytest.raises(FileNotFoundError):
+            SectionDatabase(str(tmp_path / "missing.sqlite"))
+        other = tmp_path / "other.sqlite"
+        sqlite3.connect(other).close()
+        with pytest.raises(ValueError, match="Unsupported"):
+            SectionDatabase(str(other))
+
+
+class TestDatabaseCli:
+    """Test the --database option."""
+
+    def test_database_option(self, tmp_path):
+        """Test storing the sections of a CLI run in a database."""
+        input_file = tmp_path / "guide.md"
+        input_file.write_text(MARKDOWN, encoding="utf-8")
+        argv = [
+            "mcpdoc-split", str(input_file),
+            "--output-dir", str(tmp_path / "docs"),
+            "--toc-file", str(tmp_path / "llms.txt"),
+            "--database", str(tmp_path / "docs.sqlite"),
+        ]
+        with patch.object(sys, "argv", argv):
+            with patch.object(sys, "stdout", new=StringIO()):
+                main()
+        db = SectionDatabase(str(tmp_path / "docs.sqlite"))
+        assert len(db.children()) == 2
+        db.close()
+        assert (tmp_path / "llms.txt").exists()
+
+    def _fail(self, tmp_path, flags):
+        input_file = tmp_path / "guide.md"
+        input_file.write_text(MARKDOWN, encoding="utf-8")
+        argv = [
+            "mcpdoc-split", str(input_file),
+            "--output-dir", str(tmp_path / "docs"),
+            "--toc-file", str(tmp_path / "llms.txt"),
+            "--database", str(tmp_path / "docs.sqlite"),
+            *flags,
+        ]
+        with patch.object(sys, "argv", argv):
+            with patch.object(sys, "stdout", new=StringIO()):
+                with patch.object(sys, "stderr", new=StringIO()) as stderr:
+                    with pytest.raises(SystemExit):
+                        main()
+        assert sorted(os.listdir(tmp_path)) == ["guide.md"]
+        return stderr.getvalue()
+
+    @pytest.mark.parametrize(
+        "flags", [["--incremental"], ["--streaming"], ["--target", "max_level=1"]]
+    )
+    def test_rejects_filesystem_only_options(self, tmp_path, flags):
+        """Test that bad combinations fail before the database is created."""
+        error = self._fail(tmp_path, flags)
+        assert f"--database can't be combined with {flags[0]}" in error
+
+    def test_failed_run_removes_temporary_database(self, tmp_path):
+        """Test that a run failing after the database was started cleans up."""
+        error = self._fail(tmp_path, ["--chunk-size", "-1"])
+        assert "chunk_size must be at least 1" in error
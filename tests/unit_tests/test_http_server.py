@@ -0,0 +1,315 @@
+"""Tests for mcpdoc_split.http_server module."""
+
+import asyncio
+import gzip
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from mcpdoc_split import http_server
+from mcpdoc_split.cli import main
+from mcpdoc_split.http_server import (
+    DocsHTTPServer,
+    accepts_gzip,
+    parse_range,
+    rewrite_toc,
+)
+
+SECTION = ("Service text with select_related. " * 40).encode("utf-8")
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Write a small split and return a loaded server for it."""
+    docs = tmp_path / "docs"
+    (docs / "guide").mkdir(parents=True)
+    (docs / "services.md").write_bytes(SECTION)
+    (docs / "guide" / "intro.md").write_bytes(b"Intro.\n")
+    toc = tmp_path / "llms.txt"
+    toc.write_text(
+        "# Guide\n\n"
+        "- [Services](https://example.com/docs/services.md)\n"
+        "- [Other](https://other.example/docs/intro.md)\n",
+        encoding="utf-8",
+    )
+    server = DocsHTTPServer(
+        output_dir=str(docs),
+        toc_file=str(toc),
+        public_url="http://mirror.test:8000/",
+    )
+    server.reload()
+    return server
+
+
+class TestHelpers:
+    """Test header parsing and TOC rewriting."""
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ("bytes=0-9", (0, 9)),
+            ("bytes=10-", (10, 99)),
+            ("bytes=-10", (90, 99)),
+            ("bytes=-500", (0, 99)),
+            ("bytes=90-500", (90, 99)),
+            ("bytes = 5 - 6", (5, 6)),
+            ("items=0-9", None),
+            ("bytes=0-1,5-6", None),
+            ("bytes=9-0", None),
+            ("bytes=-", None),
+            ("bytes=a-b", None),
+            ("bytes=5", None),
+        ],
+    )
+    def test_parse_range(self, header, expected):
+        """Test single byte ranges and the headers that are ignored."""
+        assert parse_range(header, 100) == expected
+
+    @pytest.mark.parametrize("header", ["bytes=100-", "bytes=-0", "bytes=200-300"])
+    def test_unsatisfiable_range(self, header):
+        """Test that ranges outside the body raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_range(header, 100)
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ("gzip, deflate, br", True),
+            ("br;q=1.0, gzip;q=0.5", True),
+            ("gzip;q=0", False),
+            ("*", True),
+            ("*;q=0", False),
+            ("identity", False),
+            ("", False),
+        ],
+    )
+    def test_accepts_gzip(self, header, expected):
+        """Test Accept-Encoding negotiation."""
+        assert accepts_gzip(header) is expected
+
+    def test_rewrite_toc(self):
+        """Test that only links under the generated prefix are rewritten."""
+        toc = (
+            b"- [A](https://example.com/docs/a.md)\n"
+            b"- [B](https://other.example/docs/b.md)\n"
+        )
+        rewritten = rewrite_toc(
+            toc, "https://example.com", "/docs", "http://localhost:8000"
+        )
+        assert rewritten == (
+            b"- [A](http://localhost:8000/docs/a.md)\n"
+            b"- [B](https://other.example/docs/b.md)\n"
+        )
+
+
+class TestRespond:
+    """Test answering requests from the loaded files."""
+
+    def test_serves_toc_and_sections(self, server):
+        """Test the routes and the rewritten TOC."""
+        assert set(server.resources) == {
+            "/", "/llms.txt", "/docs/services.md", "/docs/guide/intro.md",
+        }
+        status, headers, body = server.respond("GET", "/", {})
+        assert status == 200
+        assert b"(http://mirror.test:8000/docs/services.md)" in bytes(body)
+        assert b"(https://other.example/docs/intro.md)" in bytes(body)
+        assert dict(headers)["Content-Type"] == "text/plain; charset=utf-8"
+
+        status, headers, body = server.respond("GET", "/docs/guide/intro.md?x=1", {})
+        assert (status, body) == (200, b"Intro.\n")
+        assert dict(headers)["Content-Type"] == "text/markdown; charset=utf-8"
+        assert "Vary" not in dict(headers)
+
+    def test_gzip(self, server):
+        """Test that gzip is negotiated, with its own entity tag."""
+        _, plain_headers, _ = server.respond("GET", "/docs/services.md", {})
+        # Files are compressed when loaded, not while answering
+        with patch("gzip.compress", side_effect=AssertionError):
+            status, headers, body = server.respond(
+                "GET", "/docs/services.md", {"accept-encoding": "gzip"}
+            )
+        headers = dict(headers)
+        assert status == 200
+        assert headers["Content-Encoding"] == "gzip"
+        assert headers["Vary"] == "Accept-Encoding"
+        assert headers["Content-Length"] == str(len(body))
+        assert gzip.decompress(body) == SECTION
+        assert headers["ETag"] != dict(plain_headers)["ETag"]
+
+        # Tiny files are never compressed
+        _, headers, _ = server.respond(
+            "GET", "/docs/guide/intro.md", {"accept-encoding": "gzip"}
+        )
+        assert "Content-Encoding" not in dict(headers)
+
+    def test_not_modified(self, server):
+        """Test If-None-Match against the tag of each representation."""
+        _, headers, _ = server.respond(
+            "GET", "/docs/services.md", {"accept-encoding": "gzip"}
+        )
+        etag = dict(headers)["ETag"]
+        status, headers, body = server.respond(
+            "GET", "/docs/services.md",
+            {"accept-encoding": "gzip", "if-none-match": f'"other", W/{etag}'},
+        )
+        assert (status, headers, body) == (304, [("ETag", etag)], b"")
+
+        # The gzip tag doesn't validate the uncompressed representation
+        status, _, _ = server.respond(
+            "GET", "/docs/services.md", {"if-none-match": etag}
+        )
+        assert status == 200
+
+    def test_range(self, server):
+        """Test partial responses on the uncompressed bytes."""
+        _, headers, _ = server.respond("GET", "/docs/services.md", {})
+        etag = dict(headers)["ETag"]
+        status, headers, body = server.respond(
+            "GET", "/docs/services.md",
+            {"range": "bytes=0-6", "accept-encoding": "gzip", "if-range": etag},
+        )
+        headers = dict(headers)
+        assert (status, body) == (206, b"Service")
+        assert headers["Content-Range"] == f"bytes 0-6/{len(SECTION)}"
+        assert "Content-Encoding" not in headers
+
+        # A stale If-Range gets the full body
+        status, _, body = server.respond(
+            "GET", "/docs/services.md", {"range": "bytes=0-6", "if-range": '"old"'}
+        )
+        assert (status, body) == (200, SECTION)
+
+        status, headers, _ = server.respond(
+            "GET", "/docs/services.md", {"range": "bytes=99999-"}
+        )
+        assert status == 416
+        assert dict(headers)["Content-Range"] == f"bytes */{len(SECTION)}"
+
+    def test_head_and_errors(self, server):
+        """Test HEAD, unknown paths and unsupported methods."""
+        status, headers, body = server.respond("HEAD", "/docs/services.md", {})
+        assert (status, body) == (200, b"")
+        assert dict(headers)["Content-Length"] == str(len(SECTION))
+
+        assert server.respond("GET", "/docs/missing.md", {})[0] == 404
+        status, headers, _ = server.respond("POST", "/", {})
+        assert status == 405
+        assert ("Allow", "GET, HEAD") in headers
+        assert server.requests == 3
+
+    def test_reload(self, server, tmp_path, monkeypatch):
+        """Test that reload picks up changes, memory-mapping large files."""
+        monkeypatch.setattr(http_server, "MMAP_THRESHOLD", 100)
+        (tmp_path / "docs" / "new.md").write_text("New.\n")
+        assert server.reload() == 4
+        resource = server.resources["/docs/services.md"]
+        assert resource.mapping is not None
+        status, _, body = server.respond("GET", "/docs/services.md", {})
+        assert (status, body) == (200, SECTION)
+        # The body is a view of the map, not a copy
+        assert body.obj is resource.mapping
+        assert server.respond("GET", "/docs/new.md", {})[2] == b"New.\n"
+
+        # A map still used by a response stays open across a reload
+        server.reload()
+        assert not resource.mapping.closed
+        assert bytes(body) == SECTION
+        body.release()
+        assert bytes(server.respond("GET", "/docs/services.md", {})[2]) == SECTION
+
+    def test_reload_skips_hidden_files_and_sidecars(self, server, tmp_path):
+        """Test that manifests, sidecars and temporary files aren't served."""
+        docs = tmp_path / "docs"
+        (docs / ".mcpdoc-manifest.json").write_text("{}")
+        (docs / ".cache").mkdir()
+        (docs / ".cache" / "state.md").write_text("State.")
+        for name in ("services.md.gz", "services.md.br", "services.md.zst"):
+            (docs / name).write_bytes(b"packed")
+        (docs / "services.md.123.tmp").write_bytes(b"partial")
+        assert server.reload() == 3
+        assert set(server.resources) == {
+            "/", "/llms.txt", "/docs/services.md", "/docs/guide/intro.md",
+        }
+
+    def test_missing_output_dir(self, tmp_path):
+        """Test that loading a missing directory raises FileNotFoundError."""
+        server = DocsHTTPServer(output_dir=str(tmp_path / "missing"))
+        with pytest.raises(FileNotFoundError, match="Output directory not found"):
+            server.reload()
+
+
+class TestConnection:
+    """Test the server over a real socket."""
+
+    async def _exchange(self, server, payload: bytes) -> bytes:
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(payload)
+            await writer.drain()
+            data = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            return data
+        finally:
+            listener.close()
+            await listener.wait_closed()
+
+    def test_keep_alive(self, tmp_path, server):
+        """Test several requests on one connection, closed by the last one."""
+        server.public_url = None
+        data = asyncio.run(self._exchange(server, (
+            b"GET /docs/guide/intro.md HTTP/1.1\r\nHost: x\r\n\r\n"
+            b"HEAD / HTTP/1.1\r\nHost: x\r\n\r\n"
+            b"GET /missing HTTP/1.1\r\nConnection: close\r\n\r\n"
+            b"GET / HTTP/1.1\r\n\r\n"
+        )))
+        responses = data.split(b"HTTP/1.1 ")[1:]
+        assert [response[:3] for response in responses] == [b"200", b"200", b"404"]
+        assert responses[0].endswith(b"\r\n\r\nIntro.\n")
+        assert b"Connection: close" in responses[2]
+        # The TOC links point at the address the server is bound to
+        assert server.public_url.startswith("http://127.0.0.1:")
+
+    def test_http_1_0_and_bad_requests(self, server):
+        """Test that HTTP/1.0 and malformed requests close the connection."""
+        data = asyncio.run(self._exchange(
+            server, b"GET / HTTP/1.0\r\n\r\nGET / HTTP/1.0\r\n\r\n"
+        ))
+        assert data.count(b"HTTP/1.0 200 OK") == 1
+
+        data = asyncio.run(self._exchange(server, b"GET /\r\n\r\n"))
+        assert data.startswith(b"HTTP/1.1 400 Bad Request")
+        assert b"Connection: close" in data
+
+    def test_large_body_is_rejected(self, server):
+        """Test that an oversized request body is refused without reading it."""
+        data = asyncio.run(self._exchange(
+            server,
+            b"POST / HTTP/1.1\r\nContent-Length: 1000000000000\r\n\r\n",
+        ))
+        assert data.startswith(b"HTTP/1.1 413 ")
+        assert b"Connection: close" in data
+
+        data = asyncio.run(self._exchange(
+            server,
+            b"POST / HTTP/1.1\r\nContent-Length: 5\r\n\r\nhello"
+            b"GET / HTTP/1.1\r\nConnection: close\r\n\r\n",
+        ))
+        assert data.startswith(b"HTTP/1.1 405")
+        assert b"HTTP/1.1 200 OK" in data
+
+
+class TestHttpCli:
+    """Test the http subcommand."""
+
+    def test_missing_output_dir(self, tmp_path, capsys):
+        """Test that a missing output directory fails before serving."""
+        argv = ["mcpdoc-split", "http", "-o", str(tmp_path / "missing"), "--port", "0"]
+        with patch.object(sys, "argv", argv):
+            with pytest.raises(SystemExit) as exit_info:
+                main()
+        assert exit_info.value.code == 1
+        assert "Output directory not found" in capsys.readouterr().err
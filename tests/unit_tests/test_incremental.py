@@ -0,0 +1,186 @@
+"""Tests for mcpdoc_split.incremental module."""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from mcpdoc_split.incremental import (
+    MANIFEST_FILENAME,
+    load_manifest,
+    sync_sections,
+    write_if_changed,
+)
+from mcpdoc_split.main import generate_docs
+
+MARKDOWN = """# Introduction
+Intro text.
+
+## Installation
+Install it.
+
+## Usage
+Use it.
+"""
+
+
+def _section(filename, header="Header", level=1, start_line=0, end_line=1):
+    return {
+        "filename": filename,
+        "header": header,
+        "level": level,
+        "start_line": start_line,
+        "end_line": end_line,
+    }
+
+
+class TestWriteIfChanged:
+    """Test the write_if_changed function."""
+
+    def test_writes_new_file(self):
+        """Test that a missing file is written."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "a.md")
+            assert write_if_changed(path, "content") is True
+            assert Path(path).read_text() == "content"
+
+    def test_skips_identical_content(self):
+        """Test that identical content is not rewritten."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "a.md")
+            write_if_changed(path, "content")
+            assert write_if_changed(path, "content") is False
+            assert write_if_changed(path, "changed") is True
+
+
+class TestSyncSections:
+    """Test the sync_sections function."""
+
+    def test_first_run_writes_everything(self):
+        """Test that all sections are written without a manifest."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            stats = sync_sections(
+                [(_section("a.md"), "# A"), (_section("b.md"), "# B")], temp_dir
+            )
+
+            assert stats == {
+                "written": 2, "renamed": 0, "deleted": 0, "unchanged": 0,
+                "bytes_written": 6,
+            }
+            manifest = load_manifest(temp_dir)
+            assert set(manifest) == {"a.md", "b.md"}
+            assert manifest["a.md"]["size"] == 3
+
+    def test_unchanged_sections_are_not_touched(self):
+        """Test that sections with matching digests keep their mtime."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            rendered = [(_section("a.md"), "# A"), (_section("b.md"), "# B")]
+            sync_sections(rendered, temp_dir)
+            path = os.path.join(temp_dir, "a.md")
+            os.utime(path, (0, 0))
+
+            stats = sync_sections(
+                [(_section("a.md"), "# A"), (_section("b.md"), "# B changed")],
+                temp_dir,
+            )
+
+            assert stats == {
+                "written": 1, "renamed": 0, "deleted": 0, "unchanged": 1,
+                "bytes_written": 11,
+            }
+            assert os.path.getmtime(path) == 0
+            assert Path(temp_dir, "b.md").read_text() == "# B changed"
+
+    def test_renamed_and_deleted_sections(self):
+        """Test that moved content is renamed and stale files are removed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sync_sections(
+                [(_section("a.md"), "# A"), (_section("b.md"), "# B")], temp_dir
+            )
+
+            stats = sync_sections([(_section("c.md"), "# A")], temp_dir)
+
+            assert stats == {
+                "written": 0, "renamed": 1, "deleted": 1, "unchanged": 0,
+                "bytes_written": 0,
+            }
+            assert sorted(p.name for p in Path(temp_dir).glob("*.md")) == ["c.md"]
+            assert Path(temp_dir, "c.md").read_text() == "# A"
+
+    def test_bootstraps_from_existing_files(self):
+        """Test that files from a full run are reused without a manifest."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            Path(temp_dir, "a.md").write_text("# A")
+            Path(temp_dir, "old.md").write_text("# Old")
+
+            stats = sync_sections([(_section("a.md"), "# A")], temp_dir)
+
+            assert stats == {
+                "written": 0, "renamed": 0, "deleted": 1, "unchanged": 1,
+                "bytes_written": 0,
+            }
+            assert not Path(temp_dir, "old.md").exists()
+
+    def test_corrupt_manifest_is_ignored(self):
+        """Test that an unreadable manifest falls back to scanning the directory."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            Path(temp_dir, MANIFEST_FILENAME).write_text("not json")
+            assert load_manifest(temp_dir) is None
+
+            stats = sync_sections([(_section("a.md"), "# A")], temp_dir)
+            assert stats["written"] == 1
+            data = json.loads(Path(temp_dir, MANIFEST_FILENAME).read_text())
+            assert data["sections"][0]["filename"] == "a.md"
+
+
+class TestIncrementalGenerateDocs:
+    """Test generate_docs with incremental=True."""
+
+    def test_matches_full_generation(self):
+        """Test that incremental output matches a full regeneration."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = os.path.join(temp_dir, "input.md")
+            Path(input_file).write_text(MARKDOWN)
+            full_dir = os.path.join(temp_dir, "full")
+            inc_dir = os.path.join(temp_dir, "inc")
+
+            generate_docs(
+                input_file, output_dir=full_dir,
+                toc_file=os.path.join(temp_dir, "full.txt"),
+            )
+            generate_docs(
+                input_file, output_dir=inc_dir,
+                toc_file=os.path.join(temp_dir, "inc.txt"), incremental=True,
+            )
+
+            for path in Path(full_dir).glob("*.md"):
+                assert Path(inc_dir, path.name).read_text() == path.read_text()
+            assert (
+                Path(temp_dir, "inc.txt").read_text()
+                == Path(temp_dir, "full.txt").read_text()
+            )
+
+    def test_only_changed_sections_are_rewritten(self):
+        """Test that a second run only touches the edited section and TOC."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = os.path.join(temp_dir, "input.md")
+            output_dir = os.path.join(temp_dir, "docs")
+            toc_file = os.path.join(temp_dir, "llms.txt")
+            Path(input_file).write_text(MARKDOWN)
+            generate_docs(
+                input_file, output_dir=output_dir, toc_file=toc_file,
+                incremental=True,
+            )
+            for path in list(Path(output_dir).glob("*.md")) + [Path(toc_file)]:
+                os.utime(path, (0, 0))
+
+            Path(input_file).write_text(MARKDOWN.replace("Use it.", "Use it well."))
+            generate_docs(
+                input_file, output_dir=output_dir, toc_file=toc_file,
+                incremental=True,
+            )
+
+            assert os.path.getmtime(os.path.join(output_dir, "introduction.md")) == 0
+            assert os.path.getmtime(os.path.join(output_dir, "installation.md")) == 0
+            assert os.path.getmtime(toc_file) == 0
+            assert Path(output_dir, "usage.md").read_text() == "## Usage\nUse it well."
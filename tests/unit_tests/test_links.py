@@ -0,0 +1,242 @@
+"""Tests for mcpdoc_split.links module."""
+
+import json
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from mcpdoc_split.cli import main
+from mcpdoc_split.links import AnchorRewriter, attach_link_targets
+from mcpdoc_split.main import (
+    collect_sections,
+    generate_docs,
+    get_parser,
+    heading_starts,
+)
+
+MARKDOWN = """# Guide
+See [Services](#services) and [the rules](#model-rules "Rules").
+Also [missing](#nowhere), [top](#) and [elsewhere](https://x.test/#services).
+
+```python
+# [not a link](#services)
+```
+
+Inline `[code](#services)` stays.
+
+## Models
+[back](#guide), [second setup](#setup-1) and [encoded](#Model%2Drules).
+
+### Model rules
+Text.
+
+### Setup
+First setup.
+
+## Services
+<a href="#models">models</a>
+
+### Setup
+Second setup.
+
+[ref]: #model-rules
+"""
+
+URL = "https://example.com/docs"
+
+
+def _rewriter(content=MARKDOWN, max_level=2):
+    sections = collect_sections(content, max_level)
+    tokens = get_parser().parse(content)
+    attach_link_targets(sections, heading_starts(tokens, 6))
+    return sections, AnchorRewriter(sections, "https://example.com", "/docs")
+
+
+class TestAttachLinkTargets:
+    """Test the attach_link_targets function."""
+
+    def test_targets(self):
+        """Test document anchors mapped to the anchors inside section files."""
+        sections, _ = _rewriter()
+        assert [section["link_targets"] for section in sections] == [
+            {"guide": ""},
+            {"models": "", "model-rules": "model-rules", "setup": "setup"},
+            {"services": "", "setup-1": "setup"},
+        ]
+
+    def test_headings_before_first_section(self):
+        """Test that headings outside any section still count for numbering."""
+        content = "### Setup\nText.\n\n# Setup\nText.\n"
+        sections, rewriter = _rewriter(content, max_level=1)
+        assert sections[0]["link_targets"] == {"setup-1": ""}
+        assert "setup" not in rewriter.urls
+
+
+class TestAnchorRewriter:
+    """Test the AnchorRewriter class."""
+
+    def test_rewrite(self):
+        """Test every kind of link, code and the unresolved report."""
+        sections, rewriter = _rewriter()
+        texts = [
+            rewriter.rewrite(section["filename"], "\n".join(
+                MARKDOWN.split("\n")[section["start_line"]:section["end_line"]]
+            ))
+            for section in sections
+        ]
+        assert f"[Services]({URL}/services.md)" in texts[0]
+        assert f'[the rules]({URL}/models.md#model-rules "Rules")' in texts[0]
+        assert "[missing](#nowhere), [top](#)" in texts[0]
+        assert "(https://x.test/#services)" in texts[0]
+        assert "# [not a link](#services)" in texts[0]
+        assert "`[code](#services)`" in texts[0]
+
+        assert f"[back]({URL}/guide.md)" in texts[1]
+        assert f"[second setup]({URL}/services.md#setup)" in texts[1]
+        assert f"[encoded]({URL}/models.md#model-rules)" in texts[1]
+
+        assert f'<a href="{URL}/models.md">' in texts[2]
+        assert f"[ref]: {URL}/models.md#model-rules" in texts[2]
+
+        assert rewriter.rewritten == 7
+        assert rewriter.unresolved == [("guide.md", "#nowhere")]
+
+    def test_indented_code_keeps_links(self):
+        """Test that indented code is skipped, but not list continuations."""
+        _, rewriter = _rewriter()
+        text = (
+            "## Example\n"
+            "    [heading](#services)\n"
+            "\n"
+            "Text:\n"
+            "\n"
+            "    [code](#services)\n"
+            "\n"
+            "\t[more code](#services)\n"
+            "Paragraph\n"
+            "    [continued](#services)\n"
+            "\n"
+            "1. Step\n"
+            "\n"
+            "    [in item](#services)\n"
+        )
+        rewritten = rewriter.rewrite("example.md", text)
+        assert "    [heading](#services)" in rewritten
+        assert "    [code](#services)" in rewritten
+        assert "\t[more code](#services)" in rewritten
+        assert f"    [continued]({URL}/services.md)" in rewritten
+        assert f"    [in item]({URL}/services.md)" in rewritten
+        assert rewriter.rewritten == 2
+
+    def test_indented_code_in_list_item_keeps_links(self):
+        """Test that code indented past a list item's content column is kept."""
+        _, rewriter = _rewriter()
+        text = (
+            "- list\n"
+            "\n"
+            "      [x](#services)\n"
+            "\n"
+            "  [continued](#services)\n"
+            "\n"
+            "1.     [first line code](#services)\n"
+        )
+        rewritten = rewriter.rewrite("example.md", text)
+        assert "      [x](#services)" in rewritten
+        assert f"  [continued]({URL}/services.md)" in rewritten
+        assert "1.     [first line code](#services)" in rewritten
+        assert rewriter.rewritten == 1
+
+    def test_text_without_links_is_returned_as_is(self):
+        """Test that sections without anchor targets skip the rewrite."""
+        _, rewriter = _rewriter()
+        text = "## Plain\nNo links here."
+        assert rewriter.rewrite("plain.md", text) is text
+
+
+class TestGenerateDocs:
+    """Test rewriting anchor links in generate_docs runs."""
+
+    @pytest.fixture
+    def guide(self, tmp_path):
+        path = tmp_path / "guide.md"
+        path.write_text(MARKDOWN, encoding="utf-8")
+        return path
+
+    def _run(self, tmp_path, guide, **options):
+        return generate_docs(
+            str(guide),
+            output_dir=str(tmp_path / "docs"),
+            toc_file=str(tmp_path / "llms.txt"),
+            max_level=2,
+            rewrite_links=True,
+            **options,
+        )
+
+    @pytest.mark.parametrize("incremental", [False, True])
+    def test_rewrites_section_files(self, tmp_path, guide, incremental):
+        """Test the written files and the report of both write paths."""
+        result = self._run(tmp_path, guide, incremental=incremental)
+        services = (tmp_path / "docs" / "services.md").read_text()
+        assert f'<a href="{URL}/models.md">' in services
+        assert result.anchor_links == 7
+        assert result.unresolved_anchors == [
+            {"file": "guide.md", "anchor": "#nowhere"}
+        ]
+        assert "Anchor links:    7 rewritten, 1 unresolved" in result.format()
+
+    def test_bundle_and_manifest_match_files(self, tmp_path, guide):
+        """Test that derived outputs see the rewritten content."""
+        self._run(
+            tmp_path, guide, bundle_file=str(tmp_path / "full.txt"),
+            cache_manifest=str(tmp_path / "cache.json"),
+        )
+        assert f"[back]({URL}/guide.md)" in (tmp_path / "full.txt").read_text()
+        manifest = json.loads((tmp_path / "cache.json").read_text())
+        sizes = {entry["filename"]: entry["size"] for entry in manifest["sections"]}
+        assert sizes["models.md"] == (tmp_path / "docs" / "models.md").stat().st_size
+
+    def test_cached_tables_keep_targets(self, tmp_path, guide):
+        """Test that a parse cache hit still resolves the anchors."""
+        cache = str(tmp_path / "cache")
+        generate_docs(
+            str(guide), output_dir=str(tmp_path / "plain"),
+            toc_file=str(tmp_path / "plain.txt"), max_level=2, parse_cache=cache,
+        )
+        assert self._run(tmp_path, guide, parse_cache=cache).parse_cache_hit is False
+        with patch("mcpdoc_split.main.get_parser", side_effect=AssertionError):
+            result = self._run(tmp_path, guide, parse_cache=cache)
+        assert result.parse_cache_hit is True
+        assert result.anchor_links == 7
+
+    def test_off_by_default(self, tmp_path, guide):
+        """Test that links are kept unless asked for."""
+        result = generate_docs(
+            str(guide), output_dir=str(tmp_path / "docs"),
+            toc_file=str(tmp_path / "llms.txt"), max_level=2,
+        )
+        assert "[back](#guide)" in (tmp_path / "docs" / "models.md").read_text()
+        assert result.anchor_links is None
+
+    @pytest.mark.parametrize(
+        "options",
+        [{"streaming": True}, {"parse_workers": 2}, {"content_hash": True}],
+    )
+    def test_invalid_combinations(self, tmp_path, guide, options):
+        """Test the options rewriting links can't be combined with."""
+        with pytest.raises(ValueError, match="rewrite_links can't be combined"):
+            self._run(tmp_path, guide, **options)
+
+    def test_cli(self, tmp_path, guide, capsys):
+        """Test the --rewrite-links option."""
+        argv = [
+            "mcpdoc-split", str(guide), "--no-daemon", "--rewrite-links",
+            "--max-level", "2",
+            "--output-dir", str(tmp_path / "docs"),
+            "--toc-file", str(tmp_path / "llms.txt"),
+        ]
+        with patch.object(sys, "argv", argv):
+            main()
+        output = capsys.readouterr().out
+        assert "Anchor links: 7 rewritten, 1 unresolved" in output
+        assert "Warning: Unresolved anchor link #nowhere in guide.md" in output
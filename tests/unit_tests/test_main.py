@@ -6,9 +6,15 @@ import os
 from pathlib import Path
 
 from mcpdoc_split.main import (
+    PARSE_MODES,
+    FilenameRegistry,
+    collect_sections,
+    content_digest,
+    hashed_filename,
     generate_filename,
     generate_anchor_link,
     extract_heading_text,
+    get_parser,
     save_section_by_lines,
     generate_docs,
 )
@@ -42,6 +48,34 @@ class TestGenerateFilename:
         assert generate_filename("Chapter 1: Overview") == "chapter-1-overview.md"
 
 
+class TestFilenameRegistry:
+    """Test the FilenameRegistry class."""
+
+    def test_repeated_headers_get_numbered(self):
+        """Test that repeated headers get numbered filenames."""
+        registry = FilenameRegistry()
+        names = [registry.assign(h) for h in ("Testing", "Usage", "Testing", "Testing")]
+        assert names == ["testing.md", "usage.md", "testing-2.md", "testing-3.md"]
+
+    def test_numbered_names_skip_taken_names(self):
+        """Test that numbering never reuses a name taken by another header."""
+        registry = FilenameRegistry()
+        names = [
+            registry.assign(h) for h in ("Testing 2", "Testing", "Testing", "Testing 2")
+        ]
+        assert names == ["testing-2.md", "testing.md", "testing-3.md", "testing-2-2.md"]
+
+
+class TestHashedFilename:
+    """Test content-hash filenames."""
+
+    def test_embeds_digest_prefix(self):
+        """Test that the digest prefix goes before the extension."""
+        digest = content_digest("# Services\nText.")
+        assert len(digest) == 64
+        assert hashed_filename("services.md", digest) == f"services.{digest[:8]}.md"
+
+
 class TestGenerateAnchorLink:
     """Test the generate_anchor_link function."""
 
@@ -204,6 +238,71 @@ Advanced topics.
             finally:
                 os.unlink(temp_file)
 
+    def test_repeated_headers_get_their_own_files(self):
+        """Test that sections with the same header don't overwrite each other."""
+        markdown_content = "# Models\n## Testing\nA.\n# Services\n## Testing\nB.\n"
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = os.path.join(temp_dir, "input.md")
+            Path(input_file).write_text(markdown_content)
+            output_dir = os.path.join(temp_dir, "docs")
+            toc_file = os.path.join(temp_dir, "toc.txt")
+
+            generate_docs(input_file, output_dir=output_dir, toc_file=toc_file)
+
+            assert Path(output_dir, "testing.md").read_text() == "## Testing\nA."
+            assert Path(output_dir, "testing-2.md").read_text() == "## Testing\nB."
+            assert "https://example.com/docs/testing-2.md" in Path(toc_file).read_text()
+
+    def test_content_hash_filenames(self):
+        """Test that content-hash filenames follow the section content."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = os.path.join(temp_dir, "input.md")
+            output_dir = os.path.join(temp_dir, "docs")
+            toc_file = os.path.join(temp_dir, "toc.txt")
+
+            names = []
+            for text in ("A.", "A.", "B."):
+                Path(input_file).write_text(f"# Intro\n{text}\n# Usage\nSame.\n")
+                generate_docs(
+                    input_file, output_dir=output_dir, toc_file=toc_file,
+                    content_hash=True,
+                )
+                names.append(sorted(os.listdir(output_dir)))
+
+            digest = content_digest("# Intro\nA.")
+            assert names[0][0] == f"intro.{digest[:8]}.md"
+            assert names[1] == names[0]
+            assert names[2][0] != names[0][0]
+            assert names[2][1] == names[0][1]
+            assert f"/docs/{names[2][0]}" in Path(toc_file).read_text()
+
+    def test_returns_result_with_stats(self):
+        """Test the counters and timings of the returned result."""
+        markdown_content = "# Short\nA.\n\n## Longer section\nSome more text here.\n"
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = os.path.join(temp_dir, "input.md")
+            Path(input_file).write_text(markdown_content)
+            output_dir = os.path.join(temp_dir, "docs")
+            toc_file = os.path.join(temp_dir, "toc.txt")
+
+            result = generate_docs(input_file, output_dir=output_dir, toc_file=toc_file)
+
+            assert result.sections == 2
+            assert result.bytes_read == len(markdown_content)
+            written = sum(p.stat().st_size for p in Path(output_dir).iterdir())
+            assert result.bytes_written == written + Path(toc_file).stat().st_size
+            assert result.largest_section == "longer-section.md"
+            assert result.largest_section_bytes == len(
+                "## Longer section\nSome more text here."
+            )
+            assert {
+                "read", "parse", "boundaries", "toc_write", "section_writes", "total"
+            } <= set(result.timings)
+            assert result.to_dict()["sections"] == 2
+            assert "Largest section: longer-section.md" in result.format()
+
     def test_custom_toc_file_path(self):
         """Test custom TOC file path with subdirectory."""
         markdown_content = """# Test Header
@@ -276,3 +375,62 @@ Content 4.
 
             finally:
                 os.unlink(temp_file)
+
+
+PARSE_MODE_CASES = [
+    "# Introduction\nText with *emphasis* and `code`.\n\n## Details\nMore.",
+    "# Heading with [a link](https://example.com) and **bold** text",
+    "## `mypy` / type annotations\n### Prefixing with `DJANGO_`",
+    "Setext *title*\n==============\n\nSub\n---",
+    "```python\n# comment, not a heading\n```\n# Real heading",
+    "<div>\n# inside html\n</div>\n\n# After html",
+    "[ref]: https://example.com\n===\n# Heading",
+    "> # Quoted heading\n- # Item heading\n\n    # indented code",
+    "# Escaped \\# hash #\n# Trailing hashes ###\n#",
+    "Text\n***\n---\n# Done",
+]
+
+
+class TestParseModes:
+    """Test that the block-only parse mode matches the full parser."""
+
+    @pytest.mark.parametrize("content", PARSE_MODE_CASES)
+    @pytest.mark.parametrize("max_level", [1, 2, 6])
+    def test_block_mode_matches_full_mode(self, content, max_level):
+        """Test that both parse modes build the same section table."""
+        assert collect_sections(content, max_level, "block") == collect_sections(
+            content, max_level, "full"
+        )
+
+    def test_block_mode_skips_inline_rules(self):
+        """Test that the block parser doesn't run inline tokenization."""
+        tokens = get_parser("block").parse("# Title with *emphasis*")
+        inline = [token for token in tokens if token.type == "inline"]
+
+        assert inline[0].content == "Title with *emphasis*"
+        assert not inline[0].children
+
+    def test_unknown_parse_mode(self):
+        """Test that an unknown parse mode is rejected."""
+        with pytest.raises(ValueError, match="parse_mode must be one of"):
+            get_parser("fast")
+
+    def test_generate_docs_outputs_match(self):
+        """Test that generated files don't depend on the parse mode."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = os.path.join(temp_dir, "input.md")
+            Path(input_file).write_text("\n\n".join(PARSE_MODE_CASES))
+            outputs = []
+            for parse_mode in PARSE_MODES:
+                output_dir = os.path.join(temp_dir, parse_mode)
+                toc_file = os.path.join(temp_dir, f"{parse_mode}.txt")
+                generate_docs(
+                    input_file, output_dir=output_dir, toc_file=toc_file,
+                    parse_mode=parse_mode,
+                )
+                outputs.append((
+                    {p.name: p.read_text() for p in Path(output_dir).iterdir()},
+                    Path(toc_file).read_text(),
+                ))
+
+            assert outputs[0] == outputs[1]
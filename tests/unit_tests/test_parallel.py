@@ -0,0 +1,129 @@
+"""Tests for mcpdoc_split.parallel module."""
+
+import random
+
+import pytest
+
+from mcpdoc_split import parallel
+from mcpdoc_split.main import collect_sections, generate_docs
+from mcpdoc_split.parallel import find_cut_points, parallel_sections
+
+# Blocks that put heading-like lines where a naive cut would go wrong
+BLOCKS = [
+    "# Heading {n}\n\nText {n}.\n",
+    "## Sub {n}\n",
+    "```\n\n# In fence {n}\n\n```\n",
+    "~~~~\n\n# In tilde fence {n}\n\n~~~\n\n# Still in fence {n}\n\n~~~~\n",
+    "<!--\n\n# In comment {n}\n\n-->\n",
+    "<script>\n\n# In script {n}\n\n</script>\n",
+    "<div>\n# In div {n}\n</div>\n",
+    "- Item {n}\n\n  ```\n\n# After list fence {n}\n",
+    "> Quote {n}\n> ```\n\n# After quote {n}\n",
+    "   ```\n\n# Indented fence {n}\n\n```\n",
+    "```py `x`\n\n# After inline code {n}\n",
+    "Setext {n}\n===\n",
+    "    code\n\n# After code {n}\n",
+    "Paragraph {n}\n# Tight {n}\n",
+    "",
+]
+
+
+def _document(seed):
+    rng = random.Random(seed)
+    return "\n".join(
+        rng.choice(BLOCKS).format(n=n) for n in range(rng.randint(5, 80))
+    )
+
+
+class TestFindCutPoints:
+    """Test the find_cut_points function."""
+
+    def test_cuts_at_headings_after_blank_lines(self):
+        """Test that cuts land on heading lines following a blank line."""
+        content = "".join(f"# H{n}\n\ntext\n\n" for n in range(10))
+        cuts = find_cut_points(content, 4)
+        assert len(cuts) == 3
+        assert cuts == sorted(set(cuts))
+        for cut in cuts:
+            assert content[cut] == "#"
+            assert content[cut - 2:cut] == "\n\n"
+
+    def test_skips_fences(self):
+        """Test that headings inside fences are not proposed."""
+        content = "# A\n\n```\n\n# Fenced\n\n```\n\n# B\n"
+        assert find_cut_points(content, 2) == [content.index("# B")]
+
+    def test_no_candidates(self):
+        """Test a document without headings to cut at."""
+        assert find_cut_points("text\n" * 100, 4) == []
+
+
+class TestParallelSections:
+    """Test the parallel_sections function."""
+
+    @pytest.mark.parametrize("seed", range(12))
+    def test_matches_serial_parse(self, seed):
+        """Test that stitched chunks give the serial section table."""
+        content = _document(seed)
+        parse_mode = "full" if seed % 3 == 0 else "block"
+        assert parallel_sections(
+            content, 6, parse_mode, workers=4, min_chunk_chars=64
+        ) == collect_sections(content, 6, parse_mode)
+
+    def test_reparses_cuts_inside_blocks(self, monkeypatch):
+        """Test that a cut inside an HTML comment is detected and undone."""
+        content = "# A\n\n<!--\n\n# Hidden\n\n-->\n\n# B\n\ntext\n"
+        monkeypatch.setattr(
+            parallel, "find_cut_points",
+            lambda text, chunks: [text.index("# Hidden"), text.index("# B")],
+        )
+        sections = parallel_sections(content, workers=2, min_chunk_chars=1)
+        assert [section["header"] for section in sections] == ["A", "B"]
+        assert sections == collect_sections(content)
+
+    def test_small_input_parsed_in_process(self):
+        """Test that a document below the chunk size needs no workers."""
+        content = _document(1)
+        assert parallel_sections(content, workers=8) == collect_sections(content)
+
+    def test_rejects_no_workers(self):
+        """Test that workers must be positive."""
+        with pytest.raises(ValueError, match="workers"):
+            parallel_sections("# A\n", workers=0)
+
+
+class TestGenerateParallel:
+    """Test parse_workers in generate_docs."""
+
+    def test_same_files_as_serial(self, tmp_path, monkeypatch):
+        """Test that parallel parsing writes the serial output."""
+        monkeypatch.setattr(parallel, "MIN_CHUNK_CHARS", 64)
+        input_file = tmp_path / "guide.md"
+        input_file.write_text(_document(7), encoding="utf-8")
+
+        outputs = []
+        for name, options in (("serial", {}), ("parallel", {"parse_workers": 3})):
+            generate_docs(
+                str(input_file),
+                output_dir=str(tmp_path / name),
+                toc_file=str(tmp_path / f"{name}.txt"),
+                **options,
+            )
+            outputs.append((
+                {path.name: path.read_bytes() for path in (tmp_path / name).iterdir()},
+                (tmp_path / f"{name}.txt").read_text(),
+            ))
+        assert outputs[0] == outputs[1]
+
+    @pytest.mark.parametrize("options, message", [
+        ({"parse_workers": 0}, "at least 1"),
+        ({"parse_workers": 2, "streaming": True}, "streaming"),
+        ({"parse_workers": 2, "chunk_size": 100}, "chunking"),
+    ])
+    def test_rejected_options(self, tmp_path, options, message):
+        """Test options that can't be combined with parse_workers."""
+        input_file = tmp_path / "guide.md"
+        input_file.write_text("# A\n", encoding="utf-8")
+        with pytest.raises(ValueError, match=message):
+            generate_docs(str(input_file), output_dir=str(tmp_path / "docs"),
+                          toc_file=str(tmp_path / "llms.txt"), **options)
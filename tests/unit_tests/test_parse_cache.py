@@ -0,0 +1,186 @@
+"""Tests for mcpdoc_split.parse_cache module."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from mcpdoc_split.main import collect_sections, generate_docs
+from mcpdoc_split.parse_cache import (
+    SectionCache,
+    evict,
+    load_sections,
+    parse_cache_key,
+    store_sections,
+)
+
+MARKDOWN = """# Guide
+Intro.
+
+## Models
+Model text.
+
+## Services
+Service text.
+"""
+
+
+class TestParseCacheKey:
+    """Test the parse_cache_key function."""
+
+    def test_depends_on_every_setting(self):
+        """Test that content, level and chunking options change the key."""
+        keys = {
+            parse_cache_key("a" * 64, 6),
+            parse_cache_key("b" * 64, 6),
+            parse_cache_key("a" * 64, 2),
+            parse_cache_key("a" * 64, 6, {"chunk_size": 100}),
+            parse_cache_key("a" * 64, 6, {"chunk_size": 200}),
+        }
+        assert len(keys) == 5
+        assert parse_cache_key("a" * 64, 6) == parse_cache_key("a" * 64, 6)
+
+
+class TestStore:
+    """Test storing, loading and evicting entries."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that a stored table loads back unchanged."""
+        sections = collect_sections(MARKDOWN)
+        store_sections(str(tmp_path / "cache"), "key", sections)
+        assert load_sections(str(tmp_path / "cache"), "key") == sections
+        assert load_sections(str(tmp_path / "cache"), "other") is None
+
+    def test_invalid_entry_is_a_miss(self, tmp_path):
+        """Test that an unreadable entry is ignored."""
+        (tmp_path / "key.json").write_text("{not json")
+        assert load_sections(str(tmp_path), "key") is None
+        (tmp_path / "key.json").write_text('{"version": 0, "sections": []}')
+        assert load_sections(str(tmp_path), "key") is None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test that eviction removes the entries used longest ago."""
+        cache_dir = str(tmp_path)
+        for number, key in enumerate(("old", "used", "new")):
+            store_sections(cache_dir, key, [{"header": "x" * 100}])
+            os.utime(tmp_path / f"{key}.json", (number, number))
+        load_sections(cache_dir, "old")
+        entry_size = os.path.getsize(tmp_path / "new.json")
+
+        assert evict(cache_dir, 2 * entry_size) == 1
+        assert sorted(os.listdir(tmp_path)) == ["new.json", "old.json"]
+
+    def test_size_limit_applied_on_store(self, tmp_path):
+        """Test that storing keeps the directory under its size limit."""
+        for key in ("a", "b", "c"):
+            store_sections(str(tmp_path), key, [{"header": key}], max_size=60)
+        assert len(os.listdir(tmp_path)) < 3
+
+
+class TestGenerateWithParseCache:
+    """Test parse_cache in generate_docs."""
+
+    def _generate(self, tmp_path, name, **options):
+        return generate_docs(
+            str(tmp_path / "guide.md"),
+            output_dir=str(tmp_path / name),
+            toc_file=str(tmp_path / f"{name}.txt"),
+            parse_cache=str(tmp_path / "cache"),
+            **options,
+        )
+
+    def test_repeat_run_skips_parsing(self, tmp_path):
+        """Test that a second run with another URL prefix doesn't parse."""
+        (tmp_path / "guide.md").write_text(MARKDOWN, encoding="utf-8")
+        first = self._generate(tmp_path, "a", url_prefix="https://a.example")
+        assert first.parse_cache_hit is False
+        assert "parse" in first.timings
+
+        with patch("mcpdoc_split.main.get_parser", side_effect=AssertionError):
+            second = self._generate(tmp_path, "b", url_prefix="https://b.example")
+        assert second.parse_cache_hit is True
+        assert "parse" not in second.timings
+        assert "Parse cache:     hit" in second.format()
+
+        for path in (tmp_path / "a").iterdir():
+            assert (tmp_path / "b" / path.name).read_bytes() == path.read_bytes()
+        assert (tmp_path / "b.txt").read_text() == (tmp_path / "a.txt").read_text(
+        ).replace("https://a.example", "https://b.example")
+
+    def test_changed_input_is_parsed_again(self, tmp_path):
+        """Test that editing the input misses the cache."""
+        (tmp_path / "guide.md").write_text(MARKDOWN, encoding="utf-8")
+        self._generate(tmp_path, "a")
+        (tmp_path / "guide.md").write_text(MARKDOWN + "\n## Views\n", encoding="utf-8")
+        result = self._generate(tmp_path, "b")
+        assert result.parse_cache_hit is False
+        assert (tmp_path / "b" / "views.md").exists()
+
+    def test_chunked_tables_are_cached_separately(self, tmp_path):
+        """Test that chunking options are part of the key."""
+        (tmp_path / "guide.md").write_text(MARKDOWN, encoding="utf-8")
+        self._generate(tmp_path, "a")
+        result = self._generate(
+            tmp_path, "b", chunk_size=1000, chunk_unit="bytes"
+        )
+        assert result.parse_cache_hit is False
+        assert sorted(os.listdir(tmp_path / "b")) == ["guide.md"]
+
+    def test_streaming_rejects_parse_cache(self, tmp_path):
+        """Test that streaming mode can't use the parse cache."""
+        (tmp_path / "guide.md").write_text(MARKDOWN, encoding="utf-8")
+        with pytest.raises(ValueError, match="parse cache"):
+            self._generate(tmp_path, "a", streaming=True)
+
+
+class TestSectionCache:
+    """Test the in-memory SectionCache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the cache keeps the most recently used tables."""
+        cache = SectionCache(max_entries=2)
+        cache.store("a", [{"filename": "a.md"}])
+        cache.store("b", [{"filename": "b.md"}])
+        cache.load("a")
+        cache.store("c", [{"filename": "c.md"}])
+        assert len(cache) == 2
+        assert cache.load("b") is None
+        assert cache.load("a") == [{"filename": "a.md"}]
+
+    def test_tables_are_copied(self):
+        """Test that renaming a loaded section doesn't change the cache."""
+        cache = SectionCache()
+        cache.store("a", [{"filename": "a.md"}])
+        cache.load("a")[0]["filename"] = "a.1a2b3c4d.md"
+        assert cache.load("a") == [{"filename": "a.md"}]
+
+    def test_generate_docs_uses_memory_first(self, tmp_path):
+        """Test that a run with a warm section cache doesn't parse."""
+        (tmp_path / "guide.md").write_text(MARKDOWN, encoding="utf-8")
+        cache = SectionCache()
+        options = {"toc_file": str(tmp_path / "llms.txt"), "section_cache": cache}
+        first = generate_docs(
+            str(tmp_path / "guide.md"), str(tmp_path / "a"), **options
+        )
+        assert first.parse_cache_hit is False
+        with patch("mcpdoc_split.main.get_parser", side_effect=AssertionError):
+            second = generate_docs(
+                str(tmp_path / "guide.md"), str(tmp_path / "b"),
+                content_hash=True, **options,
+            )
+        assert second.parse_cache_hit is True
+        assert sorted(os.listdir(tmp_path / "a")) == [
+            "guide.md", "models.md", "services.md",
+        ]
+        assert len(os.listdir(tmp_path / "b")) == 3
+        # The content-hash renames didn't leak into the cache
+        third = generate_docs(
+            str(tmp_path / "guide.md"), str(tmp_path / "c"), **options
+        )
+        assert third.parse_cache_hit is True
+        assert sorted(os.listdir(tmp_path / "c")) == sorted(os.listdir(tmp_path / "a"))
+
+    def test_rejects_empty_cache(self):
+        """Test that a cache must hold at least one table."""
+        with pytest.raises(ValueError, match="max_entries"):
+            SectionCache(max_entries=0)
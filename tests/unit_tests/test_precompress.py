@@ -0,0 +1,221 @@
+"""Tests for mcpdoc_split.precompress module."""
+
+import gzip
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from mcpdoc_split.backends import MemoryBackend
+from mcpdoc_split.cli import main
+from mcpdoc_split.main import generate_docs
+from mcpdoc_split.precompress import (
+    available_formats,
+    compress_file,
+    precompress,
+    prune_sidecars,
+    resolve_formats,
+)
+
+TEXT = "Service text with select_related. " * 20
+
+MARKDOWN = f"""# Guide
+Intro.
+
+## Models
+Model text. {TEXT}
+
+## Services
+{TEXT}
+"""
+
+
+@pytest.fixture
+def guide(tmp_path):
+    """Write the sample input and return its path."""
+    path = tmp_path / "guide.md"
+    path.write_text(MARKDOWN, encoding="utf-8")
+    return path
+
+
+def _split(tmp_path, guide, **options):
+    return generate_docs(
+        str(guide),
+        output_dir=str(tmp_path / "docs"),
+        toc_file=str(tmp_path / "llms.txt"),
+        precompress=["gzip"],
+        **options,
+    )
+
+
+class TestResolveFormats:
+    """Test the resolve_formats function."""
+
+    def test_formats(self):
+        """Test ordering, repeats and the "all" shorthand."""
+        assert resolve_formats(["gzip", "gzip"]) == ["gzip"]
+        assert resolve_formats(["all"]) == available_formats()
+        assert "gzip" in available_formats()
+
+    @pytest.mark.parametrize("names", [[], ["brotli"]])
+    def test_invalid_formats(self, names):
+        """Test that unknown formats raise ValueError."""
+        with pytest.raises(ValueError):
+            resolve_formats(names)
+
+    def test_unavailable_format(self):
+        """Test that a format this Python can't write raises ValueError."""
+        with patch("mcpdoc_split.precompress._compressor", return_value=None):
+            with pytest.raises(ValueError, match="not available"):
+                resolve_formats(["zstd"])
+
+
+class TestCompressFile:
+    """Test the compress_file function."""
+
+    def test_writes_sidecar_once(self, tmp_path):
+        """Test that a sidecar is written, then kept while the file is."""
+        path = tmp_path / "services.md"
+        path.write_text(TEXT)
+        stats = compress_file(str(path), ["gzip"])
+        assert stats["written"] == 1
+        sidecar = tmp_path / "services.md.gz"
+        assert gzip.decompress(sidecar.read_bytes()) == TEXT.encode()
+        assert stats["bytes_written"] == sidecar.stat().st_size
+        assert sidecar.stat().st_mtime_ns == path.stat().st_mtime_ns
+
+        with patch("gzip.compress", side_effect=AssertionError):
+            assert compress_file(str(path), ["gzip"])["unchanged"] == 1
+
+        path.write_text(TEXT + "More.")
+        os.utime(path, ns=(0, 1))
+        assert compress_file(str(path), ["gzip"])["written"] == 1
+        assert gzip.decompress(sidecar.read_bytes()).endswith(b"More.")
+
+    def test_same_mtime_different_size(self, tmp_path):
+        """Test that a file changed within the mtime resolution is recompressed."""
+        path = tmp_path / "services.md"
+        path.write_text(TEXT)
+        compress_file(str(path), ["gzip"])
+        mtime_ns = path.stat().st_mtime_ns
+
+        path.write_text(TEXT + "More.")
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        assert compress_file(str(path), ["gzip"])["written"] == 1
+        packed = (tmp_path / "services.md.gz").read_bytes()
+        assert gzip.decompress(packed).endswith(b"More.")
+
+        # A truncated sidecar is rewritten too
+        (tmp_path / "services.md.gz").write_bytes(b"")
+        os.utime(tmp_path / "services.md.gz", ns=(mtime_ns, mtime_ns))
+        assert compress_file(str(path), ["gzip"])["written"] == 1
+
+    def test_skips_small_and_incompressible_files(self, tmp_path):
+        """Test that files that don't shrink lose their sidecar."""
+        small = tmp_path / "small.md"
+        small.write_text("Small.")
+        (tmp_path / "small.md.gz").write_bytes(b"stale")
+        assert compress_file(str(small), ["gzip"])["removed"] == 1
+
+        noise = tmp_path / "noise.bin"
+        noise.write_bytes(os.urandom(4096))
+        assert compress_file(str(noise), ["gzip"])["written"] == 0
+        assert sorted(os.listdir(tmp_path)) == ["noise.bin", "small.md"]
+
+    def test_prune_sidecars(self, tmp_path):
+        """Test that only sidecars without their file are removed."""
+        (tmp_path / "kept.md").write_text("Kept.")
+        (tmp_path / "kept.md.gz").write_bytes(b"")
+        (tmp_path / "gone.md.gz").write_bytes(b"")
+        (tmp_path / "gone.md.zst").write_bytes(b"")
+        assert prune_sidecars(str(tmp_path)) == 2
+        assert sorted(os.listdir(tmp_path)) == ["kept.md", "kept.md.gz"]
+
+
+class TestPrecompress:
+    """Test precompressed sidecars of generate_docs runs."""
+
+    def test_sidecars_of_every_output(self, tmp_path, guide):
+        """Test sidecars of the sections, TOC and bundle, not the index."""
+        result = _split(tmp_path, guide, bundle_file=str(tmp_path / "full.txt"))
+        assert sorted(os.listdir(tmp_path / "docs")) == [
+            "guide.md", "models.md", "models.md.gz", "services.md", "services.md.gz",
+        ]
+        assert (tmp_path / "full.txt.gz").exists()
+        assert not (tmp_path / "full.index.json.gz").exists()
+        # The TOC is too small to be worth it
+        assert not (tmp_path / "llms.txt.gz").exists()
+        assert result.sidecars_written == 3
+        assert "precompress" in result.timings
+        for name in ("models.md", "services.md"):
+            path = tmp_path / "docs" / name
+            packed = (tmp_path / "docs" / f"{name}.gz").read_bytes()
+            assert gzip.decompress(packed) == path.read_bytes()
+
+    def test_incremental_run_compresses_changed_files(self, tmp_path, guide):
+        """Test that unchanged files keep their sidecars without recompressing."""
+        _split(tmp_path, guide, incremental=True)
+        guide.write_text(
+            MARKDOWN.replace("Model text.", "Changed model text."), encoding="utf-8"
+        )
+        result = _split(tmp_path, guide, incremental=True)
+        assert result.sidecars_written == 1
+        packed = (tmp_path / "docs" / "models.md.gz").read_bytes()
+        assert b"Changed model text." in gzip.decompress(packed)
+
+    def test_removes_sidecars_of_deleted_sections(self, tmp_path, guide):
+        """Test that an incremental run prunes sidecars with their sections."""
+        _split(tmp_path, guide, incremental=True)
+        guide.write_text(MARKDOWN.split("## Services")[0], encoding="utf-8")
+        _split(tmp_path, guide, incremental=True)
+        assert not (tmp_path / "docs" / "services.md.gz").exists()
+        assert (tmp_path / "docs" / "models.md.gz").exists()
+
+    def test_streaming(self, tmp_path, guide):
+        """Test sidecars of a streaming run."""
+        result = _split(tmp_path, guide, streaming=True)
+        assert result.sidecars_written == 2
+
+    def test_invalid_options(self, tmp_path, guide):
+        """Test the options precompression can't be combined with."""
+        with pytest.raises(ValueError, match="needs the filesystem backend"):
+            _split(tmp_path, guide, backend=MemoryBackend())
+        with pytest.raises(ValueError, match="targets can't be combined"):
+            _split(tmp_path, guide, targets=[{}])
+        with pytest.raises(ValueError, match="precompress_workers"):
+            _split(tmp_path, guide, precompress_workers=0)
+        assert not (tmp_path / "docs").exists()
+
+    def test_precompress_function(self, tmp_path, guide):
+        """Test precompress over a directory and extra files."""
+        _split(tmp_path, guide)
+        stats = precompress(
+            str(tmp_path / "docs"), [str(tmp_path / "missing.txt")], ["gzip"], 2
+        )
+        assert stats == {
+            "written": 0, "unchanged": 2, "removed": 0, "bytes_written": 0,
+        }
+
+
+class TestPrecompressCli:
+    """Test the --precompress option."""
+
+    def test_cli(self, tmp_path, guide, capsys):
+        """Test that --precompress writes gzip sidecars."""
+        argv = [
+            "mcpdoc-split", str(guide), "--no-daemon", "--precompress",
+            "--output-dir", str(tmp_path / "docs"),
+            "--toc-file", str(tmp_path / "llms.txt"),
+        ]
+        with patch.object(sys, "argv", argv):
+            main()
+        assert (tmp_path / "docs" / "services.md.gz").exists()
+        assert "Precompressed: 2 written" in capsys.readouterr().out
+
+    def test_rejects_input_as_format(self, guide, capsys):
+        """Test that a format list is validated by the parser."""
+        with patch.object(sys, "argv", ["mcpdoc-split", "--precompress", str(guide)]):
+            with pytest.raises(SystemExit):
+                main()
+        assert "invalid format list" in capsys.readouterr().err
@@ -0,0 +1,203 @@
+"""Tests for mcpdoc_split.search module."""
+
+import json
+import os
+import sys
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from mcpdoc_split.cli import main
+from mcpdoc_split.main import generate_docs
+from mcpdoc_split.search import SearchIndex, build_index, dump_index, tokenize
+
+MARKDOWN = """# Guide
+An introduction to the styleguide.
+
+## Selectors
+Use select_related and prefetch_related in selectors to avoid extra queries.
+Selectors return querysets.
+
+## Services
+Services hold business logic and write to the database.
+
+## Testing
+Test services and selectors separately.
+"""
+
+
+def _section(filename, header="Header"):
+    return {"filename": filename, "header": header, "level": 1}
+
+
+@pytest.fixture
+def index_file():
+    """Split MARKDOWN with a search index and return the index path."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_file = os.path.join(temp_dir, "input.md")
+        Path(input_file).write_text(MARKDOWN)
+        index_file = os.path.join(temp_dir, "search", "index.json")
+
+        generate_docs(
+            input_file,
+            output_dir=os.path.join(temp_dir, "docs"),
+            toc_file=os.path.join(temp_dir, "llms.txt"),
+            search_index=index_file,
+        )
+        yield index_file
+
+
+class TestTokenize:
+    """Test the tokenize function."""
+
+    def test_terms(self):
+        """Test lowercasing, identifiers and dropped single characters."""
+        assert tokenize("Use `select_related()` for a FK, x2!") == [
+            "use", "select_related", "for", "fk", "x2"
+        ]
+
+
+class TestBuildIndex:
+    """Test the build_index function."""
+
+    def test_postings_and_statistics(self):
+        """Test the document table, postings and average length."""
+        index = build_index(
+            [
+                (_section("a.md", "A"), "# A\napple apple pear"),
+                (_section("b.md", "B"), "# B\npear"),
+            ],
+            "https://example.com",
+            "/docs",
+        )
+
+        assert index["documents"] == [
+            ["a.md", "A", "https://example.com/docs/a.md", 3],
+            ["b.md", "B", "https://example.com/docs/b.md", 1],
+        ]
+        assert index["postings"]["apple"] == [0, 2]
+        assert index["postings"]["pear"] == [0, 1, 1, 1]
+        assert index["average_length"] == 2.0
+
+    def test_duplicate_filenames_index_last_section(self):
+        """Test that a repeated filename is indexed with the file on disk."""
+        index = build_index(
+            [
+                (_section("usage.md"), "first"),
+                (_section("other.md"), "other"),
+                (_section("usage.md"), "second"),
+            ],
+            "https://example.com",
+            "/docs",
+        )
+
+        assert [document[0] for document in index["documents"]] == [
+            "usage.md", "other.md"
+        ]
+        assert "first" not in index["postings"]
+        assert index["postings"]["second"] == [0, 1]
+
+
+class TestSearchIndex:
+    """Test querying a saved index."""
+
+    def test_ranking(self, index_file):
+        """Test that the most relevant section comes first."""
+        results = SearchIndex(index_file).search("select_related queries")
+
+        assert [result["filename"] for result in results] == ["selectors.md"]
+        assert results[0]["header"] == "Selectors"
+        assert results[0]["url"] == "https://example.com/docs/selectors.md"
+
+    def test_multiple_matches_and_limit(self, index_file):
+        """Test ordering by score and the result limit."""
+        index = SearchIndex(index_file)
+        results = index.search("services")
+
+        assert [result["filename"] for result in results] == [
+            "services.md", "testing.md"
+        ]
+        assert results[0]["score"] > results[1]["score"]
+        assert len(index.search("services", limit=1)) == 1
+        assert index.search("celery") == []
+
+    def test_lazy_loading(self, index_file):
+        """Test that the index file is only read on the first query."""
+        index = SearchIndex(index_file)
+        os.rename(index_file, index_file + ".bak")
+        with pytest.raises(FileNotFoundError):
+            index.search("services")
+
+        os.rename(index_file + ".bak", index_file)
+        assert index.search("services")
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test that files that aren't search indexes are rejected."""
+        path = tmp_path / "index.json"
+        path.write_text(json.dumps({"version": 99}))
+        with pytest.raises(ValueError):
+            SearchIndex(str(path)).search("services")
+
+        path.write_text("not json")
+        with pytest.raises(ValueError):
+            SearchIndex(str(path)).search("services")
+
+
+class TestGenerateDocsSearchIndex:
+    """Test building the index while splitting."""
+
+    def test_index_matches_build_index(self, index_file):
+        """Test that the saved index is the compact JSON of build_index."""
+        saved = Path(index_file).read_text()
+        docs_dir = os.path.join(os.path.dirname(os.path.dirname(index_file)), "docs")
+        rendered = [
+            (_section(name, None), Path(docs_dir, name).read_text())
+            for name in ("guide.md", "selectors.md", "services.md", "testing.md")
+        ]
+        expected = build_index(rendered, "https://example.com", "/docs")
+
+        index = json.loads(saved)
+        assert index["postings"] == expected["postings"]
+        assert saved == dump_index(index)
+
+    def test_streaming_rejects_search_index(self, tmp_path):
+        """Test that streaming mode can't be combined with an index."""
+        input_file = tmp_path / "input.md"
+        input_file.write_text(MARKDOWN)
+        with pytest.raises(ValueError):
+            generate_docs(
+                str(input_file),
+                output_dir=str(tmp_path / "docs"),
+                toc_file=str(tmp_path / "llms.txt"),
+                streaming=True,
+                search_index=str(tmp_path / "index.json"),
+            )
+
+
+class TestSearchCommand:
+    """Test the search subcommand."""
+
+    def test_json_output(self, index_file):
+        """Test printing results as JSON."""
+        argv = ["mcpdoc-split", "search", index_file, "select_related", "--json"]
+        with patch.object(sys, "argv", argv):
+            with patch.object(sys, "stdout", new=StringIO()) as mock_stdout:
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+
+        assert exc_info.value.code == 0
+        results = json.loads(mock_stdout.getvalue())
+        assert results[0]["filename"] == "selectors.md"
+
+    def test_no_results(self, index_file):
+        """Test the exit code when nothing matches."""
+        argv = ["mcpdoc-split", "search", index_file, "celery"]
+        with patch.object(sys, "argv", argv):
+            with patch.object(sys, "stdout", new=StringIO()):
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+
+        assert exc_info.value.code == 1
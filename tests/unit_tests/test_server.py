@@ -0,0 +1,196 @@
+"""Tests for mcpdoc_split.server module."""
+
+import io
+import json
+import os
+import tempfile
+
+import pytest
+
+from mcpdoc_split.server import (
+    INVALID_PARAMS,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    TOC_URI,
+    DocServer,
+    load_sections,
+    serve_stdio,
+)
+
+MARKDOWN = """# Guide
+Welcome.
+
+## Services
+Services hold business logic.
+
+## Testing
+Test the services.
+"""
+
+
+@pytest.fixture
+def server():
+    """A DocServer over a small in-memory document."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".md", delete=False) as f:
+        f.write(MARKDOWN)
+        temp_file = f.name
+
+    try:
+        yield DocServer(load_sections(temp_file))
+    finally:
+        os.unlink(temp_file)
+
+
+def _request(server, method, params=None, request_id=1):
+    message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+    if params is not None:
+        message["params"] = params
+    return server.handle(message)
+
+
+class TestLoadSections:
+    """Test the load_sections function."""
+
+    def test_sections_carry_content(self, server):
+        """Test that sections hold the same text the splitter writes."""
+        assert [s["filename"] for s in server.sections] == [
+            "guide.md", "services.md", "testing.md"
+        ]
+        assert server.sections[1]["content"] == (
+            "## Services\nServices hold business logic."
+        )
+
+
+class TestDocServer:
+    """Test the DocServer request handler."""
+
+    def test_initialize(self, server):
+        """Test protocol negotiation and advertised capabilities."""
+        response = _request(server, "initialize", {"protocolVersion": "2024-11-05"})
+
+        result = response["result"]
+        assert result["protocolVersion"] == "2024-11-05"
+        assert set(result["capabilities"]) == {"tools", "resources"}
+
+        response = _request(server, "initialize", {"protocolVersion": "1999-01-01"})
+        assert response["result"]["protocolVersion"] == "2025-06-18"
+
+    def test_notifications_get_no_response(self, server):
+        """Test that notifications are not answered."""
+        message = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+        assert server.handle(message) is None
+
+    def test_unknown_method(self, server):
+        """Test the error for unknown methods."""
+        response = _request(server, "prompts/list")
+        assert response["error"]["code"] == METHOD_NOT_FOUND
+
+    def test_list_tools(self, server):
+        """Test that both tools are advertised."""
+        tools = _request(server, "tools/list")["result"]["tools"]
+        assert [tool["name"] for tool in tools] == ["list_sections", "get_section"]
+
+    def test_list_sections(self, server):
+        """Test the list_sections tool with and without max_level."""
+        result = _request(
+            server, "tools/call", {"name": "list_sections", "arguments": {}}
+        )["result"]
+        text = result["content"][0]["text"]
+        assert "  - Services (services.md)" in text
+
+        result = _request(
+            server, "tools/call",
+            {"name": "list_sections", "arguments": {"max_level": 1}},
+        )["result"]
+        assert "Services" not in result["content"][0]["text"]
+
+    @pytest.mark.parametrize("max_level", [True, 0, "2"])
+    def test_invalid_max_level(self, server, max_level):
+        """Test that max_level must be an integer level, not a boolean."""
+        result = _request(
+            server, "tools/call",
+            {"name": "list_sections", "arguments": {"max_level": max_level}},
+        )["result"]
+        assert result["isError"] is True
+        assert "max_level" in result["content"][0]["text"]
+
+    @pytest.mark.parametrize("arguments", [["services"], "services", 1])
+    def test_arguments_must_be_an_object(self, server, arguments):
+        """Test that non-object arguments are invalid params, not a crash."""
+        response = _request(
+            server, "tools/call", {"name": "get_section", "arguments": arguments}
+        )
+        assert response["error"]["code"] == INVALID_PARAMS
+        assert "arguments" in response["error"]["message"]
+
+    @pytest.mark.parametrize("name", ["services.md", "services", "Services"])
+    def test_get_section(self, server, name):
+        """Test looking up a section by filename, slug or title."""
+        result = _request(
+            server, "tools/call", {"name": "get_section", "arguments": {"name": name}}
+        )["result"]
+
+        assert result["isError"] is False
+        assert result["content"][0]["text"].startswith("## Services")
+
+    def test_get_unknown_section(self, server):
+        """Test that unknown sections are reported as tool errors."""
+        result = _request(
+            server, "tools/call",
+            {"name": "get_section", "arguments": {"name": "celery"}},
+        )["result"]
+
+        assert result["isError"] is True
+        assert "list_sections" in result["content"][0]["text"]
+
+    def test_resources(self, server):
+        """Test listing and reading resources."""
+        resources = _request(server, "resources/list")["result"]["resources"]
+        uris = [resource["uri"] for resource in resources]
+        assert uris[0] == TOC_URI
+        assert "mcpdoc://sections/testing.md" in uris
+
+        contents = _request(
+            server, "resources/read", {"uri": "mcpdoc://sections/testing.md"}
+        )["result"]["contents"]
+        assert contents[0]["text"] == "## Testing\nTest the services."
+
+        response = _request(server, "resources/read", {"uri": "mcpdoc://nope"})
+        assert "error" in response
+
+
+class TestServeStdio:
+    """Test the line-delimited stdio transport."""
+
+    def test_round_trip(self, server):
+        """Test that requests are answered in order and bad JSON is reported."""
+        stdin = io.StringIO(
+            json.dumps({"jsonrpc": "2.0", "id": 1, "method": "ping"}) + "\n"
+            + json.dumps({"jsonrpc": "2.0", "method": "notifications/initialized"})
+            + "\n\nnot json\n"
+        )
+        stdout = io.StringIO()
+
+        serve_stdio(server, stdin, stdout)
+
+        responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        assert responses[0] == {"jsonrpc": "2.0", "id": 1, "result": {}}
+        assert responses[1]["error"]["code"] == PARSE_ERROR
+        assert len(responses) == 2
+
+    def test_invalid_arguments_keep_serving(self, server):
+        """Test that a request with bad arguments doesn't end the loop."""
+        stdin = io.StringIO(
+            json.dumps({
+                "jsonrpc": "2.0", "id": 1, "method": "tools/call",
+                "params": {"name": "get_section", "arguments": ["services"]},
+            })
+            + "\n" + json.dumps({"jsonrpc": "2.0", "id": 2, "method": "ping"}) + "\n"
+        )
+        stdout = io.StringIO()
+
+        serve_stdio(server, stdin, stdout)
+
+        responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        assert responses[0]["error"]["code"] == INVALID_PARAMS
+        assert responses[1] == {"jsonrpc": "2.0", "id": 2, "result": {}}
@@ -0,0 +1,150 @@
+"""Tests for mcpdoc_split.source module."""
+
+import pytest
+
+from mcpdoc_split.chunking import chunk_sections
+from mcpdoc_split.main import (
+    collect_sections,
+    generate_docs,
+    get_parser,
+    render_section,
+)
+from mcpdoc_split.source import (
+    LineSource,
+    MappedSource,
+    line_offsets,
+    open_source,
+    strip_range,
+)
+
+MARKDOWN = """# Guide
+Intro with a non-ASCII character: café.
+
+## Models　
+ Model text. 
+
+```python
+# not a heading
+```
+
+## Empty
+"""
+
+
+def _open(tmp_path, content):
+    input_file = tmp_path / "guide.md"
+    input_file.write_bytes(content.encode("utf-8"))
+    return open_source(str(input_file))
+
+
+class TestLineOffsets:
+    """Test the line_offsets function."""
+
+    def test_line_breaks(self):
+        """Test that CRLF, CR and LF all end a line, as in markdown-it."""
+        assert list(line_offsets(b"a\nb\r\nc\rd")) == [0, 2, 5, 7, 9]
+        assert list(line_offsets(b"a\nb\n")) == [0, 2, 4, 5]
+        assert list(line_offsets(b"")) == [0, 1]
+
+
+class TestOpenSource:
+    """Test the open_source function."""
+
+    def test_lf_input_is_mapped(self, tmp_path):
+        """Test that LF input is sliced from a memory map."""
+        source = _open(tmp_path, MARKDOWN)
+        try:
+            assert isinstance(source, MappedSource)
+            assert source.decode() == MARKDOWN
+            assert source.line_count == len(MARKDOWN.split("\n"))
+        finally:
+            source.close()
+
+    @pytest.mark.parametrize("newline", ["\r\n", "\r"])
+    def test_cr_input_falls_back_to_lines(self, tmp_path, newline):
+        """Test that CR line breaks are read with universal newlines."""
+        source = _open(tmp_path, MARKDOWN.replace("\n", newline))
+        assert isinstance(source, LineSource)
+        assert source.decode() == MARKDOWN
+
+    def test_invalid_utf8(self, tmp_path):
+        """Test that undecodable input raises ValueError."""
+        input_file = tmp_path / "guide.md"
+        input_file.write_bytes(b"# \xff\n")
+        source = open_source(str(input_file))
+        with pytest.raises(ValueError, match="guide.md"):
+            source.decode()
+
+    def test_changed_input(self, tmp_path):
+        """Test that input resized after reading is refused."""
+        source = _open(tmp_path, MARKDOWN)
+        source.decode()
+        (tmp_path / "guide.md").write_text(MARKDOWN + "More.\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="changed"):
+            source.line_offsets
+
+
+class TestSectionView:
+    """Test slicing sections out of the input."""
+
+    @pytest.mark.parametrize("content", [MARKDOWN, MARKDOWN.rstrip("\n"), ""])
+    def test_matches_render_section(self, tmp_path, content):
+        """Test that every slice equals the rendered section."""
+        source = _open(tmp_path, content)
+        try:
+            lines = content.split("\n")
+            for section in collect_sections(source.decode()):
+                with source.section_view(section) as view:
+                    assert str(view, "utf-8") == render_section(section, lines)
+                assert source.section_text(section) == render_section(section, lines)
+        finally:
+            source.close()
+
+    def test_offsets_match_line_source(self, tmp_path):
+        """Test that both sources compute the same line offsets."""
+        source = _open(tmp_path, MARKDOWN)
+        try:
+            assert list(source.line_offsets) == list(
+                LineSource(MARKDOWN).line_offsets
+            )
+        finally:
+            source.close()
+
+    def test_strip_unicode_whitespace(self):
+        """Test that trimming matches str.strip() on multi-byte whitespace."""
+        text = "　  é  \n"
+        data = text.encode("utf-8")
+        start, end = strip_range(data, 0, len(data))
+        assert data[start:end].decode("utf-8") == text.strip()
+
+
+class TestGenerateFromSource:
+    """Test generate_docs output written from the mapped input."""
+
+    @pytest.mark.parametrize("options", [
+        {}, {"content_hash": True}, {"chunk_size": 40, "min_chunk_size": 1},
+    ])
+    def test_same_files_as_line_source(self, tmp_path, options):
+        """Test that LF and CRLF inputs produce identical files."""
+        outputs = []
+        for name, newline in (("lf", "\n"), ("crlf", "\r\n")):
+            input_file = tmp_path / f"{name}.md"
+            input_file.write_bytes(MARKDOWN.replace("\n", newline).encode("utf-8"))
+            output_dir = tmp_path / name
+            generate_docs(
+                str(input_file), output_dir=str(output_dir),
+                toc_file=str(tmp_path / f"{name}.txt"), **options
+            )
+            outputs.append({
+                path.name: path.read_bytes() for path in output_dir.iterdir()
+            })
+        assert outputs[0] == outputs[1]
+        assert outputs[0]
+
+    def test_chunk_sections_with_offsets(self):
+        """Test that line offsets give the same chunks as line strings."""
+        tokens = get_parser("block").parse(MARKDOWN)
+        source = LineSource(MARKDOWN)
+        assert chunk_sections(
+            tokens, None, 6, 40, 1, line_offsets=source.line_offsets
+        ) == chunk_sections(tokens, source.lines, 6, 40, 1)
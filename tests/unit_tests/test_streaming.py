@@ -0,0 +1,154 @@
+"""Tests for mcpdoc_split.streaming module."""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from mcpdoc_split.main import collect_sections, generate_docs
+from mcpdoc_split.streaming import scan_lines
+
+
+def _streamed_headings(content):
+    """Return (line, level, header) for every heading found by the scanner."""
+    return [
+        (line_no, heading[0], heading[1])
+        for line_no, (_, heading) in enumerate(scan_lines(content.split("\n")))
+        if heading is not None and heading[1]
+    ]
+
+
+def _parsed_headings(content):
+    """Return (line, level, header) for every heading found by markdown-it."""
+    return [
+        (section["start_line"], section["level"], section["header"])
+        for section in collect_sections(content)
+    ]
+
+
+EQUIVALENCE_CASES = [
+    "# Title\nText\n## Sub ##\nMore",
+    "Title\n=====\n\nSub\n---\ntext",
+    "Multi\nline\n===",
+    "```\n# not a heading\n```\n# Heading",
+    "~~~~\n# not\n~~~\n# still not\n~~~~\n# Heading",
+    "```python\n# comment\n",
+    "    # indented code\n\n# Heading",
+    "<div>\n# inside html\n</div>\n\n# Heading",
+    "<!--\n# commented out\n-->\n# Heading",
+    "> # Quoted\n> text",
+    "> ```\n> # in quoted fence\n\n# Heading",
+    "- # Item heading\n- ```\n  # in list fence\n  ```\n# Heading",
+    "- item\n  ---\n",
+    "Para\n---\n***\n- - -\nNext\n***",
+    "#NoSpace\n#\n# #\n## Trailing#",
+    "text\n    # continuation\n# Heading",
+    "1. item\n    # nested heading",
+    "- item\n\n\t# tab heading",
+    "Para\n> quote\n---",
+    "[ref]: /x\n===",
+    "[ref]: /x\nTitle\n===",
+    "Title\n[ref]: /x\n===",
+    "[ref]: /x\n\"title\"\n===",
+    "[ref]:\n/x 'title'\n===",
+    "[ref]:\n---",
+    ">\n#nospace 1\n===",
+    "- ```\n>\n-->\n===",
+    "Title\n- \n",
+    "- \n\n  ===\n---",
+    "> - item\n\t# lazy",
+    "> > deep\n> ===",
+    "# Top\n\n- > q\n\t# Tab heading\n",
+    ">\t# tab after marker",
+    "-\tpara\n\t# in item",
+    "- > - c\n\t# outer item",
+    "- - a\n\n  # outer item",
+    "1. > b\n   > more\n   ===",
+]
+
+
+class TestScanLines:
+    """Test the scan_lines heading scanner against markdown-it."""
+
+    @pytest.mark.parametrize("content", EQUIVALENCE_CASES)
+    def test_matches_markdown_it(self, content):
+        """Test that streamed heading boundaries match the parsed ones."""
+        assert _streamed_headings(content) == _parsed_headings(content)
+
+    def test_yields_every_line(self):
+        """Test that lines are passed through unchanged and in order."""
+        lines = ["Title", "more", "===", "", "# Next", "body"]
+        assert [line for line, _ in scan_lines(lines)] == lines
+
+    def test_setext_heading_starts_at_paragraph(self):
+        """Test that a setext heading is reported on its first line."""
+        result = list(scan_lines(["Title", "more", "==="]))
+        assert result[0] == ("Title", (1, "Title\nmore"))
+        assert result[1] == ("more", None)
+
+
+class TestStreamingGenerateDocs:
+    """Test generate_docs with streaming=True."""
+
+    @pytest.mark.parametrize("content_hash", [False, True])
+    def test_matches_default_output(self, content_hash):
+        """Test that streamed files and TOC are identical to the default path."""
+        markdown_content = """Preamble is dropped.
+
+# Introduction
+Intro text.
+
+```bash
+# not a heading
+```
+
+Getting Started
+---------------
+
+Trailing spaces and blank lines are trimmed.   
+
+
+## Usage
+Use it.
+
+## Usage
+Use it again.
+"""
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = os.path.join(temp_dir, "input.md")
+            Path(input_file).write_text(markdown_content)
+            outputs = {}
+            results = {}
+            for name, streaming in (("default", False), ("stream", True)):
+                output_dir = os.path.join(temp_dir, name)
+                toc_file = os.path.join(temp_dir, f"{name}.txt")
+                results[name] = generate_docs(
+                    input_file, output_dir=output_dir, toc_file=toc_file,
+                    streaming=streaming, content_hash=content_hash,
+                )
+                outputs[name] = (
+                    {p.name: p.read_text() for p in Path(output_dir).iterdir()},
+                    Path(toc_file).read_text(),
+                )
+
+            assert outputs["stream"] == outputs["default"]
+            for attr in ("sections", "bytes_written", "largest_section"):
+                assert getattr(results["stream"], attr) == getattr(
+                    results["default"], attr
+                )
+            assert "not-a-heading.md" not in outputs["stream"][0]
+            assert len(outputs["stream"][0]) == 4
+
+    def test_streaming_rejects_incremental(self):
+        """Test that streaming and incremental modes can't be combined."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".md", delete=False) as f:
+            f.write("# Test\nContent")
+            temp_file = f.name
+
+        try:
+            with pytest.raises(ValueError, match="can't be combined"):
+                generate_docs(temp_file, streaming=True, incremental=True)
+        finally:
+            os.unlink(temp_file)
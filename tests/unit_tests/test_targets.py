@@ -0,0 +1,205 @@
+"""Tests for mcpdoc_split.targets module."""
+
+import argparse
+import os
+import sys
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+
+from mcpdoc_split import main as main_module
+from mcpdoc_split.cli import main, parse_target
+from mcpdoc_split.incremental import write_if_changed
+from mcpdoc_split.main import collect_sections, generate_docs
+from mcpdoc_split.targets import derive_sections, resolve_targets
+
+MARKDOWN = """# Guide
+Intro.
+
+## Setup
+Setup text.
+
+### Install
+Install text.
+
+## Models
+Model text.
+
+### Setup
+Repeated header.
+
+# Reference
+Reference text.
+"""
+
+
+def _read_dir(path):
+    return {entry.name: entry.read_bytes() for entry in path.iterdir()}
+
+
+class TestDeriveSections:
+    """Test the derive_sections function."""
+
+    @pytest.mark.parametrize("max_level", range(1, 7))
+    def test_matches_collect_sections(self, max_level):
+        """Test that a derived table equals a direct split at that level."""
+        total_lines = MARKDOWN.count("\n") + 1
+        assert derive_sections(
+            collect_sections(MARKDOWN), max_level, total_lines
+        ) == collect_sections(MARKDOWN, max_level)
+
+
+class TestResolveTargets:
+    """Test the resolve_targets function."""
+
+    DEFAULTS = {
+        "output_dir": "docs",
+        "toc_file": "llms.txt",
+        "url_prefix": "https://example.com",
+        "base_path": "/docs",
+        "max_level": 6,
+    }
+
+    def test_fills_defaults(self):
+        """Test that unset settings come from the defaults."""
+        targets = resolve_targets(
+            [{}, {"toc_file": "short.txt", "max_level": 2, "output_dir": "short"}],
+            **self.DEFAULTS,
+        )
+        assert targets[0] == self.DEFAULTS
+        assert targets[1]["url_prefix"] == "https://example.com"
+        assert targets[1]["max_level"] == 2
+
+    @pytest.mark.parametrize("targets, message", [
+        ([], "at least one"),
+        ([{"streaming": True}], "unknown settings: streaming"),
+        ([{"max_level": 7}], "max_level"),
+        ([{}, {"url_prefix": "https://mirror.example.com"}], "both write to"),
+        ([{}, {"toc_file": "short.txt", "max_level": 2}], "same max_level"),
+    ])
+    def test_rejects(self, targets, message):
+        """Test invalid and colliding targets."""
+        with pytest.raises(ValueError, match=message):
+            resolve_targets(targets, **self.DEFAULTS)
+
+
+class TestGenerateTargets:
+    """Test generate_docs with several targets."""
+
+    TARGETS = [
+        {},
+        {"toc_file": "mirror.txt", "url_prefix": "https://mirror.example.com"},
+        {"output_dir": "copy", "toc_file": "copy.txt"},
+        {"output_dir": "short", "toc_file": "short.txt", "max_level": 2},
+    ]
+
+    def _generate(self, tmp_path, **options):
+        input_file = tmp_path / "guide.md"
+        input_file.write_text(MARKDOWN, encoding="utf-8")
+        targets = [
+            {key: str(tmp_path / value) if key in ("output_dir", "toc_file")
+             else value for key, value in target.items()}
+            for target in self.TARGETS
+        ]
+        return generate_docs(
+            str(input_file),
+            output_dir=str(tmp_path / "docs"),
+            toc_file=str(tmp_path / "llms.txt"),
+            targets=targets,
+            **options,
+        )
+
+    @pytest.mark.parametrize("options", [{}, {"content_hash": True}])
+    def test_same_output_as_separate_runs(self, tmp_path, options):
+        """Test that every target matches a run of its own, after one parse."""
+        with patch.object(
+            main_module, "get_parser", wraps=main_module.get_parser
+        ) as get_parser:
+            result = self._generate(tmp_path, **options)
+        assert get_parser.call_count == 1
+        assert len(result.targets) == 4
+
+        for name, toc, options_ in (
+            ("docs", "llms.txt", {}),
+            ("docs", "mirror.txt", {"url_prefix": "https://mirror.example.com"}),
+            ("copy", "copy.txt", {}),
+            ("short", "short.txt", {"max_level": 2}),
+        ):
+            generate_docs(
+                str(tmp_path / "guide.md"),
+                output_dir=str(tmp_path / "expected"),
+                toc_file=str(tmp_path / "expected.txt"),
+                **options, **options_,
+            )
+            assert _read_dir(tmp_path / name) == _read_dir(tmp_path / "expected")
+            assert (tmp_path / toc).read_text() == (
+                tmp_path / "expected.txt"
+            ).read_text()
+
+    def test_identical_files_are_linked(self, tmp_path):
+        """Test that files shared between output directories are hard links."""
+        result = self._generate(tmp_path)
+        assert [target["linked"] for target in result.targets] == [0, 0, 6, 2]
+        assert os.path.samefile(
+            tmp_path / "docs" / "guide.md", tmp_path / "copy" / "guide.md"
+        )
+        assert os.path.samefile(
+            tmp_path / "docs" / "reference.md", tmp_path / "short" / "reference.md"
+        )
+        assert not os.path.samefile(
+            tmp_path / "docs" / "setup.md", tmp_path / "short" / "setup.md"
+        )
+
+    def test_rewrite_breaks_links(self, tmp_path):
+        """Test that rewriting a linked file leaves the other copies alone."""
+        self._generate(tmp_path)
+        write_if_changed(str(tmp_path / "copy" / "guide.md"), "# Changed\n")
+        assert (tmp_path / "docs" / "guide.md").read_text().startswith("# Guide")
+
+    def test_incremental_targets(self, tmp_path):
+        """Test that incremental runs keep every target up to date."""
+        self._generate(tmp_path, incremental=True)
+        result = self._generate(tmp_path, incremental=True)
+        assert all(target["bytes_written"] == 0 for target in result.targets)
+        assert sorted(os.listdir(tmp_path / "short")) == [
+            ".mcpdoc-manifest.json", "guide.md", "models.md", "reference.md",
+            "setup.md",
+        ]
+
+    def test_rejects_single_output_options(self, tmp_path):
+        """Test that options writing one extra file can't be combined."""
+        with pytest.raises(ValueError, match="search_index"):
+            self._generate(tmp_path, search_index=str(tmp_path / "index.json"))
+
+
+class TestTargetCli:
+    """Test the --target option."""
+
+    def test_parse_target(self):
+        """Test parsing a target specification."""
+        assert parse_target("output-dir=short,toc_file=short.txt,max_level=2") == {
+            "output_dir": "short", "toc_file": "short.txt", "max_level": 2,
+        }
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_target("colour=blue")
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_target("max_level=two")
+
+    def test_target_option(self, tmp_path):
+        """Test generating an extra target from the command line."""
+        input_file = tmp_path / "guide.md"
+        input_file.write_text(MARKDOWN, encoding="utf-8")
+        argv = [
+            "mcpdoc-split", str(input_file),
+            "--output-dir", str(tmp_path / "docs"),
+            "--toc-file", str(tmp_path / "llms.txt"),
+            "--target",
+            f"output_dir={tmp_path / 'short'},toc_file={tmp_path / 'short.txt'},"
+            "max_level=1",
+        ]
+        with patch.object(sys, "argv", argv):
+            with patch.object(sys, "stdout", new=StringIO()):
+                main()
+        assert sorted(os.listdir(tmp_path / "short")) == ["guide.md", "reference.md"]
+        assert (tmp_path / "docs" / "install.md").exists()
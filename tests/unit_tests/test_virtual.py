@@ -0,0 +1,189 @@
+"""Tests for mcpdoc_split.virtual module."""
+
+import json
+import os
+import sys
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+
+from mcpdoc_split.cli import main
+from mcpdoc_split.main import collect_sections, generate_docs, render_section
+from mcpdoc_split.virtual import (
+    VirtualDocs,
+    build_virtual_index,
+    write_virtual_index,
+)
+
+MARKDOWN = """# Guide
+Intro with a non-ASCII character: café.
+
+## Models
+Model text.
+
+```python
+# not a heading
+```
+
+## Models
+Second models section.
+
+Setext heading
+--------------
+Setext text.
+"""
+
+
+@pytest.fixture
+def split(tmp_path):
+    """Split MARKDOWN virtually and return the index path."""
+    input_file = tmp_path / "guide.md"
+    input_file.write_text(MARKDOWN, encoding="utf-8")
+    index_file = tmp_path / "index" / "guide.json"
+    write_virtual_index(
+        str(input_file), str(index_file), toc_file=str(tmp_path / "llms.txt")
+    )
+    return index_file
+
+
+class TestBuildVirtualIndex:
+    """Test the build_virtual_index function."""
+
+    def test_ranges_match_section_files(self):
+        """Test that every byte range holds what the section file would."""
+        data = MARKDOWN.encode("utf-8")
+        index, sections = build_virtual_index(data, "guide.md")
+
+        lines = MARKDOWN.split("\n")
+        expected = collect_sections(MARKDOWN)
+        assert [row[0] for row in index["sections"]] == [
+            "guide", "models", "models-2", "setext-heading"
+        ]
+        for row, section in zip(index["sections"], expected):
+            text = data[row[3]:row[4]].decode("utf-8")
+            assert text == render_section(section, lines)
+        assert sections == expected
+        assert index["size"] == len(data)
+
+    def test_crlf_source(self):
+        """Test that sections are found at the same lines with CRLF endings."""
+        data = MARKDOWN.replace("\n", "\r\n").encode("utf-8")
+        index, _ = build_virtual_index(data, "guide.md")
+
+        _, header, level, start, end = index["sections"][1]
+        assert (header, level) == ("Models", 2)
+        assert data[start:end] == (
+            b"## Models\r\nModel text.\r\n\r\n```python\r\n# not a heading\r\n```"
+        )
+
+    def test_strips_like_section_files(self):
+        """Test that ranges are trimmed as str.strip() trims section text."""
+        content = "# Guide\n\u3000Intro.\u00a0\x1c\n\n## Next\nText.\n"
+        data = content.encode("utf-8")
+        index, sections = build_virtual_index(data, "guide.md")
+
+        lines = content.split("\n")
+        for row, section in zip(index["sections"], sections):
+            text = data[row[3]:row[4]].decode("utf-8")
+            assert text == render_section(section, lines)
+
+    def test_rejects_invalid_utf8(self):
+        """Test that an undecodable source raises ValueError."""
+        with pytest.raises(ValueError, match="guide.md"):
+            build_virtual_index(b"# \xff\n", "guide.md")
+
+
+class TestVirtualDocs:
+    """Test the VirtualDocs reader."""
+
+    def test_writes_no_section_files(self, split, tmp_path):
+        """Test that only the index and the TOC are written."""
+        assert sorted(os.listdir(tmp_path)) == ["guide.md", "index", "llms.txt"]
+        index = json.loads(split.read_text())
+        assert index["source"] == os.path.join("..", "guide.md")
+
+    def test_sections_by_slug(self, split):
+        """Test reading sections by slug through the map."""
+        with VirtualDocs(str(split)) as docs:
+            assert docs.slugs() == ["guide", "models", "models-2", "setext-heading"]
+            assert docs.section_text("models-2") == (
+                "## Models\nSecond models section."
+            )
+            view = docs.section_bytes("guide")
+            assert bytes(view[:8]) == b"# Guide\n"
+            assert bytes(view).endswith("café.".encode("utf-8"))
+            view.release()
+            entry = docs.entry("setext-heading")
+            assert entry["header"] == "Setext heading"
+            assert entry["level"] == 2
+            with pytest.raises(KeyError):
+                docs.entry("missing")
+
+    def test_matches_regular_split(self, split, tmp_path):
+        """Test that every section equals the file a regular split writes."""
+        generate_docs(
+            str(tmp_path / "guide.md"),
+            output_dir=str(tmp_path / "docs"),
+            toc_file=str(tmp_path / "regular.txt"),
+        )
+        with VirtualDocs(str(split)) as docs:
+            for slug in docs.slugs():
+                path = tmp_path / "docs" / f"{slug}.md"
+                assert docs.section_text(slug) == path.read_text(encoding="utf-8")
+        assert (tmp_path / "llms.txt").read_text() == (
+            tmp_path / "regular.txt"
+        ).read_text()
+
+    def test_rejects_changed_source(self, split, tmp_path):
+        """Test that a source of a different size is refused."""
+        (tmp_path / "guide.md").write_text(MARKDOWN + "More.\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="changed"):
+            VirtualDocs(str(split))
+
+    def test_empty_source(self, tmp_path):
+        """Test a source without sections."""
+        input_file = tmp_path / "empty.md"
+        input_file.write_text("")
+        write_virtual_index(str(input_file), str(tmp_path / "i.json"), toc_file=None)
+        with VirtualDocs(str(tmp_path / "i.json")) as docs:
+            assert docs.slugs() == []
+
+
+class TestVirtualCli:
+    """Test the --virtual option."""
+
+    def test_virtual_option(self, tmp_path):
+        """Test that --virtual writes the index instead of section files."""
+        input_file = tmp_path / "guide.md"
+        input_file.write_text(MARKDOWN, encoding="utf-8")
+        argv = [
+            "mcpdoc-split", str(input_file),
+            "--output-dir", str(tmp_path / "docs"),
+            "--toc-file", str(tmp_path / "llms.txt"),
+            "--virtual", str(tmp_path / "guide.json"),
+        ]
+
+        with patch.object(sys, "argv", argv):
+            with patch.object(sys, "stdout", new=StringIO()):
+                main()
+
+        assert not (tmp_path / "docs").exists()
+        with VirtualDocs(str(tmp_path / "guide.json")) as docs:
+            assert docs.section_text("models").startswith("## Models")
+
+    def test_rejects_incompatible_options(self, tmp_path):
+        """Test that --virtual can't be combined with section file options."""
+        input_file = tmp_path / "guide.md"
+        input_file.write_text(MARKDOWN, encoding="utf-8")
+        argv = [
+            "mcpdoc-split", str(input_file), "--virtual", "i.json", "--incremental",
+        ]
+
+        with patch.object(sys, "argv", argv):
+            with patch.object(sys, "stderr", new=StringIO()) as mock_stderr:
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+
+        assert exc_info.value.code == 1
+        assert "--incremental" in mock_stderr.getvalue()
@@ -0,0 +1,280 @@
+"""Tests for mcpdoc_split.watch module."""
+
+import os
+import random
+import sys
+import threading
+import time
+
+import pytest
+
+from mcpdoc_split.incremental import load_manifest
+from mcpdoc_split.main import build_toc, collect_sections, render_section
+from mcpdoc_split.watch import (
+    InotifyWatcher,
+    LiveSplitter,
+    PollingWatcher,
+    _common_prefix,
+    _common_suffix,
+    watch,
+)
+
+MARKDOWN = """# Guide
+Intro text.
+
+## Models
+Model text.
+
+```python
+# not a heading
+```
+
+## Services
+Service text.
+
+> quoted paragraph
+
+## Testing
+Testing text.
+"""
+
+
+def _split(tmp_path, text, **options):
+    """Write the input and build a live splitter over it."""
+    input_file = tmp_path / "guide.md"
+    input_file.write_text(text)
+    splitter = LiveSplitter(
+        str(input_file),
+        output_dir=str(tmp_path / "docs"),
+        toc_file=str(tmp_path / "llms.txt"),
+        **options,
+    )
+    splitter.build()
+    return splitter, input_file
+
+
+def _expected(text, max_level=6):
+    """Return the files and TOC a full parse produces."""
+    lines = text.split("\n")
+    sections = collect_sections(text, max_level)
+    files = {
+        section["filename"]: render_section(section, lines) for section in sections
+    }
+    return files, build_toc(sections, "https://example.com", "/docs")
+
+
+def _output(tmp_path):
+    docs = tmp_path / "docs"
+    files = {path.name: path.read_text() for path in docs.glob("*.md")}
+    return files, (tmp_path / "llms.txt").read_text()
+
+
+class TestCommonAffixes:
+    """Test the changed-region helpers."""
+
+    def test_common_prefix(self):
+        """Test the common prefix across and within comparison blocks."""
+        assert _common_prefix("abcdef", "abcxef") == 3
+        assert _common_prefix("abc", "abcdef") == 3
+        assert _common_prefix("", "abc") == 0
+        long_text = "x" * 200000
+        assert _common_prefix(long_text + "a", long_text + "b") == 200000
+
+    def test_common_suffix(self):
+        """Test that the common suffix respects its limit."""
+        assert _common_suffix("abcdef", "abxdef", 6) == 3
+        assert _common_suffix("aaa", "aaaa", 3) == 3
+        assert _common_suffix("aaa", "aaaa", 1) == 1
+        long_text = "x" * 200000
+        assert _common_suffix("a" + long_text, "b" + long_text, 200001) == 200000
+
+
+class TestLiveSplitter:
+    """Test the LiveSplitter class."""
+
+    def test_build_matches_full_split(self, tmp_path):
+        """Test that the initial build writes what a full split writes."""
+        _split(tmp_path, MARKDOWN)
+        assert _output(tmp_path) == _expected(MARKDOWN)
+
+    def test_edit_rewrites_one_section(self, tmp_path):
+        """Test that editing a section only rewrites that section."""
+        splitter, input_file = _split(tmp_path, MARKDOWN)
+        text = MARKDOWN.replace("Service text.", "Service text, edited.")
+        input_file.write_text(text)
+
+        stats = splitter.update()
+
+        assert stats["written"] == 1
+        assert stats["deleted"] == 0
+        assert stats["parsed_lines"] < len(text.split("\n"))
+        assert _output(tmp_path) == _expected(text)
+
+    def test_unchanged_input(self, tmp_path):
+        """Test that an unchanged input parses and writes nothing."""
+        splitter, _ = _split(tmp_path, MARKDOWN)
+        stats = splitter.update()
+        assert stats["written"] == 0
+        assert stats["parsed_lines"] == 0
+
+    def test_inserted_duplicate_heading_renumbers(self, tmp_path):
+        """Test that filenames after an inserted duplicate heading shift."""
+        splitter, input_file = _split(tmp_path, MARKDOWN)
+        text = MARKDOWN.replace("## Models", "## Testing\nEarly tests.\n\n## Models")
+        input_file.write_text(text)
+
+        splitter.update()
+
+        files, toc = _output(tmp_path)
+        assert files["testing.md"].startswith("## Testing\nEarly tests.")
+        assert files["testing-2.md"] == "## Testing\nTesting text."
+        assert (files, toc) == _expected(text)
+
+    def test_unclosed_fence_swallows_later_headings(self, tmp_path):
+        """Test that an edit changing the block structure below it is handled."""
+        splitter, input_file = _split(tmp_path, MARKDOWN)
+        text = MARKDOWN.replace("Model text.", "Model text.\n\n~~~")
+        input_file.write_text(text)
+
+        stats = splitter.update()
+
+        assert stats["deleted"] == 2
+        assert _output(tmp_path) == _expected(text)
+
+        input_file.write_text(MARKDOWN)
+        splitter.update()
+        assert _output(tmp_path) == _expected(MARKDOWN)
+
+    def test_keeps_manifest_current(self, tmp_path):
+        """Test that the incremental manifest describes the output."""
+        splitter, input_file = _split(tmp_path, MARKDOWN)
+        input_file.write_text(MARKDOWN.replace("## Services", "## Selectors"))
+        splitter.update()
+
+        manifest = load_manifest(str(tmp_path / "docs"))
+        assert sorted(manifest) == sorted(_output(tmp_path)[0])
+        assert manifest["selectors.md"]["start_line"] == 10
+
+    def test_max_level(self, tmp_path):
+        """Test that headings below max_level stay inside their parent."""
+        splitter, input_file = _split(tmp_path, MARKDOWN, max_level=1)
+        text = MARKDOWN + "\n# Appendix\nMore.\n"
+        input_file.write_text(text)
+        splitter.update()
+        assert _output(tmp_path) == _expected(text, max_level=1)
+
+    def test_random_edits_match_full_split(self, tmp_path):
+        """Test the re-parsed output against a full split after random edits."""
+        snippets = [
+            "```", "# Top", "## Models", "Setext", "---", "===", "", "> quote",
+            "> ## Quoted", "- item", "    indented", "<div>", "</div>", "text",
+        ]
+        rng = random.Random(7)
+        splitter, input_file = _split(tmp_path, MARKDOWN * 3)
+        lines = (MARKDOWN * 3).split("\n")
+        for _ in range(60):
+            pos = rng.randrange(len(lines) + 1)
+            operation = rng.random()
+            if operation < 0.4:
+                lines.insert(pos, rng.choice(snippets))
+            elif operation < 0.7:
+                del lines[pos:pos + rng.randint(1, 3)]
+            else:
+                lines[pos:pos + 1] = [rng.choice(snippets)]
+            text = "\n".join(lines)
+            input_file.write_text(text)
+
+            splitter.update()
+
+            assert _output(tmp_path) == _expected(text)
+            assert splitter.lines == lines
+
+
+class TestWatchers:
+    """Test the file watchers and the watch loop."""
+
+    def _touch_later(self, path, text, delay=0.1):
+        def write():
+            time.sleep(delay)
+            path.write_text(text)
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        return thread
+
+    def test_polling_watcher(self, tmp_path):
+        """Test that the polling watcher reports a change and then times out."""
+        path = tmp_path / "guide.md"
+        path.write_text("# A\n")
+        watcher = PollingWatcher(str(path), interval=0.01)
+        assert watcher.wait(0.02) is False
+
+        thread = self._touch_later(path, "# B, longer\n")
+        assert watcher.wait(5) is True
+        thread.join()
+        assert watcher.wait(0.02) is False
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux only")
+    def test_inotify_watcher(self, tmp_path):
+        """Test that inotify reports changes to the file only."""
+        path = tmp_path / "guide.md"
+        path.write_text("# A\n")
+        watcher = InotifyWatcher(str(path))
+        try:
+            (tmp_path / "other.md").write_text("unrelated")
+            assert watcher.wait(0.05) is False
+
+            thread = self._touch_later(path, "# B\n", delay=0.05)
+            assert watcher.wait(5) is True
+            thread.join()
+        finally:
+            watcher.close()
+
+    @pytest.mark.parametrize("polling", [True, False])
+    def test_watch_debounces_and_regenerates(self, tmp_path, polling):
+        """Test that a burst of saves triggers a single regeneration."""
+        path = tmp_path / "guide.md"
+        path.write_text("# A\n")
+        calls = []
+
+        def burst():
+            time.sleep(0.1)
+            for number in range(3):
+                path.write_text(f"# A\n\nSave {number}.\n")
+                time.sleep(0.01)
+
+        thread = threading.Thread(target=burst)
+        thread.start()
+        watch(
+            str(path),
+            regenerate=lambda: {"text": path.read_text()},
+            report=calls.append,
+            debounce=0.2,
+            polling=polling,
+            stop=lambda: bool(calls),
+        )
+        thread.join()
+
+        assert calls == [{"text": "# A\n\nSave 2.\n"}]
+
+    def test_watch_reports_errors(self, tmp_path):
+        """Test that a failed regeneration is reported and not raised."""
+        path = tmp_path / "guide.md"
+        path.write_text("# A\n")
+        calls = []
+
+        def fail():
+            raise ValueError("broken input")
+
+        thread = threading.Thread(
+            target=lambda: (time.sleep(0.05), path.write_text("# B\n"))
+        )
+        thread.start()
+        watch(
+            str(path), fail, calls.append, debounce=0.01, polling=True,
+            stop=lambda: bool(calls),
+        )
+        thread.join()
+
+        assert calls == [{"error": "broken input"}]
+        assert os.path.exists(path)